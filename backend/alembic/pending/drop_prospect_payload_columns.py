@@ -0,0 +1,91 @@
+"""drop the raw payload columns from prospects
+
+Revision ID: drop_prospect_payload_columns
+Revises: add_prospect_score_index
+Create Date: 2026-10-18 17:00:00.000000
+
+Contract step of add_prospect_payloads. Ship it in the release after the one
+that moved the payloads to prospect_payloads, once no worker runs code that
+still reads or writes prospects.dataforseo_payload/snov_payload/
+scrape_payload/verification_payload.
+
+Kept in alembic/pending/ (not a version location) so `alembic upgrade head`
+and AUTO_MIGRATE do not run it in the same deploy as add_prospect_payloads.
+To ship it, move it to alembic/versions/ and point down_revision at the head
+of that release.
+
+Payloads written to the old columns during the rollout are copied first
+(batches of BATCH_SIZE, each committed on its own); values already in
+prospect_payloads win. Then the columns are dropped.
+
+Idempotent.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect, text
+
+# revision identifiers, used by Alembic.
+revision = 'drop_prospect_payload_columns'
+down_revision = 'add_prospect_score_index'
+branch_labels = None
+depends_on = None
+
+PAYLOAD_COLUMNS = ['dataforseo_payload', 'snov_payload', 'scrape_payload', 'verification_payload']
+BATCH_SIZE = 5000
+
+
+def existing_columns(table_name: str) -> set:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return {col['name'] for col in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    columns = [c for c in PAYLOAD_COLUMNS if c in existing_columns('prospects')]
+    if not columns:
+        return
+
+    column_list = ", ".join(columns)
+    any_payload = " OR ".join(f"{c} IS NOT NULL" for c in columns)
+    fill_gaps = ", ".join(f"{c} = COALESCE(prospect_payloads.{c}, excluded.{c})" for c in columns)
+    catch_up = text(f"""
+        WITH batch AS (
+            SELECT id, {column_list}
+            FROM prospects
+            WHERE id > :last_id
+            ORDER BY id
+            LIMIT :batch_size
+        ),
+        copied AS (
+            INSERT INTO prospect_payloads (prospect_id, {column_list})
+            SELECT id, {column_list} FROM batch WHERE {any_payload}
+            ON CONFLICT (prospect_id) DO UPDATE SET {fill_gaps}
+            RETURNING 1
+        )
+        SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+               (SELECT count(*) FROM copied) AS copied
+    """)
+    bind = op.get_bind()
+    last_id = '00000000-0000-0000-0000-000000000000'
+    total = 0
+    while True:
+        with op.get_context().autocommit_block():
+            row = bind.execute(catch_up, {"last_id": last_id, "batch_size": BATCH_SIZE}).one()
+        if row.last_id is None:
+            break
+        last_id = row.last_id
+        total += row.copied
+    print(f"✅ Synced payloads of {total} prospects to prospect_payloads")
+
+    for column in columns:
+        op.drop_column('prospects', column)
+    print(f"✅ Dropped {column_list} from prospects")
+
+
+def downgrade() -> None:
+    present = existing_columns('prospects')
+    for column in PAYLOAD_COLUMNS:
+        if column not in present:
+            op.add_column('prospects', sa.Column(column, sa.JSON(), nullable=True))
+    assignments = ", ".join(f"{c} = pp.{c}" for c in PAYLOAD_COLUMNS)
+    op.execute(f"UPDATE prospects p SET {assignments} FROM prospect_payloads pp WHERE pp.prospect_id = p.id")
@@ -0,0 +1,75 @@
+"""move email attachment bytes out of email_attachments rows
+
+Revision ID: add_email_attachment_content_hash
+Revises: add_email_log_gmail_ids
+Create Date: 2026-10-18 03:00:00.000000
+
+Attachment bytes now live in a content-addressed blob store
+(services/attachment_store.py); rows keep only metadata and the sha256
+content_hash. `data` becomes nullable: rows drop their bytes only once they
+are in a durable store (ATTACHMENT_STORE_DIR set explicitly).
+
+Idempotent. The downgrade copies blobs back into `data` from
+ATTACHMENT_STORE_DIR and refuses to run if any are missing.
+"""
+import os
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'add_email_attachment_content_hash'
+down_revision = 'add_email_log_gmail_ids'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    if not column_exists('email_attachments', 'content_hash'):
+        op.add_column('email_attachments', sa.Column('content_hash', sa.String(64), nullable=True))
+        print("✅ Added email_attachments.content_hash")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_email_attachments_content_hash ON email_attachments (content_hash)")
+    op.alter_column('email_attachments', 'data', existing_type=sa.LargeBinary(), nullable=True)
+
+
+def _stored_blob(digest):
+    # Same layout as LocalBlobStore: <root>/<hash[:2]>/<hash>
+    root = Path(os.getenv("ATTACHMENT_STORE_DIR") or "storage/attachments")
+    path = root / digest[:2] / digest
+    return path.read_bytes() if path.is_file() else None
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, content_hash FROM email_attachments WHERE data IS NULL"
+    )).all()
+    restored = [(row.id, row.content_hash and _stored_blob(row.content_hash)) for row in rows]
+    missing = [str(attachment_id) for attachment_id, data in restored if data is None]
+    if missing:
+        raise RuntimeError(
+            f"Refusing to downgrade: {len(missing)} attachment(s) have no data and their blob is not in "
+            f"ATTACHMENT_STORE_DIR ({', '.join(missing[:10])}). Point ATTACHMENT_STORE_DIR at the blob store."
+        )
+    for attachment_id, data in restored:
+        bind.execute(
+            sa.text("UPDATE email_attachments SET data = :data WHERE id = :id"),
+            {"data": data, "id": attachment_id},
+        )
+    if restored:
+        print(f"✅ Copied {len(restored)} attachment blob(s) back into email_attachments.data")
+
+    op.alter_column('email_attachments', 'data', existing_type=sa.LargeBinary(), nullable=False)
+    op.execute("DROP INDEX IF EXISTS ix_email_attachments_content_hash")
+    if column_exists('email_attachments', 'content_hash'):
+        op.drop_column('email_attachments', 'content_hash')
@@ -0,0 +1,71 @@
+"""add Gmail thread / message ids to email_logs
+
+Revision ID: add_email_log_gmail_ids
+Revises: add_prospect_domain_lower_index
+Create Date: 2026-10-18 02:00:00.000000
+
+Reply detection (services/reply_sync.py) matches incoming Gmail messages to
+prospects by thread id, falling back to the RFC 822 Message-ID of the sent
+email (In-Reply-To / References). Until now those ids only existed inside
+the email_logs.response JSON, which cannot be indexed usefully.
+
+Adds the columns, backfills them from the stored send results and indexes
+them CONCURRENTLY. Idempotent.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'add_email_log_gmail_ids'
+down_revision = 'add_prospect_domain_lower_index'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ["gmail_thread_id", "gmail_message_id", "message_id_header"]
+
+# (name, column)
+INDEXES = [
+    ("ix_email_logs_gmail_thread_id", "gmail_thread_id"),
+    ("ix_email_logs_message_id_header", "message_id_header"),
+]
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        if not column_exists('email_logs', column):
+            op.add_column('email_logs', sa.Column(column, sa.String(), nullable=True))
+            print(f"✅ Added email_logs.{column}")
+
+    # Send results stored by GmailClient.send_email carry the ids
+    op.execute("""
+        UPDATE email_logs SET
+            gmail_thread_id = response->>'thread_id',
+            gmail_message_id = response->>'message_id'
+        WHERE gmail_thread_id IS NULL
+          AND response IS NOT NULL
+          AND response->>'thread_id' IS NOT NULL
+    """)
+
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON email_logs ({column})")
+            print(f"✅ Ensured index {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    for column in COLUMNS:
+        if column_exists('email_logs', column):
+            op.drop_column('email_logs', column)
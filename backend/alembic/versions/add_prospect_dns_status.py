@@ -0,0 +1,45 @@
+"""add DNS preflight columns to prospects
+
+Revision ID: add_prospect_dns_status
+Revises: add_prospect_dossiers
+Create Date: 2026-10-18 11:00:00.000000
+
+dns_status / dns_checked_at record the DNS / MX preflight
+(services/dns_preflight.py) that lets scraping skip dead domains and
+verification skip domains without a mail server.
+
+Idempotent.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'add_prospect_dns_status'
+down_revision = 'add_prospect_dossiers'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    if not column_exists('prospects', 'dns_status'):
+        op.add_column('prospects', sa.Column('dns_status', sa.String(), nullable=True))
+        print("✅ Added prospects.dns_status")
+    if not column_exists('prospects', 'dns_checked_at'):
+        op.add_column('prospects', sa.Column('dns_checked_at', sa.DateTime(timezone=True), nullable=True))
+        print("✅ Added prospects.dns_checked_at")
+
+
+def downgrade() -> None:
+    if column_exists('prospects', 'dns_checked_at'):
+        op.drop_column('prospects', 'dns_checked_at')
+    if column_exists('prospects', 'dns_status'):
+        op.drop_column('prospects', 'dns_status')
@@ -0,0 +1,30 @@
+"""add lower(domain) expression index on prospects
+
+Revision ID: add_prospect_domain_lower_index
+Revises: add_prospect_pipeline_indexes
+Create Date: 2026-10-18 01:00:00.000000
+
+Set-based deduplication (services/deduplication.py) partitions and looks up
+prospects by lower(domain). The plain ix_prospects_domain index cannot serve
+that expression, so every dedup batch would scan the whole table.
+
+Built CONCURRENTLY; idempotent.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_prospect_domain_lower_index'
+down_revision = 'add_prospect_pipeline_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_prospects_domain_lower ON prospects (lower(domain))")
+        print("✅ Ensured index ix_prospects_domain_lower")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_prospects_domain_lower")
@@ -0,0 +1,58 @@
+"""add prospect_dossiers table
+
+Revision ID: add_prospect_dossiers
+Revises: add_email_attachment_content_hash
+Create Date: 2026-10-18 09:00:00.000000
+
+One research dossier per prospect (cleaned site text, positioning summary,
+key facts) with the builder version and an expiry, reused by compose, chat
+and follow-ups instead of re-fetching the site on every call
+(services/research_dossier.py).
+
+Idempotent.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_prospect_dossiers'
+down_revision = 'add_email_attachment_content_hash'
+branch_labels = None
+depends_on = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    if not table_exists('prospect_dossiers'):
+        op.create_table(
+            'prospect_dossiers',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+            sa.Column(
+                'prospect_id', postgresql.UUID(as_uuid=True),
+                sa.ForeignKey('prospects.id', ondelete='CASCADE'), nullable=False,
+            ),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('source_url', sa.String(), nullable=True),
+            sa.Column('site_text', sa.Text(), nullable=True),
+            sa.Column('positioning_summary', sa.Text(), nullable=False),
+            sa.Column('key_facts', sa.JSON(), nullable=True),
+            sa.Column('built_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        )
+        print("✅ Created prospect_dossiers table")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_prospect_dossiers_prospect_id ON prospect_dossiers (prospect_id)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_prospect_dossiers_expires_at ON prospect_dossiers (expires_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS prospect_dossiers")
@@ -0,0 +1,110 @@
+"""move raw provider payloads out of prospects into prospect_payloads
+
+Revision ID: add_prospect_payloads
+Revises: add_prospect_dns_status
+Create Date: 2026-10-18 13:00:00.000000
+
+dataforseo_payload, snov_payload, scrape_payload and verification_payload
+move to a one-row-per-prospect side table (models/prospect_payload.py), so
+select(Prospect) in list endpoints, tasks and exports no longer reads them
+and status updates no longer rewrite them. The data is copied in batches of
+BATCH_SIZE prospects (keyset on id), each batch committed on its own so no
+long transaction holds locks on prospects. serp_signals (small, displayed)
+stays.
+
+The old columns are kept here so workers still running the previous code
+keep working during the rollout; drop_prospect_payload_columns (alembic/pending/)
+copies what they wrote meanwhile and drops them in the following release.
+
+Idempotent.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_prospect_payloads'
+down_revision = 'add_prospect_dns_status'
+branch_labels = None
+depends_on = None
+
+PAYLOAD_COLUMNS = ['dataforseo_payload', 'snov_payload', 'scrape_payload', 'verification_payload']
+BATCH_SIZE = 5000
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def existing_columns(table_name: str) -> set:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return {col['name'] for col in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    if not table_exists('prospect_payloads'):
+        op.create_table(
+            'prospect_payloads',
+            sa.Column(
+                'prospect_id', postgresql.UUID(as_uuid=True),
+                sa.ForeignKey('prospects.id', ondelete='CASCADE'), primary_key=True, nullable=False,
+            ),
+            sa.Column('dataforseo_payload', sa.JSON(), nullable=True),
+            sa.Column('snov_payload', sa.JSON(), nullable=True),
+            sa.Column('scrape_payload', sa.JSON(), nullable=True),
+            sa.Column('verification_payload', sa.JSON(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        )
+        print("✅ Created prospect_payloads table")
+
+    columns = [c for c in PAYLOAD_COLUMNS if c in existing_columns('prospects')]
+    if not columns:
+        return
+
+    # Backfill in batches: only prospects with at least one payload get a row
+    column_list = ", ".join(columns)
+    any_payload = " OR ".join(f"{c} IS NOT NULL" for c in columns)
+    backfill = text(f"""
+        WITH batch AS (
+            SELECT id, {column_list}
+            FROM prospects
+            WHERE id > :last_id
+            ORDER BY id
+            LIMIT :batch_size
+        ),
+        copied AS (
+            INSERT INTO prospect_payloads (prospect_id, {column_list})
+            SELECT id, {column_list} FROM batch WHERE {any_payload}
+            ON CONFLICT (prospect_id) DO NOTHING
+            RETURNING 1
+        )
+        SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+               (SELECT count(*) FROM copied) AS copied
+    """)
+    bind = op.get_bind()
+    last_id = '00000000-0000-0000-0000-000000000000'
+    total = 0
+    while True:
+        with op.get_context().autocommit_block():
+            row = bind.execute(backfill, {"last_id": last_id, "batch_size": BATCH_SIZE}).one()
+        if row.last_id is None:
+            break
+        last_id = row.last_id
+        total += row.copied
+    print(f"✅ Copied payloads of {total} prospects to prospect_payloads")
+
+
+def downgrade() -> None:
+    present = existing_columns('prospects')
+    for column in PAYLOAD_COLUMNS:
+        if column not in present:
+            op.add_column('prospects', sa.Column(column, sa.JSON(), nullable=True))
+    if table_exists('prospect_payloads'):
+        assignments = ", ".join(f"{c} = pp.{c}" for c in PAYLOAD_COLUMNS)
+        op.execute(f"UPDATE prospects p SET {assignments} FROM prospect_payloads pp WHERE pp.prospect_id = p.id")
+        op.drop_table('prospect_payloads')
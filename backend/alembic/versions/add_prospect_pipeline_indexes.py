@@ -0,0 +1,67 @@
+"""add composite and partial indexes for pipeline queries
+
+Revision ID: add_prospect_pipeline_indexes
+Revises: ('merge_job_progress_social', '20260128_add_email_attachments', 'fix_discovery_query_id')
+Create Date: 2026-10-18 00:00:00.000000
+
+Only single-column indexes existed on prospects, so the pipeline queries
+(api/pipeline.py, api/prospects.py, tasks/*.py) combining source_type with
+the step statuses, contact_email IS NOT NULL and ORDER BY created_at fell
+back to sequential scans as the table grew.
+
+Website queries filter on "source_type = 'website' OR source_type IS NULL",
+so source_type is the leading column and each OR branch becomes one index
+range (BitmapOr). The verify/send queues are partial indexes covering only
+rows still waiting for that step.
+
+This migration also merges the three open heads so "alembic upgrade head"
+resolves to a single revision again.
+
+Indexes are built CONCURRENTLY (outside the migration transaction) so the
+prospects table stays writable. Idempotent: IF NOT EXISTS / IF EXISTS.
+Keep in sync with Prospect.__table_args__.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_prospect_pipeline_indexes'
+down_revision = ('merge_job_progress_social', '20260128_add_email_attachments', 'fix_discovery_query_id')  # Merge all heads
+branch_labels = None
+depends_on = None
+
+
+# (name, column list, partial-index predicate or None)
+PIPELINE_INDEXES = [
+    ("ix_prospects_scrape_queue", "source_type, discovery_status, scrape_status, approval_status", None),
+    ("ix_prospects_source_scrape_created", "source_type, scrape_status, created_at DESC", None),
+    (
+        "ix_prospects_verify_queue",
+        "source_type, scrape_status, created_at",
+        "contact_email IS NOT NULL AND verification_status <> 'verified'",
+    ),
+    (
+        "ix_prospects_send_queue",
+        "verification_status, created_at",
+        "contact_email IS NOT NULL AND send_status <> 'sent'",
+    ),
+    ("ix_prospects_source_approval", "source_type, approval_status, scrape_status", None),
+    ("ix_prospects_source_stage_created", "source_type, stage, created_at DESC", None),
+    ("ix_prospects_source_created", "source_type, created_at DESC", None),
+]
+
+
+def upgrade() -> None:
+    """Create the pipeline indexes without blocking writes to prospects."""
+    with op.get_context().autocommit_block():
+        for name, columns, predicate in PIPELINE_INDEXES:
+            where = f" WHERE {predicate}" if predicate else ""
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON prospects ({columns}){where}")
+            print(f"✅ Ensured index {name}")
+        op.execute("ANALYZE prospects")
+
+
+def downgrade() -> None:
+    """Drop the pipeline indexes."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(PIPELINE_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,38 @@
+"""add (score, created_at) index for the prospect list
+
+Revision ID: add_prospect_score_index
+Revises: add_prospect_payloads
+Create Date: 2026-10-18 09:00:00.000000
+
+GET /api/prospects orders by score DESC, created_at DESC and pages with
+LIMIT/OFFSET. Without a matching index every page sorts the whole table
+(a parallel seq scan at 100k rows, caught by tests/test_dashboard_queries.py).
+
+Built CONCURRENTLY; idempotent.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_prospect_score_index'
+down_revision = 'add_prospect_payloads'
+branch_labels = None
+depends_on = None
+
+
+# Same shape as add_prospect_pipeline_indexes.PIPELINE_INDEXES
+PIPELINE_INDEXES = [
+    ("ix_prospects_score_created", "score DESC, created_at DESC", None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, _ in PIPELINE_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON prospects ({columns})")
+            print(f"✅ Ensured index {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(PIPELINE_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
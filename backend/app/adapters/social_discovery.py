@@ -42,6 +42,7 @@ class LinkedInDiscoveryAdapter:
         logger.info(f"🔍 [LINKEDIN DISCOVERY] ========================================")
         
         prospects = []
+        seen_usernames = set()  # O(1) duplicate check instead of scanning prospects
         
         # Try LinkedIn API first if credentials are available
         linkedin_token = os.getenv("LINKEDIN_ACCESS_TOKEN")
@@ -58,6 +59,7 @@ class LinkedInDiscoveryAdapter:
                     prospect.discovery_category = categories[0] if categories else None
                     prospect.discovery_location = locations[0] if locations else None
                     prospects.append(prospect)
+                    seen_usernames.add(prospect.username)
                 
                 logger.info(f"✅ [LINKEDIN DISCOVERY] Discovered {len(prospects)} profiles via LinkedIn API")
                 return prospects[:max_results]
@@ -239,7 +241,7 @@ class LinkedInDiscoveryAdapter:
                                     username = url.split("linkedin.com/in/")[-1].split("/")[0].split("?")[0]
                                     
                                     # Skip if we already have this username
-                                    if any(p.username == username for p in prospects):
+                                    if username in seen_usernames:
                                         logger.debug(f"⏭️  [LINKEDIN DISCOVERY] Skipping duplicate username: {username}")
                                         continue
                                     
@@ -265,6 +267,7 @@ class LinkedInDiscoveryAdapter:
                                         engagement_rate=1.5,  # Default to pass LinkedIn minimum (1.0%)
                                     )
                                     prospects.append(prospect)
+                                    seen_usernames.add(username)
                                     
                                     if len(prospects) >= max_results:
                                         break
@@ -344,6 +347,7 @@ class InstagramDiscoveryAdapter:
         logger.info(f"🔍 [INSTAGRAM DISCOVERY] ========================================")
         
         prospects = []
+        seen_usernames = set()  # O(1) duplicate check instead of scanning prospects
         
         # Try Instagram Graph API first if credentials are available
         instagram_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
@@ -360,6 +364,7 @@ class InstagramDiscoveryAdapter:
                     prospect.discovery_category = categories[0] if categories else None
                     prospect.discovery_location = locations[0] if locations else None
                     prospects.append(prospect)
+                    seen_usernames.add(prospect.username)
                 
                 logger.info(f"✅ [INSTAGRAM DISCOVERY] Discovered {len(prospects)} profiles via Instagram API")
                 return prospects[:max_results]
@@ -564,7 +569,7 @@ class InstagramDiscoveryAdapter:
                                         continue
                                     
                                     # Skip if we already have this username
-                                    if any(p.username == username for p in prospects):
+                                    if username in seen_usernames:
                                         logger.debug(f"⏭️  [INSTAGRAM DISCOVERY] Skipping duplicate username: {username}")
                                         continue
                                     
@@ -590,6 +595,7 @@ class InstagramDiscoveryAdapter:
                                         engagement_rate=2.5,  # Default to pass Instagram minimum (2.0%)
                                     )
                                     prospects.append(prospect)
+                                    seen_usernames.add(username)
                                     profiles_extracted += 1
                                     
                                     if len(prospects) >= max_results:
@@ -662,6 +668,7 @@ class TikTokDiscoveryAdapter:
         logger.info(f"🔍 [TIKTOK DISCOVERY] Starting discovery: {len(categories)} categories, {len(locations)} locations")
         
         prospects = []
+        seen_usernames = set()  # O(1) duplicate check instead of scanning prospects
         
         # Try TikTok API first if credentials are available
         tiktok_key = os.getenv("TIKTOK_CLIENT_KEY")
@@ -679,6 +686,7 @@ class TikTokDiscoveryAdapter:
                     prospect.discovery_category = categories[0] if categories else None
                     prospect.discovery_location = locations[0] if locations else None
                     prospects.append(prospect)
+                    seen_usernames.add(prospect.username)
                 
                 logger.info(f"✅ [TIKTOK DISCOVERY] Discovered {len(prospects)} profiles via TikTok API")
                 return prospects[:max_results]
@@ -872,7 +880,7 @@ class TikTokDiscoveryAdapter:
                                         continue
                                     
                                     # Skip if we already have this username
-                                    if any(p.username == username for p in prospects):
+                                    if username in seen_usernames:
                                         logger.debug(f"⏭️  [TIKTOK DISCOVERY] Skipping duplicate username: {username}")
                                         continue
                                     
@@ -898,6 +906,7 @@ class TikTokDiscoveryAdapter:
                                         engagement_rate=3.5,  # Default to pass TikTok minimum (3.0%)
                                     )
                                     prospects.append(prospect)
+                                    seen_usernames.add(username)
                                     profiles_extracted += 1
                                     
                                     if len(prospects) >= max_results:
@@ -970,6 +979,7 @@ class FacebookDiscoveryAdapter:
         logger.info(f"🔍 [FACEBOOK DISCOVERY] Starting discovery: {len(categories)} categories, {len(locations)} locations")
         
         prospects = []
+        seen_usernames = set()  # O(1) duplicate check instead of scanning prospects
         
         # Try Facebook Graph API first if credentials are available
         facebook_token = os.getenv("FACEBOOK_ACCESS_TOKEN")
@@ -986,6 +996,7 @@ class FacebookDiscoveryAdapter:
                     prospect.discovery_category = categories[0] if categories else None
                     prospect.discovery_location = locations[0] if locations else None
                     prospects.append(prospect)
+                    seen_usernames.add(prospect.username)
                 
                 logger.info(f"✅ [FACEBOOK DISCOVERY] Discovered {len(prospects)} pages via Facebook API")
                 return prospects[:max_results]
@@ -1188,7 +1199,7 @@ class FacebookDiscoveryAdapter:
                                         continue
                                     
                                     # Skip if we already have this username
-                                    if any(p.username == username for p in prospects):
+                                    if username in seen_usernames:
                                         logger.debug(f"⏭️  [FACEBOOK DISCOVERY] Skipping duplicate username: {username}")
                                         continue
                                     
@@ -1214,6 +1225,7 @@ class FacebookDiscoveryAdapter:
                                         engagement_rate=2.0,  # Default to pass Facebook minimum (1.5%)
                                     )
                                     prospects.append(prospect)
+                                    seen_usernames.add(username)
                                     profiles_extracted += 1
                                     
                                     if len(prospects) >= max_results:
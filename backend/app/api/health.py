@@ -3,11 +3,16 @@ Health check endpoints
 
 FEATURE-SCOPED VALIDATION:
 - /health - Basic health check (always returns 200)
-- /health/ready - Database connectivity check
+- /health/ready - Database connectivity check + per-phase startup timings
 - /health/schema - Full schema diagnostics (can return 500 if invalid)
+- /health/rate-limits - Remaining API quota per provider (token buckets)
+- /health/latency - Latency histograms (e.g. per database session dependency)
+- /health/enrichment-routing - Enrichment router estimates per provider
+- /metrics - Pipeline stage histograms and provider counters (Prometheus text format)
 - /health/migrate - Run database migrations (protected by token)
 """
 from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 from app.db.database import engine
 from app.utils.schema_validator import get_full_schema_diagnostics
@@ -124,17 +129,53 @@ async def check_connection_string():
 
 @router.get("/health/ready")
 async def readiness():
-    """Readiness check - verifies database connectivity"""
+    """
+    Readiness check - verifies database connectivity and reports startup phases.
+
+    "startup" holds the duration and status of every startup phase (imports,
+    pool warm-up, migrations) and of the background schema maintenance.
+    """
+    from app.startup import startup_state
+
+    report = {"status": "ready" if startup_state.ready else "starting", "startup": startup_state.snapshot()}
     try:
         # Quick database connectivity check (with timeout)
         async with engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
-        return {"status": "ready", "database": "connected"}
+        return {**report, "database": "connected"}
     except Exception as e:
         logger.warning(f"Readiness check failed: {e}")
         # Still return 200 so Render doesn't fail deployment
         # Database might be temporarily unavailable
-        return {"status": "ready", "database": "checking", "warning": str(e)}
+        return {**report, "database": "checking", "warning": str(e)}
+
+
+@router.get("/health/rate-limits")
+async def rate_limits():
+    """Remaining requests per provider in the shared token buckets"""
+    from app.utils.rate_limiter import get_rate_limiter
+    return {"providers": await get_rate_limiter().get_quota_snapshot()}
+
+
+@router.get("/health/latency")
+async def latency():
+    """In-process latency histograms since startup (db.get_db.* vs db.get_read_db.*)"""
+    from app.utils.latency import latency_snapshot
+    return {"histograms": latency_snapshot()}
+
+
+@router.get("/health/enrichment-routing")
+async def enrichment_routing():
+    """Rolling hit rate, p95 latency, cost and credits spent per enrichment provider (this process)"""
+    from app.services.enrichment_router import get_enrichment_router
+    return {"providers": get_enrichment_router().snapshot()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint (stage spans, provider errors/retries, latency histograms)"""
+    from app.utils.metrics import render_prometheus
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 @router.get("/health/schema")
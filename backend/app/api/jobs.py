@@ -3,20 +3,25 @@ Job management API endpoints
 """
 import asyncio
 import logging
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional, Dict
 from uuid import UUID
 from datetime import datetime, timezone
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.api.auth import get_current_user_optional
 from app.models.job import Job
 from app.schemas.job import JobResponse, JobCreate, JobListResponse
+from app.services.job_events import broker, ensure_listener, format_sse, job_event
 
 logger = logging.getLogger(__name__)
 
+# Comment line sent on idle event streams so proxies keep the connection open
+JOB_EVENTS_KEEPALIVE_SECONDS = 15
+
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
@@ -26,7 +31,7 @@ async def list_jobs(
     limit: int = 50,
     job_type: Optional[str] = None,
     status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -86,7 +91,7 @@ async def list_jobs(
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -107,6 +112,61 @@ async def get_job(
         raise HTTPException(status_code=500, detail=f"Failed to get job: {str(e)}")
 
 
+@router.get("/{job_id}/events")
+async def job_events(
+    job_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[str] = Depends(get_current_user_optional)
+):
+    """
+    Live progress of a job as Server-Sent Events (replaces polling /api/jobs/{job_id})
+
+    The first event is the job's current state from the database; after that
+    every committed progress change is pushed ("progress" events) until the
+    job ends ("end" event, then the stream closes).
+    """
+    # Subscribe before reading the row so no change between the two is missed
+    key = str(job_id)
+    queue = broker.subscribe(key)
+    try:
+        result = await db.execute(select(Job).where(Job.id == job_id))
+        job = result.scalar_one_or_none()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        snapshot = job_event(job)
+    except Exception:
+        broker.unsubscribe(key, queue)
+        raise
+    finally:
+        # Do not hold a pooled connection for the lifetime of the stream
+        await db.close()
+    ensure_listener()
+
+    async def stream():
+        try:
+            yield format_sse(snapshot)
+            if snapshot["type"] == "end":
+                return
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), JOB_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(payload)
+                if payload["type"] == "end":
+                    return
+        finally:
+            broker.unsubscribe(key, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/cancel/{job_id}")
 async def cancel_job(
     job_id: UUID,
@@ -20,6 +20,7 @@ from app.models.prospect import (
     ProspectStage,
 )
 from app.services.enrichment import _scrape_emails_from_domain
+from app.services.prospect_payloads import save_payloads
 from app.clients.snov import SnovIOClient
 
 logger = logging.getLogger(__name__)
@@ -149,7 +150,7 @@ async def manual_scrape(
             # Emails found
             prospect.contact_email = all_emails[0]  # Primary email
             prospect.scrape_source_url = source_url
-            prospect.scrape_payload = emails_by_page
+            await save_payloads(db, prospect.id, scrape_payload=emails_by_page)
             prospect.scrape_status = ScrapeStatus.SCRAPED.value
             prospect.stage = ProspectStage.EMAIL_FOUND.value
             
@@ -340,12 +341,12 @@ async def manual_verify(
             if verified:
                 prospect.verification_status = VerificationStatus.VERIFIED.value
                 prospect.verification_confidence = confidence
-                prospect.verification_payload = snov_result
+                await save_payloads(db, prospect.id, verification_payload=snov_result)
                 prospect.stage = ProspectStage.LEAD.value  # Verified email = ready to be a lead
                 verification_status_str = "verified"
             else:
                 prospect.verification_status = VerificationStatus.UNVERIFIED.value
-                prospect.verification_payload = snov_result
+                await save_payloads(db, prospect.id, verification_payload=snov_result)
                 verification_status_str = "unverified"
             
             await db.commit()
@@ -364,7 +365,7 @@ async def manual_verify(
             error = snov_result.get("error", "No emails found in Snov results")
             logger.error(f"❌ [MANUAL VERIFY] Verification failed for {email}: {error}")
             prospect.verification_status = VerificationStatus.FAILED.value
-            prospect.verification_payload = snov_result
+            await save_payloads(db, prospect.id, verification_payload=snov_result)
             await db.commit()
             raise HTTPException(
                 status_code=500,
@@ -11,7 +11,7 @@ import logging
 import json
 from pydantic import BaseModel
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.api.auth import get_current_user_optional
 from app.api.scraper import check_master_switch
 from app.models.prospect import (
@@ -24,6 +24,7 @@ from app.models.prospect import (
     ProspectStage,
 )
 from app.models.job import Job
+from app.services.categorization import classify_category
 
 logger = logging.getLogger(__name__)
 
@@ -588,7 +589,7 @@ async def verify_emails(
 async def get_review_prospects(
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -829,7 +830,7 @@ class DraftJobStatusResponse(BaseModel):
 @router.get("/draft/jobs/{job_id}", response_model=DraftJobStatusResponse)
 async def get_draft_job_status(
     job_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1599,7 +1600,7 @@ async def check_gmail_config():
 
 @router.get("/status")
 async def get_pipeline_status(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1948,7 +1949,7 @@ async def get_pipeline_status(
 async def get_websites(
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -2133,6 +2134,7 @@ async def update_prospect_category(
 class AutoCategorizeResponse(BaseModel):
     success: bool
     categorized_count: int
+    job_id: Optional[UUID] = None
     message: str
 
 
@@ -2171,165 +2173,50 @@ async def auto_categorize_prospect(prospect: Prospect, db: AsyncSession) -> Opti
             logger.warning(f"⚠️  [AUTO CATEGORIZE] Error checking same-domain prospects: {e}")
     
     # Priority 3: Pattern matching based on domain, title, and URL
-    domain_lower = (prospect.domain or '').lower()
-    title_lower = (prospect.page_title or '').lower()
-    url_lower = (prospect.page_url or '').lower()
-    combined_text = f"{domain_lower} {title_lower} {url_lower}"
-    
-    # Extract domain without TLD for better matching
-    domain_parts = domain_lower.replace('www.', '').split('.')
-    domain_base = domain_parts[0] if domain_parts else domain_lower
-    
-    # Comprehensive category detection patterns
-    # Order matters - more specific patterns first
-    # Categories must match frontend available categories
-    category_patterns = {
-        'Museum': [
-            # Domain patterns
-            'museum', 'museums', 'museo', 'museu', 'muse', 'museet',
-            # Title/URL patterns
-            'art museum', 'gallery museum', 'contemporary museum', 'modern museum',
-            'museum of art', 'art collection', 'permanent collection'
-        ],
-        'Art Lovers': [
-            # Domain patterns
-            'gallery', 'galleries', 'galerie', 'galeria', 'galerija',
-            'studio', 'studios', 'atelier', 'ateliers',
-            'art', 'arts', 'artwork', 'artworks',
-            # Title/URL patterns
-            'art gallery', 'contemporary art', 'fine art gallery', 'art space',
-            'exhibition space', 'art showroom', 'gallery space', 'art room',
-            'contemporary gallery', 'modern gallery', 'fine art', 'art display',
-            'art studio', 'artist studio', 'creative studio', 'painting studio',
-            'sculpture studio', 'artists studio', 'working studio', 'art workshop',
-            'art fair', 'art exhibition', 'art show', 'art expo', 'art market',
-            'art event', 'art festival', 'biennale', 'biennial', 'art week',
-            'art lover', 'art lovers', 'art enthusiast', 'art enthusiasts'
-        ],
-        'Interior Design': [
-            # Domain patterns
-            'interior', 'interiors', 'design', 'designer', 'designers',
-            # Title/URL patterns
-            'interior design', 'interior designer', 'home design', 'space design',
-            'interior decorator', 'interior decoration', 'home styling'
-        ],
-        'Interior Decor': [
-            # Domain patterns
-            'decor', 'decoration', 'decorator', 'decorators',
-            # Title/URL patterns
-            'interior decor', 'home decor', 'decorating', 'home decoration'
-        ],
-        'Home Decor': [
-            # Domain patterns
-            'home', 'homedecor', 'homedecoration',
-            # Title/URL patterns
-            'home decor', 'home decoration', 'home accessories', 'home furnishings'
-        ],
-        'Holiday Decor': [
-            # Domain patterns
-            'holiday', 'holidays', 'christmas', 'halloween', 'thanksgiving',
-            # Title/URL patterns
-            'holiday decor', 'holiday decoration', 'seasonal decor', 'holiday decorating'
-        ],
-        'Holidays': [
-            # Domain patterns
-            'holiday', 'holidays', 'festival', 'festivals', 'celebration',
-            # Title/URL patterns
-            'holiday', 'holidays', 'festival', 'celebration', 'seasonal'
-        ],
-        'Pet Lovers': [
-            # Domain patterns - combined dog and cat patterns
-            'dog', 'dogs', 'puppy', 'puppies', 'canine', 'canines',
-            'cat', 'cats', 'kitten', 'kittens', 'feline', 'felines',
-            'pet', 'pets', 'petlover', 'petlovers', 'pet-lover', 'pet-lovers',
-            'doglover', 'doglovers', 'dog-lover', 'dog-lovers',
-            'catlover', 'catlovers', 'cat-lover', 'cat-lovers',
-            # Title/URL patterns
-            'dog', 'dogs', 'puppy', 'canine', 'dog training', 'dog care',
-            'cat', 'cats', 'kitten', 'feline', 'cat care', 'cat training',
-            'pet lover', 'pet lovers', 'pet owner', 'pet owners',
-            'dog lover', 'dog lovers', 'dog owner', 'dog owners',
-            'cat lover', 'cat lovers', 'cat owner', 'cat owners'
-        ],
-        'Dogs and Cat Owners - Fur Parent': [
-            # Domain patterns
-            'furparent', 'furparents', 'fur-parent', 'fur-parents',
-            'furmom', 'furdad', 'furmommy', 'furdaddy',
-            # Title/URL patterns
-            'fur parent', 'fur parents', 'fur mom', 'fur dad',
-            'fur mommy', 'fur daddy', 'pet parent', 'pet parents',
-            'dog and cat owner', 'dogs and cats owner', 'dog and cat owners',
-            'dogs and cats owners', 'multi pet owner', 'multi pet owners'
-        ],
-        'Parenting': [
-            # Domain patterns
-            'parent', 'parents', 'parenting', 'mom', 'moms', 'dad', 'dads',
-            'family', 'families', 'children', 'kids', 'child',
-            # Title/URL patterns
-            'parenting', 'parent', 'family', 'children', 'kids', 'child care'
-        ],
-        'Childhood Development': [
-            # Domain patterns
-            'child', 'children', 'childhood', 'development', 'early', 'education',
-            # Title/URL patterns
-            'child development', 'childhood development', 'early childhood', 'child education'
-        ],
-        'Home Tech': [
-            # Domain patterns
-            'tech', 'technology', 'smart', 'automation', 'iot', 'homeautomation',
-            # Title/URL patterns
-            'home tech', 'smart home', 'home automation', 'home technology'
-        ],
-        'Audio Visual': [
-            # Domain patterns
-            'audio', 'visual', 'av', 'audiovisual', 'sound', 'video',
-            # Title/URL patterns
-            'audio visual', 'audiovisual', 'sound system', 'home theater'
-        ],
-        'NFTs': [
-            # Domain patterns
-            'nft', 'nfts', 'crypto', 'blockchain', 'web3',
-            # Title/URL patterns
-            'nft', 'nfts', 'non-fungible token', 'crypto art', 'digital art'
-        ],
-        'Famous Quotes': [
-            # Domain patterns
-            'quote', 'quotes', 'quotation', 'quotations', 'inspirational',
-            # Title/URL patterns
-            'quote', 'quotes', 'famous quote', 'inspirational quote'
-        ]
-    }
+    category = classify_category(prospect.domain, prospect.page_title, prospect.page_url)
+    if category:
+        logger.info(f"✅ [AUTO CATEGORIZE] Detected category '{category}' from domain/title/URL for {prospect.domain}")
+        return category
     
-    # Check domain base first (most reliable indicator)
-    for category, patterns in category_patterns.items():
-        for pattern in patterns:
-            # Check domain base (without TLD)
-            if pattern in domain_base:
-                logger.info(f"✅ [AUTO CATEGORIZE] Detected category '{category}' from domain base '{domain_base}' (pattern: '{pattern}') for {prospect.domain}")
-                return category
-            # Check full domain
-            if pattern in domain_lower:
-                logger.info(f"✅ [AUTO CATEGORIZE] Detected category '{category}' from domain '{domain_lower}' (pattern: '{pattern}') for {prospect.domain}")
-                return category
-    
-    # Then check title and URL (less reliable but still useful)
-    for category, patterns in category_patterns.items():
-        for pattern in patterns:
-            if pattern in title_lower or pattern in url_lower:
-                logger.info(f"✅ [AUTO CATEGORIZE] Detected category '{category}' from title/URL (pattern: '{pattern}') for {prospect.domain}")
-                return category
-    
-    # Finally check combined text as fallback
-    for category, patterns in category_patterns.items():
-        for pattern in patterns:
-            if pattern in combined_text:
-                logger.info(f"✅ [AUTO CATEGORIZE] Detected category '{category}' from combined text (pattern: '{pattern}') for {prospect.domain}")
-                return category
-    
-    logger.debug(f"⚠️  [AUTO CATEGORIZE] Could not determine category for {prospect.domain} (domain: {domain_lower}, title: {title_lower[:50] if title_lower else 'N/A'})")
+    logger.debug(f"⚠️  [AUTO CATEGORIZE] Could not determine category for {prospect.domain} (title: {(prospect.page_title or 'N/A')[:50]})")
     return None
 
 
+async def _start_categorize_job(db: AsyncSession, params: dict, label: str) -> Job:
+    """Create a "categorize" job and run it in the background (app/tasks/categorization.py)"""
+    job = Job(job_type="categorize", params=params, status="pending")
+    
+    try:
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+    except Exception as commit_err:
+        logger.error(f"❌ [{label}] Commit error: {commit_err}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to create categorize job: {str(commit_err)}")
+    
+    try:
+        from app.tasks.categorization import categorize_prospects_async
+        import asyncio
+        from app.task_manager import register_task
+        
+        task = asyncio.create_task(categorize_prospects_async(str(job.id)))
+        register_task(str(job.id), task)
+        logger.info(f"✅ [{label}] Categorize job {job.id} started")
+    except Exception as e:
+        logger.error(f"❌ [{label}] Failed to start categorize job: {e}", exc_info=True)
+        try:
+            await db.rollback()
+            job.status = "failed"
+            job.error_message = str(e)
+            await db.commit()
+        except Exception as rollback_err:
+            logger.error(f"❌ [{label}] Error during rollback: {rollback_err}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to start categorize job: {str(e)}")
+    
+    return job
+
+
 @router.post("/auto_categorize", response_model=AutoCategorizeResponse)
 async def auto_categorize_all(
     db: AsyncSession = Depends(get_db),
@@ -2337,122 +2224,24 @@ async def auto_categorize_all(
 ):
     """
     Automatically categorize all prospects that don't have a category.
-    Uses heuristics based on domain, title, and URL to determine category.
-    """
-    logger.info("🤖 [AUTO CATEGORIZE] Starting automatic categorization - updating from discovery queries and pattern matching")
-    
-    # First, check how many total prospects exist and their category status
-    total_result = await db.execute(select(func.count(Prospect.id)))
-    total_prospects = total_result.scalar_one()
-    
-    # Check category distribution
-    category_dist = await db.execute(
-        select(Prospect.discovery_category, func.count(Prospect.id)).group_by(Prospect.discovery_category)
-    )
-    category_counts = {cat or 'NULL': count for cat, count in category_dist.all()}
-    logger.info(f"📊 [AUTO CATEGORIZE] Total prospects: {total_prospects}, Category distribution: {category_counts}")
-    
-    # Strategy 1: Get prospects with discovery_query_id that need category updates
-    # This ensures all prospects inherit their discovery query category
-    from app.models.discovery_query import DiscoveryQuery
-    
-    prospects_with_query = await db.execute(
-        select(Prospect).where(
-            Prospect.discovery_query_id.isnot(None)
-        ).limit(1000)  # Limit to avoid memory issues
-    )
-    prospects = prospects_with_query.scalars().all()
-    logger.info(f"📊 [AUTO CATEGORIZE] Found {len(prospects)} prospects with discovery_query_id")
-    
-    # Strategy 2: Also get uncategorized prospects without discovery_query_id
-    uncategorized_result = await db.execute(
-        select(Prospect).where(
-            and_(
-                Prospect.discovery_query_id.is_(None),
-            or_(
-                Prospect.discovery_category.is_(None),
-                Prospect.discovery_category == '',
-                    func.lower(Prospect.discovery_category) == 'n/a',
-                Prospect.discovery_category == 'N/A',
-                    func.lower(Prospect.discovery_category) == 'unknown',
-                    Prospect.discovery_category == 'Unknown',
-                    func.trim(Prospect.discovery_category) == ''  # Also catch whitespace-only
-                )
-            )
-        ).limit(1000)
-    )
-    uncategorized = uncategorized_result.scalars().all()
-    logger.info(f"📊 [AUTO CATEGORIZE] Found {len(uncategorized)} uncategorized prospects without discovery_query_id")
-    
-    # Combine both lists (avoid duplicates)
-    prospect_ids = {p.id for p in prospects}
-    for p in uncategorized:
-        if p.id not in prospect_ids:
-            prospects.append(p)
-            prospect_ids.add(p.id)
-    
-    logger.info(f"📊 [AUTO CATEGORIZE] Processing {len(prospects)} total prospects")
     
-    categorized_count = 0
+    Set-based, no row cap (see app/services/categorization.py):
+    1. Inherit the category of the discovery query that found the prospect
+    2. Propagate categories across prospects with the same domain
+    3. Keyword-classify the remaining rows by domain, title and URL in chunks
     
-    for prospect in prospects:
-        original_category = prospect.discovery_category
-        new_category = None
-        
-        # First try to get category from discovery_query
-        if prospect.discovery_query_id:
-            try:
-                result = await db.execute(
-                    select(DiscoveryQuery.category).where(
-                        DiscoveryQuery.id == prospect.discovery_query_id,
-                        DiscoveryQuery.category.isnot(None),
-                        DiscoveryQuery.category != '',
-                        DiscoveryQuery.category != 'N/A',
-                        DiscoveryQuery.category != 'Unknown'
-                    )
-                )
-                query_category = result.scalar_one_or_none()
-                if query_category:
-                    new_category = query_category
-                    logger.info(f"✅ [AUTO CATEGORIZE] Prospect {prospect.id} ({prospect.domain}): Inherited category '{query_category}' from discovery query")
-                else:
-                    logger.debug(f"⚠️  [AUTO CATEGORIZE] Prospect {prospect.id} ({prospect.domain}): discovery_query_id exists but query has no category")
-            except Exception as query_err:
-                logger.warning(f"⚠️  [AUTO CATEGORIZE] Error getting category from discovery query for prospect {prospect.id} ({prospect.domain}): {query_err}")
-        else:
-            logger.debug(f"⚠️  [AUTO CATEGORIZE] Prospect {prospect.id} ({prospect.domain}): No discovery_query_id")
-        
-        # If no category from discovery_query, try auto-categorization
-        if not new_category:
-            new_category = await auto_categorize_prospect(prospect, db)
-            if new_category:
-                logger.info(f"✅ [AUTO CATEGORIZE] Prospect {prospect.id} ({prospect.domain}): Auto-categorized as '{new_category}'")
-            else:
-                logger.warning(f"⚠️  [AUTO CATEGORIZE] Prospect {prospect.id} ({prospect.domain}): Could not determine category (domain: {prospect.domain}, title: {prospect.page_title or 'N/A'})")
-        
-        # Update category if we found one
-        if new_category and new_category != original_category:
-            prospect.discovery_category = new_category
-            categorized_count += 1
-            # Explicitly mark as modified
-            from sqlalchemy.orm.attributes import flag_modified
-            flag_modified(prospect, 'discovery_category')
-    
-    # Commit all changes
-    try:
-        await db.commit()
-        logger.info(f"✅ [AUTO CATEGORIZE] Committed {categorized_count} category updates to database")
-    except Exception as commit_err:
-        logger.error(f"❌ [AUTO CATEGORIZE] Failed to commit changes: {commit_err}")
-        await db.rollback()
-        raise
+    Runs as a background "categorize" job; returns its job_id immediately.
+    categorized_count is 0 here - the job result carries the final counts.
+    """
+    logger.info("🤖 [AUTO CATEGORIZE] Starting automatic categorization - updating from discovery queries and pattern matching")
     
-    logger.info(f"✅ [AUTO CATEGORIZE] Automatically categorized {categorized_count} of {len(prospects)} prospects")
+    job = await _start_categorize_job(db, {}, "AUTO CATEGORIZE")
     
     return AutoCategorizeResponse(
         success=True,
-        categorized_count=categorized_count,
-        message=f"Successfully auto-categorized {categorized_count} prospect(s) based on their content"
+        categorized_count=0,
+        job_id=job.id,
+        message="Auto-categorization job started - check the job status for results"
     )
 
 
@@ -2460,6 +2249,7 @@ class MigrateCategoriesResponse(BaseModel):
     success: bool
     migrated_count: int
     category_mapping: dict
+    job_id: Optional[UUID] = None
     message: str
 
 
@@ -2475,206 +2265,26 @@ async def migrate_categories(
     
     This helps fix filtering issues where old records have categories that don't match
     the new category list used in the frontend.
+    
+    Runs as a background "categorize" job; returns its job_id immediately. The
+    job result carries migrated/mapped counts and the category mapping.
     """
     logger.info("🔄 [MIGRATE CATEGORIES] Starting category migration")
     
-    # Define mapping from old categories to new ones
-    # Handles various formats: lowercase, snake_case, variations
-    category_mapping = {
-        # Old lowercase/snake_case formats
-        'art': 'Art Lovers',
-        'Art': 'Art Lovers',  # Updated to new category name
-        'art lovers': 'Art Lovers',
-        'Art Lovers': 'Art Lovers',
-        'art enthusiast': 'Art Lovers',
-        'art enthusiasts': 'Art Lovers',
-        'interior_design': 'Interior Design',
-        'interior design': 'Interior Design',
-        'Interior Design': 'Interior Design',
-        'interior_decor': 'Interior Decor',
-        'interior decor': 'Interior Decor',
-        'Interior Decor': 'Interior Decor',
-        'home_decor': 'Home Decor',
-        'home decor': 'Home Decor',
-        'Home Decor': 'Home Decor',
-        'home_tech': 'Home Tech',
-        'home tech': 'Home Tech',
-        'Home Tech': 'Home Tech',
-        'tech_blog': 'Home Tech',  # Map tech_blog to Home Tech
-        'tech blog': 'Home Tech',
-        'mothers_tech': 'Parenting',  # Map mothers_tech to Parenting
-        'mothers tech': 'Parenting',
-        'mom_blog': 'Parenting',
-        'mom blog': 'Parenting',
-        'nft': 'NFTs',
-        'NFT': 'NFTs',
-        'NFTs': 'NFTs',
-        'nft_tech': 'NFTs',
-        'museum': 'Museum',
-        'Museum': 'Museum',
-        'museums': 'Museum',
-        'Museums': 'Museum',
-        'art_gallery': 'Art',
-        'art gallery': 'Art',
-        'Art Gallery': 'Art',
-        'gallery': 'Art',
-        'holiday': 'Holidays',
-        'Holiday': 'Holidays',
-        'Holidays': 'Holidays',
-        'holiday_decor': 'Holiday Decor',
-        'holiday decor': 'Holiday Decor',
-        'Holiday Decor': 'Holiday Decor',
-        'holiday/family': 'Holidays',
-        'Holiday/Family': 'Holidays',
-        'editorial_media': 'Art Lovers',  # Map editorial to Art Lovers (closest match)
-        'editorial media': 'Art Lovers',
-        'Editorial Media': 'Art Lovers',
-        # Old pet categories mapped to new combined categories
-        'dog': 'Pet Lovers',
-        'Dogs': 'Pet Lovers',
-        'dog_lover': 'Pet Lovers',
-        'dog lover': 'Dog Lovers',  # Keep for backward compatibility, but map to Pet Lovers
-        'Dog Lovers': 'Pet Lovers',
-        'cat': 'Pet Lovers',
-        'Cats': 'Pet Lovers',
-        'cat_lover': 'Pet Lovers',
-        'cat lover': 'Cat Lovers',  # Keep for backward compatibility, but map to Pet Lovers
-        'Cat Lovers': 'Pet Lovers',
-        # New category names
-        'Pet Lovers': 'Pet Lovers',
-        'pet_lovers': 'Pet Lovers',
-        'pet lovers': 'Pet Lovers',
-        'pet': 'Pet Lovers',
-        'pets': 'Pet Lovers',
-        'Dogs and Cat Owners - Fur Parent': 'Dogs and Cat Owners - Fur Parent',
-        'dogs and cat owners - fur parent': 'Dogs and Cat Owners - Fur Parent',
-        'fur parent': 'Dogs and Cat Owners - Fur Parent',
-        'fur parents': 'Dogs and Cat Owners - Fur Parent',
-        'fur_parent': 'Dogs and Cat Owners - Fur Parent',
-        'fur_parents': 'Dogs and Cat Owners - Fur Parent',
-        'parenting': 'Parenting',
-        'Parenting': 'Parenting',
-        'childhood_development': 'Childhood Development',
-        'childhood development': 'Childhood Development',
-        'Childhood Development': 'Childhood Development',
-        'audio_visual': 'Audio Visual',
-        'audio visual': 'Audio Visual',
-        'Audio Visual': 'Audio Visual',
-        'famous_quotes': 'Famous Quotes',
-        'famous quotes': 'Famous Quotes',
-        'Famous Quotes': 'Famous Quotes',
-        # Handle unknown/null values - will be handled by auto-categorize
-        'unknown': None,  # Will trigger auto-categorization
-        'Unknown': None,
-        'n/a': None,
-        'N/A': None,
-        '': None,
-        None: None
-    }
-    
-    # Get all prospects with categories that need migration
-    all_prospects_result = await db.execute(
-        select(Prospect).where(
-            Prospect.discovery_category.isnot(None)
-        )
-    )
-    all_prospects = all_prospects_result.scalars().all()
-    
-    logger.info(f"📊 [MIGRATE CATEGORIES] Found {len(all_prospects)} prospects with categories")
-    
-    # Get current category distribution before migration
-    category_dist_before = await db.execute(
-        select(Prospect.discovery_category, func.count(Prospect.id)).group_by(Prospect.discovery_category)
-    )
-    categories_before = {cat or 'NULL': count for cat, count in category_dist_before.all()}
-    logger.info(f"📊 [MIGRATE CATEGORIES] Categories before migration: {categories_before}")
-    
-    migrated_count = 0
-    migration_details = {}
-    
-    for prospect in all_prospects:
-        old_category = prospect.discovery_category
-        if not old_category:
-            continue
-            
-        # Normalize the category (strip whitespace, handle case variations)
-        normalized_old = old_category.strip() if old_category else None
-        
-        # Check if this category needs migration
-        new_category = category_mapping.get(normalized_old)
-        
-        # If not in mapping, try case-insensitive lookup
-        if new_category is None and normalized_old:
-            # Try case-insensitive match
-            for old_cat, new_cat in category_mapping.items():
-                if old_cat and normalized_old.lower() == old_cat.lower():
-                    new_category = new_cat
-                    break
-        
-        # If still no match, check if it's already a valid new category
-        valid_categories = [
-            'Art Lovers', 'Interior Design', 'Pet Lovers', 'Dogs and Cat Owners - Fur Parent', 'Childhood Development',
-            'Holidays', 'Famous Quotes', 'Home Decor',
-            'Audio Visual', 'Interior Decor', 'Holiday Decor', 'Home Tech',
-            'Parenting', 'NFTs', 'Museum'
-        ]
-        if normalized_old in valid_categories:
-            # Already a valid category, skip
-            continue
-        
-        # If we found a mapping, update the prospect
-        if new_category is not None:
-            if new_category != old_category:
-                prospect.discovery_category = new_category
-                migrated_count += 1
-                
-                # Track migration details
-                if old_category not in migration_details:
-                    migration_details[old_category] = {'to': new_category, 'count': 0}
-                migration_details[old_category]['count'] += 1
-                
-                logger.debug(f"🔄 [MIGRATE CATEGORIES] Prospect {prospect.id}: '{old_category}' → '{new_category}'")
-        else:
-            # Category not in mapping and not valid - try auto-categorization
-            logger.debug(f"⚠️  [MIGRATE CATEGORIES] Prospect {prospect.id}: Unknown category '{old_category}', attempting auto-categorization")
-            auto_category = await auto_categorize_prospect(prospect, db)
-            if auto_category and auto_category != old_category:
-                prospect.discovery_category = auto_category
-                migrated_count += 1
-                
-                if old_category not in migration_details:
-                    migration_details[old_category] = {'to': auto_category, 'count': 0}
-                migration_details[old_category]['count'] += 1
-                
-                logger.info(f"✅ [MIGRATE CATEGORIES] Prospect {prospect.id}: Auto-categorized '{old_category}' → '{auto_category}'")
-    
-    # Commit all changes
-    try:
-        await db.commit()
-        logger.info(f"✅ [MIGRATE CATEGORIES] Committed {migrated_count} category migrations to database")
-    except Exception as commit_err:
-        logger.error(f"❌ [MIGRATE CATEGORIES] Failed to commit changes: {commit_err}")
-        await db.rollback()
-        raise
-    
-    # Get category distribution after migration
-    category_dist_after = await db.execute(
-        select(Prospect.discovery_category, func.count(Prospect.id)).group_by(Prospect.discovery_category)
-    )
-    categories_after = {cat or 'NULL': count for cat, count in category_dist_after.all()}
-    logger.info(f"📊 [MIGRATE CATEGORIES] Categories after migration: {categories_after}")
+    job = await _start_categorize_job(db, {"migrate": True}, "MIGRATE CATEGORIES")
     
     return MigrateCategoriesResponse(
         success=True,
-        migrated_count=migrated_count,
-        category_mapping=migration_details,
-        message=f"Successfully migrated {migrated_count} prospect(s) to new category format"
+        migrated_count=0,
+        category_mapping={},
+        job_id=job.id,
+        message="Category migration job started - check the job status for results"
     )
 
 
 @router.get("/debug/counts")
 async def debug_counts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -2,8 +2,10 @@
 Prospect management API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_, and_
+from sqlalchemy.orm import defer
 from typing import List, Optional, Dict
 from uuid import UUID
 import os
@@ -11,15 +13,18 @@ from dotenv import load_dotenv
 import logging
 import csv
 import io
+import json
 from datetime import datetime
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.api.auth import get_current_user_optional
 from app.utils.email_validation import format_job_error
 
 logger = logging.getLogger(__name__)
 from app.models.prospect import Prospect
 from app.models.email_attachment import EmailAttachment
+from app.services.attachment_store import release_blob, store_attachment_data
+from app.services.prospect_payloads import get_payloads, save_payloads, snippet_from_payload
 from app.models.job import Job
 from app.schemas.prospect import (
     ProspectResponse,
@@ -46,7 +51,7 @@ class BulkDraftRequest(BaseModel):
 
 @router.get("/categories")
 async def get_available_categories(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -206,7 +211,7 @@ async def enrich_prospect_by_id(
         
         # STRICT MODE: Enrich using domain and page_url
         from app.services.enrichment import enrich_prospect_email
-        enrich_result = await enrich_prospect_email(prospect.domain, None, prospect.page_url)
+        enrich_result = await enrich_prospect_email(prospect.domain, None, prospect.page_url, category=prospect.discovery_category)
         
         if not enrich_result:
             # Enrichment service returned None (should not happen)
@@ -231,7 +236,7 @@ async def enrich_prospect_by_id(
             # Email found on website - update prospect
             prospect.contact_email = primary_email
             prospect.contact_method = enrich_result.get("source", "html_scraping")
-            prospect.snov_payload = enrich_result
+            await save_payloads(db, prospect.id, snov_payload=enrich_result)
             await db.commit()
             await db.refresh(prospect)
             
@@ -251,7 +256,7 @@ async def enrich_prospect_by_id(
             # No email found on website - store "no_email_found" status
             prospect.contact_email = None
             prospect.contact_method = "no_email_found"
-            prospect.snov_payload = enrich_result
+            await save_payloads(db, prospect.id, snov_payload=enrich_result)
             await db.commit()
             await db.refresh(prospect)
             
@@ -325,110 +330,43 @@ async def bulk_draft_endpoint(
 
 @router.post("/deduplicate")
 async def deduplicate_prospects(
+    dry_run: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
     Remove duplicate prospects by domain, keeping the best version of each.
     
-    Strategy:
+    Strategy (runs set-based inside PostgreSQL, see services/deduplication.py):
     - Groups prospects by domain (case-insensitive)
     - For each domain, keeps the prospect with:
       1. Highest priority: Has email (contact_email IS NOT NULL)
       2. Second priority: Most recent updated_at
       3. Third priority: Most recent created_at
-    - Deletes all other duplicates
+    - Merges email, category, location, keywords and payloads from the
+      duplicates into the kept prospect when it has none
+    - Moves email logs/attachments to the kept prospect, then deletes the others
+    - dry_run=true only reports how many prospects would be removed
     """
     try:
-        logger.info("🔍 Starting prospect deduplication...")
-        
-        # Find all prospects grouped by domain
-        # Use func.lower() for case-insensitive comparison
-        from sqlalchemy import func as sql_func
-        
-        # Get all prospects with their domain (lowercased for grouping)
-        result = await db.execute(
-            select(
-                Prospect.id,
-                Prospect.domain,
-                Prospect.contact_email,
-                Prospect.updated_at,
-                Prospect.created_at,
-                sql_func.lower(Prospect.domain).label('domain_lower')
-            )
-        )
-        all_prospects = result.all()
-        
-        # Group by domain (case-insensitive)
-        domain_groups: Dict[str, List[Dict]] = {}
-        for p in all_prospects:
-            domain_lower = p.domain_lower
-            if domain_lower not in domain_groups:
-                domain_groups[domain_lower] = []
-            domain_groups[domain_lower].append({
-                'id': p.id,
-                'domain': p.domain,
-                'has_email': p.contact_email is not None and str(p.contact_email).strip() != '',
-                'updated_at': p.updated_at,
-                'created_at': p.created_at
-            })
+        from app.services.deduplication import deduplicate_prospects_by_domain
         
-        # Find duplicates (domains with more than 1 prospect)
-        duplicates_found = 0
-        to_delete = []
-        kept = []
+        logger.info(f"🔍 Starting prospect deduplication (dry_run={dry_run})...")
+        stats = await deduplicate_prospects_by_domain(db, dry_run=dry_run)
         
-        for domain_lower, prospects_list in domain_groups.items():
-            if len(prospects_list) > 1:
-                duplicates_found += len(prospects_list) - 1
-                
-                # Sort to find the best one to keep
-                # Priority: 1) Has email, 2) Most recent updated_at, 3) Most recent created_at
-                sorted_prospects = sorted(
-                    prospects_list,
-                    key=lambda p: (
-                        not p['has_email'],  # False (has email) comes before True (no email)
-                        -(p['updated_at'].timestamp() if p['updated_at'] else 0),  # Most recent first
-                        -(p['created_at'].timestamp() if p['created_at'] else 0)  # Most recent first
-                    )
-                )
-                
-                # Keep the first (best) one
-                best = sorted_prospects[0]
-                kept.append({
-                    'id': best['id'],
-                    'domain': best['domain'],
-                    'has_email': best['has_email']
-                })
-                
-                # Mark others for deletion
-                for p in sorted_prospects[1:]:
-                    to_delete.append(p['id'])
-        
-        # Delete duplicates
-        deleted_count = 0
-        if to_delete:
-            logger.info(f"🗑️  Deleting {len(to_delete)} duplicate prospects...")
-            delete_result = await db.execute(
-                select(Prospect).where(Prospect.id.in_(to_delete))
-            )
-            duplicates_to_delete = delete_result.scalars().all()
-            
-            for prospect in duplicates_to_delete:
-                await db.delete(prospect)
-            
-            await db.commit()
-            deleted_count = len(duplicates_to_delete)
-            logger.info(f"✅ Deleted {deleted_count} duplicate prospects")
+        if dry_run:
+            message = f"Would remove {stats['duplicates_found']} duplicate prospect(s) across {stats['domains']} domain(s)"
+        elif stats["deleted"]:
+            message = f"Removed {stats['deleted']} duplicate prospect(s), kept {stats['domains']} unique domain(s)"
         else:
-            logger.info("✅ No duplicates found - all prospects are unique")
+            message = "No duplicates found - all prospects are unique"
+        logger.info(f"✅ {message} ({stats['elapsed_ms']}ms)")
         
         return {
             "success": True,
-            "duplicates_found": duplicates_found,
-            "deleted": deleted_count,
-            "kept": len(kept),
-            "message": f"Removed {deleted_count} duplicate prospect(s), kept {len(kept)} unique domain(s)"
+            **stats,
+            "kept": stats["domains"],
+            "message": message
         }
         
     except Exception as e:
@@ -441,6 +379,7 @@ async def deduplicate_prospects(
 async def enrich_and_deduplicate(
     max_prospects: int = 100,
     only_missing_emails: bool = True,
+    dry_run: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
@@ -448,6 +387,7 @@ async def enrich_and_deduplicate(
     Combined endpoint: First enrich existing prospects, then deduplicate.
     
     This is the main endpoint for the "Enrich & Clean" button.
+    dry_run=true only reports duplicate counts (enrichment still starts).
     """
     try:
         # Step 1: Create enrichment job (reuse the existing endpoint logic)
@@ -532,7 +472,7 @@ async def enrich_and_deduplicate(
         
         # Step 2: Deduplicate
         logger.info("🔍 Step 2: Starting deduplication...")
-        deduplicate_result = await deduplicate_prospects(db=db, current_user=current_user)
+        deduplicate_result = await deduplicate_prospects(dry_run=dry_run, db=db, current_user=current_user)
         
         return {
             "success": True,
@@ -550,7 +490,7 @@ async def enrich_and_deduplicate(
 async def list_websites(
     page: int = 1,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -782,7 +722,7 @@ async def list_leads(
     skip: int = 0,
     limit: int = 50,
     category: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1005,7 +945,7 @@ async def list_scraped_emails(
     skip: int = 0,
     limit: int = 50,
     category: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1179,7 +1119,7 @@ async def list_prospects(
     status: Optional[str] = None,
     min_score: Optional[float] = None,
     has_email: Optional[str] = None,  # Changed to str to handle string "true"/"false" from frontend
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1211,14 +1151,6 @@ async def list_prospects(
         # DEBUG: Log incoming parameters and total prospects count
         logger.info(f"🔍 GET /api/prospects - skip={skip}, limit={limit}, status={status}, min_score={min_score}, has_email={has_email} (type: {type(has_email)})")
         
-        # Log total prospects count for debugging
-        try:
-            total_all_result = await db.execute(select(func.count(Prospect.id)))
-            total_all = total_all_result.scalar() or 0
-            logger.info(f"📊 [LIST PROSPECTS] Total prospects in database: {total_all}")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not count total prospects: {e}")
-        
         # Parse pagination (support both page-based and skip-based)
         try:
             # Default: page=1, limit=50, max limit=1000
@@ -1448,7 +1380,7 @@ async def list_prospects(
 @router.get("/{prospect_id}", response_model=ProspectResponse)
 async def get_prospect(
     prospect_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a single prospect by ID"""
     result = await db.execute(select(Prospect).where(Prospect.id == prospect_id))
@@ -1555,21 +1487,30 @@ async def debug_gemini_config():
         }
 
 
-@router.post("/{prospect_id}/compose", response_model=ComposeResponse)
-async def compose_email(
-    prospect_id: UUID,
-    db: AsyncSession = Depends(get_db)
-):
+def _sse(event: str, data: Dict) -> str:
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_error_message(e: Exception) -> str:
+    """Message for an SSE error event - never str() of an httpx error, its URL carries the API key"""
+    import httpx
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"Gemini API returned status {e.response.status_code}: {e.response.text[:500]}"
+    if isinstance(e, httpx.TimeoutException):
+        return "Gemini API call timed out"
+    if isinstance(e, httpx.RequestError):
+        return f"Network error calling Gemini API: {type(e).__name__}"
+    return str(e)
+
+
+async def _prepare_compose(db: AsyncSession, prospect_id: UUID) -> Dict:
     """
-    Compose an email for a prospect using Gemini
-    
-    STRICT DRAFT-ONLY: This endpoint ONLY saves drafts, never sends emails.
-    
-    Rules:
-    - If email already exists → overwrite draft, not duplicate
-    - Save draft_body and draft_subject
-    - Set draft_status to "drafted"
-    - If this is a follow-up (duplicate domain/email), use Gemini follow-up logic with memory
+    Everything compose needs before the Gemini call, shared by /compose and
+    /compose/stream: the prospect, the thread_id / sequence_index to save with
+    the draft (not set on the prospect, so committing the stored research
+    dossier does not persist them early), a validated Gemini client and the
+    compose_email or compose_followup_email arguments.
     """
     from datetime import datetime, timezone
     from sqlalchemy import or_
@@ -1610,15 +1551,14 @@ async def compose_email(
     if is_followup:
         logger.info(f"📝 [COMPOSE] Follow-up email for {prospect.domain} (original sent to {duplicate_prospect.domain or duplicate_prospect.contact_email})")
         # Use sequence index from original prospect
-        prospect.sequence_index = (duplicate_prospect.sequence_index or 0) + 1
-        prospect.thread_id = duplicate_prospect.thread_id or duplicate_prospect.id
-        logger.info(f"📝 [COMPOSE] Follow-up sequence index: {prospect.sequence_index}, thread_id: {prospect.thread_id}")
+        sequence_index = (duplicate_prospect.sequence_index or 0) + 1
+        thread_id = duplicate_prospect.thread_id or duplicate_prospect.id
+        logger.info(f"📝 [COMPOSE] Follow-up sequence index: {sequence_index}, thread_id: {thread_id}")
     else:
         # Ensure thread_id is set for initial emails
-        if not prospect.thread_id:
-            prospect.thread_id = prospect.id
-        prospect.sequence_index = 0
-        logger.info(f"📝 [COMPOSE] Initial email for {prospect.domain} (thread_id: {prospect.thread_id})")
+        thread_id = prospect.thread_id or prospect.id
+        sequence_index = 0
+        logger.info(f"📝 [COMPOSE] Initial email for {prospect.domain} (thread_id: {thread_id})")
     
     # Import and initialize Gemini client
     try:
@@ -1647,15 +1587,17 @@ async def compose_email(
         logger.error(f"❌ [COMPOSE] Unexpected error with Gemini client: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to initialize Gemini client: {str(e)}")
     
+    # Raw payloads live in prospect_payloads; only these two are needed here
+    payloads = await get_payloads(db, prospect.id, "dataforseo_payload", "snov_payload")
+    
     # Extract snippet from DataForSEO payload (safe None check)
-    page_snippet = None
-    if prospect.dataforseo_payload and isinstance(prospect.dataforseo_payload, dict):
-        page_snippet = prospect.dataforseo_payload.get("description") or prospect.dataforseo_payload.get("snippet")
+    page_snippet = snippet_from_payload(payloads["dataforseo_payload"])
     
     # Extract contact name from Snov.io payload (safe list access)
     contact_name = None
-    if prospect.snov_payload and isinstance(prospect.snov_payload, dict):
-        emails = prospect.snov_payload.get("emails", [])
+    snov_payload = payloads["snov_payload"]
+    if snov_payload and isinstance(snov_payload, dict):
+        emails = snov_payload.get("emails", [])
         if emails and isinstance(emails, list) and len(emails) > 0:
             first_email = emails[0]
             if isinstance(first_email, dict):
@@ -1664,13 +1606,17 @@ async def compose_email(
                 if first_name or last_name:
                     contact_name = f"{first_name or ''} {last_name or ''}".strip()
     
+    # Research dossier shared with chat and follow-ups (built once per prospect)
+    from app.services.research_dossier import get_or_build_dossier
+    dossier = await get_or_build_dossier(db, prospect, client)
+    
     # If follow-up, fetch previous emails in thread for Gemini memory
-    if is_followup and prospect.thread_id:
+    if is_followup and thread_id:
         # Get all sent emails in this thread (from email_logs)
         previous_emails_query = await db.execute(
             select(EmailLog).where(
                 EmailLog.prospect_id.in_(
-                    select(Prospect.id).where(Prospect.thread_id == prospect.thread_id)
+                    select(Prospect.id).where(Prospect.thread_id == thread_id)
                 )
             ).order_by(EmailLog.sent_at.asc())
         )
@@ -1694,7 +1640,7 @@ async def compose_email(
                 # Column exists - safe to query using ORM
                 previous_prospects_query = await db.execute(
                     select(Prospect).where(
-                        Prospect.thread_id == prospect.thread_id,
+                        Prospect.thread_id == thread_id,
                         Prospect.id != prospect_id,
                         Prospect.final_body.isnot(None)
                     ).order_by(Prospect.last_sent.asc())
@@ -1728,14 +1674,15 @@ async def compose_email(
         # Sort by sent_at
         previous_emails.sort(key=lambda x: x.get("sent_at", ""))
         
-        # Call Gemini to compose follow-up email with memory
-        gemini_result = await client.compose_followup_email(
+        # Gemini follow-up email with memory
+        compose_args = dict(
             domain=prospect.domain,
             previous_emails=previous_emails,
             page_title=prospect.page_title,
             page_url=prospect.page_url,
             page_snippet=page_snippet,
-            contact_name=contact_name
+            contact_name=contact_name,
+            dossier=dossier
         )
     else:
         # Initial email - use regular compose
@@ -1756,23 +1703,33 @@ async def compose_email(
             elif "nft" in title_lower or "nft" in domain_lower:
                 category = "NFTs"
         
-        gemini_result = await client.compose_email(
+        compose_args = dict(
             domain=prospect.domain,
             page_title=prospect.page_title,
             page_url=prospect.page_url,
             page_snippet=page_snippet,
             contact_name=contact_name,
-            category=category
+            category=category,
+            dossier=dossier
         )
     
-    if not gemini_result.get("success"):
-        error = gemini_result.get("error", "Unknown error")
-        logger.error(f"❌ [COMPOSE] Gemini API error: {error}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to compose email: {error}")
-    
+    return {
+        "prospect": prospect,
+        "thread_id": thread_id,
+        "sequence_index": sequence_index,
+        "client": client,
+        "is_followup": is_followup,
+        "compose_args": compose_args,
+    }
+
+
+async def _save_draft(
+    db: AsyncSession, prospect: Prospect, subject: Optional[str], body: Optional[str], is_followup: bool
+) -> ComposeResponse:
+    """Save a composed draft on the prospect and commit"""
     # Save draft to prospect (OVERWRITE if draft already exists, don't duplicate)
-    prospect.draft_subject = gemini_result.get("subject")
-    prospect.draft_body = gemini_result.get("body")
+    prospect.draft_subject = subject
+    prospect.draft_body = body
     # drafted_at column doesn't exist - use draft_subject/draft_body as indicators
     # prospect.drafted_at = datetime.now(timezone.utc)  # REMOVED: Column doesn't exist
     # Update draft_status to "drafted" so pipeline Drafting card reflects this
@@ -1792,6 +1749,120 @@ async def compose_email(
     )
 
 
+@router.post("/{prospect_id}/compose", response_model=ComposeResponse)
+async def compose_email(
+    prospect_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Compose an email for a prospect using Gemini
+    
+    STRICT DRAFT-ONLY: This endpoint ONLY saves drafts, never sends emails.
+    
+    Rules:
+    - If email already exists → overwrite draft, not duplicate
+    - Save draft_body and draft_subject
+    - Set draft_status to "drafted"
+    - If this is a follow-up (duplicate domain/email), use Gemini follow-up logic with memory
+    """
+    prepared = await _prepare_compose(db, prospect_id)
+    client = prepared["client"]
+    if prepared["is_followup"]:
+        gemini_result = await client.compose_followup_email(**prepared["compose_args"])
+    else:
+        gemini_result = await client.compose_email(**prepared["compose_args"])
+    
+    if not gemini_result.get("success"):
+        error = gemini_result.get("error", "Unknown error")
+        logger.error(f"❌ [COMPOSE] Gemini API error: {error}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to compose email: {error}")
+    
+    prospect = prepared["prospect"]
+    prospect.thread_id = prepared["thread_id"]
+    prospect.sequence_index = prepared["sequence_index"]
+    return await _save_draft(
+        db, prospect, gemini_result.get("subject"), gemini_result.get("body"), prepared["is_followup"]
+    )
+
+
+@router.post("/{prospect_id}/compose/stream")
+async def compose_email_stream(
+    prospect_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Streaming variant of /compose (Server-Sent Events, via Gemini streamGenerateContent).
+    
+    Events:
+    - `field`: {"field": "subject" | "body", "delta": "..."} - newly generated text;
+      the subject is complete before the body starts
+    - `field_done`: {"field": ..., "value": "..."}
+    - `done`: the ComposeResponse, after the draft is saved (markdown stripped)
+    - `error`: {"error": "COMPOSE_FAILED", "message": ...}; nothing is saved
+    
+    Prospect lookup and client validation errors are returned as regular HTTP errors.
+    """
+    from app.clients.gemini import strip_markdown_formatting
+    from app.db.database import AsyncSessionLocal
+    from app.utils.json_stream import JsonObjectStream
+    
+    prepared = await _prepare_compose(db, prospect_id)
+    client = prepared["client"]
+    is_followup = prepared["is_followup"]
+    prospect = prepared["prospect"]
+    domain = prospect.domain
+    thread_id, sequence_index = prepared["thread_id"], prepared["sequence_index"]
+    if is_followup:
+        payload = await client.build_followup_request(**prepared["compose_args"])
+    else:
+        payload = await client.build_compose_request(**prepared["compose_args"])
+    # Keep a newly built research dossier for the next call, then don't hold a pooled
+    # connection while the model generates; the draft is saved in a new session
+    await db.commit()
+    await db.close()
+    
+    async def events():
+        parser = JsonObjectStream()
+        fragments = []
+        try:
+            async for fragment in client.stream_generate(payload):
+                fragments.append(fragment)
+                for kind, key, value in parser.feed(fragment):
+                    if key not in ("subject", "body"):
+                        continue
+                    if kind == "delta":
+                        yield _sse("field", {"field": key, "delta": value})
+                    else:
+                        yield _sse("field_done", {"field": key, "value": value})
+            
+            values = parser.values
+            if not (values.get("subject") and values.get("body")):
+                # Not the requested JSON object - same fallback as compose_email
+                values = client._extract_from_text("".join(fragments), domain)
+            subject = strip_markdown_formatting(values.get("subject") or "")
+            body = strip_markdown_formatting(values.get("body") or "")
+            if not subject or not body:
+                raise ValueError("Gemini returned empty subject/body")
+            
+            async with AsyncSessionLocal() as session:
+                target = await session.get(Prospect, prospect_id)
+                if target is None:
+                    raise ValueError("Prospect was deleted while composing")
+                target.thread_id = thread_id
+                target.sequence_index = sequence_index
+                saved = await _save_draft(session, target, subject, body, is_followup)
+            yield _sse("done", saved.model_dump(mode="json"))
+        except Exception as e:
+            logger.error(f"❌ [COMPOSE] Streaming compose failed for {domain}: {e}", exc_info=True)
+            yield _sse("error", {"error": "COMPOSE_FAILED", "message": _stream_error_message(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{prospect_id}/send", response_model=SendResponse)
 async def send_email(
     prospect_id: UUID,
@@ -1934,7 +2005,7 @@ async def send_email(
 async def export_prospects_csv(
     status: Optional[str] = None,
     source_type: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -2014,7 +2085,7 @@ async def export_prospects_csv(
 
 @router.get("/leads/export/csv")
 async def export_leads_csv(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -2083,7 +2154,7 @@ async def export_leads_csv(
 
 @router.get("/scraped-emails/export/csv")
 async def export_scraped_emails_csv(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -2177,13 +2248,18 @@ async def upload_attachment(
     if len(content) > MAX_ATTACHMENT_BYTES:
         raise HTTPException(status_code=400, detail="Attachment exceeds 10MB limit")
 
+    # Bytes go to the content-addressed blob store; the row keeps them too
+    # unless the store is durable (see services/attachment_store.py). The
+    # digest stays locked against release_blob() until the commit below
+    digest, row_data = await store_attachment_data(db, content)
     attachment = EmailAttachment(
         prospect_id=prospect_id,
         filename=file.filename or "attachment",
         content_type=file.content_type or "application/octet-stream",
         size_bytes=len(content),
         scope=scope,
-        data=content
+        content_hash=digest,
+        data=row_data
     )
     db.add(attachment)
     await db.commit()
@@ -2204,10 +2280,10 @@ async def upload_attachment(
 async def list_attachments(
     scope: Optional[str] = None,
     prospect_id: Optional[UUID] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
-    query = select(EmailAttachment)
+    query = select(EmailAttachment).options(defer(EmailAttachment.data))
     if scope:
         query = query.where(EmailAttachment.scope == scope)
     if prospect_id:
@@ -2238,14 +2314,19 @@ async def delete_attachment(
     db: AsyncSession = Depends(get_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
-    result = await db.execute(select(EmailAttachment).where(EmailAttachment.id == attachment_id))
+    result = await db.execute(
+        select(EmailAttachment).options(defer(EmailAttachment.data)).where(EmailAttachment.id == attachment_id)
+    )
     attachment = result.scalar_one_or_none()
 
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
 
+    digest = attachment.content_hash
     await db.delete(attachment)
     await db.commit()
+    # Identical files uploaded elsewhere share the blob
+    await release_blob(db, digest)
 
     return {"success": True}
 
@@ -2273,18 +2354,11 @@ class GeminiChatResponse(BaseModel):
     candidate_draft: Optional[Dict[str, str]] = None  # {subject: str, body: str} if draft suggestion detected
 
 
-@router.post("/{prospect_id}/chat", response_model=GeminiChatResponse)
-async def gemini_chat(
-    prospect_id: UUID,
-    request: GeminiChatRequest,
-    db: AsyncSession = Depends(get_db),
-    current_user: Optional[str] = Depends(get_current_user_optional)
-):
+async def _prepare_chat(db: AsyncSession, prospect_id: UUID, request: GeminiChatRequest):
     """
-    Chat with Gemini to refine email drafts.
-    
-    This is a human-in-the-loop feature - Gemini provides suggestions,
-    but the user must manually copy/paste into the draft editor.
+    Stages 1-3 of the chat endpoints (prospect lookup, client init, prompt).
+    Returns (gemini_client, prompt); failures are raised as GEMINI_CHAT_FAILED
+    HTTP errors with their stage.
     """
     stage = "init"
     try:
@@ -2341,28 +2415,96 @@ async def gemini_chat(
                 }
             )
         
-        # Stage 3: Build prompt using centralized method
+        # Stage 3: Build prompt using centralized method (stored research dossier, built on first use)
         stage = "prompt"
+        from app.services.research_dossier import get_or_build_dossier
+        dossier = await get_or_build_dossier(db, prospect, gemini_client)
         context = await gemini_client.build_chat_prompt(
             prospect=prospect,
             user_message=request.message,
             current_subject=request.current_subject,
-            current_body=request.current_body
+            current_body=request.current_body,
+            dossier=dossier
         )
         
         logger.info(f"✅ [GEMINI CHAT] Prompt built ({len(context)} chars)")
         
+        return gemini_client, context
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ [GEMINI CHAT] Unexpected error at stage '{stage}': {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "GEMINI_CHAT_FAILED",
+                "message": f"Unexpected error: {str(e)}",
+                "stage": stage
+            }
+        )
+
+
+def _chat_payload(prompt: str) -> Dict:
+    return {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {
+            "temperature": 0.7,
+            "maxOutputTokens": 1024
+        }
+    }
+
+
+def _parse_chat_reply(text_content: str):
+    """Split a chat reply into (conversational text, candidate_draft or None)"""
+    candidate_draft = None
+    
+    # Look for draft suggestion markers
+    import re
+    draft_pattern = r'---\s*DRAFT SUGGESTION\s*---\s*Subject:\s*(.+?)\s*Body:\s*(.+?)\s*---\s*END DRAFT SUGGESTION\s*---'
+    match = re.search(draft_pattern, text_content, re.DOTALL | re.IGNORECASE)
+    
+    if match:
+        suggested_subject = match.group(1).strip()
+        suggested_body = match.group(2).strip()
+        
+        # Strip markdown formatting (asterisks, etc.) from draft suggestions
+        from app.clients.gemini import strip_markdown_formatting
+        suggested_subject = strip_markdown_formatting(suggested_subject)
+        suggested_body = strip_markdown_formatting(suggested_body)
+        
+        # Remove the draft suggestion markers from the response text
+        # Keep the conversational part before/after
+        text_content = re.sub(draft_pattern, '', text_content, flags=re.DOTALL | re.IGNORECASE).strip()
+        
+        candidate_draft = {
+            "subject": suggested_subject,
+            "body": suggested_body
+        }
+        logger.info(f"✅ [GEMINI CHAT] Draft suggestion detected: subject={len(suggested_subject)} chars, body={len(suggested_body)} chars")
+    
+    return text_content, candidate_draft
+
+
+@router.post("/{prospect_id}/chat", response_model=GeminiChatResponse)
+async def gemini_chat(
+    prospect_id: UUID,
+    request: GeminiChatRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[str] = Depends(get_current_user_optional)
+):
+    """
+    Chat with Gemini to refine email drafts.
+    
+    This is a human-in-the-loop feature - Gemini provides suggestions,
+    but the user must manually copy/paste into the draft editor.
+    """
+    gemini_client, context = await _prepare_chat(db, prospect_id, request)
+    stage = "api_call"
+    try:
         # Stage 4: API call
-        stage = "api_call"
         url = f"{gemini_client.BASE_URL}/models/{gemini_client.model}:generateContent?key={gemini_client.api_key}"
         
-        payload = {
-            "contents": [{"parts": [{"text": context}]}],
-            "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 1024
-            }
-        }
+        payload = _chat_payload(context)
         
         import httpx
         try:
@@ -2457,31 +2599,7 @@ async def gemini_chat(
         
         # Stage 6: Parse response for draft suggestions
         stage = "parse"
-        candidate_draft = None
-        
-        # Look for draft suggestion markers
-        import re
-        draft_pattern = r'---\s*DRAFT SUGGESTION\s*---\s*Subject:\s*(.+?)\s*Body:\s*(.+?)\s*---\s*END DRAFT SUGGESTION\s*---'
-        match = re.search(draft_pattern, text_content, re.DOTALL | re.IGNORECASE)
-        
-        if match:
-            suggested_subject = match.group(1).strip()
-            suggested_body = match.group(2).strip()
-            
-            # Strip markdown formatting (asterisks, etc.) from draft suggestions
-            from app.clients.gemini import strip_markdown_formatting
-            suggested_subject = strip_markdown_formatting(suggested_subject)
-            suggested_body = strip_markdown_formatting(suggested_body)
-            
-            # Remove the draft suggestion markers from the response text
-            # Keep the conversational part before/after
-            text_content = re.sub(draft_pattern, '', text_content, flags=re.DOTALL | re.IGNORECASE).strip()
-            
-            candidate_draft = {
-                "subject": suggested_subject,
-                "body": suggested_body
-            }
-            logger.info(f"✅ [GEMINI CHAT] Draft suggestion detected: subject={len(suggested_subject)} chars, body={len(suggested_body)} chars")
+        text_content, candidate_draft = _parse_chat_reply(text_content)
         
         logger.info(f"✅ [GEMINI CHAT] Successfully generated response ({len(text_content)} chars, draft_suggestion={'yes' if candidate_draft else 'no'})")
         return GeminiChatResponse(
@@ -2502,3 +2620,49 @@ async def gemini_chat(
                 "stage": stage
             }
     )
+
+
+@router.post("/{prospect_id}/chat/stream")
+async def gemini_chat_stream(
+    prospect_id: UUID,
+    request: GeminiChatRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[str] = Depends(get_current_user_optional)
+):
+    """
+    Streaming variant of /chat (Server-Sent Events, via Gemini streamGenerateContent).
+    
+    Events:
+    - `delta`: {"text": "..."} - reply text as it is generated (draft suggestion
+      markers included)
+    - `done`: the GeminiChatResponse, parsed from the full reply as in /chat
+    - `error`: {"error": "GEMINI_CHAT_FAILED", "message": ..., "stage": "stream"}
+    
+    Errors before generation starts are returned as regular HTTP errors.
+    """
+    gemini_client, context = await _prepare_chat(db, prospect_id, request)
+    # Keep a newly built research dossier for the next turn
+    await db.commit()
+    await db.close()
+    
+    async def events():
+        fragments = []
+        try:
+            async for fragment in gemini_client.stream_generate(_chat_payload(context), timeout=30.0):
+                fragments.append(fragment)
+                yield _sse("delta", {"text": fragment})
+            text_content = "".join(fragments)
+            if not text_content:
+                raise ValueError("Gemini API returned empty response")
+            text_content, candidate_draft = _parse_chat_reply(text_content)
+            reply = GeminiChatResponse(success=True, response=text_content, candidate_draft=candidate_draft)
+            yield _sse("done", reply.model_dump())
+        except Exception as e:
+            logger.error(f"❌ [GEMINI CHAT] Streaming chat failed: {e}", exc_info=True)
+            yield _sse("error", {"error": "GEMINI_CHAT_FAILED", "message": _stream_error_message(e), "stage": "stream"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -9,7 +9,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, timedelta
 import logging
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.settings import Settings
 from app.models.job import Job
 
@@ -132,7 +132,7 @@ class ScraperStatusResponse(BaseModel):
 # ============================================
 
 @router.get("/master", response_model=MasterSwitchResponse)
-async def get_master_switch(db: AsyncSession = Depends(get_db)):
+async def get_master_switch(db: AsyncSession = Depends(get_read_db)):
     """Get master switch status"""
     enabled = await check_master_switch(db)
     return MasterSwitchResponse(
@@ -165,7 +165,7 @@ async def set_master_switch(
 # ============================================
 
 @router.get("/automatic", response_model=AutoSwitchResponse)
-async def get_auto_switch(db: AsyncSession = Depends(get_db)):
+async def get_auto_switch(db: AsyncSession = Depends(get_read_db)):
     """Get auto switch status and validation"""
     master_enabled = await check_master_switch(db)
     auto_enabled = await get_scraper_setting(db, "auto_enabled", False)
@@ -289,7 +289,7 @@ async def set_scraper_config(
 # ============================================
 
 @router.get("/status", response_model=ScraperStatusResponse)
-async def get_scraper_status(db: AsyncSession = Depends(get_db)):
+async def get_scraper_status(db: AsyncSession = Depends(get_read_db)):
     """Get complete scraper status"""
     master_enabled = await check_master_switch(db)
     auto_enabled = await get_scraper_setting(db, "auto_enabled", False)
@@ -393,7 +393,7 @@ class ScraperHistoryListResponse(BaseModel):
 async def get_scraper_history(
     page: int = 1,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get scraper history with pagination"""
     from app.models.scraper_history import ScraperHistory
@@ -445,7 +445,7 @@ async def get_scraper_history(
 async def list_websites(
     page: int = 1,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List websites (prospects) with pagination
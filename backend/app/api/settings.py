@@ -9,7 +9,7 @@ import os
 from dotenv import load_dotenv
 import logging
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.settings import Settings
 from sqlalchemy import select
 from sqlalchemy.sql import func
@@ -348,7 +348,7 @@ async def get_dataforseo_diagnostics():
 
 
 @router.get("/automation", response_model=AutomationSettings)
-async def get_automation_settings(db: AsyncSession = Depends(get_db)):
+async def get_automation_settings(db: AsyncSession = Depends(get_read_db)):
     """
     Get current automation settings
     """
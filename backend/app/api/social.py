@@ -15,7 +15,7 @@ import csv
 import io
 from datetime import datetime
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.api.auth import get_current_user_optional
 from app.models.prospect import Prospect, DiscoveryStatus
 from app.adapters.social_discovery import (
@@ -171,7 +171,7 @@ async def list_profiles(
     limit: int = 50,
     platform: Optional[str] = None,
     discovery_status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -422,7 +422,7 @@ async def list_profiles(
 
 @router.get("/debug/profiles")
 async def debug_social_profiles(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -524,7 +524,7 @@ async def debug_social_profiles(
 
 @router.get("/stats")
 async def get_social_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -889,7 +889,7 @@ async def list_drafted_profiles(
     skip: int = 0,
     limit: int = 50,
     platform: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -979,7 +979,7 @@ async def list_sent_profiles(
     skip: int = 0,
     limit: int = 50,
     platform: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1073,7 +1073,7 @@ async def list_sent_profiles(
 @router.get("/profiles/export/csv")
 async def export_profiles_csv(
     platform: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1145,7 +1145,7 @@ async def export_profiles_csv(
 @router.get("/drafts/export/csv")
 async def export_drafts_csv(
     platform: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -1213,7 +1213,7 @@ async def export_drafts_csv(
 @router.get("/sent/export/csv")
 async def export_sent_csv(
     platform: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
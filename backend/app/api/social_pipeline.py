@@ -22,7 +22,7 @@ from datetime import datetime, timezone, timedelta
 import logging
 from pydantic import BaseModel
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.api.auth import get_current_user_optional
 from app.models.prospect import Prospect, DiscoveryStatus
 from app.adapters.social_discovery import (
@@ -44,7 +44,7 @@ router = APIRouter(prefix="/api/social/pipeline", tags=["social-pipeline"])
 @router.get("/status")
 async def get_social_pipeline_status(
     platform: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[str] = Depends(get_current_user_optional)
 ):
     """
@@ -7,9 +7,7 @@ import logging
 import json
 import asyncio
 
-# TODO: Implement reply handler in backend/app/tasks/reply_handler.py
-# When implemented, uncomment:
-# from app.tasks.reply_handler import process_reply_async
+from app.services.reply_sync import decode_push_notification
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -35,33 +33,27 @@ async def gmail_webhook(request: Request):
     """
     Gmail webhook endpoint for push notifications
     
-    Gmail will POST here when new emails arrive
+    Gmail publishes mailbox changes to Cloud Pub/Sub, which POSTs here:
+    {"message": {"data": base64({"emailAddress": ..., "historyId": ...})}, "subscription": ...}
+    
+    The notification only carries the new historyId; the reply sync fetches
+    the history delta in the background so Pub/Sub gets its ack immediately.
     """
     try:
         body = await request.json()
-        logger.info(f"Gmail webhook received: {json.dumps(body)}")
-        
-        # Parse Gmail push notification
-        # Format depends on Gmail push notification setup
-        # This is a placeholder - implement based on actual Gmail webhook format
-        
-        # Example structure (adjust based on actual Gmail webhook):
-        # {
-        #   "message": {
-        #     "data": "base64_encoded_message_data"
-        #   }
-        # }
-        
-        # For now, just log and return success
-        # In production, implement:
-        # 1. Decode message data
-        # 2. Extract email thread/message info
-        # 3. Match to prospect by email address
-        # 4. Call process_reply_async
-        
-        return {"status": "received"}
-    
-    except Exception as e:
-        logger.error(f"Error processing Gmail webhook: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+    notification = decode_push_notification(body)
+    if not notification:
+        # Ack anyway - Pub/Sub would redeliver a malformed message forever
+        logger.warning(f"Ignoring Gmail webhook payload without a historyId: {json.dumps(body)[:500]}")
+        return {"status": "ignored"}
 
+    logger.info(
+        f"Gmail push notification for {notification['email_address']} (historyId {notification['history_id']})"
+    )
+    # Imported here: pulls in the Gmail client, which the app does not need at startup
+    from app.tasks.reply_handler import process_reply_check_job
+    asyncio.create_task(process_reply_check_job(notification["history_id"]))
+    return {"status": "received"}
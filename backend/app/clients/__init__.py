@@ -1,21 +1,25 @@
 """
 API clients for third-party services
+
+Clients are imported on first attribute access, so importing one client
+(e.g. app.clients.gmail) does not pull in every other client's dependencies.
 """
-from app.clients.dataforseo import DataForSEOClient
-from app.clients.gemini import GeminiClient
-from app.clients.gmail import GmailClient
-from app.clients.linkedin import LinkedInClient
-from app.clients.instagram import InstagramClient
-from app.clients.facebook import FacebookClient
-from app.clients.tiktok import TikTokClient
+from importlib import import_module
+
+_CLIENTS = {
+    "DataForSEOClient": "app.clients.dataforseo",
+    "GeminiClient": "app.clients.gemini",
+    "GmailClient": "app.clients.gmail",
+    "LinkedInClient": "app.clients.linkedin",
+    "InstagramClient": "app.clients.instagram",
+    "FacebookClient": "app.clients.facebook",
+    "TikTokClient": "app.clients.tiktok",
+}
+
+__all__ = list(_CLIENTS)
 
-__all__ = [
-    "DataForSEOClient", 
-    "GeminiClient", 
-    "GmailClient",
-    "LinkedInClient",
-    "InstagramClient",
-    "FacebookClient",
-    "TikTokClient"
-]
 
+def __getattr__(name):
+    if name in _CLIENTS:
+        return getattr(import_module(_CLIENTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,6 +13,7 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 import logging
+from app.utils.metrics import instrument, record_provider_error, record_provider_retry, span
 from app.utils.rate_limiter import get_rate_limiter
 
 load_dotenv()
@@ -246,18 +247,8 @@ class DataForSEOClient:
             
             url = f"{self.BASE_URL}/serp/google/organic/task_post"
             
-            # Rate limiting: Wait if needed to prevent cost overruns and API bans
-            # WRAPPED IN TRY-EXCEPT to prevent rate limiter bugs from blocking discovery
-            try:
-                limiter = get_rate_limiter()
-                await limiter.wait_if_needed("dataforseo")
-            except Exception as rate_limit_err:
-                # Log but don't fail - allow request to proceed if rate limiter has issues
-                logger.warning(
-                    f"⚠️  [RATE LIMITER] Error in rate limiter (allowing request to proceed): {rate_limit_err}\n"
-                    f"This is likely the 'key_for' bug - rate limiting temporarily disabled for this request",
-                    exc_info=True
-                )
+            # Rate limiting: shared token bucket prevents cost overruns and API bans
+            await get_rate_limiter().wait_if_needed("dataforseo")
             
             # Store request for diagnostics
             self._last_request = {
@@ -277,11 +268,12 @@ class DataForSEOClient:
                 logger.debug(f"🔵 [HTTP HEADERS] {json.dumps(dict(self.headers), indent=2)}")
                 
                 # Send using json parameter (httpx handles encoding and Content-Type)
-                response = await client.post(
-                    url,
-                    headers=self.headers,
-                    json=payload  # httpx will serialize this correctly
-                )
+                with span("serp.post"):
+                    response = await client.post(
+                        url,
+                        headers=self.headers,
+                        json=payload  # httpx will serialize this correctly
+                    )
                 
                 # DEFENSIVE LOGGING: Log HTTP response status
                 logger.info(f"🔵 [HTTP RESPONSE] Status: {response.status_code}")
@@ -294,6 +286,7 @@ class DataForSEOClient:
                     logger.error(f"🔴 [DATAFORSEO 402 ERROR] Response: {response.text[:500]}")
                     self._error_count += 1
                     self._last_error = error_msg
+                    record_provider_error("dataforseo", "insufficient_credits")
                     return {
                         "success": False,
                         "error": error_msg,
@@ -364,10 +357,12 @@ class DataForSEOClient:
         except Exception as e:
             error_msg = f"DataForSEO API call failed: {str(e)}"
             logger.error(f"🔴 {error_msg}", exc_info=True)
+            record_provider_error("dataforseo", type(e).__name__)
             self._error_count += 1
             self._last_error = error_msg
             return {"success": False, "error": error_msg}
     
+    @instrument("serp.poll", provider="dataforseo")
     async def _get_serp_results(self, task_id: str, max_attempts: int = 30) -> Dict[str, Any]:
         """
         Poll DataForSEO API for SERP results
@@ -388,6 +383,8 @@ class DataForSEOClient:
         await asyncio.sleep(5)
         
         for attempt in range(max_attempts):
+            if attempt:
+                record_provider_retry("dataforseo")
             try:
                 async with httpx.AsyncClient(timeout=60.0) as client:
                     logger.debug(f"🔄 Poll attempt {attempt + 1}/{max_attempts} for task {task_id}")
@@ -2,20 +2,32 @@
 Google Gemini API client for email composition
 """
 import httpx
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from typing import Dict, Any, AsyncIterator, Optional, List, TYPE_CHECKING
 import os
 from dotenv import load_dotenv
 import logging
 import json
 import asyncio
+import time
+
+from app.utils.metrics import (
+    error_reason, increment, instrument, observe_stage, record_provider_error, record_provider_retry,
+)
+from app.utils.rate_limiter import get_rate_limiter
 
 if TYPE_CHECKING:
     from app.models.prospect import Prospect
+    from app.models.prospect_dossier import ProspectDossier
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# How long a successful Liquid Canvas web search is reused (process-wide)
+GEMINI_BRAND_INFO_TTL = int(os.getenv("GEMINI_BRAND_INFO_TTL", "21600"))
+# Bytes of a prospect's page read for research
+GEMINI_FETCH_MAX_BYTES = int(os.getenv("GEMINI_FETCH_MAX_BYTES", str(256 * 1024)))
+
 # CANONICAL LIQUID CANVAS DESCRIPTION (NON-NEGOTIABLE)
 # This is the ONLY valid source of truth for Liquid Canvas positioning.
 # Must be used consistently across all drafting, Gemini prompts, and outreach logic.
@@ -79,6 +91,9 @@ class GeminiClient:
     
     BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
     
+    # (fetched_at, text) of the last successful Liquid Canvas search, shared by all clients
+    _brand_info: Optional[tuple] = None
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize Gemini client
@@ -176,6 +191,7 @@ class GeminiClient:
                         logger.warning(f"⚠️ [GEMINI] Rate limited on model {self.model}, waiting...")
                         await asyncio.sleep(3)
                         # Retry once after waiting
+                        record_provider_retry("gemini")
                         retry_response = await client.post(url, json=test_payload)
                         if retry_response.status_code == 200:
                             logger.info(f"✅ Gemini model {self.model} worked after retry")
@@ -190,9 +206,16 @@ class GeminiClient:
         """
         Search for information about Liquid Canvas using Gemini's web search
         
+        A successful result is reused by every client in the process for
+        GEMINI_BRAND_INFO_TTL seconds; it does not depend on the prospect.
+        
         Returns:
             String with information about Liquid Canvas
         """
+        cached = GeminiClient._brand_info
+        if cached and time.monotonic() - cached[0] < GEMINI_BRAND_INFO_TTL:
+            return cached[1]
+        
         search_url = f"{self.BASE_URL}/models/{self.model}:generateContent?key={self.api_key}"
         
         search_prompt = f"""Search DEEPLY into the internet for comprehensive information about Liquid Canvas (liquidcanvas.art), a mobile-to-TV streaming art platform.
@@ -235,7 +258,7 @@ IMPORTANT: Liquid Canvas is a streaming art platform, NOT an art services compan
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=30.0) as client:
                 logger.info("🔍 Searching for Liquid Canvas information...")
                 response = await client.post(search_url, json=search_payload)
                 response.raise_for_status()
@@ -249,6 +272,7 @@ IMPORTANT: Liquid Canvas is a streaming art platform, NOT an art services compan
                             info_text = parts[0].get("text", "") if isinstance(parts[0], dict) else ""
                             if info_text:
                                 logger.info("✅ Found Liquid Canvas information")
+                                GeminiClient._brand_info = (time.monotonic(), info_text)
                                 return info_text
         except Exception as e:
             logger.warning(f"⚠️  Failed to search for Liquid Canvas info: {e}. Using default info.")
@@ -268,47 +292,71 @@ IMPORTANT: Liquid Canvas is a streaming art platform, NOT an art services compan
             page_url = f"https://{domain}"
         
         try:
-            import httpx
             from bs4 import BeautifulSoup
+            from app.services.crawl_scheduler import get_crawl_scheduler
             
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-                response = await client.get(page_url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                response.raise_for_status()
-                html = response.text
-                
-                # Parse HTML and extract main content
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style", "nav", "footer", "header"]):
-                    script.decompose()
-                
-                # Get text content
-                text = soup.get_text()
-                
-                # Clean up whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                # Limit to first 2000 characters to avoid token limits
-                if len(text) > 2000:
-                    text = text[:2000] + "..."
-                
-                logger.info(f"✅ Fetched website content from {page_url} ({len(text)} chars)")
-                return text
+            # Same politeness rules (host slots, crawl delay, robots.txt) as the scraper;
+            # only the first GEMINI_FETCH_MAX_BYTES are read (2000 chars of text are kept)
+            page = await get_crawl_scheduler().fetch_html(page_url, max_bytes=GEMINI_FETCH_MAX_BYTES)
+            if page.is_error:
+                logger.warning(f"⚠️  Failed to fetch website content from {page_url}: HTTP {page.status_code}")
+                return None
+            html = page.text
+            
+            # Parse HTML and extract main content
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            # Remove script and style elements
+            for script in soup(["script", "style", "nav", "footer", "header"]):
+                script.decompose()
+            
+            # Get text content
+            text = soup.get_text()
+            
+            # Clean up whitespace
+            lines = (line.strip() for line in text.splitlines())
+            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+            text = ' '.join(chunk for chunk in chunks if chunk)
+            
+            # Limit to first 2000 characters to avoid token limits
+            if len(text) > 2000:
+                text = text[:2000] + "..."
+            
+            logger.info(f"✅ Fetched website content from {page_url} ({len(text)} chars)")
+            return text
         except Exception as e:
             logger.warning(f"⚠️  Failed to fetch website content from {page_url}: {e}")
             return None
     
+    async def build_research(
+        self,
+        page_url: Optional[str],
+        domain: str,
+        page_title: Optional[str] = None,
+        page_snippet: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Research a website prospect: fetch the site and build the positioning summary.
+        
+        This is what services/research_dossier.py stores per prospect, so compose,
+        chat and follow-ups do not repeat it on every call.
+        
+        Returns:
+            Dictionary with site_text (None if the fetch failed) and positioning_summary
+        """
+        logger.info(f"📄 [GEMINI] Fetching website content for {domain}...")
+        site_text = await self._fetch_website_content(page_url, domain)
+        logger.info(f"📊 [GEMINI] Building positioning summary for {domain}...")
+        positioning_summary = await self._build_positioning_summary(site_text, page_title, page_snippet, domain)
+        return {"site_text": site_text, "positioning_summary": positioning_summary}
+    
     async def build_chat_prompt(
         self,
         prospect: "Prospect",
         user_message: str,
         current_subject: Optional[str] = None,
-        current_body: Optional[str] = None
+        current_body: Optional[str] = None,
+        dossier: Optional["ProspectDossier"] = None
     ) -> str:
         """
         Build a prompt for Gemini chat to refine email drafts.
@@ -321,6 +369,8 @@ IMPORTANT: Liquid Canvas is a streaming art platform, NOT an art services compan
             user_message: User's chat message/request
             current_subject: Current draft subject (if any)
             current_body: Current draft body (if any)
+            dossier: Stored research for the prospect; without it the website is
+                fetched and summarized here
         
         Returns:
             Complete prompt string for Gemini
@@ -332,7 +382,9 @@ IMPORTANT: Liquid Canvas is a streaming art platform, NOT an art services compan
         source_type = getattr(prospect, 'source_type', None)
         positioning_summary = ""
         
-        if source_type != 'social':
+        if source_type != 'social' and dossier is not None:
+            positioning_summary = dossier.positioning_summary
+        elif source_type != 'social':
             # Website prospect - fetch website content and build positioning summary
             website_content = await self._fetch_website_content(
                 getattr(prospect, 'page_url', None),
@@ -489,7 +541,7 @@ Create a brief positioning summary (2-3 sentences) that:
 Return ONLY the positioning summary text, no additional formatting."""
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(url, json={
                     "contents": [{"parts": [{"text": analysis_prompt}]}],
                     "generationConfig": {
@@ -515,48 +567,72 @@ Return ONLY the positioning summary text, no additional formatting."""
         # Fallback summary
         return f"This appears to be a {page_title or 'business'} in the {domain} domain. Liquid Canvas, a mobile-to-TV streaming art platform, could help them display curated art collections, create custom playlists, and transform their spaces into galleries using connected TVs."
     
-    async def compose_email(
+    async def stream_generate(self, payload: Dict[str, Any], timeout: float = 60.0) -> AsyncIterator[str]:
+        """
+        Run a generateContent request body through streamGenerateContent (SSE)
+        and yield the text fragments as they arrive.
+        
+        Records time to the first fragment (stage "gemini.first_token") and the
+        whole stream ("gemini.stream"). HTTP errors are raised as
+        httpx.HTTPStatusError, like the non-streaming calls.
+        """
+        url = f"{self.BASE_URL}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+        started = time.perf_counter()
+        first_fragment = True
+        increment("provider_requests_total", provider="gemini")
+        try:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=timeout) as client:
+                async with client.stream("POST", url, json=payload) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        try:
+                            chunk = json.loads(line[5:])
+                        except ValueError:
+                            continue
+                        for candidate in chunk.get("candidates") or []:
+                            for part in (candidate.get("content") or {}).get("parts") or []:
+                                text = part.get("text") if isinstance(part, dict) else None
+                                if not text:
+                                    continue
+                                if first_fragment:
+                                    first_fragment = False
+                                    observe_stage("gemini.first_token", time.perf_counter() - started)
+                                yield text
+        except Exception as e:
+            observe_stage("gemini.stream", time.perf_counter() - started, failed=True)
+            record_provider_error("gemini", error_reason(e))
+            raise
+        observe_stage("gemini.stream", time.perf_counter() - started)
+    
+    async def build_compose_request(
         self,
         domain: str,
         page_title: Optional[str] = None,
         page_url: Optional[str] = None,
         page_snippet: Optional[str] = None,
         contact_name: Optional[str] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        dossier: Optional["ProspectDossier"] = None
     ) -> Dict[str, Any]:
         """
-        Compose an email using Gemini API with Liquid Canvas information.
-        
-        CRITICAL: Reads website content first, builds positioning summary, then generates email.
-        
-        Args:
-            domain: Website domain
-            page_title: Page title (business/organization name)
-            page_url: Page URL
-            page_snippet: Page description/snippet
-            contact_name: Contact name (if available)
-            category: Category of the prospect (e.g., "Museum", "Art Gallery", "Interior Design", etc.)
-        
-        Returns:
-            Dictionary with subject and body
+        Build the generateContent request body for compose_email (also used by
+        the streaming compose endpoint). Arguments as for compose_email.
         """
-        url = f"{self.BASE_URL}/models/{self.model}:generateContent?key={self.api_key}"
-        
         # STEP 1: Search for Liquid Canvas information
         liquid_canvas_info = await self._search_liquid_canvas_info()
         
-        # STEP 2: Fetch website content
-        logger.info(f"📄 [GEMINI] Fetching website content for {domain}...")
-        website_content = await self._fetch_website_content(page_url, domain)
-        
-        # STEP 3: Build positioning summary
-        logger.info(f"📊 [GEMINI] Building positioning summary for {domain}...")
-        positioning_summary = await self._build_positioning_summary(
-            website_content,
-            page_title,
-            page_snippet,
-            domain
-        )
+        # STEP 2 + 3: Website content and positioning summary (stored dossier if given)
+        if dossier is not None:
+            website_content = dossier.site_text
+            positioning_summary = dossier.positioning_summary
+        else:
+            research = await self.build_research(page_url, domain, page_title, page_snippet)
+            website_content = research["site_text"]
+            positioning_summary = research["positioning_summary"]
         
         # STEP 4: Build context for the email
         # Extract business/organization name from page_title
@@ -655,7 +731,7 @@ You MUST return ONLY valid JSON with this exact structure:
 
 Do not include any text before or after the JSON. Return ONLY the JSON object."""
 
-        payload = {
+        return {
             "contents": [{
                 "parts": [{
                     "text": prompt
@@ -669,9 +745,43 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
                 "responseMimeType": "application/json"
             }
         }
+    
+    @instrument("gemini.generate", provider="gemini")
+    async def compose_email(
+        self,
+        domain: str,
+        page_title: Optional[str] = None,
+        page_url: Optional[str] = None,
+        page_snippet: Optional[str] = None,
+        contact_name: Optional[str] = None,
+        category: Optional[str] = None,
+        dossier: Optional["ProspectDossier"] = None
+    ) -> Dict[str, Any]:
+        """
+        Compose an email using Gemini API with Liquid Canvas information.
+        
+        CRITICAL: Reads website content first, builds positioning summary, then generates email.
+        
+        Args:
+            domain: Website domain
+            page_title: Page title (business/organization name)
+            page_url: Page URL
+            page_snippet: Page description/snippet
+            contact_name: Contact name (if available)
+            category: Category of the prospect (e.g., "Museum", "Art Gallery", "Interior Design", etc.)
+            dossier: Stored research for the prospect (services/research_dossier.py);
+                replaces steps 2 and 3
+        
+        Returns:
+            Dictionary with subject and body
+        """
+        url = f"{self.BASE_URL}/models/{self.model}:generateContent?key={self.api_key}"
+        payload = await self.build_compose_request(
+            domain, page_title, page_url, page_snippet, contact_name, category, dossier
+        )
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=60.0) as client:
                 logger.info(f"Calling Gemini API to compose email for domain: {domain}")
                 response = await client.post(url, json=payload)
                 response.raise_for_status()
@@ -741,6 +851,7 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
                 "domain": domain
             }
     
+    @instrument("gemini.generate", provider="gemini")
     async def compose_social_message(
         self,
         platform: str,
@@ -779,7 +890,7 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
         }
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=60.0) as client:
                 logger.info(f"Calling Gemini API to compose {platform} {'follow-up' if is_followup else 'initial'} message")
                 response = await client.post(url, json=payload)
                 response.raise_for_status()
@@ -897,7 +1008,7 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
             "body": body
         }
     
-    async def compose_followup_email(
+    async def build_followup_request(
         self,
         domain: str,
         previous_emails: List[Dict[str, Any]],
@@ -905,29 +1016,13 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
         page_url: Optional[str] = None,
         page_snippet: Optional[str] = None,
         contact_name: Optional[str] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        dossier: Optional["ProspectDossier"] = None
     ) -> Dict[str, Any]:
         """
-        Compose a follow-up email using Gemini API with memory of previous emails
-        
-        Args:
-            domain: Website domain
-            previous_emails: List of previous emails in thread, each with:
-                - subject: str
-                - body: str
-                - sent_at: str (ISO timestamp)
-                - sequence_index: int (0 = initial, 1+ = follow-up)
-            page_title: Page title (business/organization name)
-            page_url: Page URL
-            page_snippet: Page description/snippet
-            contact_name: Contact name (if available)
-            category: Category of the prospect (e.g., "Museum", "Art Gallery", "Interior Design", etc.)
-        
-        Returns:
-            Dictionary with subject and body
+        Build the generateContent request body for compose_followup_email (also
+        used by the streaming compose endpoint). Arguments as for compose_followup_email.
         """
-        url = f"{self.BASE_URL}/models/{self.model}:generateContent?key={self.api_key}"
-        
         # Build context for the email
         # Extract business/organization name from page_title
         business_name = page_title or domain or "Business"
@@ -945,6 +1040,8 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
             context_parts.append(f"Contact Name: {contact_name}")
         if category:
             context_parts.append(f"Category: {category}")
+        if dossier is not None and dossier.positioning_summary:
+            context_parts.append(f"Positioning Summary: {dossier.positioning_summary}")
         
         context = "\n".join(context_parts) if context_parts else f"Website: {domain}"
         
@@ -964,7 +1061,7 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
         previous_emails_text = "\n\n".join(previous_context) if previous_context else "No previous emails"
         followup_count = len(previous_emails)
         
-        # Search for Liquid Canvas information (cache it to avoid repeated searches)
+        # Liquid Canvas information (cached process-wide by _search_liquid_canvas_info)
         liquid_canvas_info = await self._search_liquid_canvas_info()
         
         # Create category-specific context (same logic as compose_email)
@@ -1039,7 +1136,7 @@ You MUST return ONLY valid JSON with this exact structure:
 
 Do not include any text before or after the JSON. Return ONLY the JSON object."""
 
-        payload = {
+        return {
             "contents": [{
                 "parts": [{
                     "text": prompt
@@ -1053,9 +1150,47 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
                 "responseMimeType": "application/json"
             }
         }
+    
+    @instrument("gemini.generate", provider="gemini")
+    async def compose_followup_email(
+        self,
+        domain: str,
+        previous_emails: List[Dict[str, Any]],
+        page_title: Optional[str] = None,
+        page_url: Optional[str] = None,
+        page_snippet: Optional[str] = None,
+        contact_name: Optional[str] = None,
+        category: Optional[str] = None,
+        dossier: Optional["ProspectDossier"] = None
+    ) -> Dict[str, Any]:
+        """
+        Compose a follow-up email using Gemini API with memory of previous emails
+        
+        Args:
+            domain: Website domain
+            previous_emails: List of previous emails in thread, each with:
+                - subject: str
+                - body: str
+                - sent_at: str (ISO timestamp)
+                - sequence_index: int (0 = initial, 1+ = follow-up)
+            page_title: Page title (business/organization name)
+            page_url: Page URL
+            page_snippet: Page description/snippet
+            contact_name: Contact name (if available)
+            category: Category of the prospect (e.g., "Museum", "Art Gallery", "Interior Design", etc.)
+            dossier: Stored research for the prospect; adds its positioning summary
+        
+        Returns:
+            Dictionary with subject and body
+        """
+        url = f"{self.BASE_URL}/models/{self.model}:generateContent?key={self.api_key}"
+        followup_count = len(previous_emails)
+        payload = await self.build_followup_request(
+            domain, previous_emails, page_title, page_url, page_snippet, contact_name, category, dossier
+        )
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=60.0) as client:
                 logger.info(f"Calling Gemini API to compose follow-up email #{followup_count} for domain: {domain}")
                 response = await client.post(url, json=payload)
                 response.raise_for_status()
@@ -1123,6 +1258,7 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
                 "domain": domain
             }
     
+    @instrument("gemini.generate", provider="gemini")
     async def compose_social_message(
         self,
         platform: str,
@@ -1161,7 +1297,7 @@ Do not include any text before or after the JSON. Return ONLY the JSON object.""
         }
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_rate_limiter().limit("gemini"), httpx.AsyncClient(timeout=60.0) as client:
                 logger.info(f"Calling Gemini API to compose {platform} {'follow-up' if is_followup else 'initial'} message")
                 response = await client.post(url, json=payload)
                 response.raise_for_status()
@@ -1,16 +1,20 @@
 """
-Gmail API client for sending emails
+Gmail API client for sending emails and reading mailbox history (reply detection)
 """
 import base64
 import json
+from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, Optional
+from email.utils import make_msgid
+from typing import Dict, Any, List, Optional
 import os
 from dotenv import load_dotenv
 import logging
 import httpx
 
+from app.utils.metrics import instrument, record_provider_retry
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -26,7 +30,9 @@ class GmailClient:
         access_token: Optional[str] = None,
         refresh_token: Optional[str] = None,
         client_id: Optional[str] = None,
-        client_secret: Optional[str] = None
+        client_secret: Optional[str] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Initialize Gmail client
@@ -36,11 +42,17 @@ class GmailClient:
             refresh_token: OAuth2 refresh token (if None, uses GMAIL_REFRESH_TOKEN from env)
             client_id: OAuth2 client ID (if None, uses GMAIL_CLIENT_ID from env)
             client_secret: OAuth2 client secret (if None, uses GMAIL_CLIENT_SECRET from env)
+            base_url: Gmail API root (if None, uses GMAIL_API_BASE_URL from env or the public API)
+            transport: Optional httpx transport (e.g. a fake Gmail server in tests)
         """
         self.access_token = access_token or os.getenv("GMAIL_ACCESS_TOKEN")
         self.refresh_token = refresh_token or os.getenv("GMAIL_REFRESH_TOKEN")
         self.client_id = client_id or os.getenv("GMAIL_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("GMAIL_CLIENT_SECRET")
+        self.BASE_URL = (base_url or os.getenv("GMAIL_API_BASE_URL") or self.BASE_URL).rstrip("/")
+        # Media upload endpoint: takes the RFC 822 message as-is instead of base64 inside JSON
+        self.UPLOAD_URL = self.BASE_URL.replace("/gmail/v1", "/upload/gmail/v1", 1)
+        self.transport = transport
         
         if not self.access_token and not self.refresh_token:
             raise ValueError("Gmail credentials not configured. Set GMAIL_ACCESS_TOKEN or GMAIL_REFRESH_TOKEN")
@@ -113,12 +125,14 @@ class GmailClient:
             logger.error(f"Failed to refresh Gmail access token: {str(e)}", exc_info=True)
             return False
     
+    @instrument("send", provider="gmail")
     async def send_email(
         self,
         to_email: str,
         subject: str,
         body: str,
-        from_email: Optional[str] = None
+        from_email: Optional[str] = None,
+        attachments: Optional[List[MIMEBase]] = None
     ) -> Dict[str, Any]:
         """
         Send an email via Gmail API
@@ -128,6 +142,7 @@ class GmailClient:
             subject: Email subject
             body: Email body (plain text)
             from_email: Sender email (if None, uses authenticated user's email)
+            attachments: Ready MIME parts (see services/attachment_store.py)
         
         Returns:
             Dictionary with send result
@@ -158,35 +173,44 @@ class GmailClient:
         message["subject"] = subject
         if from_email:
             message["from"] = from_email
+        # Our own Message-ID, so replies can be matched by In-Reply-To / References
+        message_id_header = make_msgid(domain=from_email.split("@")[-1] if from_email else None)
+        message["Message-ID"] = message_id_header
         
         # Add body
         message.attach(MIMEText(body, "plain"))
+        for part in attachments or []:
+            message.attach(part)
         
-        # Encode message
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        url = f"{self.BASE_URL}/users/me/messages/send"
-        
-        payload = {
-            "raw": raw_message
-        }
+        if attachments:
+            # Attachments are already base64 in the MIME parts; upload the message
+            # as-is rather than base64-encoding it a second time inside JSON
+            url = f"{self.UPLOAD_URL}/users/me/messages/send"
+            request_kwargs = {"params": {"uploadType": "media"}, "content": message.as_bytes()}
+            content_type = "message/rfc822"
+        else:
+            url = f"{self.BASE_URL}/users/me/messages/send"
+            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+            request_kwargs = {"json": {"raw": raw_message}}
+            content_type = "application/json"
         
         headers = {
             "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
+            "Content-Type": content_type
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=self.transport) as client:
                 logger.info(f"Sending email via Gmail API to: {to_email}")
-                response = await client.post(url, headers=headers, json=payload)
+                response = await client.post(url, headers=headers, **request_kwargs)
                 
                 # If unauthorized, try refreshing token
                 if response.status_code == 401:
                     logger.warning("Gmail API returned 401, attempting token refresh")
+                    record_provider_retry("gmail")
                     if await self.refresh_access_token():
                         headers["Authorization"] = f"Bearer {self.access_token}"
-                        response = await client.post(url, headers=headers, json=payload)
+                        response = await client.post(url, headers=headers, **request_kwargs)
                 
                 response.raise_for_status()
                 result = response.json()
@@ -198,6 +222,7 @@ class GmailClient:
                     "success": True,
                     "message_id": message_id,
                     "thread_id": result.get("threadId"),
+                    "message_id_header": message_id_header,
                     "raw_response": result
                 }
         
@@ -252,7 +277,7 @@ class GmailClient:
         headers = {"Authorization": f"Bearer {self.access_token}"}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=self.transport) as client:
                 response = await client.get(url, headers=headers)
                 response.raise_for_status()
                 return {
@@ -263,3 +288,77 @@ class GmailClient:
             logger.error(f"Failed to get Gmail profile: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """
+        Authorized GET against the Gmail API, refreshing the token once on 401.
+
+        Raises:
+            ValueError: No access token could be obtained
+            httpx.HTTPStatusError: Non-2xx response (callers check 404 for expired history)
+        """
+        if not self.access_token and not await self.refresh_access_token():
+            raise ValueError("Failed to obtain Gmail access token")
+
+        url = f"{self.BASE_URL}{path}"
+        async with httpx.AsyncClient(timeout=30.0, transport=self.transport) as client:
+            response = await client.get(url, headers={"Authorization": f"Bearer {self.access_token}"}, params=params)
+            if response.status_code == 401:
+                logger.warning("Gmail API returned 401, attempting token refresh")
+                record_provider_retry("gmail")
+                if await self.refresh_access_token():
+                    response = await client.get(
+                        url, headers={"Authorization": f"Bearer {self.access_token}"}, params=params
+                    )
+            response.raise_for_status()
+            return response
+
+    async def list_history(
+        self,
+        start_history_id: str,
+        page_token: Optional[str] = None,
+        history_types: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of mailbox changes after start_history_id (users.history.list)
+
+        Returns:
+            Raw API response: history records, nextPageToken, historyId
+
+        Raises:
+            httpx.HTTPStatusError: 404 when start_history_id is too old and a full sync is needed
+        """
+        params: Dict[str, Any] = {"startHistoryId": start_history_id, "maxResults": 500}
+        if history_types:
+            params["historyTypes"] = history_types
+        if page_token:
+            params["pageToken"] = page_token
+        response = await self._get("/users/me/history", params)
+        return response.json()
+
+    async def list_messages(self, query: str, page_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of message ids matching a Gmail search query (users.messages.list)
+
+        Returns:
+            Raw API response: messages [{id, threadId}], nextPageToken
+        """
+        params: Dict[str, Any] = {"q": query, "maxResults": 500}
+        if page_token:
+            params["pageToken"] = page_token
+        response = await self._get("/users/me/messages", params)
+        return response.json()
+
+    async def get_message_headers(self, message_id: str, header_names: List[str]) -> Dict[str, str]:
+        """
+        Selected headers of a message, without fetching its body (format=metadata)
+
+        Returns:
+            {header name (lowercase): value}
+        """
+        response = await self._get(
+            f"/users/me/messages/{message_id}",
+            {"format": "metadata", "metadataHeaders": header_names},
+        )
+        headers = (response.json().get("payload") or {}).get("headers") or []
+        return {h.get("name", "").lower(): h.get("value", "") for h in headers}
+
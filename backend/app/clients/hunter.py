@@ -9,6 +9,8 @@ import logging
 import json
 
 from app.services.exceptions import RateLimitError
+from app.utils.metrics import instrument
+from app.utils.rate_limiter import get_rate_limiter
 
 load_dotenv()
 
@@ -36,6 +38,49 @@ class HunterIOClient:
         """Check if client is properly configured"""
         return bool(self.api_key and self.api_key.strip())
     
+    def _rate_limit_error(self, response: httpx.Response, domain: str) -> RateLimitError:
+        """Build the RateLimitError for a 429 from the JSON error body (restricted_account vs too_many_requests)"""
+        logger.error(f"Hunter.io API HTTP error for {domain}: 429 - {response.text}")
+        logger.warning(f"⚠️  [HUNTER] Rate limit (429) detected for {domain}")
+        try:
+            error_body = response.json()
+        except json.JSONDecodeError:
+            # Can't parse JSON, generic rate limit error
+            return RateLimitError(
+                provider="hunter",
+                message="Hunter.io rate limit exceeded",
+                retry_after=60,
+                error_id="too_many_requests"
+            )
+        errors = error_body.get("errors", []) if isinstance(error_body, dict) else []
+        error_id = None
+        details = None
+        
+        if errors and isinstance(errors, list) and len(errors) > 0:
+            first_error = errors[0] if isinstance(errors[0], dict) else {}
+            error_id = first_error.get("id", "")
+            details = first_error.get("details", "")
+        
+        # Check for restricted_account error
+        if error_id == "restricted_account" or (details and "restricted" in details.lower()):
+            logger.error(f"🚫 [HUNTER] Account restricted for {domain}: {details}")
+            return RateLimitError(
+                provider="hunter",
+                message=f"Hunter.io account restricted: {details or 'Account access restricted'}",
+                retry_after=3600,  # Default 1 hour
+                error_id="restricted_account",
+                details=details
+            )
+        # Regular rate limit
+        return RateLimitError(
+            provider="hunter",
+            message=f"Hunter.io rate limit exceeded: {details or 'Too many requests'}",
+            retry_after=60,  # Default 1 minute for regular rate limits
+            error_id=error_id or "too_many_requests",
+            details=details
+        )
+    
+    @instrument("hunter.domain_search", provider="hunter")
     async def domain_search(
         self,
         domain: str,
@@ -65,9 +110,12 @@ class HunterIOClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("hunter"), httpx.AsyncClient(timeout=30.0) as client:
                 logger.info(f"Calling Hunter.io API for domain: {domain} (limit={effective_limit})")
                 response = await client.get(url, params=params)
+                if response.status_code == 429:
+                    # Raised inside the limiter block so the restriction reaches ProviderState
+                    raise self._rate_limit_error(response, domain)
                 response.raise_for_status()
                 result = response.json()
                 
@@ -119,56 +167,12 @@ class HunterIOClient:
                         "message": error_msg
                     }
         
+        except RateLimitError:
+            raise
         except httpx.HTTPStatusError as e:
             status_code = e.response.status_code
             logger.error(f"Hunter.io API HTTP error for {domain}: {status_code} - {e.response.text}")
             
-            # Detect 429 rate limit - parse JSON body for error details and raise RateLimitError
-            if status_code == 429:
-                logger.warning(f"⚠️  [HUNTER] Rate limit (429) detected for {domain}")
-                try:
-                    error_body = e.response.json()
-                    errors = error_body.get("errors", [])
-                    error_id = None
-                    details = None
-                    retry_after = None
-                    
-                    if errors and isinstance(errors, list) and len(errors) > 0:
-                        first_error = errors[0] if isinstance(errors[0], dict) else {}
-                        error_id = first_error.get("id", "")
-                        details = first_error.get("details", "")
-                    
-                    # Check for restricted_account error
-                    if error_id == "restricted_account" or (details and "restricted" in details.lower()):
-                        logger.error(f"🚫 [HUNTER] Account restricted for {domain}: {details}")
-                        raise RateLimitError(
-                            provider="hunter",
-                            message=f"Hunter.io account restricted: {details or 'Account access restricted'}",
-                            retry_after=3600,  # Default 1 hour
-                            error_id="restricted_account",
-                            details=details
-                        )
-                    else:
-                        # Regular rate limit
-                        raise RateLimitError(
-                            provider="hunter",
-                            message=f"Hunter.io rate limit exceeded: {details or 'Too many requests'}",
-                            retry_after=60,  # Default 1 minute for regular rate limits
-                            error_id=error_id or "too_many_requests",
-                            details=details
-                        )
-                except json.JSONDecodeError:
-                    # Can't parse JSON, raise generic rate limit error
-                    raise RateLimitError(
-                        provider="hunter",
-                        message="Hunter.io rate limit exceeded",
-                        retry_after=60,
-                        error_id="too_many_requests"
-                    )
-                except RateLimitError:
-                    # Re-raise our custom exception
-                    raise
-            
             return {
                 "success": False,
                 "error": f"HTTP {status_code}: {e.response.text}",
@@ -182,6 +186,7 @@ class HunterIOClient:
                 "domain": domain
             }
     
+    @instrument("hunter.email_verifier", provider="hunter")
     async def email_verifier(
         self,
         email: str
@@ -203,7 +208,7 @@ class HunterIOClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("hunter"), httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 result = response.json()
@@ -233,6 +238,7 @@ class HunterIOClient:
                 "email": email
             }
     
+    @instrument("hunter.email_finder", provider="hunter")
     async def email_finder(
         self,
         domain: str,
@@ -263,7 +269,7 @@ class HunterIOClient:
             params["last_name"] = last_name
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("hunter"), httpx.AsyncClient(timeout=30.0) as client:
                 logger.info(f"Calling Hunter.io email-finder for {domain} (name: {first_name} {last_name})")
                 response = await client.get(url, params=params)
                 response.raise_for_status()
@@ -310,6 +316,7 @@ class HunterIOClient:
                 "domain": domain
             }
     
+    @instrument("hunter.company_enrichment", provider="hunter")
     async def company_enrichment(
         self,
         domain: str
@@ -331,7 +338,7 @@ class HunterIOClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("hunter"), httpx.AsyncClient(timeout=30.0) as client:
                 logger.info(f"Calling Hunter.io company enrichment for {domain}")
                 response = await client.get(url, params=params)
                 response.raise_for_status()
@@ -401,7 +408,7 @@ class HunterIOClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("hunter"), httpx.AsyncClient(timeout=30.0) as client:
                 logger.info(f"Calling Hunter.io combined enrichment for {email}")
                 response = await client.get(url, params=params)
                 response.raise_for_status()
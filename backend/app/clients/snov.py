@@ -10,6 +10,8 @@ import json
 import base64
 
 from app.services.exceptions import RateLimitError
+from app.utils.metrics import instrument
+from app.utils.rate_limiter import get_rate_limiter
 
 load_dotenv()
 
@@ -127,6 +129,7 @@ class SnovIOClient:
             logger.error(f"Snov.io token request failed: {str(e)}", exc_info=True)
             raise Exception(f"Failed to get Snov.io access token: {str(e)}")
     
+    @instrument("snov.domain_search", provider="snov")
     async def domain_search(
         self,
         domain: str,
@@ -207,6 +210,7 @@ class SnovIOClient:
             ]
             
             last_error = None
+            limiter = get_rate_limiter()
             async with httpx.AsyncClient(timeout=30.0) as client:
                 for endpoint_config in endpoints_to_try:
                     method = endpoint_config["method"]
@@ -216,33 +220,38 @@ class SnovIOClient:
                     body = endpoint_config["body"]
                     url = f"{self.BASE_URL}{endpoint}"
                     try:
-                        auth_method = 'Bearer token' if 'Authorization' in req_headers else 'access_token param'
-                        logger.info(f"Calling Snov.io API for domain: {domain} using {method} {endpoint} with {auth_method}")
+                        # One token per HTTP request: each endpoint attempt counts against the quota
+                        async with limiter.limit("snov"):
+                            auth_method = 'Bearer token' if 'Authorization' in req_headers else 'access_token param'
+                            logger.info(f"Calling Snov.io API for domain: {domain} using {method} {endpoint} with {auth_method}")
                         
-                        if method == "POST":
-                            response = await client.post(url, params=params, headers=req_headers, json=body)
-                        else:
-                            response = await client.get(url, params=params, headers=req_headers)
+                            if method == "POST":
+                                response = await client.post(url, params=params, headers=req_headers, json=body)
+                            else:
+                                response = await client.get(url, params=params, headers=req_headers)
                         
-                        # If 404, try next endpoint
-                        if response.status_code == 404:
-                            error_body = response.text[:200] if response.text else ""
-                            logger.debug(f"Snov.io endpoint {endpoint} returned 404: {error_body}, trying next method...")
-                            last_error = f"HTTP 404: {error_body}"
-                            continue
+                            # If 404, try next endpoint
+                            if response.status_code == 404:
+                                error_body = response.text[:200] if response.text else ""
+                                logger.debug(f"Snov.io endpoint {endpoint} returned 404: {error_body}, trying next method...")
+                                last_error = f"HTTP 404: {error_body}"
+                                continue
                         
-                        # If 401, authentication issue - try different auth method
-                        if response.status_code == 401:
-                            error_body = response.text[:200] if response.text else ""
-                            logger.debug(f"Snov.io endpoint {endpoint} returned 401 (auth failed): {error_body}, trying different auth method...")
-                            last_error = f"HTTP 401: {error_body}"
-                            continue
+                            # If 401, authentication issue - try different auth method
+                            if response.status_code == 401:
+                                error_body = response.text[:200] if response.text else ""
+                                logger.debug(f"Snov.io endpoint {endpoint} returned 401 (auth failed): {error_body}, trying different auth method...")
+                                last_error = f"HTTP 401: {error_body}"
+                                continue
                         
-                        response.raise_for_status()
-                        result = response.json()
+                            response.raise_for_status()
+                            result = response.json()
                         logger.info(f"✅ Snov.io API call successful for {domain} using endpoint: {endpoint}")
                         break  # Success, exit loop
                     except httpx.HTTPStatusError as e:
+                        if e.response.status_code == 429:
+                            # The endpoints share one quota - stop and surface the rate limit
+                            raise
                         if e.response.status_code == 404:
                             error_body = e.response.text[:200] if e.response.text else ""
                             logger.debug(f"Snov.io endpoint {endpoint} returned 404: {error_body}, trying next method...")
@@ -371,6 +380,7 @@ class SnovIOClient:
                 "domain": domain
             }
     
+    @instrument("snov.email_verifier", provider="snov")
     async def email_verifier(
         self,
         email: str
@@ -394,7 +404,7 @@ class SnovIOClient:
                 "access_token": access_token
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("snov"), httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 result = response.json()
@@ -434,6 +444,107 @@ class SnovIOClient:
                 "email": email
             }
     
+    # Emails per add-emails-to-verification / get-emails-verification-status call (API limit)
+    VERIFY_CHUNK_SIZE = 10
+    
+    # smtpStatus -> Hunter.io-compatible result (as in email_verifier)
+    SMTP_STATUS_MAP = {
+        "valid": "deliverable",
+        "not_valid": "undeliverable",
+        "unknown": "unknown",
+        "catch_all": "risky",
+        "greylisted": "risky",
+    }
+    
+    def _raise_for_rate_limit(self, e: httpx.HTTPStatusError) -> None:
+        if e.response.status_code == 429:
+            retry_after = e.response.headers.get("Retry-After")
+            raise RateLimitError(
+                provider="snov",
+                message="Snov.io rate limit exceeded",
+                retry_after=int(retry_after) if retry_after and retry_after.isdigit() else 60,
+                error_id="too_many_requests",
+            )
+    
+    @instrument("snov.add_emails_to_verification", provider="snov")
+    async def add_emails_to_verification(self, emails: List[str]) -> Dict[str, Any]:
+        """
+        Queue up to VERIFY_CHUNK_SIZE emails for Snov.io's bulk email verifier.
+        
+        Results are read later with get_emails_verification_status().
+        
+        Returns:
+            {"success": bool, "emails": [...], "raw_response" | "error"}
+        """
+        try:
+            access_token = await self._get_access_token()
+            async with get_rate_limiter().limit("snov"), httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(
+                    f"{self.BASE_URL}/add-emails-to-verification",
+                    headers={"Authorization": f"Bearer {access_token}"},
+                    data={"emails[]": list(emails)},
+                )
+                response.raise_for_status()
+                result = response.json()
+            return {"success": bool(result.get("success", True)), "emails": list(emails), "raw_response": result}
+        except httpx.HTTPStatusError as e:
+            self._raise_for_rate_limit(e)
+            logger.error(f"Snov.io add-emails-to-verification failed: HTTP {e.response.status_code}")
+            return {"success": False, "emails": list(emails), "error": f"HTTP {e.response.status_code}: {e.response.text}"}
+        except RateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Snov.io add-emails-to-verification failed: {str(e)}")
+            return {"success": False, "emails": list(emails), "error": str(e)}
+    
+    @instrument("snov.get_emails_verification_status", provider="snov")
+    async def get_emails_verification_status(self, emails: List[str]) -> Dict[str, Any]:
+        """
+        Results of emails queued with add_emails_to_verification().
+        
+        Returns:
+            {"success": bool, "results": {email: {"complete": bool, "result": deliverable |
+             undeliverable | risky | unknown | None, "smtp_status": str | None, "raw": {...}}}}
+        """
+        try:
+            access_token = await self._get_access_token()
+            async with get_rate_limiter().limit("snov"), httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.get(
+                    f"{self.BASE_URL}/get-emails-verification-status",
+                    headers={"Authorization": f"Bearer {access_token}"},
+                    params={"emails[]": list(emails)},
+                )
+                response.raise_for_status()
+                result = response.json()
+        except httpx.HTTPStatusError as e:
+            self._raise_for_rate_limit(e)
+            logger.error(f"Snov.io get-emails-verification-status failed: HTTP {e.response.status_code}")
+            return {"success": False, "results": {}, "error": f"HTTP {e.response.status_code}: {e.response.text}"}
+        except RateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Snov.io get-emails-verification-status failed: {str(e)}")
+            return {"success": False, "results": {}, "error": str(e)}
+        
+        # One entry per email: {"status": {"identifier": "complete" | "in_progress" | ...}, "data": {...}}
+        results = {}
+        for email in emails:
+            entry = result.get(email)
+            if not isinstance(entry, dict):
+                continue
+            status = entry.get("status") or {}
+            data = entry.get("data") or {}
+            complete = status.get("identifier") == "complete"
+            smtp_status = data.get("smtpStatus")
+            results[email] = {
+                "complete": complete,
+                "result": self.SMTP_STATUS_MAP.get(smtp_status, "unknown") if complete else None,
+                "smtp_status": smtp_status,
+                "raw": entry,
+            }
+        return {"success": bool(result.get("success", True)), "results": results}
+    
+    @instrument("snov.email_finder", provider="snov")
     async def email_finder(
         self,
         domain: str,
@@ -466,7 +577,7 @@ class SnovIOClient:
             if last_name:
                 params["lastName"] = last_name
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with get_rate_limiter().limit("snov"), httpx.AsyncClient(timeout=30.0) as client:
                 logger.info(f"Calling Snov.io email-finder for {domain} (name: {first_name} {last_name})")
                 response = await client.get(url, params=params)
                 response.raise_for_status()
@@ -4,16 +4,20 @@ Database configuration and session management
 ISOLATED: Engine creation is lazy to prevent conflicts with Alembic imports.
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from sqlalchemy import event
+from sqlalchemy.orm import Session, declarative_base
+from typing import AsyncGenerator, Tuple
 import os
 import sys
+import time
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except Exception:
     pass  # Continue without .env if it has issues
 import logging
+from app.utils.latency import record_latency, timed
+from app.utils.metrics import METRICS_ENABLED, observe_stage
 
 logger = logging.getLogger(__name__)
 
@@ -258,6 +262,20 @@ if "@" in DATABASE_URL:
 _engine_instance = None
 _engine_lock = None
 
+# Connection liveness is handled by age, not by a SELECT 1 ping on every checkout:
+# connections older than DB_POOL_RECYCLE seconds are replaced when checked out, and
+# the pool hands out the most recently returned connection first (LIFO) so surplus
+# idle connections age out instead of being reused after the pooler dropped them.
+# A connection that still turns out dead invalidates the pool on the error.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+
+POOL_OPTIONS = dict(
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_use_lifo=True,
+)
+
 def get_engine():
     """Get the single async engine instance (public API)"""
     return _get_engine()
@@ -510,11 +528,11 @@ def _get_engine():
                     DATABASE_URL,
                     echo=False,
                     future=True,
-                    pool_pre_ping=True,
                     pool_size=10,
                     max_overflow=20,
                     pool_timeout=30,  # Wait up to 30s for connection from pool
-                    connect_args=connect_args
+                    connect_args=connect_args,
+                    **POOL_OPTIONS
                 )
                 logger.info("✅ Async engine created successfully")
     return _engine_instance
@@ -581,21 +599,43 @@ else:
 Base = declarative_base()
 
 
+# "db.commit" pipeline stage: final flush + COMMIT of every session
+if METRICS_ENABLED:
+    @event.listens_for(Session, "before_commit")
+    def _commit_started(session):
+        session.info["commit_started"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_commit")
+    def _commit_finished(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            observe_stage("db.commit", time.perf_counter() - started)
+
+    @event.listens_for(Session, "after_rollback")
+    def _commit_failed(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            observe_stage("db.commit", time.perf_counter() - started, failed=True)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session
     """
+    started = time.perf_counter()
     try:
         async with AsyncSessionLocal() as session:
             try:
                 yield session
-                await session.commit()
+                with timed("db.get_db.teardown"):
+                    await session.commit()
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Database session error: {e}", exc_info=True)
                 raise
             finally:
                 await session.close()
+                record_latency("db.get_db.session", time.perf_counter() - started)
     except Exception as e:
         logger.error(f"Failed to create database session: {e}", exc_info=True)
         logger.error(f"DATABASE_URL is set: {bool(os.getenv('DATABASE_URL'))}")
@@ -610,6 +650,97 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         raise
 
 
+# ============================================
+# Read-only sessions (list / status / export endpoints)
+# ============================================
+
+def _prepare_read_url(raw_url: str) -> Tuple[str, bool]:
+    """Same normalization as DATABASE_URL: asyncpg scheme, encoded password, no sslmode/pgbouncer params"""
+    for prefix in ("postgresql://", "postgres://"):
+        if raw_url.startswith(prefix):
+            raw_url = raw_url.replace(prefix, "postgresql+asyncpg://", 1)
+            break
+    url = encode_password_in_url(raw_url)
+    needs_ssl = False
+    if "?" in url:
+        base, query_string = url.split("?", 1)
+        needs_ssl = "sslmode=require" in query_string.lower()
+        params = [
+            p for p in query_string.split("&")
+            if not p.lower().startswith(("sslmode=", "pgbouncer="))
+        ]
+        url = f"{base}?{'&'.join(params)}" if params else base
+    return url, needs_ssl
+
+
+_read_session_factory_instance = None
+
+
+def _get_read_engine():
+    """
+    Engine for read-only sessions.
+
+    With DATABASE_READ_URL set (a read replica) reads get their own pool there;
+    otherwise they share the primary engine's pool.
+    """
+    raw_read_url = os.getenv("DATABASE_READ_URL")
+    if not raw_read_url:
+        return _get_engine()
+
+    read_url, needs_ssl = _prepare_read_url(raw_read_url)
+    connect_args = {}
+    if ".supabase.co" in read_url or needs_ssl:
+        import ssl
+        connect_args["ssl"] = ssl.create_default_context()
+    is_pooler = ":6543" in read_url or "pgbouncer=" in raw_read_url.lower()
+    connect_args["timeout"] = 30 if is_pooler else 20
+    logger.info(f"🔗 Read-only sessions use the replica at {read_url.split('@')[-1].split('/')[0]}")
+    return create_async_engine(
+        read_url,
+        echo=False,
+        future=True,
+        pool_size=int(os.getenv("DB_READ_POOL_SIZE", "10")),
+        max_overflow=20,
+        pool_timeout=30,
+        connect_args=connect_args,
+        **POOL_OPTIONS
+    )
+
+
+def _get_read_session_factory():
+    global _read_session_factory_instance
+    if _read_session_factory_instance is None:
+        # postgresql_readonly makes asyncpg open the transaction as BEGIN READ ONLY
+        # (the equivalent of SET TRANSACTION READ ONLY, without an extra round-trip)
+        read_engine = _get_read_engine().execution_options(postgresql_readonly=True)
+        _read_session_factory_instance = async_sessionmaker(
+            read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False
+        )
+    return _read_session_factory_instance
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only endpoints (lists, status, exports)
+
+    The transaction is READ ONLY (writes fail loudly), there is no flush or
+    COMMIT at the end - closing the session just ends the transaction - and
+    with DATABASE_READ_URL set the queries go to the read replica.
+    """
+    started = time.perf_counter()
+    async with _get_read_session_factory()() as session:
+        try:
+            yield session
+        finally:
+            with timed("db.get_read_db.teardown"):
+                await session.close()
+            record_latency("db.get_read_db.session", time.perf_counter() - started)
+
+
 async def test_connection() -> bool:
     """
     Test database connection by running SELECT 1.
@@ -31,12 +31,8 @@ PROSPECT_CORE_COLUMNS = [
     "discovery_category",
     "discovery_location",
     "discovery_keywords",
-    "scrape_payload",
     "scrape_source_url",
     "verification_confidence",
-    "verification_payload",
-    "dataforseo_payload",
-    "snov_payload",
     "serp_intent",
     "serp_confidence",
     "serp_signals",
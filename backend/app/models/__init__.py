@@ -8,12 +8,15 @@ from app.models.settings import Settings
 from app.models.email_attachment import EmailAttachment
 from app.models.discovery_query import DiscoveryQuery
 from app.models.scraper_history import ScraperHistory
+from app.models.prospect_dossier import ProspectDossier
+from app.models.prospect_payload import ProspectPayload
 # Import social outreach models (separate system, but need to be in metadata)
 from app.models.social import SocialProfile, SocialDiscoveryJob, SocialDraft, SocialMessage
 from app.models.social_integration import SocialIntegration, Platform, ConnectionStatus
 
 __all__ = [
     "Prospect", "Job", "EmailLog", "Settings", "DiscoveryQuery", "ScraperHistory", "EmailAttachment",
+    "ProspectDossier", "ProspectPayload",
     "SocialProfile", "SocialDiscoveryJob", "SocialDraft", "SocialMessage",
     "SocialIntegration", "Platform", "ConnectionStatus"
 ]
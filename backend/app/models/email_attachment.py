@@ -19,5 +19,7 @@ class EmailAttachment(Base):
     content_type = Column(String, nullable=False)
     size_bytes = Column(Integer, nullable=False)
     scope = Column(String, nullable=False, server_default="global")  # global or prospect
-    data = Column(LargeBinary, nullable=False)
+    # sha256 of the content; the bytes live in the attachment blob store (services/attachment_store.py)
+    content_hash = Column(String(64), nullable=True, index=True)
+    data = Column(LargeBinary, nullable=True)  # legacy rows only, moved to the blob store on first send
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
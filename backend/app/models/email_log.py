@@ -18,6 +18,10 @@ class EmailLog(Base):
     subject = Column(Text)
     body = Column(Text)
     response = Column(JSON)  # Gmail API response
+    # Ids used to match replies (see services/reply_sync.py)
+    gmail_thread_id = Column(String, nullable=True, index=True)
+    gmail_message_id = Column(String, nullable=True)
+    message_id_header = Column(String, nullable=True, index=True)  # RFC 822 Message-ID we sent
     sent_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationship
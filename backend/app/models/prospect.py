@@ -2,7 +2,7 @@
 Prospect model - stores discovered websites and their contact information
 STRICT PIPELINE: Each step has explicit status tracking
 """
-from sqlalchemy import Column, String, Text, Numeric, Integer, DateTime, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, Numeric, Integer, DateTime, JSON, ForeignKey, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -70,6 +70,36 @@ class ProspectStage(str, Enum):
 class Prospect(Base):
     """Prospect model for storing discovered websites and contacts"""
     __tablename__ = "prospects"
+    # Composite/partial indexes for the pipeline's hot predicates (migration:
+    # add_prospect_pipeline_indexes). Website queries filter on
+    # "source_type = 'website' OR source_type IS NULL", so source_type leads
+    # and each branch of the OR becomes one index range.
+    __table_args__ = (
+        # Scrape queue + discovered / scrape-ready counts
+        Index('ix_prospects_scrape_queue', 'source_type', 'discovery_status', 'scrape_status', 'approval_status'),
+        # Leads / scraped lists: scrape_status IN (...) ORDER BY created_at DESC
+        Index('ix_prospects_source_scrape_created', 'source_type', 'scrape_status', text('created_at DESC')),
+        # Verification queue: email present, not yet verified
+        Index(
+            'ix_prospects_verify_queue', 'source_type', 'scrape_status', 'created_at',
+            postgresql_where=text("contact_email IS NOT NULL AND verification_status <> 'verified'"),
+        ),
+        # Send queue: verified + drafted, not yet sent
+        Index(
+            'ix_prospects_send_queue', 'verification_status', 'created_at',
+            postgresql_where=text("contact_email IS NOT NULL AND send_status <> 'sent'"),
+        ),
+        # Approval counts + social scraping queue
+        Index('ix_prospects_source_approval', 'source_type', 'approval_status', 'scrape_status'),
+        # Stage tabs / counts
+        Index('ix_prospects_source_stage_created', 'source_type', 'stage', text('created_at DESC')),
+        # Default prospect list: ORDER BY created_at DESC per source
+        Index('ix_prospects_source_created', 'source_type', text('created_at DESC')),
+        # Unfiltered prospect list: ORDER BY score DESC, created_at DESC
+        Index('ix_prospects_score_created', text('score DESC'), text('created_at DESC')),
+        # Case-insensitive domain lookups (deduplication)
+        Index('ix_prospects_domain_lower', text('lower(domain)')),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     domain = Column(String, nullable=False, index=True)
@@ -154,16 +184,15 @@ class Prospect(Base):
     discovery_keywords = Column(Text)  # Keywords from discovery
     
     # Scraping metadata
-    scrape_payload = Column(JSON)  # Emails found during scraping: {url: [emails]}
     scrape_source_url = Column(Text)  # URL where email was found
+    dns_status = Column(String, nullable=True)  # DNS preflight: ok, no_mx, no_address, nxdomain, unresolved
+    dns_checked_at = Column(DateTime(timezone=True), nullable=True)
     
     # Verification metadata
     verification_confidence = Column(Numeric(5, 2))  # Confidence score from Snov
-    verification_payload = Column(JSON)  # Raw verification response
     
-    # Raw API responses (kept for backward compatibility)
-    dataforseo_payload = Column(JSON)  # Raw DataForSEO response
-    snov_payload = Column(JSON)  # Raw Snov.io response
+    # Raw provider payloads (DataForSEO, Snov.io, scraping, verification) live in
+    # prospect_payloads - see models/prospect_payload.py and services/prospect_payloads.py
     
     # SERP intent (from previous implementation)
     serp_intent = Column(String)  # SERP intent: service, brand, blog, media, marketplace, platform, unknown
@@ -192,6 +221,10 @@ class Prospect(Base):
     
     # Relationships - lazy load to avoid errors if column doesn't exist yet
     discovery_query = relationship("DiscoveryQuery", back_populates="prospects", lazy="select")
+    # Never loaded implicitly; new prospects may be created with payloads=ProspectPayload(...)
+    payloads = relationship(
+        "ProspectPayload", back_populates="prospect", uselist=False, lazy="raise", passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<Prospect(id={self.id}, domain={self.domain}, discovery={self.discovery_status}, approval={self.approval_status})>"
@@ -0,0 +1,29 @@
+"""
+Prospect research dossier - cached research used by drafting and chat
+"""
+import uuid
+from sqlalchemy import Column, String, Text, Integer, DateTime, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ProspectDossier(Base):
+    """Cleaned site text, positioning summary and key facts for one prospect (services/research_dossier.py)"""
+
+    __tablename__ = "prospect_dossiers"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    prospect_id = Column(
+        UUID(as_uuid=True), ForeignKey("prospects.id", ondelete="CASCADE"), nullable=False, unique=True, index=True
+    )
+    version = Column(Integer, nullable=False)  # DOSSIER_VERSION it was built with; older versions are rebuilt
+    source_url = Column(String, nullable=True)  # page the site text was fetched from
+    site_text = Column(Text, nullable=True)  # None if the site could not be fetched
+    positioning_summary = Column(Text, nullable=False)
+    key_facts = Column(JSON, nullable=True)
+    built_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ProspectDossier(prospect_id={self.prospect_id}, version={self.version}, expires_at={self.expires_at})>"
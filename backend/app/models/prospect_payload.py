@@ -0,0 +1,31 @@
+"""
+Prospect payloads - raw provider responses kept out of the hot prospects row
+"""
+from sqlalchemy import Column, DateTime, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+
+class ProspectPayload(Base):
+    """
+    Raw DataForSEO / Snov.io / scraping / verification payloads of one prospect.
+
+    Read and written through services/prospect_payloads.py; a select(Prospect)
+    never loads them (Prospect.payloads is lazy="raise").
+    """
+
+    __tablename__ = "prospect_payloads"
+
+    prospect_id = Column(UUID(as_uuid=True), ForeignKey("prospects.id", ondelete="CASCADE"), primary_key=True)
+    dataforseo_payload = Column(JSON)  # Raw DataForSEO response
+    snov_payload = Column(JSON)  # Raw Snov.io response / full enrichment result
+    scrape_payload = Column(JSON)  # Emails found during scraping: {url: [emails]}
+    verification_payload = Column(JSON)  # Raw verification response
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    prospect = relationship("Prospect", back_populates="payloads")
+
+    def __repr__(self):
+        return f"<ProspectPayload(prospect_id={self.prospect_id})>"
@@ -35,18 +35,11 @@ def schedule_followups():
     #     logger.warning("Followup task not yet implemented")
 
 
-def schedule_reply_check():
-    """Schedule reply check job"""
-    # TODO: Implement reply handler in backend/app/tasks/reply_handler.py
-    logger.warning("Reply handler not yet implemented in backend - scheduler job skipped")
-    # When implemented, use asyncio.create_task() like other tasks:
-    # try:
-    #     from app.tasks.reply_handler import process_reply_check_job
-    #     import asyncio
-    #     asyncio.create_task(process_reply_check_job())
-    #     logger.info("Scheduled reply check job")
-    # except ImportError:
-    #     logger.warning("Reply handler not yet implemented")
+async def schedule_reply_check():
+    """Run the incremental reply check (safety net for missed Gmail push notifications)"""
+    from app.tasks.reply_handler import process_reply_check_job
+    result = await process_reply_check_job()
+    logger.info(f"Reply check finished: {result}")
 
 
 async def check_and_run_scraper():
@@ -315,20 +308,47 @@ def start_scheduler():
         name="Daily Follow-up Emails"
     )
     
-    # Schedule reply checks every 6 hours
+    _add_reply_check_job()
+    
+    if not scheduler.running:
+        scheduler.start()
+    logger.info("Scheduler started (includes automatic scraper check every minute)")
+
+
+def _add_reply_check_job():
+    # Reply checks only fetch the Gmail history delta, so they can run often
     scheduler.add_job(
         schedule_reply_check,
-        trigger=IntervalTrigger(hours=6),
+        trigger=IntervalTrigger(minutes=int(os.getenv("REPLY_CHECK_INTERVAL_MINUTES", "30"))),
         id="reply_checks",
-        name="Check for Email Replies"
+        name="Check for Email Replies",
+        max_instances=1,
+        replace_existing=True
     )
-    
-    scheduler.start()
-    logger.info("Scheduler started (includes automatic scraper check every minute)")
+
+
+def start_reply_check_scheduler() -> bool:
+    """
+    Schedule only the periodic reply check (called on app startup).
+
+    The full scheduler stays disabled to prevent auto-triggering on refresh;
+    the reply check never sends or drafts anything, so it can be enabled on
+    its own with REPLY_CHECK_ENABLED=true. Returns True if it was scheduled.
+    """
+    if os.getenv("REPLY_CHECK_ENABLED", "false").lower() != "true":
+        logger.info("Reply check scheduler disabled (REPLY_CHECK_ENABLED not true)")
+        return False
+    _add_reply_check_job()
+    if not scheduler.running:
+        scheduler.start()
+    logger.info(f"Reply check scheduled every {os.getenv('REPLY_CHECK_INTERVAL_MINUTES', '30')} minute(s)")
+    return True
 
 
 def stop_scheduler():
     """Stop the scheduler"""
+    if not scheduler.running:
+        return
     scheduler.shutdown()
     logger.info("Scheduler stopped")
 
@@ -0,0 +1,305 @@
+"""
+Attachment blob store and pre-encoded MIME part cache.
+
+Attachment bytes used to live in email_attachments.data and were read from
+Postgres and re-base64-encoded for every single send. Now:
+- Blobs are content-addressed (sha256) and kept outside the email_attachments
+  rows, in a BlobStore. LocalBlobStore (a directory, ATTACHMENT_STORE_DIR) is
+  the default; an object store only has to implement put/get/delete/exists
+- Rows drop their bytes only when the store is durable: ATTACHMENT_STORE_DIR
+  explicitly set to persistent storage (or an object store). The built-in
+  default directory does not survive a redeploy on ephemeral hosts (Render),
+  so without it `data` stays in Postgres and the store is only a cache that
+  is refilled from the row when a blob is missing
+- Legacy rows get their content_hash (and, with a durable store, give up
+  `data`) the first time they are sent
+- Uploads and releases of the same content hash take a transaction-scoped
+  PostgreSQL advisory lock on it (lock_blob), so a release never deletes a
+  blob that a concurrent upload wrote but has not committed a row for yet
+- The base64 body of each blob is encoded once and kept in a process-wide
+  LRU keyed by content hash, bounded by ATTACHMENT_CACHE_MAX_BYTES; every
+  send in a batch builds its MIME part from the cached text, for both the
+  SMTP and the Gmail API path
+"""
+import asyncio
+import base64
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from email.mime.base import MIMEBase
+from pathlib import Path
+from typing import List, Optional, Tuple
+import logging
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.email_attachment import EmailAttachment
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_STORE_DIR = os.getenv("ATTACHMENT_STORE_DIR") or "storage/attachments"
+# Only an explicitly configured directory is trusted to outlive the process
+ATTACHMENT_STORE_DURABLE = bool(os.getenv("ATTACHMENT_STORE_DIR"))
+# Upper bound for cached base64 text (~4/3 of the raw attachment size)
+ATTACHMENT_CACHE_MAX_BYTES = int(os.getenv("ATTACHMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Columns needed to build a send; never the legacy `data` blob
+METADATA_COLUMNS = (
+    EmailAttachment.id,
+    EmailAttachment.filename,
+    EmailAttachment.content_type,
+    EmailAttachment.size_bytes,
+    EmailAttachment.content_hash,
+)
+
+
+class AttachmentBlobMissing(Exception):
+    """Attachment row points at a blob the store does not have"""
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """
+    Content-addressed blob storage interface.
+
+    durable: blobs survive restarts and redeploys, so attachment rows may
+    drop their `data` once the blob is stored.
+    """
+
+    durable = False
+
+    async def put(self, data: bytes) -> str:
+        """Store data; returns its sha256 content hash (idempotent)"""
+        raise NotImplementedError
+
+    async def get(self, digest: str) -> bytes:
+        """Raises AttachmentBlobMissing if the blob is not stored"""
+        raise NotImplementedError
+
+    async def exists(self, digest: str) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, digest: str) -> None:
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under root/<hash[:2]>/<hash>; file I/O runs in a thread"""
+
+    def __init__(self, root: str = ATTACHMENT_STORE_DIR, durable: bool = ATTACHMENT_STORE_DURABLE):
+        self.root = Path(root)
+        self.durable = durable
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer: threads of one process may write the same digest
+        tmp = path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # atomic: readers never see a partial blob
+
+    async def put(self, data: bytes) -> str:
+        digest = content_hash(data)
+        await asyncio.to_thread(self._write, digest, data)
+        return digest
+
+    async def get(self, digest: str) -> bytes:
+        try:
+            return await asyncio.to_thread(self._path(digest).read_bytes)
+        except FileNotFoundError:
+            raise AttachmentBlobMissing(f"Attachment blob {digest} not found in {self.root}")
+
+    async def exists(self, digest: str) -> bool:
+        return await asyncio.to_thread(self._path(digest).exists)
+
+    async def delete(self, digest: str) -> None:
+        await asyncio.to_thread(self._path(digest).unlink, True)
+
+
+class EncodedPartCache:
+    """LRU of base64-encoded attachment bodies keyed by content hash"""
+
+    def __init__(self, max_bytes: int = ATTACHMENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: str) -> Optional[str]:
+        encoded = self._entries.get(digest)
+        if encoded is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return encoded
+
+    def put(self, digest: str, encoded: str) -> None:
+        if digest in self._entries or len(encoded) > self.max_bytes:
+            return
+        self._entries[digest] = encoded
+        self._size += len(encoded)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def discard(self, digest: str) -> None:
+        encoded = self._entries.pop(digest, None)
+        if encoded is not None:
+            self._size -= len(encoded)
+
+
+_blob_store: Optional[BlobStore] = None
+_part_cache = EncodedPartCache()
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = LocalBlobStore()
+    return _blob_store
+
+
+def build_mime_part(filename: str, content_type: str, encoded: str) -> MIMEBase:
+    """MIME part around an already base64-encoded body (no re-encoding)"""
+    maintype, _, subtype = (content_type or "").partition("/")
+    if not maintype or not subtype:
+        maintype, subtype = "application", "octet-stream"
+    part = MIMEBase(maintype, subtype)
+    part.set_payload(encoded)
+    part["Content-Transfer-Encoding"] = "base64"
+    part.add_header("Content-Disposition", "attachment", filename=filename)
+    return part
+
+
+async def encoded_body(digest: str, store: Optional[BlobStore] = None) -> str:
+    """base64 text of a stored blob; read and encoded once per process while cached"""
+    encoded = _part_cache.get(digest)
+    if encoded is None:
+        data = await (store or get_blob_store()).get(digest)
+        # Same line-wrapped output as email.encoders.encode_base64
+        encoded = base64.encodebytes(data).decode("ascii")
+        _part_cache.put(digest, encoded)
+    return encoded
+
+
+async def lock_blob(db: AsyncSession, digest: str) -> None:
+    """
+    Lock a content hash until db's transaction ends (PostgreSQL advisory lock).
+
+    Taken by uploads before writing the blob and by release_blob() before
+    counting references, so the two are mutually exclusive per digest across
+    all API and worker processes.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))"),
+            {"key": f"attachment_blob:{digest}"},
+        )
+
+
+async def store_attachment_data(
+    db: AsyncSession,
+    data: bytes,
+    store: Optional[BlobStore] = None,
+) -> Tuple[str, Optional[bytes]]:
+    """
+    Write attachment bytes to the blob store, holding the digest's lock until
+    the caller commits the row that references it.
+
+    Returns (content hash, bytes to keep in email_attachments.data): None
+    with a durable store, the bytes themselves otherwise.
+    """
+    store = store or get_blob_store()
+    await lock_blob(db, content_hash(data))
+    return await store.put(data), (None if store.durable else data)
+
+
+async def _offload_legacy(db: AsyncSession, attachment_id, store: BlobStore) -> str:
+    """
+    Copy a row's `data` into the blob store: legacy rows (once per row) and
+    rows whose blob was lost with a non-durable store. `data` is only
+    cleared when the store is durable.
+    """
+    data = (await db.execute(
+        select(EmailAttachment.data).where(EmailAttachment.id == attachment_id)
+    )).scalar_one()
+    if data is None:
+        raise AttachmentBlobMissing(f"Attachment {attachment_id} has neither a stored blob nor data")
+    await lock_blob(db, content_hash(data))
+    digest = await store.put(data)
+    values = {"content_hash": digest}
+    if store.durable:
+        values["data"] = None
+    await db.execute(
+        update(EmailAttachment)
+        .where(EmailAttachment.id == attachment_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    logger.info(f"📎 [ATTACH] Stored attachment {attachment_id} ({len(data)} bytes) in the blob store")
+    return digest
+
+
+async def load_attachment_parts(
+    db: AsyncSession,
+    prospect_id: str,
+    store: Optional[BlobStore] = None,
+) -> List[MIMEBase]:
+    """
+    MIME parts for the global attachments plus the prospect's own ones.
+
+    Only metadata is read from Postgres; bodies come from the encoded-part
+    cache (or the blob store on a miss). Legacy rows and blobs missing from a
+    non-durable store are (re)stored from `data` on the fly; the caller's
+    commit persists that.
+    """
+    store = store or get_blob_store()
+    result = await db.execute(
+        select(*METADATA_COLUMNS)
+        .where((EmailAttachment.scope == "global") | (EmailAttachment.prospect_id == prospect_id))
+        .order_by(EmailAttachment.created_at)
+    )
+    parts = []
+    for row in result.all():
+        digest = row.content_hash or await _offload_legacy(db, row.id, store)
+        try:
+            encoded = await encoded_body(digest, store)
+        except AttachmentBlobMissing:
+            if store.durable:
+                raise
+            encoded = await encoded_body(await _offload_legacy(db, row.id, store), store)
+        parts.append(build_mime_part(row.filename, row.content_type, encoded))
+    return parts
+
+
+async def release_blob(db: AsyncSession, digest: Optional[str], store: Optional[BlobStore] = None) -> bool:
+    """
+    Delete a blob once no attachment row references it; returns True if deleted.
+
+    Call after the row deletion is committed. Runs in its own transaction
+    under the digest's lock (committed here), so an upload of the same
+    content either commits its row first or writes the blob again after.
+    """
+    if not digest:
+        return False
+    await lock_blob(db, digest)
+    references = (await db.execute(
+        select(func.count()).select_from(EmailAttachment).where(EmailAttachment.content_hash == digest)
+    )).scalar()
+    if not references:
+        _part_cache.discard(digest)
+        await (store or get_blob_store()).delete(digest)
+    await db.commit()  # releases the lock
+    return not references
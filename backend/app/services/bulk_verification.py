@@ -0,0 +1,172 @@
+"""
+Bulk email verification through the providers' batch APIs.
+
+The per-prospect verification spends a Snov.io domain-search credit and a
+round-trip (plus a 1s pause) per lead. verify_emails() checks a whole batch
+of addresses instead:
+- Snov.io: the batch is queued with add-emails-to-verification
+  (VERIFY_CHUNK_SIZE addresses per request, submitted concurrently), then
+  polled for the whole batch with get-emails-verification-status: one
+  wait of BULK_VERIFY_POLL_INTERVAL seconds, then only the addresses still
+  in progress are asked again
+- The Snov.io calls are sized against its rate-limiter bucket: only as
+  many chunks are queued as the bucket can also poll within
+  BULK_VERIFY_TIMEOUT (the rest go to Hunter.io), and poll rounds are
+  spaced so they do not outrun the refill rate. Submission and every poll
+  round are bounded by the remaining BULK_VERIFY_TIMEOUT
+- Hunter.io: addresses Snov.io could not answer (not configured,
+  restricted, errors, timeout) fan out to email_verifier, at most
+  BULK_VERIFY_HUNTER_CONCURRENCY in flight
+- A Snov.io 429 is shared through ProviderState, like the enrichment
+  calls; restricted providers are not asked
+
+Addresses no provider answered are absent from the result; the caller
+decides what that means.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from app.services.exceptions import RateLimitError
+from app.services.provider_state import get_provider_state
+from app.utils.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+BULK_VERIFY_POLL_INTERVAL = float(os.getenv("BULK_VERIFY_POLL_INTERVAL", "5"))
+BULK_VERIFY_TIMEOUT = float(os.getenv("BULK_VERIFY_TIMEOUT", "300"))
+BULK_VERIFY_HUNTER_CONCURRENCY = int(os.getenv("BULK_VERIFY_HUNTER_CONCURRENCY", "5"))
+
+DELIVERABLE = "deliverable"
+UNDELIVERABLE = "undeliverable"
+RISKY = "risky"
+UNKNOWN = "unknown"
+
+
+class EmailVerdict:
+    """One provider's answer for one address"""
+
+    __slots__ = ("email", "result", "score", "provider", "raw")
+
+    def __init__(self, email: str, result: str, provider: str, score: Optional[float] = None, raw: Any = None):
+        self.email = email
+        self.result = result  # deliverable | undeliverable | risky | unknown
+        self.provider = provider
+        self.score = score  # provider score 0-100, when it gives one
+        self.raw = raw
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {"email": self.email, "result": self.result, "score": self.score, "provider": self.provider, "raw": self.raw}
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def _restrict(rate_err: RateLimitError) -> None:
+    if rate_err.retry_after:
+        await get_provider_state().set_restricted(rate_err.provider, rate_err.retry_after)
+
+
+async def _snov_tokens() -> int:
+    return await get_rate_limiter().get_remaining_requests("snov") or 0
+
+
+async def _verify_with_snov(emails: List[str]) -> Dict[str, EmailVerdict]:
+    from app.clients.snov import SnovIOClient
+
+    client = SnovIOClient()
+    deadline = time.monotonic() + BULK_VERIFY_TIMEOUT
+    refill = get_rate_limiter().configs["snov"].refill_per_second
+
+    # Every queued chunk costs a submit call and at least one status call
+    budget = await _snov_tokens() + int(refill * BULK_VERIFY_TIMEOUT)
+    chunks = _chunks(emails, client.VERIFY_CHUNK_SIZE)
+    if len(chunks) > max(1, budget // 2):
+        chunks = chunks[:max(1, budget // 2)]
+        logger.info(
+            f"📨 [BULK VERIFY] Snov.io rate limit allows {len(chunks)} chunk(s) within {BULK_VERIFY_TIMEOUT:.0f}s; "
+            f"{len(emails) - sum(len(chunk) for chunk in chunks)} address(es) left to the next provider"
+        )
+    try:
+        submitted = await asyncio.wait_for(
+            asyncio.gather(*(client.add_emails_to_verification(chunk) for chunk in chunks)),
+            timeout=deadline - time.monotonic(),
+        )
+    except RateLimitError as rate_err:
+        await _restrict(rate_err)
+        logger.warning(f"⚠️  [BULK VERIFY] Snov.io rate-limited while submitting: {rate_err}")
+        return {}
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️  [BULK VERIFY] Snov.io submission did not finish within {BULK_VERIFY_TIMEOUT:.0f}s")
+        return {}
+    pending = [email for result in submitted if result.get("success") for email in result["emails"]]
+    logger.info(f"📨 [BULK VERIFY] Queued {len(pending)}/{len(emails)} addresses with Snov.io in {len(chunks)} request(s)")
+
+    verdicts: Dict[str, EmailVerdict] = {}
+    while pending:
+        poll_chunks = _chunks(pending, client.VERIFY_CHUNK_SIZE)
+        # Wait long enough for the bucket to hold a whole round
+        wait = max(BULK_VERIFY_POLL_INTERVAL, (len(poll_chunks) - await _snov_tokens()) / refill)
+        if time.monotonic() + wait >= deadline:
+            break
+        await asyncio.sleep(wait)
+        try:
+            polled = await asyncio.wait_for(
+                asyncio.gather(*(client.get_emails_verification_status(chunk) for chunk in poll_chunks)),
+                timeout=deadline - time.monotonic(),
+            )
+        except RateLimitError as rate_err:
+            await _restrict(rate_err)
+            logger.warning(f"⚠️  [BULK VERIFY] Snov.io rate-limited while polling: {rate_err}")
+            break
+        except asyncio.TimeoutError:
+            break
+        for result in polled:
+            for email, status in result.get("results", {}).items():
+                if status["complete"]:
+                    verdicts[email] = EmailVerdict(email, status["result"], "snov", raw=status["raw"])
+        pending = [email for email in pending if email not in verdicts]
+    if pending:
+        logger.warning(f"⏱️  [BULK VERIFY] Snov.io left {len(pending)} address(es) unanswered")
+    return verdicts
+
+
+async def _verify_with_hunter(emails: List[str]) -> Dict[str, EmailVerdict]:
+    from app.clients.hunter import HunterIOClient
+
+    client = HunterIOClient()
+    slots = asyncio.Semaphore(BULK_VERIFY_HUNTER_CONCURRENCY)
+
+    async def verify(email: str) -> Optional[EmailVerdict]:
+        async with slots:
+            result = await client.email_verifier(email)
+        if not result.get("success"):
+            return None
+        score = result.get("score")
+        return EmailVerdict(
+            email, result.get("result") or UNKNOWN, "hunter",
+            score=float(score) if score is not None else None,
+            raw=(result.get("raw_response") or {}).get("data"),
+        )
+
+    answered = await asyncio.gather(*(verify(email) for email in emails))
+    return {verdict.email: verdict for verdict in answered if verdict is not None}
+
+
+async def _available(provider: str, *env: str) -> bool:
+    return all(os.getenv(name) for name in env) and not await get_provider_state().is_restricted(provider)
+
+
+async def verify_emails(emails: Iterable[str]) -> Dict[str, EmailVerdict]:
+    """Verdicts for a batch of addresses (keys as given); unanswered addresses are absent"""
+    pending = list(dict.fromkeys(email for email in emails if email))
+    verdicts: Dict[str, EmailVerdict] = {}
+    if pending and await _available("snov", "SNOV_USER_ID", "SNOV_SECRET"):
+        verdicts.update(await _verify_with_snov(pending))
+        pending = [email for email in pending if email not in verdicts]
+    if pending and await _available("hunter", "HUNTER_IO_API_KEY"):
+        verdicts.update(await _verify_with_hunter(pending))
+    return verdicts
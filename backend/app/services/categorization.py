@@ -0,0 +1,541 @@
+"""
+Set-based prospect categorization.
+
+Replaces the per-row categorization loop (2-3 queries per prospect, capped at
+1,000 rows per call) with three set-based steps:
+- Inherit: one UPDATE prospects ... FROM discovery_queries copies the query's
+  category onto every prospect discovered by it
+- Propagate: one UPDATE copies a same-domain prospect's category onto
+  uncategorized rows
+- Classify: the remaining uncategorized rows are streamed in keyset-paginated
+  chunks, matched against a precompiled keyword matcher in Python and written
+  back with one bulk UPDATE per chunk
+
+Progress is reported through an optional Job (result / total_targets), which
+is committed after every step and chunk.
+"""
+import os
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Uncategorized rows classified per chunk/transaction
+CATEGORIZE_CHUNK_SIZE = int(os.getenv("CATEGORIZE_CHUNK_SIZE", "5000"))
+
+# Placeholder values treated as "no category" (compared lower-cased and trimmed)
+PLACEHOLDER_CATEGORIES = ("", "n/a", "unknown")
+
+# Comprehensive category detection patterns
+# Order matters - more specific patterns first
+# Categories must match frontend available categories
+CATEGORY_PATTERNS = {
+    'Museum': [
+        # Domain patterns
+        'museum', 'museums', 'museo', 'museu', 'muse', 'museet',
+        # Title/URL patterns
+        'art museum', 'gallery museum', 'contemporary museum', 'modern museum',
+        'museum of art', 'art collection', 'permanent collection'
+    ],
+    'Art Lovers': [
+        # Domain patterns
+        'gallery', 'galleries', 'galerie', 'galeria', 'galerija',
+        'studio', 'studios', 'atelier', 'ateliers',
+        'art', 'arts', 'artwork', 'artworks',
+        # Title/URL patterns
+        'art gallery', 'contemporary art', 'fine art gallery', 'art space',
+        'exhibition space', 'art showroom', 'gallery space', 'art room',
+        'contemporary gallery', 'modern gallery', 'fine art', 'art display',
+        'art studio', 'artist studio', 'creative studio', 'painting studio',
+        'sculpture studio', 'artists studio', 'working studio', 'art workshop',
+        'art fair', 'art exhibition', 'art show', 'art expo', 'art market',
+        'art event', 'art festival', 'biennale', 'biennial', 'art week',
+        'art lover', 'art lovers', 'art enthusiast', 'art enthusiasts'
+    ],
+    'Interior Design': [
+        # Domain patterns
+        'interior', 'interiors', 'design', 'designer', 'designers',
+        # Title/URL patterns
+        'interior design', 'interior designer', 'home design', 'space design',
+        'interior decorator', 'interior decoration', 'home styling'
+    ],
+    'Interior Decor': [
+        # Domain patterns
+        'decor', 'decoration', 'decorator', 'decorators',
+        # Title/URL patterns
+        'interior decor', 'home decor', 'decorating', 'home decoration'
+    ],
+    'Home Decor': [
+        # Domain patterns
+        'home', 'homedecor', 'homedecoration',
+        # Title/URL patterns
+        'home decor', 'home decoration', 'home accessories', 'home furnishings'
+    ],
+    'Holiday Decor': [
+        # Domain patterns
+        'holiday', 'holidays', 'christmas', 'halloween', 'thanksgiving',
+        # Title/URL patterns
+        'holiday decor', 'holiday decoration', 'seasonal decor', 'holiday decorating'
+    ],
+    'Holidays': [
+        # Domain patterns
+        'holiday', 'holidays', 'festival', 'festivals', 'celebration',
+        # Title/URL patterns
+        'holiday', 'holidays', 'festival', 'celebration', 'seasonal'
+    ],
+    'Pet Lovers': [
+        # Domain patterns - combined dog and cat patterns
+        'dog', 'dogs', 'puppy', 'puppies', 'canine', 'canines',
+        'cat', 'cats', 'kitten', 'kittens', 'feline', 'felines',
+        'pet', 'pets', 'petlover', 'petlovers', 'pet-lover', 'pet-lovers',
+        'doglover', 'doglovers', 'dog-lover', 'dog-lovers',
+        'catlover', 'catlovers', 'cat-lover', 'cat-lovers',
+        # Title/URL patterns
+        'dog', 'dogs', 'puppy', 'canine', 'dog training', 'dog care',
+        'cat', 'cats', 'kitten', 'feline', 'cat care', 'cat training',
+        'pet lover', 'pet lovers', 'pet owner', 'pet owners',
+        'dog lover', 'dog lovers', 'dog owner', 'dog owners',
+        'cat lover', 'cat lovers', 'cat owner', 'cat owners'
+    ],
+    'Dogs and Cat Owners - Fur Parent': [
+        # Domain patterns
+        'furparent', 'furparents', 'fur-parent', 'fur-parents',
+        'furmom', 'furdad', 'furmommy', 'furdaddy',
+        # Title/URL patterns
+        'fur parent', 'fur parents', 'fur mom', 'fur dad',
+        'fur mommy', 'fur daddy', 'pet parent', 'pet parents',
+        'dog and cat owner', 'dogs and cats owner', 'dog and cat owners',
+        'dogs and cats owners', 'multi pet owner', 'multi pet owners'
+    ],
+    'Parenting': [
+        # Domain patterns
+        'parent', 'parents', 'parenting', 'mom', 'moms', 'dad', 'dads',
+        'family', 'families', 'children', 'kids', 'child',
+        # Title/URL patterns
+        'parenting', 'parent', 'family', 'children', 'kids', 'child care'
+    ],
+    'Childhood Development': [
+        # Domain patterns
+        'child', 'children', 'childhood', 'development', 'early', 'education',
+        # Title/URL patterns
+        'child development', 'childhood development', 'early childhood', 'child education'
+    ],
+    'Home Tech': [
+        # Domain patterns
+        'tech', 'technology', 'smart', 'automation', 'iot', 'homeautomation',
+        # Title/URL patterns
+        'home tech', 'smart home', 'home automation', 'home technology'
+    ],
+    'Audio Visual': [
+        # Domain patterns
+        'audio', 'visual', 'av', 'audiovisual', 'sound', 'video',
+        # Title/URL patterns
+        'audio visual', 'audiovisual', 'sound system', 'home theater'
+    ],
+    'NFTs': [
+        # Domain patterns
+        'nft', 'nfts', 'crypto', 'blockchain', 'web3',
+        # Title/URL patterns
+        'nft', 'nfts', 'non-fungible token', 'crypto art', 'digital art'
+    ],
+    'Famous Quotes': [
+        # Domain patterns
+        'quote', 'quotes', 'quotation', 'quotations', 'inspirational',
+        # Title/URL patterns
+        'quote', 'quotes', 'famous quote', 'inspirational quote'
+    ]
+}
+
+# Mapping from old category values to the standardized ones
+# Handles various formats: lowercase, snake_case, variations
+# None means "no usable category" - handled by auto-categorization
+CATEGORY_MAPPING = {
+    # Old lowercase/snake_case formats
+    'art': 'Art Lovers',
+    'Art': 'Art Lovers',  # Updated to new category name
+    'art lovers': 'Art Lovers',
+    'Art Lovers': 'Art Lovers',
+    'art enthusiast': 'Art Lovers',
+    'art enthusiasts': 'Art Lovers',
+    'interior_design': 'Interior Design',
+    'interior design': 'Interior Design',
+    'Interior Design': 'Interior Design',
+    'interior_decor': 'Interior Decor',
+    'interior decor': 'Interior Decor',
+    'Interior Decor': 'Interior Decor',
+    'home_decor': 'Home Decor',
+    'home decor': 'Home Decor',
+    'Home Decor': 'Home Decor',
+    'home_tech': 'Home Tech',
+    'home tech': 'Home Tech',
+    'Home Tech': 'Home Tech',
+    'tech_blog': 'Home Tech',  # Map tech_blog to Home Tech
+    'tech blog': 'Home Tech',
+    'mothers_tech': 'Parenting',  # Map mothers_tech to Parenting
+    'mothers tech': 'Parenting',
+    'mom_blog': 'Parenting',
+    'mom blog': 'Parenting',
+    'nft': 'NFTs',
+    'NFT': 'NFTs',
+    'NFTs': 'NFTs',
+    'nft_tech': 'NFTs',
+    'museum': 'Museum',
+    'Museum': 'Museum',
+    'museums': 'Museum',
+    'Museums': 'Museum',
+    'art_gallery': 'Art',
+    'art gallery': 'Art',
+    'Art Gallery': 'Art',
+    'gallery': 'Art',
+    'holiday': 'Holidays',
+    'Holiday': 'Holidays',
+    'Holidays': 'Holidays',
+    'holiday_decor': 'Holiday Decor',
+    'holiday decor': 'Holiday Decor',
+    'Holiday Decor': 'Holiday Decor',
+    'holiday/family': 'Holidays',
+    'Holiday/Family': 'Holidays',
+    'editorial_media': 'Art Lovers',  # Map editorial to Art Lovers (closest match)
+    'editorial media': 'Art Lovers',
+    'Editorial Media': 'Art Lovers',
+    # Old pet categories mapped to new combined categories
+    'dog': 'Pet Lovers',
+    'Dogs': 'Pet Lovers',
+    'dog_lover': 'Pet Lovers',
+    'dog lover': 'Dog Lovers',  # Keep for backward compatibility, but map to Pet Lovers
+    'Dog Lovers': 'Pet Lovers',
+    'cat': 'Pet Lovers',
+    'Cats': 'Pet Lovers',
+    'cat_lover': 'Pet Lovers',
+    'cat lover': 'Cat Lovers',  # Keep for backward compatibility, but map to Pet Lovers
+    'Cat Lovers': 'Pet Lovers',
+    # New category names
+    'Pet Lovers': 'Pet Lovers',
+    'pet_lovers': 'Pet Lovers',
+    'pet lovers': 'Pet Lovers',
+    'pet': 'Pet Lovers',
+    'pets': 'Pet Lovers',
+    'Dogs and Cat Owners - Fur Parent': 'Dogs and Cat Owners - Fur Parent',
+    'dogs and cat owners - fur parent': 'Dogs and Cat Owners - Fur Parent',
+    'fur parent': 'Dogs and Cat Owners - Fur Parent',
+    'fur parents': 'Dogs and Cat Owners - Fur Parent',
+    'fur_parent': 'Dogs and Cat Owners - Fur Parent',
+    'fur_parents': 'Dogs and Cat Owners - Fur Parent',
+    'parenting': 'Parenting',
+    'Parenting': 'Parenting',
+    'childhood_development': 'Childhood Development',
+    'childhood development': 'Childhood Development',
+    'Childhood Development': 'Childhood Development',
+    'audio_visual': 'Audio Visual',
+    'audio visual': 'Audio Visual',
+    'Audio Visual': 'Audio Visual',
+    'famous_quotes': 'Famous Quotes',
+    'famous quotes': 'Famous Quotes',
+    'Famous Quotes': 'Famous Quotes',
+    # Handle unknown/null values - will be handled by auto-categorize
+    'unknown': None,  # Will trigger auto-categorization
+    'Unknown': None,
+    'n/a': None,
+    'N/A': None,
+    '': None,
+    None: None
+}
+
+# Standardized categories (already migrated)
+VALID_CATEGORIES = frozenset([
+    'Art Lovers', 'Interior Design', 'Pet Lovers', 'Dogs and Cat Owners - Fur Parent', 'Childhood Development',
+    'Holidays', 'Famous Quotes', 'Home Decor',
+    'Audio Visual', 'Interior Decor', 'Holiday Decor', 'Home Tech',
+    'Parenting', 'NFTs', 'Museum'
+])
+
+# Built once at import; first_group() returns categories in CATEGORY_PATTERNS order
+_CATEGORY_MATCHER = KeywordMatcher(CATEGORY_PATTERNS)
+
+# Case-insensitive fallback for CATEGORY_MAPPING (first entry wins, like the dict order)
+_CATEGORY_MAPPING_LOWER: Dict[str, Optional[str]] = {}
+for _old, _new in CATEGORY_MAPPING.items():
+    if _old:
+        _CATEGORY_MAPPING_LOWER.setdefault(_old.lower(), _new)
+
+
+def classify_category(
+    domain: Optional[str],
+    title: Optional[str] = None,
+    url: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Determine a category from domain, page title and URL keywords.
+
+    Checks the domain first (most reliable indicator), then title/URL, then the
+    combined text, returning the first category in CATEGORY_PATTERNS order
+    that matches in the earliest phase.
+
+    Returns:
+        Category name or None if no pattern matches
+    """
+    domain_lower = (domain or '').lower()
+    title_lower = (title or '').lower()
+    url_lower = (url or '').lower()
+
+    return (
+        _CATEGORY_MATCHER.first_group(domain_lower)
+        # Separator keeps patterns from matching across title and URL
+        or _CATEGORY_MATCHER.first_group(f"{title_lower}\x00{url_lower}")
+        or _CATEGORY_MATCHER.first_group(f"{domain_lower} {title_lower} {url_lower}")
+    )
+
+
+def is_uncategorized(category: Optional[str]) -> bool:
+    """True for NULL, blank and placeholder ('N/A', 'Unknown') categories"""
+    return category is None or category.strip().lower() in PLACEHOLDER_CATEGORIES
+
+
+def resolve_legacy_category(category: str) -> Tuple[bool, Optional[str]]:
+    """
+    Look up an old category value in CATEGORY_MAPPING.
+
+    Returns:
+        (found, new_category) - exact match first, then case-insensitive;
+        new_category is None for placeholder values
+    """
+    normalized = category.strip()
+    if normalized in CATEGORY_MAPPING:
+        return True, CATEGORY_MAPPING[normalized]
+    if normalized.lower() in _CATEGORY_MAPPING_LOWER:
+        return True, _CATEGORY_MAPPING_LOWER[normalized.lower()]
+    return False, None
+
+
+def _uncategorized_sql(column: str) -> str:
+    return f"({column} IS NULL OR lower(btrim({column})) IN ('', 'n/a', 'unknown'))"
+
+
+def _uncategorized_clause():
+    return or_(
+        Prospect.discovery_category.is_(None),
+        func.lower(func.trim(Prospect.discovery_category)).in_(PLACEHOLDER_CATEGORIES),
+    )
+
+
+# Each statement returns (previous category, new category, rows) so callers can
+# report what changed; "prev" is the pre-update image of the same row
+INHERIT_FROM_QUERY_SQL = f"""
+WITH updated AS (
+    UPDATE prospects p SET
+        discovery_category = dq.category,
+        updated_at = now()
+    FROM discovery_queries dq, prospects prev
+    WHERE p.discovery_query_id = dq.id
+      AND prev.id = p.id
+      AND NOT {_uncategorized_sql("dq.category")}
+      AND p.discovery_category IS DISTINCT FROM dq.category
+    RETURNING prev.discovery_category AS previous, p.discovery_category AS category
+)
+SELECT previous, category, count(*) AS rows FROM updated GROUP BY previous, category
+"""
+
+PROPAGATE_SAME_DOMAIN_SQL = f"""
+WITH source AS (
+    SELECT DISTINCT ON (domain) domain, discovery_category
+    FROM prospects
+    WHERE NOT {_uncategorized_sql("prospects.discovery_category")}
+      AND domain IN (SELECT domain FROM prospects u WHERE {_uncategorized_sql("u.discovery_category")})
+    ORDER BY domain, updated_at DESC NULLS LAST, id
+),
+updated AS (
+    UPDATE prospects p SET
+        discovery_category = source.discovery_category,
+        updated_at = now()
+    FROM source, prospects prev
+    WHERE p.domain = source.domain
+      AND prev.id = p.id
+      AND {_uncategorized_sql("p.discovery_category")}
+    RETURNING prev.discovery_category AS previous, p.discovery_category AS category
+)
+SELECT previous, category, count(*) AS rows FROM updated GROUP BY previous, category
+"""
+
+APPLY_MAPPING_SQL = """
+WITH mapping AS (
+    SELECT * FROM unnest(CAST(:old_values AS text[]), CAST(:new_values AS text[])) AS m(old_value, new_value)
+)
+UPDATE prospects p SET
+    discovery_category = mapping.new_value,
+    updated_at = now()
+FROM mapping
+WHERE p.discovery_category = mapping.old_value
+"""
+
+
+def _record(changes: Dict[str, Dict[str, Any]], previous: Optional[str], category: str, rows: int) -> None:
+    """Accumulate {previous: {'to': first new category, 'count': rows}}"""
+    key = previous if previous is not None else 'NULL'
+    entry = changes.setdefault(key, {'to': category, 'count': 0})
+    entry['count'] += rows
+
+
+async def _report(db: AsyncSession, job: Optional[Job], stats: Dict[str, Any]) -> None:
+    """Commit the current step and publish progress on the job"""
+    if job is not None:
+        job.result = {k: v for k, v in stats.items() if k != 'changes'}
+    await db.commit()
+
+
+async def _run_changes_statement(db: AsyncSession, sql: str, stats: Dict[str, Any]) -> int:
+    rows = (await db.execute(text(sql))).all()
+    updated = 0
+    for previous, category, count in rows:
+        _record(stats['changes'], previous, category, int(count))
+        updated += int(count)
+    return updated
+
+
+async def categorize_prospects(
+    db: AsyncSession,
+    job: Optional[Job] = None,
+    inherit_from_queries: bool = True,
+    chunk_size: int = CATEGORIZE_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Categorize prospects set-wise: inherit from discovery queries, propagate
+    across same-domain prospects, then keyword-classify what is left.
+
+    Args:
+        db: Database session (committed after every step and chunk)
+        job: Optional Job updated with progress after every step and chunk
+        inherit_from_queries: Overwrite categories from the discovery query first
+        chunk_size: Uncategorized rows classified per chunk
+
+    Returns:
+        Stats dict: inherited, propagated, classified, categorized, scanned,
+        unmatched, chunks, changes ({old category: {'to', 'count'}})
+    """
+    stats: Dict[str, Any] = {
+        'phase': 'inherit',
+        'inherited': 0,
+        'propagated': 0,
+        'classified': 0,
+        'categorized': 0,
+        'scanned': 0,
+        'unmatched': 0,
+        'chunks': 0,
+        'changes': {},
+    }
+    try:
+        if inherit_from_queries:
+            stats['inherited'] = await _run_changes_statement(db, INHERIT_FROM_QUERY_SQL, stats)
+            logger.info(f"✅ [AUTO CATEGORIZE] Inherited category from discovery query for {stats['inherited']} prospects")
+
+        stats['phase'] = 'propagate'
+        await _report(db, job, stats)
+        stats['propagated'] = await _run_changes_statement(db, PROPAGATE_SAME_DOMAIN_SQL, stats)
+        logger.info(f"✅ [AUTO CATEGORIZE] Propagated same-domain category to {stats['propagated']} prospects")
+
+        stats['phase'] = 'classify'
+        remaining = (await db.execute(
+            select(func.count(Prospect.id)).where(_uncategorized_clause())
+        )).scalar_one()
+        if job is not None:
+            job.total_targets = remaining
+        await _report(db, job, stats)
+
+        last_id = None
+        while True:
+            query = select(
+                Prospect.id, Prospect.domain, Prospect.page_title, Prospect.page_url, Prospect.discovery_category
+            ).where(_uncategorized_clause())
+            if last_id is not None:
+                query = query.where(Prospect.id > last_id)
+            rows = (await db.execute(query.order_by(Prospect.id).limit(chunk_size))).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            for row in rows:
+                category = classify_category(row.domain, row.page_title, row.page_url)
+                if category:
+                    updates.append({'id': row.id, 'discovery_category': category})
+                    _record(stats['changes'], row.discovery_category, category, 1)
+            if updates:
+                await db.execute(update(Prospect), updates)
+
+            stats['chunks'] += 1
+            stats['scanned'] += len(rows)
+            stats['classified'] += len(updates)
+            stats['unmatched'] += len(rows) - len(updates)
+            await _report(db, job, stats)
+            logger.info(
+                f"🤖 [AUTO CATEGORIZE] Chunk {stats['chunks']}: classified {len(updates)} of {len(rows)} "
+                f"({stats['scanned']}/{remaining} scanned)"
+            )
+    except Exception:
+        await db.rollback()
+        raise
+
+    stats['phase'] = 'done'
+    stats['categorized'] = stats['inherited'] + stats['propagated'] + stats['classified']
+    return stats
+
+
+async def migrate_legacy_categories(db: AsyncSession, job: Optional[Job] = None) -> Dict[str, Any]:
+    """
+    Map old category values to the standardized ones, then auto-categorize
+    placeholder values ('Unknown', 'N/A', blank).
+
+    The mapping is resolved once per distinct category value and applied in a
+    single UPDATE; unmapped values that are not placeholders are left as-is.
+
+    Returns:
+        Stats dict: migrated, mapped, categorize (categorize_prospects stats),
+        changes ({old category: {'to', 'count'}})
+    """
+    distinct_values = (await db.execute(
+        select(Prospect.discovery_category, func.count(Prospect.id))
+        .where(Prospect.discovery_category.isnot(None))
+        .group_by(Prospect.discovery_category)
+    )).all()
+
+    changes: Dict[str, Dict[str, Any]] = {}
+    old_values: List[str] = []
+    new_values: List[str] = []
+    for old_category, count in distinct_values:
+        if old_category.strip() in VALID_CATEGORIES:
+            continue
+        found, new_category = resolve_legacy_category(old_category)
+        if found and new_category is not None and new_category != old_category:
+            old_values.append(old_category)
+            new_values.append(new_category)
+            _record(changes, old_category, new_category, int(count))
+
+    mapped = 0
+    if old_values:
+        try:
+            result = await db.execute(
+                text(APPLY_MAPPING_SQL), {'old_values': old_values, 'new_values': new_values}
+            )
+            mapped = result.rowcount
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    logger.info(f"🔄 [MIGRATE CATEGORIES] Mapped {mapped} prospects across {len(old_values)} old category values")
+
+    categorize_stats = await categorize_prospects(db, job=job, inherit_from_queries=False)
+    for previous, entry in categorize_stats.pop('changes').items():
+        _record(changes, None if previous == 'NULL' else previous, entry['to'], entry['count'])
+
+    return {
+        'migrated': mapped + categorize_stats['categorized'],
+        'mapped': mapped,
+        'categorize': categorize_stats,
+        'changes': changes,
+    }
@@ -0,0 +1,382 @@
+"""
+Politeness scheduler for website fetches.
+
+Every fetch of a prospect's website (enrichment / scraping, the Gemini
+research fetch) goes through one CrawlScheduler instead of a private
+httpx client per call and a global sleep between prospects:
+- Slots: at most CRAWL_PER_HOST_CONCURRENCY fetches per host and
+  CRAWL_PER_IP_CONCURRENCY per resolved IP (hosted sites - Wix, Squarespace -
+  share edge IPs), within a global budget of CRAWL_MAX_CONCURRENCY fetches
+- Delay: consecutive requests to a host are spaced by CRAWL_HOST_DELAY
+  seconds, or by the robots.txt Crawl-delay (capped at CRAWL_MAX_CRAWL_DELAY)
+- robots.txt is fetched once per origin and cached for CRAWL_ROBOTS_TTL
+  seconds; disallowed URLs raise CrawlDisallowed without a request. A missing
+  or unreachable robots.txt allows everything
+- 429 / 503: the host is backed off for Retry-After (seconds or HTTP date;
+  exponential without it, capped at CRAWL_MAX_RETRY_AFTER) and the request is
+  retried up to CRAWL_MAX_RETRIES times; other hosts are unaffected
+- One shared httpx client, so connections to a host are reused across pages
+- fetch_html streams the body: non-HTML responses (PDFs, images, video) are
+  dropped after the headers, bodies stop at a per-stage byte cap (the
+  partial page is returned, marked truncated) and the charset comes from
+  the header / BOM / <meta> instead of statistical detection
+
+fetch returns the httpx.Response (callers handle the status as before),
+fetch_html an HtmlPage. Resolved
+IPs are cached per host; hosts that do not resolve are keyed by name.
+"""
+import asyncio
+import codecs
+import os
+import random
+import re
+import socket
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import logging
+
+import httpx
+
+from app.services.exceptions import CrawlDisallowed, UnsupportedContent
+
+logger = logging.getLogger(__name__)
+
+CRAWL_MAX_CONCURRENCY = int(os.getenv("CRAWL_MAX_CONCURRENCY", "16"))
+CRAWL_PER_HOST_CONCURRENCY = int(os.getenv("CRAWL_PER_HOST_CONCURRENCY", "2"))
+CRAWL_PER_IP_CONCURRENCY = int(os.getenv("CRAWL_PER_IP_CONCURRENCY", "4"))
+CRAWL_HOST_DELAY = float(os.getenv("CRAWL_HOST_DELAY", "0.5"))
+CRAWL_MAX_CRAWL_DELAY = float(os.getenv("CRAWL_MAX_CRAWL_DELAY", "10"))
+CRAWL_RESPECT_ROBOTS = os.getenv("CRAWL_RESPECT_ROBOTS", "true").lower() == "true"
+CRAWL_ROBOTS_TTL = float(os.getenv("CRAWL_ROBOTS_TTL", "3600"))
+# Token matched against robots.txt groups; the fetches themselves keep a browser User-Agent
+CRAWL_ROBOTS_AGENT = os.getenv("CRAWL_ROBOTS_AGENT", "*")
+CRAWL_MAX_RETRIES = int(os.getenv("CRAWL_MAX_RETRIES", "2"))
+CRAWL_MAX_RETRY_AFTER = float(os.getenv("CRAWL_MAX_RETRY_AFTER", "60"))
+CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", "10"))
+# Default body cap of fetch_html; callers pass their own per stage
+CRAWL_MAX_PAGE_BYTES = int(os.getenv("CRAWL_MAX_PAGE_BYTES", str(1024 * 1024)))
+DNS_CACHE_TTL = 300.0
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+HTML_ACCEPT = "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1"
+
+RETRY_STATUSES = {429, 503}
+
+CHARSET_SNIFF_BYTES = 2048
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date); None if absent/invalid"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    return max(when.timestamp() - now, 0.0)
+
+
+def is_html_content_type(content_type: str) -> bool:
+    """HTML (or no declared type, which is common on small sites)"""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in ("", "text/html", "application/xhtml+xml")
+
+
+def detect_charset(content_type: str, head: bytes) -> str:
+    """
+    Charset of an HTML body from the Content-Type header, a BOM or a <meta>
+    tag in the first bytes; utf-8 otherwise. (httpx's Response.text would run
+    statistical detection over the whole body when the header has none.)
+    """
+    match = _HEADER_CHARSET.search(content_type)
+    if match is None:
+        if head.startswith(b"\xef\xbb\xbf"):
+            return "utf-8-sig"
+        if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+            return "utf-16"
+        match = _META_CHARSET.search(head)
+    if match is not None:
+        charset = match.group(1)
+        charset = charset.decode("ascii", "ignore") if isinstance(charset, bytes) else charset
+        try:
+            return codecs.lookup(charset.strip().lower()).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+class HtmlPage:
+    """A (possibly truncated) HTML page read by CrawlScheduler.fetch_html"""
+
+    __slots__ = ("url", "status_code", "headers", "content_type", "encoding", "text", "bytes_read", "truncated")
+
+    def __init__(self, url: str, status_code: int, headers: httpx.Headers, content_type: str):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content_type = content_type
+        self.encoding = "utf-8"
+        self.text = ""
+        self.bytes_read = 0
+        self.truncated = False  # the body stopped at max_bytes; text is the partial page
+
+    @property
+    def is_error(self) -> bool:
+        return self.status_code >= 400
+
+
+class _HostState:
+    __slots__ = ("slots", "next_at", "crawl_delay", "backoff_until", "failures")
+
+    def __init__(self, concurrency: int):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.next_at = 0.0  # monotonic time the next request may start
+        self.crawl_delay: Optional[float] = None  # from robots.txt
+        self.backoff_until = 0.0
+        self.failures = 0  # consecutive 429/503 responses
+
+
+class CrawlScheduler:
+    """Per-host / per-IP slots, crawl delays, robots.txt and backoff for website fetches"""
+
+    def __init__(
+        self,
+        max_concurrency: int = CRAWL_MAX_CONCURRENCY,
+        per_host: int = CRAWL_PER_HOST_CONCURRENCY,
+        per_ip: int = CRAWL_PER_IP_CONCURRENCY,
+        host_delay: float = CRAWL_HOST_DELAY,
+        respect_robots: bool = CRAWL_RESPECT_ROBOTS,
+        max_retries: int = CRAWL_MAX_RETRIES,
+        client: Optional[httpx.AsyncClient] = None,
+        resolve: bool = True,
+    ):
+        self.per_host = per_host
+        self.per_ip = per_ip
+        self.host_delay = host_delay
+        self.respect_robots = respect_robots
+        self.max_retries = max_retries
+        self.resolve = resolve
+        self._budget = asyncio.Semaphore(max_concurrency)
+        self._hosts: Dict[str, _HostState] = {}
+        self._ips: Dict[str, asyncio.Semaphore] = {}
+        self._ip_cache: Dict[str, Tuple[float, str]] = {}
+        self._robots: Dict[str, Tuple[float, Optional[RobotFileParser]]] = {}
+        self._robots_loading: Dict[str, asyncio.Future] = {}
+        self._client = client
+        self._owns_client = client is None
+        self.stats = {
+            "fetches": 0, "retries": 0, "robots_blocked": 0,
+            "non_html_aborted": 0, "truncated": 0, "bytes_read": 0,
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=CRAWL_TIMEOUT, follow_redirects=True)
+        return self._client
+
+    async def close(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+        self._client = None
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.per_host)
+        return state
+
+    async def _ip_slots(self, host: str) -> asyncio.Semaphore:
+        key = host
+        if self.resolve:
+            cached = self._ip_cache.get(host)
+            if cached and time.monotonic() - cached[0] < DNS_CACHE_TTL:
+                key = cached[1]
+            else:
+                try:
+                    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                    key = infos[0][4][0] if infos else host
+                except (OSError, UnicodeError):
+                    key = host
+                self._ip_cache[host] = (time.monotonic(), key)
+        slots = self._ips.get(key)
+        if slots is None:
+            slots = self._ips[key] = asyncio.Semaphore(self.per_ip)
+        return slots
+
+    # --- robots.txt ---------------------------------------------------------
+
+    async def _load_robots(self, origin: str) -> Optional[RobotFileParser]:
+        try:
+            response = await self.client.get(
+                f"{origin}/robots.txt", headers={"User-Agent": USER_AGENT}, timeout=5.0
+            )
+        except Exception as e:
+            logger.debug(f"robots.txt unavailable for {origin}: {e}")
+            return None
+        if response.status_code != 200:
+            return None  # 4xx: no rules; 5xx: treated as no rules as well
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        parser.modified()  # marks the rules as loaded (crawl_delay() needs it)
+        return parser
+
+    async def robots(self, origin: str) -> Optional[RobotFileParser]:
+        """Cached robots.txt rules of an origin (None: no rules); concurrent callers share one fetch"""
+        cached = self._robots.get(origin)
+        if cached and time.monotonic() - cached[0] < CRAWL_ROBOTS_TTL:
+            return cached[1]
+        pending = self._robots_loading.get(origin)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._robots_loading[origin] = future
+        try:
+            parser = await self._load_robots(origin)
+            self._robots[origin] = (time.monotonic(), parser)
+            future.set_result(parser)
+            return parser
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when no one else is waiting
+            raise
+        finally:
+            self._robots_loading.pop(origin, None)
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt allows the URL (also picks up the host's Crawl-delay)"""
+        if not self.respect_robots:
+            return True
+        parts = urlsplit(url)
+        parser = await self.robots(f"{parts.scheme}://{parts.netloc}")
+        if parser is None:
+            return True
+        delay = parser.crawl_delay(CRAWL_ROBOTS_AGENT)
+        if delay is not None:
+            self._host(parts.hostname or parts.netloc).crawl_delay = min(float(delay), CRAWL_MAX_CRAWL_DELAY)
+        return parser.can_fetch(CRAWL_ROBOTS_AGENT, url)
+
+    # --- fetching -----------------------------------------------------------
+
+    def _backoff(self, state: _HostState, response: httpx.Response) -> float:
+        state.failures += 1
+        wait = parse_retry_after(response.headers.get("retry-after"))
+        if wait is None:
+            wait = min(2 ** state.failures, CRAWL_MAX_RETRY_AFTER) * (0.5 + random.random() / 2)
+        wait = min(wait, CRAWL_MAX_RETRY_AFTER)
+        state.backoff_until = max(state.backoff_until, time.monotonic() + wait)
+        return wait
+
+    async def _polite(self, url: str, send: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `send` (one request to the URL) under the host's politeness rules:
+        robots.txt, slots, spacing and 429/503 retries. `send` returns an object
+        with status_code and headers (an httpx.Response or an HtmlPage).
+        """
+        if not await self.allowed(url):
+            self.stats["robots_blocked"] += 1
+            raise CrawlDisallowed(url)
+        host = urlsplit(url).hostname or url
+        state = self._host(host)
+        ip_slots = await self._ip_slots(host)
+
+        attempt = 0
+        while True:
+            async with state.slots, ip_slots, self._budget:
+                # Space requests to the host; the slot is held while waiting so the order is kept
+                delay = max(self.host_delay, state.crawl_delay or 0.0)
+                now = time.monotonic()
+                start_at = max(state.next_at, state.backoff_until, now)
+                state.next_at = start_at + delay
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+                self.stats["fetches"] += 1
+                response = await send()
+            if response.status_code not in RETRY_STATUSES:
+                state.failures = 0
+                return response
+            wait = self._backoff(state, response)
+            if attempt >= self.max_retries:
+                return response
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.info(f"⏳ [CRAWL] {host} returned {response.status_code} - retrying in {wait:.1f}s")
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+        """
+        GET a page politely. Raises CrawlDisallowed if robots.txt forbids it and
+        httpx errors as usual; returns the last response (possibly a 429/503)
+        once retries are used up.
+        """
+        request_headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        return await self._polite(url, lambda: self.client.get(url, headers=request_headers, **kwargs))
+
+    async def fetch_html(
+        self,
+        url: str,
+        max_bytes: int = CRAWL_MAX_PAGE_BYTES,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> "HtmlPage":
+        """
+        GET an HTML page politely, streaming at most max_bytes of the body.
+
+        Raises CrawlDisallowed (robots.txt), UnsupportedContent (not HTML -
+        nothing past the headers is downloaded) and httpx errors. Error
+        statuses are returned with an empty body.
+        """
+        request_headers = {"User-Agent": USER_AGENT, "Accept": HTML_ACCEPT, **(headers or {})}
+        return await self._polite(url, lambda: self._read_html(url, request_headers, max_bytes))
+
+    async def _read_html(self, url: str, headers: Dict[str, str], max_bytes: int) -> "HtmlPage":
+        async with self.client.stream("GET", url, headers=headers) as response:
+            content_type = response.headers.get("content-type", "")
+            page = HtmlPage(str(response.url), response.status_code, response.headers, content_type)
+            if response.status_code >= 400:
+                return page
+            if not is_html_content_type(content_type):
+                self.stats["non_html_aborted"] += 1
+                raise UnsupportedContent(url, content_type)
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= max_bytes:
+                    del body[max_bytes:]
+                    page.truncated = True
+                    self.stats["truncated"] += 1
+                    break  # leaving the stream context closes the connection
+        self.stats["bytes_read"] += len(body)
+        page.bytes_read = len(body)
+        page.encoding = detect_charset(content_type, bytes(body[:CHARSET_SNIFF_BYTES]))
+        page.text = body.decode(page.encoding, errors="replace")
+        return page
+
+
+_scheduler: Optional[CrawlScheduler] = None
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    """Process-wide scheduler shared by all website fetches"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = CrawlScheduler()
+    return _scheduler
+
+
+async def close_crawl_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.close()
+        _scheduler = None
@@ -0,0 +1,262 @@
+"""
+Set-based prospect deduplication.
+
+Duplicates (same domain, case-insensitive) are resolved inside PostgreSQL
+instead of loading every prospect into Python:
+- ROW_NUMBER() OVER (PARTITION BY lower(domain) ORDER BY ...) ranks each
+  domain's rows; rank 1 is the survivor (has email, then most recently
+  updated, then most recently created, then id as a stable tie-break)
+- Useful fields from the losers (email, category, location, keywords,
+  payloads, ...) are merged into the survivor where the survivor has none,
+  email_logs / email_attachments are re-pointed to the survivor, and the
+  losers are deleted - all in ONE statement per batch
+- Work is split into batches of duplicate domains, each its own short
+  transaction, so no long-running transaction holds locks on prospects
+- dry_run=True only counts what would be removed
+"""
+import os
+import time
+from typing import Any, Dict, List
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Duplicate domains resolved per statement/transaction
+DEDUP_BATCH_DOMAINS = int(os.getenv("DEDUP_BATCH_DOMAINS", "2000"))
+
+# Survivor ranking - rank 1 is kept
+RANK_ORDER = """
+    (contact_email IS NOT NULL AND btrim(contact_email) <> '') DESC,
+    updated_at DESC NULLS LAST,
+    created_at DESC NULLS LAST,
+    id
+"""
+
+# Columns copied from the best-ranked loser when the survivor's value is NULL
+MERGE_COLUMNS = [
+    "contact_email",
+    "contact_method",
+    "page_url",
+    "page_title",
+    "discovery_query_id",
+    "discovery_category",
+    "discovery_location",
+    "discovery_keywords",
+    "scrape_source_url",
+    "serp_intent",
+    "serp_confidence",
+    "serp_signals",
+]
+
+# Numeric columns where the survivor takes the highest value seen
+MAX_COLUMNS = ["da_est", "score"]
+
+# prospect_payloads columns copied from the best-ranked loser when the survivor has none
+PAYLOAD_MERGE_COLUMNS = ["dataforseo_payload", "snov_payload", "scrape_payload", "verification_payload"]
+
+COUNT_DUPLICATES_SQL = f"""
+SELECT
+    count(*) FILTER (WHERE rn > 1) AS duplicates,
+    count(*) FILTER (WHERE rn = 2) AS domains
+FROM (
+    SELECT row_number() OVER (PARTITION BY lower(domain) ORDER BY {RANK_ORDER}) AS rn
+    FROM prospects
+) ranked
+"""
+
+DUPLICATE_DOMAINS_SQL = """
+SELECT lower(domain) AS domain_key
+FROM prospects
+GROUP BY lower(domain)
+HAVING count(*) > 1
+"""
+
+
+def _build_merge_statement() -> str:
+    """One statement per batch: rank, merge into survivor, re-point children, delete losers."""
+    merge_aggregates = ",\n        ".join(
+        f"(array_agg(p.{col} ORDER BY l.rn) FILTER (WHERE p.{col} IS NOT NULL))[1] AS {col}"
+        for col in MERGE_COLUMNS
+    ) + ",\n        " + ",\n        ".join(f"max(p.{col}) AS {col}" for col in MAX_COLUMNS)
+    # Only survivors that actually gain a value are rewritten; an UPDATE touches
+    # every index on prospects, so no-op merges would dominate the run time
+    gains_value = "\n        OR ".join(
+        [f"(s.{col} IS NULL AND m.{col} IS NOT NULL)" for col in MERGE_COLUMNS]
+        + [f"m.{col} > COALESCE(s.{col}, m.{col} - 1)" for col in MAX_COLUMNS]
+    )
+    payload_aggregates = ",\n        ".join(
+        f"(array_agg(pp.{col} ORDER BY l.rn) FILTER (WHERE pp.{col} IS NOT NULL))[1] AS {col}"
+        for col in PAYLOAD_MERGE_COLUMNS
+    )
+    payload_columns = ", ".join(PAYLOAD_MERGE_COLUMNS)
+    payload_assignments = ",\n        ".join(
+        f"{col} = COALESCE(prospect_payloads.{col}, EXCLUDED.{col})" for col in PAYLOAD_MERGE_COLUMNS
+    )
+    merge_assignments = ",\n        ".join(
+        f"{col} = COALESCE(s.{col}, m.{col})" for col in MERGE_COLUMNS
+    ) + ",\n        " + ",\n        ".join(
+        f"{col} = GREATEST(s.{col}, m.{col})" for col in MAX_COLUMNS
+    )
+    return f"""
+WITH ranked AS (
+    SELECT
+        id,
+        row_number() OVER w AS rn,
+        first_value(id) OVER w AS survivor_id
+    FROM prospects
+    WHERE lower(domain) = ANY(:domain_keys)
+    WINDOW w AS (PARTITION BY lower(domain) ORDER BY {RANK_ORDER})
+),
+losers AS (
+    SELECT id, survivor_id, rn FROM ranked WHERE rn > 1
+),
+merged_values AS (
+    SELECT
+        l.survivor_id,
+        {merge_aggregates}
+    FROM losers l
+    JOIN prospects p ON p.id = l.id
+    GROUP BY l.survivor_id
+),
+merged AS (
+    UPDATE prospects s SET
+        {merge_assignments},
+        updated_at = now()
+    FROM merged_values m
+    WHERE s.id = m.survivor_id
+      AND (
+        {gains_value}
+      )
+    RETURNING s.id
+),
+payload_values AS (
+    SELECT
+        l.survivor_id,
+        {payload_aggregates}
+    FROM losers l
+    JOIN prospect_payloads pp ON pp.prospect_id = l.id
+    GROUP BY l.survivor_id
+),
+merged_payloads AS (
+    -- The losers' own payload rows go with them (ON DELETE CASCADE)
+    INSERT INTO prospect_payloads (prospect_id, {payload_columns}, updated_at)
+    SELECT survivor_id, {payload_columns}, now() FROM payload_values
+    ON CONFLICT (prospect_id) DO UPDATE SET
+        {payload_assignments},
+        updated_at = now()
+    RETURNING prospect_id
+),
+moved_logs AS (
+    UPDATE email_logs e SET prospect_id = l.survivor_id
+    FROM losers l
+    WHERE e.prospect_id = l.id
+    RETURNING e.id
+),
+moved_attachments AS (
+    UPDATE email_attachments a SET prospect_id = l.survivor_id
+    FROM losers l
+    WHERE a.prospect_id = l.id
+    RETURNING a.id
+),
+deleted AS (
+    DELETE FROM prospects p
+    USING losers l
+    WHERE p.id = l.id
+    RETURNING p.id
+)
+SELECT
+    (SELECT count(*) FROM deleted) AS deleted,
+    (SELECT count(*) FROM merged) AS survivors,
+    (SELECT count(*) FROM merged_payloads) AS merged_payloads,
+    (SELECT count(*) FROM moved_logs) AS moved_logs,
+    (SELECT count(*) FROM moved_attachments) AS moved_attachments
+"""
+
+
+MERGE_AND_DELETE_SQL = _build_merge_statement()
+
+
+async def count_duplicates(db: AsyncSession) -> Dict[str, int]:
+    """
+    Count duplicate prospects without modifying anything.
+
+    Returns:
+        {"duplicates_found": rows that would be deleted, "domains": duplicated domains}
+    """
+    row = (await db.execute(text(COUNT_DUPLICATES_SQL))).one()
+    return {"duplicates_found": int(row.duplicates or 0), "domains": int(row.domains or 0)}
+
+
+async def deduplicate_prospects_by_domain(
+    db: AsyncSession,
+    dry_run: bool = False,
+    batch_domains: int = DEDUP_BATCH_DOMAINS,
+) -> Dict[str, Any]:
+    """
+    Remove duplicate prospects by domain, keeping and enriching the best row.
+
+    Args:
+        db: Database session (committed after every batch)
+        dry_run: Only count duplicates, delete nothing
+        batch_domains: Duplicate domains resolved per transaction
+
+    Returns:
+        Stats dict: duplicates_found, domains, deleted, merged, merged_payloads,
+        moved_email_logs, moved_attachments, batches, dry_run, elapsed_ms
+    """
+    started = time.perf_counter()
+
+    if dry_run:
+        counts = await count_duplicates(db)
+        return {
+            **counts,
+            "deleted": 0,
+            "merged": 0,
+            "merged_payloads": 0,
+            "moved_email_logs": 0,
+            "moved_attachments": 0,
+            "batches": 0,
+            "dry_run": True,
+            "elapsed_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    domain_keys: List[str] = list((await db.execute(text(DUPLICATE_DOMAINS_SQL))).scalars())
+    # Release the snapshot before the write batches start
+    await db.commit()
+
+    stats = {
+        "duplicates_found": 0,
+        "domains": len(domain_keys),
+        "deleted": 0,
+        "merged": 0,
+        "merged_payloads": 0,
+        "moved_email_logs": 0,
+        "moved_attachments": 0,
+        "batches": 0,
+        "dry_run": False,
+    }
+    for start in range(0, len(domain_keys), batch_domains):
+        batch = domain_keys[start:start + batch_domains]
+        try:
+            row = (await db.execute(text(MERGE_AND_DELETE_SQL), {"domain_keys": batch})).one()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        stats["deleted"] += int(row.deleted)
+        stats["merged"] += int(row.survivors)
+        stats["merged_payloads"] += int(row.merged_payloads)
+        stats["moved_email_logs"] += int(row.moved_logs)
+        stats["moved_attachments"] += int(row.moved_attachments)
+        stats["batches"] += 1
+        logger.info(
+            f"🧹 [DEDUP] Batch {stats['batches']}: {len(batch)} domains, "
+            f"deleted {row.deleted}, merged into {row.survivors} survivors"
+        )
+
+    stats["duplicates_found"] = stats["deleted"]
+    stats["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+    return stats
@@ -0,0 +1,239 @@
+"""
+DNS / MX preflight for discovered domains.
+
+A large share of discovered domains are parked, expired or have no mail
+server. Resolving them first is milliseconds; crawling ~60 URLs against a
+dead host is minutes of connect timeouts. The preflight:
+- Resolves A, AAAA and MX concurrently per domain (at most DNS_CONCURRENCY
+  lookups in flight), each query bounded by DNS_TIMEOUT seconds
+- Caches answers per domain for their record TTL (clamped to
+  DNS_MIN_TTL..DNS_MAX_TTL); negative answers for DNS_NEGATIVE_TTL
+- Classifies the domain (dns_status on the prospect):
+    ok          - has an address and a mail server
+    no_mx       - has an address but no MX (or a null MX "."): website up, no mail
+    no_address  - no A/AAAA record: nothing to crawl
+    nxdomain    - the domain does not exist
+    unresolved  - timeouts / server failures: unknown, treated as alive
+- Concurrent checks of the same domain share one lookup
+
+Scraping and enrichment skip dead domains (nxdomain / no_address);
+verification skips addresses whose domain has no mail server.
+
+Uses dnspython's async resolver (DNS_NAMESERVERS overrides the system
+resolvers). Without dnspython, addresses come from the event loop's
+getaddrinfo and MX presence is unknown.
+"""
+import asyncio
+import os
+import socket
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.rdatatype
+    import dns.resolver
+except ImportError:  # pragma: no cover - optional dependency
+    dns = None
+
+logger = logging.getLogger(__name__)
+
+DNS_CONCURRENCY = int(os.getenv("DNS_CONCURRENCY", "50"))
+DNS_TIMEOUT = float(os.getenv("DNS_TIMEOUT", "3"))
+DNS_MIN_TTL = float(os.getenv("DNS_MIN_TTL", "60"))
+DNS_MAX_TTL = float(os.getenv("DNS_MAX_TTL", "3600"))
+DNS_NEGATIVE_TTL = float(os.getenv("DNS_NEGATIVE_TTL", "300"))
+DNS_NAMESERVERS = [ns.strip() for ns in os.getenv("DNS_NAMESERVERS", "").split(",") if ns.strip()]
+
+OK = "ok"
+NO_MX = "no_mx"
+NO_ADDRESS = "no_address"
+NXDOMAIN = "nxdomain"
+UNRESOLVED = "unresolved"
+
+DEAD_STATUSES = {NO_ADDRESS, NXDOMAIN}
+
+
+class DomainDns:
+    """Preflight result of one domain"""
+
+    __slots__ = ("domain", "status", "addresses", "mx")
+
+    def __init__(self, domain: str, status: str, addresses: Optional[List[str]] = None, mx: Optional[List[str]] = None):
+        self.domain = domain
+        self.status = status
+        self.addresses = addresses or []
+        self.mx = mx  # None: unknown (lookup failed or no dnspython)
+
+    @property
+    def is_dead(self) -> bool:
+        """Nothing to crawl: the domain does not exist or has no address"""
+        return self.status in DEAD_STATUSES
+
+    @property
+    def accepts_mail(self) -> Optional[bool]:
+        """Whether the domain has a mail server; None when unknown"""
+        if self.status == NXDOMAIN:
+            return False
+        if self.mx is None:
+            return None
+        return bool(self.mx)
+
+    def __repr__(self) -> str:
+        return f"DomainDns({self.domain!r}, {self.status!r}, addresses={self.addresses}, mx={self.mx})"
+
+
+def classify(domain: str, addresses: List[str], mx: Optional[List[str]], nxdomain: bool, failed: bool) -> DomainDns:
+    if nxdomain:
+        return DomainDns(domain, NXDOMAIN, [], [])
+    if failed and not addresses:
+        return DomainDns(domain, UNRESOLVED, [], mx)
+    if not addresses:
+        return DomainDns(domain, NO_ADDRESS, [], mx)
+    if mx is not None and not mx:
+        return DomainDns(domain, NO_MX, addresses, mx)
+    return DomainDns(domain, OK, addresses, mx)
+
+
+class DnsPreflight:
+    """Cached, concurrency-bounded A/AAAA/MX resolver"""
+
+    def __init__(
+        self,
+        nameservers: Optional[List[str]] = None,
+        port: int = 53,
+        timeout: float = DNS_TIMEOUT,
+        concurrency: int = DNS_CONCURRENCY,
+    ):
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(concurrency)
+        self._cache: Dict[str, Tuple[float, DomainDns]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._resolver = None
+        if dns is not None:
+            nameservers = nameservers or DNS_NAMESERVERS
+            try:
+                self._resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+            except dns.resolver.NoResolverConfiguration:
+                logger.warning("⚠️  [DNS] No resolver configuration - falling back to getaddrinfo (MX unknown)")
+            else:
+                if nameservers:
+                    self._resolver.nameservers = nameservers
+                    self._resolver.port = port
+                self._resolver.lifetime = timeout
+        self.stats = {"lookups": 0, "cache_hits": 0}
+
+    async def check(self, domain: str) -> DomainDns:
+        """Preflight one domain (cached; concurrent callers share the lookup)"""
+        domain = domain.strip().lower().rstrip(".")
+        cached = self._cache.get(domain)
+        if cached and cached[0] > time.monotonic():
+            self.stats["cache_hits"] += 1
+            return cached[1]
+        pending = self._pending.get(domain)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[domain] = future
+        try:
+            async with self._slots:
+                self.stats["lookups"] += 1
+                result, ttl = await self._lookup(domain)
+            if ttl > 0:
+                self._cache[domain] = (time.monotonic() + ttl, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when no one else is waiting
+            raise
+        finally:
+            self._pending.pop(domain, None)
+
+    async def check_many(self, domains: Iterable[str]) -> Dict[str, DomainDns]:
+        """Preflight several domains concurrently; keyed by the domains as given"""
+        unique = list(dict.fromkeys(d for d in domains if d))
+        results = await asyncio.gather(*(self.check(d) for d in unique))
+        return dict(zip(unique, results))
+
+    async def _lookup(self, domain: str) -> Tuple[DomainDns, float]:
+        if self._resolver is None:
+            return await self._lookup_getaddrinfo(domain)
+
+        answers = await asyncio.gather(
+            *(self._query(domain, rdtype) for rdtype in ("A", "AAAA", "MX"))
+        )
+        nxdomain = any(answer == NXDOMAIN for answer in answers)
+        failed = any(answer is None for answer in answers)
+        addresses: List[str] = []
+        ttls: List[float] = []
+        for answer in answers[:2]:
+            if isinstance(answer, tuple):
+                addresses.extend(answer[0])
+                ttls.append(answer[1])
+        mx_answer = answers[2]
+        mx: Optional[List[str]]
+        if isinstance(mx_answer, tuple):
+            mx = mx_answer[0]
+            ttls.append(mx_answer[1])
+        else:
+            mx = None if mx_answer is None else []
+
+        result = classify(domain, addresses, mx, nxdomain, failed)
+        if result.status == UNRESOLVED:
+            return result, 0.0  # retried on the next check
+        if result.status in DEAD_STATUSES or not ttls:
+            return result, DNS_NEGATIVE_TTL
+        return result, min(max(min(ttls), DNS_MIN_TTL), DNS_MAX_TTL)
+
+    async def _query(self, domain: str, rdtype: str):
+        """
+        (values, ttl) for an answer, [] for no records of the type, NXDOMAIN
+        for a missing domain and None when the lookup failed
+        """
+        try:
+            answer = await self._resolver.resolve(domain, rdtype, lifetime=self.timeout, search=False)
+        except dns.resolver.NXDOMAIN:
+            return NXDOMAIN
+        except dns.resolver.NoAnswer:
+            return []
+        except (dns.exception.Timeout, dns.resolver.NoNameservers) as e:
+            logger.debug(f"DNS {rdtype} lookup failed for {domain}: {e}")
+            return None
+        except dns.exception.DNSException as e:
+            logger.debug(f"DNS {rdtype} lookup error for {domain}: {e}")
+            return None
+        if rdtype == "MX":
+            # A null MX (RFC 7505, exchange ".") means the domain accepts no mail
+            values = [str(r.exchange).rstrip(".") for r in answer if str(r.exchange) != "."]
+        else:
+            values = [r.to_text() for r in answer]
+        return values, float(answer.rrset.ttl if answer.rrset is not None else DNS_MIN_TTL)
+
+    async def _lookup_getaddrinfo(self, domain: str) -> Tuple[DomainDns, float]:
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(domain, None, type=socket.SOCK_STREAM),
+                timeout=self.timeout,
+            )
+        except socket.gaierror as e:
+            if e.errno == socket.EAI_NONAME:
+                return DomainDns(domain, NXDOMAIN, [], []), DNS_NEGATIVE_TTL
+            return DomainDns(domain, UNRESOLVED), 0.0
+        except (asyncio.TimeoutError, OSError, UnicodeError):
+            return DomainDns(domain, UNRESOLVED), 0.0
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return classify(domain, addresses, None, False, False), DNS_MIN_TTL
+
+
+_preflight: Optional[DnsPreflight] = None
+
+
+def get_dns_preflight() -> DnsPreflight:
+    """Process-wide preflight resolver (shares its cache across jobs)"""
+    global _preflight
+    if _preflight is None:
+        _preflight = DnsPreflight()
+    return _preflight
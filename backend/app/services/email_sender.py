@@ -8,15 +8,15 @@ import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
+from email.utils import make_msgid
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from app.models.prospect import Prospect, SendStatus
 from app.models.email_log import EmailLog
-from app.models.email_attachment import EmailAttachment
+from app.services.attachment_store import load_attachment_parts
 from app.clients.gmail import GmailClient
+from app.utils.metrics import record_provider_error, span
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +30,11 @@ def _smtp_configured() -> bool:
     )
 
 
-async def _get_attachments(db: AsyncSession, prospect_id: str) -> list[EmailAttachment]:
-    result = await db.execute(
-        select(EmailAttachment).where(
-            (EmailAttachment.scope == "global")
-            | (EmailAttachment.prospect_id == prospect_id)
-        )
-    )
-    return result.scalars().all()
-
-
 def _send_email_smtp(
     to_email: str,
     subject: str,
     body: str,
-    attachments: Optional[list[EmailAttachment]] = None
+    attachments: Optional[list[MIMEBase]] = None
 ) -> Dict[str, Any]:
     host = os.getenv("SMTP_HOST")
     port = int(os.getenv("SMTP_PORT", "587"))
@@ -57,16 +47,13 @@ def _send_email_smtp(
     message["to"] = to_email
     message["subject"] = subject
     message["from"] = from_email
+    # Our own Message-ID, so replies can be matched by In-Reply-To / References
+    message_id_header = make_msgid(domain=from_email.split("@")[-1] if from_email and "@" in from_email else None)
+    message["Message-ID"] = message_id_header
     message.attach(MIMEText(body, "html"))
 
-    for attachment in attachments or []:
-        part = MIMEBase("application", "octet-stream")
-        part.set_payload(attachment.data)
-        encoders.encode_base64(part)
-        part.add_header(
-            "Content-Disposition",
-            f"attachment; filename=\"{attachment.filename}\"",
-        )
+    # Parts are pre-encoded and shared across sends (services/attachment_store.py)
+    for part in attachments or []:
         message.attach(part)
 
     try:
@@ -75,7 +62,7 @@ def _send_email_smtp(
                 server.starttls()
             server.login(username, password)
             server.sendmail(from_email, [to_email], message.as_string())
-        return {"success": True, "message_id": "smtp"}
+        return {"success": True, "message_id": "smtp", "message_id_header": message_id_header}
     except Exception as e:
         logger.error(f"❌ [SEND] SMTP send failed: {e}")
         return {"success": False, "error": "SMTP send failed", "error_detail": str(e)}
@@ -125,13 +112,16 @@ async def send_prospect_email(
     # SMTP path (app password) if configured
     if _smtp_configured():
         logger.info("📧 [SEND] Using SMTP sender (app password)")
-        attachments = await _get_attachments(db, str(prospect.id))
-        send_result = _send_email_smtp(
-            to_email=prospect.contact_email,
-            subject=subject,
-            body=body,
-            attachments=attachments
-        )
+        attachments = await load_attachment_parts(db, str(prospect.id))
+        with span("send"):
+            send_result = _send_email_smtp(
+                to_email=prospect.contact_email,
+                subject=subject,
+                body=body,
+                attachments=attachments
+            )
+        if not send_result.get("success"):
+            record_provider_error("smtp", "unsuccessful")
     else:
         # Initialize Gmail client if not provided
         if not gmail_client:
@@ -169,10 +159,12 @@ async def send_prospect_email(
 
     if not _smtp_configured():
         try:
+            attachments = await load_attachment_parts(db, str(prospect.id))
             send_result = await gmail_client.send_email(
                 to_email=prospect.contact_email,
                 subject=subject,
-                body=body
+                body=body,
+                attachments=attachments
             )
         except Exception as send_err:
             logger.error(f"❌ [SEND] Gmail API call failed: {send_err}", exc_info=True)
@@ -199,7 +191,10 @@ async def send_prospect_email(
         prospect_id=prospect.id,
         subject=subject,
         body=body,
-        response=send_result
+        response=send_result,
+        gmail_thread_id=send_result.get("thread_id"),
+        gmail_message_id=send_result.get("message_id") if send_result.get("thread_id") else None,
+        message_id_header=send_result.get("message_id_header")
     )
     db.add(email_log)
     
@@ -3,27 +3,42 @@ STRICT MODE enrichment service - ONLY saves emails found explicitly on websites.
 
 Rules:
 - Emails must be extracted from actual HTML content
-- Snov.io emails are ONLY accepted if source = "website" is explicitly stated
+- Snov.io / Hunter.io emails are ONLY accepted if a website source is explicitly stated
+- Which of scraping / Snov.io / Hunter.io run, and in what order, is decided
+  per domain by services/enrichment_router.py
 - NO pattern generation, NO guessing, NO fallbacks
 - If no email found → return "no_email_found" status
 """
 import logging
+import os
 import time
-import re
 import httpx
 from typing import Optional, Dict, Any, List, Set
 from app.utils.domain import normalize_domain, validate_domain
 from app.utils.email_validation import is_plausible_email
-from app.services.exceptions import RateLimitError
+from app.utils.email_extraction import extract_emails_with_priority
+from app.services.exceptions import CrawlDisallowed, RateLimitError, UnsupportedContent
+from app.services.crawl_scheduler import get_crawl_scheduler
+from app.services.dns_preflight import get_dns_preflight
+from app.services.enrichment_router import HUNTER, SCRAPE, SNOV, get_enrichment_router
+from app.services.provider_state import get_provider_state
+from app.utils.metrics import span
 
 logger = logging.getLogger(__name__)
 
+# Bytes of a page read for email extraction (contact details usually sit in the first few hundred KB)
+SCRAPE_MAX_PAGE_BYTES = int(os.getenv("SCRAPE_MAX_PAGE_BYTES", str(1024 * 1024)))
+
 
 def _extract_emails_from_html(html_content: str, domain: Optional[str] = None) -> list[tuple[str, int]]:
     """
     Extract email addresses from HTML content using multiple methods.
     Handles obfuscated emails and various formats.
     
+    Delegates to the single-pass engine in app.utils.email_extraction, which
+    decodes obfuscations ([at], &#64;, Cloudflare data-cfemail, JS string
+    concatenation) and finds mailto: and plain-text addresses in one scan.
+    
     Returns list of (email, priority_score) tuples, sorted by priority (highest first).
     Priority scoring:
     - 100: Email from mailto: link AND matches domain
@@ -34,76 +49,7 @@ def _extract_emails_from_html(html_content: str, domain: Optional[str] = None) -
     - 50: Other valid email
     - 0: Filtered out (invalid/false positive)
     """
-    if not html_content:
-        return []
-    
-    emails_found: Set[str] = set()
-    emails_with_priority: List[tuple[str, int]] = []
-    
-    # Extract domain for matching
-    domain_lower = domain.lower() if domain else None
-    
-    # Method 1: Extract from mailto: links (highest priority)
-    mailto_pattern = r'mailto:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-    mailto_matches = re.finditer(mailto_pattern, html_content, re.IGNORECASE)
-    for match in mailto_matches:
-        email = match.group(1).lower().strip()
-        if email not in emails_found and is_plausible_email(email):
-            emails_found.add(email)
-            # Check if email matches domain
-            if domain_lower and domain_lower in email:
-                priority = 100  # mailto + domain match
-            else:
-                priority = 90  # mailto only
-            emails_with_priority.append((email, priority))
-    
-    # Method 2: Extract plain email addresses from text
-    # More restrictive pattern to avoid false positives
-    email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-    text_matches = re.finditer(email_pattern, html_content, re.IGNORECASE)
-    
-    common_contact_emails = ['info', 'contact', 'support', 'hello', 'hi', 'sales', 'help', 'admin', 'team']
-    
-    for match in text_matches:
-        email = match.group(0).lower().strip()
-        if email in emails_found:
-            continue
-        
-        if not is_plausible_email(email):
-            continue
-        
-        # Skip common false positives
-        if any(skip in email for skip in ['example.com', 'test@', 'noreply', 'no-reply', 'donotreply']):
-            continue
-        
-        emails_found.add(email)
-        
-        # Calculate priority
-        local_part = email.split('@')[0]
-        if domain_lower and domain_lower in email:
-            if local_part in common_contact_emails:
-                priority = 80  # domain match + common contact
-            else:
-                priority = 70  # domain match
-        elif local_part in common_contact_emails:
-            priority = 60  # common contact
-        else:
-            priority = 50  # other valid email
-        
-        emails_with_priority.append((email, priority))
-    
-    # Sort by priority (highest first)
-    emails_with_priority.sort(key=lambda x: x[1], reverse=True)
-    
-    # Filter out duplicates and invalid emails
-    filtered = []
-    seen = set()
-    for email, priority in emails_with_priority:
-        if email not in seen and is_plausible_email(email):
-            seen.add(email)
-            filtered.append((email, priority))
-    
-    return filtered
+    return extract_emails_with_priority(html_content, domain)
 
 
 async def _scrape_email_from_url(url: str, domain: Optional[str] = None) -> Optional[str]:
@@ -112,38 +58,39 @@ async def _scrape_email_from_url(url: str, domain: Optional[str] = None) -> Opti
     Returns the best email found (highest priority), or None.
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
-            response.raise_for_status()
-            html = response.text
-            
-            # Extract domain from URL if not provided
-            if not domain:
-                try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url)
-                    domain = parsed.netloc.replace('www.', '')
-                except:
-                    pass
-            
+        with span("page.fetch"):
+            # Per-host / per-IP slots, crawl delay, robots.txt and 429 backoff;
+            # non-HTML bodies are not downloaded and pages stop at SCRAPE_MAX_PAGE_BYTES
+            page = await get_crawl_scheduler().fetch_html(url, max_bytes=SCRAPE_MAX_PAGE_BYTES)
+        if page.is_error:
+            logger.debug(f"HTTP error scraping {url}: {page.status_code}")
+            return None
+        html = page.text  # partial page when truncated - extraction runs on what was read
+        
+        # Extract domain from URL if not provided
+        if not domain:
+            try:
+                from urllib.parse import urlparse
+                parsed = urlparse(url)
+                domain = parsed.netloc.replace('www.', '')
+            except:
+                pass
+        
+        with span("extraction"):
             emails_with_priority = _extract_emails_from_html(html, domain)
-            if emails_with_priority:
-                # Get the highest priority email
-                best_email, best_priority = emails_with_priority[0]
-                # Double-check plausibility before returning
-                if is_plausible_email(best_email):
-                    logger.info(f"✅ [SCRAPING] Found {len(emails_with_priority)} email(s) on {url}. Best: {best_email} (priority: {best_priority})")
-                    if len(emails_with_priority) > 1:
-                        logger.debug(f"   Other emails found: {[e[0] for e in emails_with_priority[1:3]]}")
-                    return best_email
-                else:
-                    logger.debug(f"🚫 [SCRAPING] Best email candidate failed plausibility check: {best_email}")
-            else:
-                logger.debug(f"⚠️  [SCRAPING] No valid emails found in HTML for {url}")
-    except httpx.HTTPStatusError as e:
-        logger.debug(f"HTTP error scraping {url}: {e.response.status_code}")
+        if emails_with_priority:
+            # Get the highest priority email (already validated by the extractor)
+            best_email, best_priority = emails_with_priority[0]
+            logger.info(f"✅ [SCRAPING] Found {len(emails_with_priority)} email(s) on {url}. Best: {best_email} (priority: {best_priority})")
+            if len(emails_with_priority) > 1:
+                logger.debug(f"   Other emails found: {[e[0] for e in emails_with_priority[1:3]]}")
+            return best_email
+        else:
+            logger.debug(f"⚠️  [SCRAPING] No valid emails found in HTML for {url}")
+    except CrawlDisallowed:
+        logger.debug(f"robots.txt disallows {url} - skipped")
+    except UnsupportedContent as e:
+        logger.debug(f"Skipped {url}: {e}")
     except Exception as e:
         logger.debug(f"Local email scraping failed for {url}: {e}")
     
@@ -235,16 +182,134 @@ def _is_snov_email_from_website(email_data: Dict[str, Any]) -> bool:
     return False
 
 
-async def enrich_prospect_email(domain: str, name: Optional[str] = None, page_url: Optional[str] = None) -> Dict[str, Any]:
+def _is_hunter_email_from_website(email_data: Dict[str, Any]) -> bool:
+    """
+    Check if a Hunter.io domain-search email was seen on a web page.
+
+    STRICT MODE: Hunter lists the pages an address was found on under
+    "sources"; addresses without any source URI are rejected.
+    """
+    sources = email_data.get("sources")
+    return isinstance(sources, list) and any(isinstance(src, dict) and src.get("uri") for src in sources)
+
+
+async def _find_by_scraping(domain: str, page_url: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Route "scrape": emails on the website's own pages"""
+    try:
+        emails_by_page = await _scrape_emails_from_domain(domain, page_url)
+    except Exception as scrape_err:
+        logger.error(f"❌ [ENRICHMENT] HTML scraping failed for {domain}: {scrape_err}", exc_info=True)
+        return None
+    emails: List[str] = []
+    for url, page_emails in emails_by_page.items():
+        for email in page_emails:
+            if is_plausible_email(email) and email not in emails:
+                emails.append(email)
+                logger.info(f"✅ [ENRICHMENT] Email found on {url}: {email}")
+    return {"emails": emails, "emails_by_page": emails_by_page, "pages_crawled": list(emails_by_page.keys())}
+
+
+async def _find_by_snov(domain: str) -> Optional[Dict[str, Any]]:
+    """Route "snov": Snov.io domain search, website-source emails only"""
+    provider_state = get_provider_state()
+    try:
+        from app.clients.snov import SnovIOClient
+        snov_result = await SnovIOClient().domain_search(domain)
+    except RateLimitError as rate_err:
+        # Share the restriction with every worker so nobody keeps hitting a 429
+        if rate_err.retry_after:
+            await provider_state.set_restricted("snov", rate_err.retry_after)
+        logger.warning(f"⚠️  [ENRICHMENT] Skipping Snov.io for {domain}: {rate_err}")
+        return None
+    except Exception as snov_err:
+        logger.warning(f"⚠️  [ENRICHMENT] Snov.io check failed for {domain}: {snov_err}")
+        return None
+    if not snov_result.get("success"):
+        logger.info(f"ℹ️  [ENRICHMENT] Snov.io failed for {domain}: {snov_result.get('error')}")
+        return None
+
+    emails: List[str] = []
+    rejected = 0
+    for email_data in snov_result.get("emails") or []:
+        if not isinstance(email_data, dict):
+            continue
+        email_value = email_data.get("value")
+        if not email_value or not is_plausible_email(email_value):
+            continue
+        # STRICT MODE: Only accept if explicitly from website
+        if _is_snov_email_from_website(email_data):
+            if email_value not in emails:
+                emails.append(email_value)
+                logger.info(f"✅ [ENRICHMENT] Accepted Snov.io email (website source): {email_value}")
+        else:
+            rejected += 1
+            logger.warning(f"🚫 [ENRICHMENT] Rejected Snov.io email (no website source): {email_value}")
+    return {"emails": emails, "rejected": rejected}
+
+
+async def _find_by_hunter(domain: str) -> Optional[Dict[str, Any]]:
+    """Route "hunter": Hunter.io domain search, emails with a web source only"""
+    provider_state = get_provider_state()
+    try:
+        from app.clients.hunter import HunterIOClient
+        hunter_result = await HunterIOClient().domain_search(domain)
+    except RateLimitError as rate_err:
+        if rate_err.retry_after:
+            await provider_state.set_restricted("hunter", rate_err.retry_after)
+        logger.warning(f"⚠️  [ENRICHMENT] Skipping Hunter.io for {domain}: {rate_err}")
+        return None
+    except Exception as hunter_err:
+        logger.warning(f"⚠️  [ENRICHMENT] Hunter.io check failed for {domain}: {hunter_err}")
+        return None
+    if not hunter_result.get("success"):
+        logger.info(f"ℹ️  [ENRICHMENT] Hunter.io failed for {domain}: {hunter_result.get('error')}")
+        return None
+
+    # The formatted emails drop the sources; the raw response keeps them
+    raw_emails = ((hunter_result.get("raw_response") or {}).get("data") or {}).get("emails") or []
+    emails: List[str] = []
+    rejected = 0
+    for email_data in raw_emails:
+        if not isinstance(email_data, dict):
+            continue
+        email_value = email_data.get("value")
+        if not email_value or not is_plausible_email(email_value):
+            continue
+        if _is_hunter_email_from_website(email_data):
+            if email_value not in emails:
+                emails.append(email_value)
+                logger.info(f"✅ [ENRICHMENT] Accepted Hunter.io email (website source): {email_value}")
+        else:
+            rejected += 1
+            logger.warning(f"🚫 [ENRICHMENT] Rejected Hunter.io email (no website source): {email_value}")
+    return {"emails": emails, "rejected": rejected}
+
+
+# Route name -> source recorded on the prospect when that route finds the email
+ROUTE_SOURCES = {SCRAPE: "html_scraping", SNOV: "snov_website", HUNTER: "hunter_website"}
+
+
+async def enrich_prospect_email(
+    domain: str,
+    name: Optional[str] = None,
+    page_url: Optional[str] = None,
+    category: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     STRICT MODE enrichment: Only saves emails found explicitly on websites.
     
     Pipeline:
-    1. Scrape homepage, /contact, /about, /team pages
-    2. Extract emails from HTML using regex
-    3. Optionally check Snov.io, but ONLY accept if source = "website"
-    4. Deduplicate and validate format
-    5. Return all found emails OR "no_email_found" status
+    0. DNS preflight - a domain that does not resolve is not crawled nor sent to any provider
+    1. Ask the enrichment router (services/enrichment_router.py) for the provider
+       order of this domain: website scraping, Snov.io, Hunter.io - cheapest
+       expected cost per found email first, providers history says will not
+       help (or that are restricted / out of credits) skipped
+    2. Try the providers in that order and stop at the first one that finds
+       an email. Scraping extracts emails from the homepage and contact pages;
+       Snov.io / Hunter.io emails are ONLY accepted with a website source
+    3. Return the emails OR "no_email_found" status, with the routing decision
+    
+    category (discovery category) sharpens the router's hit-rate estimates.
     
     Returns:
     {
@@ -257,7 +322,9 @@ async def enrich_prospect_email(domain: str, name: Optional[str] = None, page_ur
         "snov_emails_rejected": int,
         "domain": str,
         "success": bool,
-        "source": "html_scraping" | "snov_website" | "no_email_found",
+        "source": "html_scraping" | "snov_website" | "hunter_website" | "no_email_found",
+        "dns_status": str | None,  # DNS preflight (see services/dns_preflight.py)
+        "routing": Dict | None,  # Router plan + attempts: {order, skipped, estimates, attempts, ...}
         "error": str | None,
     }
     """
@@ -279,96 +346,86 @@ async def enrich_prospect_email(domain: str, name: Optional[str] = None, page_ur
             "domain": domain,
             "success": False,
             "source": "no_email_found",
+            "dns_status": None,
+            "routing": None,
             "error": error_msg,
         }
     
-    logger.info(f"🔍 [ENRICHMENT] STRICT MODE: Starting enrichment for {normalized_domain}")
-    logger.info(f"📥 [ENRICHMENT] Input - domain: {domain} → normalized: {normalized_domain}, page_url: {page_url or 'N/A'}")
+    preflight = await get_dns_preflight().check(normalized_domain)
+    if preflight.is_dead:
+        logger.warning(f"🪦 [ENRICHMENT] {normalized_domain}: DNS {preflight.status} - skipping scraping and providers")
+        return {
+            "emails": [],
+            "primary_email": None,
+            "email_status": "no_email_found",
+            "pages_crawled": [],
+            "emails_by_page": {},
+            "snov_emails_accepted": 0,
+            "snov_emails_rejected": 0,
+            "domain": normalized_domain,
+            "success": False,
+            "source": "no_email_found",
+            "dns_status": preflight.status,
+            "routing": None,
+            "error": None,
+        }
+    
+    router = get_enrichment_router()
+    plan = await router.plan(normalized_domain, category)
+    logger.info(
+        f"🔍 [ENRICHMENT] STRICT MODE: {normalized_domain} - route {' → '.join(plan.order) or 'none'}"
+        + (f" (skipped: {plan.skipped})" if plan.skipped else "")
+    )
     
-    all_emails: Set[str] = set()
+    emails: List[str] = []
+    source = "no_email_found"
     pages_crawled: List[str] = []
     emails_by_page: Dict[str, List[str]] = {}
     snov_emails_accepted = 0
     snov_emails_rejected = 0
-    
-    # STEP 1: Scrape website pages for emails
-    logger.info(f"📄 [ENRICHMENT] Step 1: Scraping website pages for {normalized_domain}...")
-    try:
-        emails_by_page = await _scrape_emails_from_domain(normalized_domain, page_url)
-        pages_crawled = list(emails_by_page.keys())
-        
-        # Collect all unique emails
-        for url, emails in emails_by_page.items():
-            for email in emails:
-                if is_plausible_email(email):
-                    all_emails.add(email)
-                    logger.info(f"✅ [ENRICHMENT] Email found on {url}: {email}")
-        
-        logger.info(f"📊 [ENRICHMENT] Step 1 complete: Crawled {len(pages_crawled)} pages, found {len(all_emails)} unique email(s)")
-        
-    except Exception as scrape_err:
-        logger.error(f"❌ [ENRICHMENT] HTML scraping failed for {normalized_domain}: {scrape_err}", exc_info=True)
-    
-    # STEP 2: Optionally check Snov.io, but ONLY accept website-source emails
-    logger.info(f"📞 [ENRICHMENT] Step 2: Checking Snov.io for website-source emails (STRICT MODE)...")
-    try:
-        from app.clients.snov import SnovIOClient
-        snov_client = SnovIOClient()
-        snov_result = await snov_client.domain_search(normalized_domain)
-        
-        if snov_result.get("success") and snov_result.get("emails"):
-            snov_emails = snov_result.get("emails", [])
-            logger.info(f"📧 [ENRICHMENT] Snov.io returned {len(snov_emails)} email(s) for {normalized_domain}")
-            
-            for email_data in snov_emails:
-                if not isinstance(email_data, dict):
-                    continue
-                
-                email_value = email_data.get("value")
-                if not email_value or not is_plausible_email(email_value):
-                    continue
-                
-                # STRICT MODE: Only accept if explicitly from website
-                if _is_snov_email_from_website(email_data):
-                    if email_value not in all_emails:
-                        all_emails.add(email_value)
-                        snov_emails_accepted += 1
-                        logger.info(f"✅ [ENRICHMENT] Accepted Snov.io email (website source): {email_value}")
-                    else:
-                        logger.debug(f"ℹ️  [ENRICHMENT] Snov.io email already found via scraping: {email_value}")
-                else:
-                    snov_emails_rejected += 1
-                    logger.warning(f"🚫 [ENRICHMENT] Rejected Snov.io email (no website source): {email_value}")
+    attempts: List[Dict[str, Any]] = []
+    
+    for provider in plan.order:
+        started = time.perf_counter()
+        if provider == SCRAPE:
+            found = await _find_by_scraping(normalized_domain, page_url)
+        elif provider == SNOV:
+            found = await _find_by_snov(normalized_domain)
         else:
-            logger.info(f"ℹ️  [ENRICHMENT] Snov.io returned no emails or failed for {normalized_domain}")
-            
-    except Exception as snov_err:
-        logger.warning(f"⚠️  [ENRICHMENT] Snov.io check failed for {normalized_domain}: {snov_err}")
-        # Continue - Snov.io is optional
-    
-    # STEP 3: Deduplicate and validate
-    unique_emails = sorted(list(all_emails))  # Sort for consistency
-    primary_email = unique_emails[0] if unique_emails else None
-    
-    # STEP 4: Determine result
+            found = await _find_by_hunter(normalized_domain)
+        seconds = time.perf_counter() - started
+        
+        if found is None:
+            # Failed or rate-limited: not evidence about the domain, not recorded
+            attempts.append({"provider": provider, "emails": 0, "ms": round(seconds * 1000), "error": True})
+            continue
+        router.record(provider, normalized_domain, category, bool(found["emails"]), seconds)
+        attempts.append({"provider": provider, "emails": len(found["emails"]), "ms": round(seconds * 1000)})
+        if provider == SCRAPE:
+            emails_by_page = found["emails_by_page"]
+            pages_crawled = found["pages_crawled"]
+        elif provider == SNOV:
+            snov_emails_accepted = len(found["emails"])
+            snov_emails_rejected = found["rejected"]
+        if found["emails"]:
+            emails = sorted(found["emails"])  # Sort for consistency
+            source = ROUTE_SOURCES[provider]
+            break
+    
+    primary_email = emails[0] if emails else None
     total_time = (time.time() - start_time) * 1000
     
-    if unique_emails:
+    if emails:
         email_status = "found"
-        source = "html_scraping" if snov_emails_accepted == 0 else "html_scraping+snov_website"
-        logger.info(f"✅ [ENRICHMENT] SUCCESS: Found {len(unique_emails)} email(s) for {normalized_domain} in {total_time:.0f}ms")
-        logger.info(f"📧 [ENRICHMENT] Emails: {', '.join(unique_emails)}")
-        logger.info(f"📄 [ENRICHMENT] Pages crawled: {len(pages_crawled)}")
-        logger.info(f"✅ [ENRICHMENT] Snov.io: {snov_emails_accepted} accepted, {snov_emails_rejected} rejected")
+        logger.info(f"✅ [ENRICHMENT] SUCCESS: Found {len(emails)} email(s) for {normalized_domain} via {source} in {total_time:.0f}ms")
+        logger.info(f"📧 [ENRICHMENT] Emails: {', '.join(emails)}")
     else:
         email_status = "no_email_found"
-        source = "no_email_found"
         logger.warning(f"⚠️  [ENRICHMENT] NO EMAIL FOUND for {normalized_domain} after {total_time:.0f}ms")
-        logger.info(f"📄 [ENRICHMENT] Pages crawled: {len(pages_crawled)}")
-        logger.info(f"🚫 [ENRICHMENT] Snov.io: {snov_emails_accepted} accepted, {snov_emails_rejected} rejected")
+    logger.info(f"📄 [ENRICHMENT] Pages crawled: {len(pages_crawled)}, attempts: {attempts}")
     
     return {
-        "emails": unique_emails,
+        "emails": emails,
         "primary_email": primary_email,
         "email_status": email_status,
         "pages_crawled": pages_crawled,
@@ -376,7 +433,9 @@ async def enrich_prospect_email(domain: str, name: Optional[str] = None, page_ur
         "snov_emails_accepted": snov_emails_accepted,
         "snov_emails_rejected": snov_emails_rejected,
         "domain": normalized_domain,
-        "success": len(unique_emails) > 0,
+        "success": len(emails) > 0,
         "source": source,
+        "dns_status": preflight.status,
+        "routing": {**plan.to_dict(), "attempts": attempts},
         "error": None,
     }
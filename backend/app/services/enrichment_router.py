@@ -0,0 +1,243 @@
+"""
+Enrichment provider routing.
+
+enrich_prospect_email() can find a domain's email by scraping the website,
+through Snov.io domain search or through Hunter.io domain search. They
+differ a lot in what they cost (credits vs. crawl time) and in how often
+they find something for a given kind of site. The router keeps rolling
+statistics per provider and picks, per domain, the order that minimizes
+the expected cost per found email:
+- Outcomes of the last ROUTER_WINDOW calls are kept per provider, overall
+  and per segment (discovery category, TLD): hit rate, p95 latency
+- A provider's cost is its credits per call (converted to seconds through
+  ROUTER_CREDIT_SECONDS) plus its p95 latency. Providers are tried in
+  increasing cost / hit rate - the optimal order for "stop at the first
+  provider that finds an email" - with priors until there is history
+- A provider is skipped when it is not configured, restricted in
+  ProviderState (429s), out of its daily credit budget, or when at least
+  ROUTER_MIN_SAMPLES calls in the domain's segment say it almost never
+  finds anything there (below ROUTER_MIN_HIT_RATE). A small share of those
+  skips (ROUTER_EXPLORE_RATE) is tried anyway so the estimate can recover
+
+Statistics are per process, like app.utils.metrics. The plan for each
+domain (order, skips and estimates) is returned by plan() and ends up in
+the enrichment result, which the callers store in the prospect's payload.
+
+DataForSEO On-Page crawls and Hunter's email_finder / combined_enrichment
+are not routes: the On-Page client can only submit tasks, email_finder
+needs a person's name and combined_enrichment starts from an email.
+"""
+import os
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import logging
+
+from app.services.provider_state import get_provider_state
+from app.utils.domain import normalize_domain
+from app.utils.metrics import increment
+
+logger = logging.getLogger(__name__)
+
+SCRAPE = "scrape"
+SNOV = "snov"
+HUNTER = "hunter"
+PROVIDERS = (SCRAPE, SNOV, HUNTER)
+
+ROUTER_PROVIDERS = [p.strip() for p in os.getenv("ROUTER_PROVIDERS", ",".join(PROVIDERS)).split(",") if p.strip()]
+ROUTER_WINDOW = int(os.getenv("ROUTER_WINDOW", "200"))
+ROUTER_MIN_SAMPLES = int(os.getenv("ROUTER_MIN_SAMPLES", "20"))
+ROUTER_MIN_HIT_RATE = float(os.getenv("ROUTER_MIN_HIT_RATE", "0.05"))
+ROUTER_EXPLORE_RATE = float(os.getenv("ROUTER_EXPLORE_RATE", "0.05"))
+# How many seconds of enrichment time one provider credit is worth
+ROUTER_CREDIT_SECONDS = float(os.getenv("ROUTER_CREDIT_SECONDS", "30"))
+
+# Credits per call and daily credit budget (0 = unlimited)
+CREDITS_PER_CALL = {
+    SCRAPE: 0.0,
+    SNOV: float(os.getenv("ROUTER_SNOV_CREDITS_PER_CALL", "1")),
+    HUNTER: float(os.getenv("ROUTER_HUNTER_CREDITS_PER_CALL", "1")),
+}
+DAILY_CREDITS = {
+    SNOV: float(os.getenv("ROUTER_SNOV_DAILY_CREDITS", "0")),
+    HUNTER: float(os.getenv("ROUTER_HUNTER_DAILY_CREDITS", "0")),
+}
+
+# Estimates before there is any history; scraping first matches the old fixed order
+PRIOR_HIT_RATE = {SCRAPE: 0.5, SNOV: 0.3, HUNTER: 0.3}
+PRIOR_SECONDS = {SCRAPE: 20.0, SNOV: 2.0, HUNTER: 2.0}
+PRIOR_WEIGHT = 2  # pseudo-calls the prior counts for
+MIN_LATENCY_SAMPLES = 5
+
+# Credentials each route needs
+REQUIRED_ENV = {
+    SCRAPE: (),
+    SNOV: ("SNOV_USER_ID", "SNOV_SECRET"),
+    HUNTER: ("HUNTER_IO_API_KEY",),
+}
+
+
+class ProviderWindow:
+    """The last ROUTER_WINDOW outcomes of one provider in one segment"""
+
+    def __init__(self, size: int = ROUTER_WINDOW):
+        self.calls: Deque[Tuple[bool, float]] = deque(maxlen=size)
+
+    def add(self, found: bool, seconds: float) -> None:
+        self.calls.append((found, seconds))
+
+    @property
+    def attempts(self) -> int:
+        return len(self.calls)
+
+    @property
+    def hits(self) -> int:
+        return sum(1 for found, _ in self.calls if found)
+
+    def hit_rate(self, prior: float) -> float:
+        """Hit rate smoothed towards prior (PRIOR_WEIGHT pseudo-calls)"""
+        return (self.hits + PRIOR_WEIGHT * prior) / (self.attempts + PRIOR_WEIGHT)
+
+    def p95_seconds(self) -> Optional[float]:
+        if len(self.calls) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(seconds for _, seconds in self.calls)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class RoutePlan:
+    """Provider order for one domain, with the reasons for every skip"""
+
+    def __init__(self, domain: str, segments: List[str]):
+        self.domain = domain
+        self.segments = segments
+        self.order: List[str] = []
+        self.skipped: Dict[str, str] = {}
+        self.explored: List[str] = []
+        self.estimates: Dict[str, Dict] = {}
+
+    def to_dict(self) -> Dict:
+        return {
+            "segments": self.segments,
+            "order": self.order,
+            "skipped": self.skipped,
+            "explored": self.explored,
+            "estimates": self.estimates,
+        }
+
+
+def _segments(domain: str, category: Optional[str]) -> List[str]:
+    segments = []
+    if category:
+        segments.append(f"category:{category.strip().lower()}")
+    tld = domain.rsplit(".", 1)[-1] if "." in domain else None
+    if tld:
+        segments.append(f"tld:{tld}")
+    return segments
+
+
+def _utc_day() -> int:
+    return int(time.time() // 86400)
+
+
+class EnrichmentRouter:
+    """Rolling per-provider statistics and the per-domain provider order"""
+
+    def __init__(self, providers: Optional[List[str]] = None, rng: Optional[random.Random] = None):
+        self.providers = [p for p in (providers or ROUTER_PROVIDERS) if p in PROVIDERS]
+        self.rng = rng or random.Random()
+        # (provider, segment or "*") -> window
+        self._windows: Dict[Tuple[str, str], ProviderWindow] = {}
+        self._credits_spent: Dict[str, float] = {}
+        self._credits_day = _utc_day()
+
+    def _window(self, provider: str, segment: str) -> ProviderWindow:
+        window = self._windows.get((provider, segment))
+        if window is None:
+            window = self._windows[(provider, segment)] = ProviderWindow()
+        return window
+
+    def credits_spent(self, provider: str) -> float:
+        """Credits spent today (UTC) by this process"""
+        if self._credits_day != _utc_day():
+            self._credits_day = _utc_day()
+            self._credits_spent.clear()
+        return self._credits_spent.get(provider, 0.0)
+
+    def record(self, provider: str, domain: str, category: Optional[str], found: bool, seconds: float) -> None:
+        """Outcome of one completed provider call (errors and rate limits are not outcomes)"""
+        domain = normalize_domain(domain) or domain
+        for segment in ["*"] + _segments(domain, category):
+            self._window(provider, segment).add(found, seconds)
+        if CREDITS_PER_CALL.get(provider):
+            self._credits_spent[provider] = self.credits_spent(provider) + CREDITS_PER_CALL[provider]
+
+    def estimate(self, provider: str, segments: List[str]) -> Dict:
+        """Hit rate, p95 latency, cost per call and the evidence behind them"""
+        overall = self._window(provider, "*")
+        prior = overall.hit_rate(PRIOR_HIT_RATE[provider])
+        # Segments with enough history refine the overall rate
+        informed = [self._windows[(provider, s)] for s in segments
+                    if (provider, s) in self._windows and self._windows[(provider, s)].attempts >= ROUTER_MIN_SAMPLES]
+        hit_rate = sum(w.hit_rate(prior) for w in informed) / len(informed) if informed else prior
+        seconds = overall.p95_seconds()
+        seconds = PRIOR_SECONDS[provider] if seconds is None else seconds
+        cost = CREDITS_PER_CALL[provider] * ROUTER_CREDIT_SECONDS + seconds
+        return {
+            "hit_rate": round(hit_rate, 4),
+            "p95_s": round(seconds, 3),
+            "cost": round(cost, 3),
+            "cost_per_email": round(cost / max(hit_rate, 1e-3), 3),
+            "attempts": overall.attempts,
+            "segment_attempts": sum(w.attempts for w in informed),
+        }
+
+    async def _unavailable(self, provider: str) -> Optional[str]:
+        if any(not os.getenv(name) for name in REQUIRED_ENV[provider]):
+            return "not_configured"
+        if provider != SCRAPE and await get_provider_state().is_restricted(provider):
+            return "restricted"
+        budget = DAILY_CREDITS.get(provider)
+        if budget and self.credits_spent(provider) + CREDITS_PER_CALL[provider] > budget:
+            return "quota_exhausted"
+        return None
+
+    async def plan(self, domain: str, category: Optional[str] = None) -> RoutePlan:
+        """Providers to try for domain, cheapest expected cost per found email first"""
+        plan = RoutePlan(domain, _segments(domain, category))
+        candidates = []
+        for provider in self.providers:
+            reason = await self._unavailable(provider)
+            if reason:
+                plan.skipped[provider] = reason
+                continue
+            estimate = plan.estimates[provider] = self.estimate(provider, plan.segments)
+            if estimate["segment_attempts"] and estimate["hit_rate"] < ROUTER_MIN_HIT_RATE:
+                if self.rng.random() >= ROUTER_EXPLORE_RATE:
+                    plan.skipped[provider] = "low_hit_rate"
+                    continue
+                plan.explored.append(provider)
+            candidates.append(provider)
+        plan.order = sorted(candidates, key=lambda p: plan.estimates[p]["cost_per_email"])
+        for provider, reason in plan.skipped.items():
+            increment("enrichment_route_skips_total", provider=provider, reason=reason)
+        return plan
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Overall estimate and credits spent per provider"""
+        return {
+            provider: {**self.estimate(provider, []), "credits_spent_today": self.credits_spent(provider)}
+            for provider in self.providers
+        }
+
+
+_router: Optional[EnrichmentRouter] = None
+
+
+def get_enrichment_router() -> EnrichmentRouter:
+    """Process-wide router (statistics accumulate across jobs)"""
+    global _router
+    if _router is None:
+        _router = EnrichmentRouter()
+    return _router
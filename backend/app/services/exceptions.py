@@ -29,3 +29,19 @@ class RateLimitError(Exception):
         self.details = details
         super().__init__(message)
 
+
+class CrawlDisallowed(Exception):
+    """Raised by the crawl scheduler when robots.txt disallows a URL"""
+
+    def __init__(self, url: str):
+        self.url = url
+        super().__init__(f"Disallowed by robots.txt: {url}")
+
+
+class UnsupportedContent(Exception):
+    """Raised by CrawlScheduler.fetch_html when a response is not HTML (body not downloaded)"""
+
+    def __init__(self, url: str, content_type: str):
+        self.url = url
+        self.content_type = content_type
+        super().__init__(f"Not HTML ({content_type or 'unknown type'}): {url}")
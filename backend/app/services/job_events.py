@@ -0,0 +1,243 @@
+"""
+Push-based job progress events.
+
+Clients used to poll the jobs row (and the pipeline status) every few seconds
+to follow a running job. Now every committed change of a job's progress is
+pushed to subscribers of GET /api/jobs/{id}/events (Server-Sent Events):
+- Jobs keep writing progress to the jobs row exactly as before. A session hook
+  turns each flushed change of status / result / error_message /
+  drafts_created / total_targets into an event, so every task publishes
+  without per-task code and a reconnecting client can still start from the row
+- In the flush, the event is also sent with pg_notify on JOB_EVENTS_CHANNEL.
+  NOTIFY is transactional: listeners only see it once the progress is
+  committed, and never for a rolled-back change
+- After the commit, the event goes straight to subscribers in this process
+  (JobEventBroker). A LISTEN connection (started with the first subscriber)
+  forwards events from other workers and instances; events from this process
+  are recognised by their origin and not delivered twice
+- Events carry only scalar counters of `result` (items processed, per-stage
+  counts), well below the 8000 byte NOTIFY limit
+
+LISTEN needs a session-level connection. Behind a transaction-mode pooler
+(pgbouncer, Supabase port 6543) set JOB_EVENTS_NOTIFY=false; events are then
+only delivered within the process that runs the job.
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+import logging
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_NOTIFY = os.getenv("JOB_EVENTS_NOTIFY", "true").lower() == "true"
+JOB_EVENTS_CHANNEL = os.getenv("JOB_EVENTS_CHANNEL", "job_events")
+# Events buffered per subscriber; the oldest are dropped for slow clients
+JOB_EVENTS_QUEUE_SIZE = int(os.getenv("JOB_EVENTS_QUEUE_SIZE", "100"))
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+TRACKED_FIELDS = ("status", "result", "error_message", "drafts_created", "total_targets")
+
+# Identifies events published by this process (skipped by its own listener)
+PROCESS_ORIGIN = uuid.uuid4().hex
+
+_PENDING_KEY = "job_events_pending"
+
+
+def _scalar_counts(result: Any) -> Dict[str, Any]:
+    """Top-level scalar values of a job result; lists and nested objects are left out"""
+    if not isinstance(result, dict):
+        return {}
+    return {
+        key: value for key, value in result.items()
+        if value is None or isinstance(value, (bool, int, float)) or (isinstance(value, str) and len(value) <= 200)
+    }
+
+
+def job_event(job: Job) -> Dict[str, Any]:
+    """Event payload for the current state of a job"""
+    status = job.status or "pending"
+    error = job.error_message
+    return {
+        "type": "end" if status in TERMINAL_STATUSES else "progress",
+        "job_id": str(job.id),
+        "job_type": job.job_type,
+        "status": status,
+        "counts": _scalar_counts(job.result),
+        "drafts_created": getattr(job, "drafts_created", None),
+        "total_targets": getattr(job, "total_targets", None),
+        "error": error[:500] if error else None,
+        "ts": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class JobEventBroker:
+    """In-process fan-out of job events to subscriber queues"""
+
+    def __init__(self, queue_size: int = JOB_EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(str(job_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(str(job_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(job_id)]
+
+    def subscriber_count(self, job_id: Optional[str] = None) -> int:
+        if job_id is not None:
+            return len(self._subscribers.get(str(job_id), ()))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, payload: Dict[str, Any]) -> int:
+        """Deliver to this process's subscribers (non-blocking); returns the number reached"""
+        queues = self._subscribers.get(payload.get("job_id"), ())
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()  # drop the oldest; the latest state matters most
+            queue.put_nowait(payload)
+        return len(queues)
+
+
+broker = JobEventBroker()
+
+
+# --- Session hook: committed job changes become events ---------------------
+
+@event.listens_for(Session, "after_flush")
+def _collect_job_events(session: Session, flush_context) -> None:
+    events = []
+    for obj in session.dirty | session.new:
+        if not isinstance(obj, Job):
+            continue
+        state = inspect(obj)
+        if obj in session.new or any(
+            field in state.attrs and state.attrs[field].history.has_changes() for field in TRACKED_FIELDS
+        ):
+            events.append(job_event(obj))
+    if not events:
+        return
+    session.info.setdefault(_PENDING_KEY, []).extend(events)
+    if JOB_EVENTS_NOTIFY and session.get_bind().dialect.name == "postgresql":
+        connection = session.connection()
+        for payload in events:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": JOB_EVENTS_CHANNEL, "payload": json.dumps({**payload, "origin": PROCESS_ORIGIN})},
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_job_events(session: Session) -> None:
+    for payload in session.info.pop(_PENDING_KEY, ()):
+        broker.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_job_events(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --- Cross-process fan-out: LISTEN ------------------------------------------
+
+class JobEventListener:
+    """Holds one connection LISTENing on the channel and forwards foreign events to the broker"""
+
+    RETRY_SECONDS = 5
+
+    def __init__(self, broker: JobEventBroker, engine=None, channel: str = JOB_EVENTS_CHANNEL):
+        self.broker = broker
+        self.engine = engine
+        self.channel = channel
+        self._task: Optional[asyncio.Task] = None
+        self.listening = asyncio.Event()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return
+        if data.pop("origin", None) == PROCESS_ORIGIN:
+            return
+        self.broker.publish(data)
+
+    async def _listen_once(self) -> None:
+        engine = self.engine
+        if engine is None:
+            from app.db.database import engine
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver_connection = raw.driver_connection
+            lost = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _connection: lost.set())
+            await driver_connection.add_listener(self.channel, self._on_notify)
+            self.listening.set()
+            logger.info(f"📡 [JOB EVENTS] Listening on '{self.channel}'")
+            try:
+                await lost.wait()
+            finally:
+                self.listening.clear()
+                if not driver_connection.is_closed():
+                    await driver_connection.remove_listener(self.channel, self._on_notify)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen_once()
+                logger.warning("⚠️  [JOB EVENTS] LISTEN connection lost - reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  [JOB EVENTS] LISTEN failed ({e}) - retrying in {self.RETRY_SECONDS}s")
+                await asyncio.sleep(self.RETRY_SECONDS)
+
+    def ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+
+_listener: Optional[JobEventListener] = None
+
+
+def ensure_listener() -> None:
+    """Start the LISTEN connection (once per process) if NOTIFY fan-out is enabled"""
+    global _listener
+    if not JOB_EVENTS_NOTIFY:
+        return
+    if _listener is None:
+        _listener = JobEventListener(broker)
+    _listener.ensure_started()
+
+
+async def close_job_events() -> None:
+    global _listener
+    if _listener is not None:
+        await _listener.stop()
+        _listener = None
+
+
+def format_sse(payload: Dict[str, Any]) -> str:
+    """One Server-Sent Events message; the event name is the payload type"""
+    return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
@@ -0,0 +1,106 @@
+"""
+Raw provider payloads of prospects (prospect_payloads side table).
+
+The DataForSEO / Snov.io / scraping / verification responses are large JSON
+documents that only a few code paths read. Keeping them out of the
+prospects row means list endpoints, exports and task selects do not drag
+them over the wire, and status updates do not rewrite them:
+- Writes are upserts of only the given payloads (save_payloads, or
+  save_payloads_many for a batch in one statement); no read of the
+  existing row is needed and the other payloads are untouched
+- Reads load only the requested payloads, for one prospect (get_payloads)
+  or a batch (get_payloads_many) in one query
+- New prospects can be created with payloads=ProspectPayload(...); the row
+  is inserted together with the prospect
+
+Like the prospect itself, nothing here commits - callers commit with their
+own state update.
+"""
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.prospect_payload import ProspectPayload
+
+PAYLOAD_COLUMNS = ("dataforseo_payload", "snov_payload", "scrape_payload", "verification_payload")
+SAVE_MANY_CHUNK = 1000
+
+
+def _check_columns(columns: Iterable[str]) -> None:
+    unknown = set(columns) - set(PAYLOAD_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown payload column(s): {', '.join(sorted(unknown))}")
+
+
+async def save_payloads(db: AsyncSession, prospect_id: UUID, **payloads: Any) -> None:
+    """
+    Store payloads of a prospect, e.g. save_payloads(db, p.id, scrape_payload={...}).
+    Only the given columns are written; None clears a payload.
+    """
+    if not payloads:
+        return
+    _check_columns(payloads)
+    statement = pg_insert(ProspectPayload).values(prospect_id=prospect_id, **payloads)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ProspectPayload.prospect_id],
+            set_={**{column: statement.excluded[column] for column in payloads}, "updated_at": func.now()},
+        )
+    )
+
+
+async def save_payloads_many(db: AsyncSession, payloads_by_prospect: Dict[UUID, Dict[str, Any]]) -> None:
+    """
+    save_payloads for several prospects, one INSERT ... ON CONFLICT per
+    SAVE_MANY_CHUNK prospects, e.g.
+    save_payloads_many(db, {p.id: {"verification_payload": {...}}}).
+    Every prospect must get the same columns.
+    """
+    if not payloads_by_prospect:
+        return
+    columns = set(next(iter(payloads_by_prospect.values())))
+    _check_columns(columns)
+    if not columns or any(set(payloads) != columns for payloads in payloads_by_prospect.values()):
+        raise ValueError("save_payloads_many needs the same payload columns for every prospect")
+    rows = [{"prospect_id": prospect_id, **payloads} for prospect_id, payloads in payloads_by_prospect.items()]
+    # Chunked to stay well below the 32767 bind parameters of one statement
+    for start in range(0, len(rows), SAVE_MANY_CHUNK):
+        statement = pg_insert(ProspectPayload).values(rows[start:start + SAVE_MANY_CHUNK])
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ProspectPayload.prospect_id],
+                set_={**{column: statement.excluded[column] for column in columns}, "updated_at": func.now()},
+            )
+        )
+
+
+async def get_payloads(db: AsyncSession, prospect_id: UUID, *columns: str) -> Dict[str, Any]:
+    """The requested payloads (all by default) of one prospect; missing ones are None"""
+    return (await get_payloads_many(db, [prospect_id], *columns)).get(prospect_id) or dict.fromkeys(
+        columns or PAYLOAD_COLUMNS
+    )
+
+
+async def get_payloads_many(db: AsyncSession, prospect_ids: Iterable[UUID], *columns: str) -> Dict[UUID, Dict[str, Any]]:
+    """Requested payloads for several prospects in one query; prospects without a row are absent"""
+    columns = columns or PAYLOAD_COLUMNS
+    _check_columns(columns)
+    prospect_ids = list(prospect_ids)
+    if not prospect_ids:
+        return {}
+    result = await db.execute(
+        select(ProspectPayload.prospect_id, *(getattr(ProspectPayload, column) for column in columns)).where(
+            ProspectPayload.prospect_id.in_(prospect_ids)
+        )
+    )
+    return {row[0]: dict(zip(columns, row[1:])) for row in result.all()}
+
+
+def snippet_from_payload(dataforseo_payload: Optional[Dict[str, Any]]) -> Optional[str]:
+    """SERP description of a prospect's page, used as drafting context"""
+    if isinstance(dataforseo_payload, dict):
+        return dataforseo_payload.get("description") or dataforseo_payload.get("snippet")
+    return None
@@ -1,23 +1,51 @@
 """
 Provider state management for tracking rate limits and restrictions.
-Uses Redis if available, falls back to in-memory storage.
+Uses Redis (asyncio client) if available, falls back to in-memory storage.
+
+- All Redis calls go through redis.asyncio with a shared connection pool, so
+  a slow Redis never blocks the event loop
+- Restriction expiries are cached locally (read-through): a restricted
+  provider is answered from memory until its expiry, an unrestricted one is
+  re-checked at most every LOCAL_CACHE_TTL seconds
+- set/clear write the key and PUBLISH on a pub/sub channel in one pipeline;
+  every worker runs a listener that updates its local cache immediately
+- Without REDIS_URL (single-node setups) restrictions live in process memory
+- If Redis is unreachable (at startup or later), the process degrades to
+  in-memory state with a warning and reconnects with exponential backoff
+  (PROVIDER_STATE_RETRY_BASE doubling up to PROVIDER_STATE_RETRY_MAX
+  seconds); restrictions set meanwhile are published once it is back
 """
+import asyncio
+import json
 import os
 import logging
+import math
 import time
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
-# Try to import Redis
+# Try to import the asyncio Redis client
 try:
-    import redis
+    import redis.asyncio as aioredis
     REDIS_AVAILABLE = True
 except ImportError:
+    aioredis = None
     REDIS_AVAILABLE = False
     logger.warning("Redis not available, using in-memory provider state")
 
+RESTRICTION_KEY_PREFIX = "provider:restricted:"
+RESTRICTION_CHANNEL = "provider:restrictions"
+
+# How long a "not restricted" answer is trusted before re-reading Redis.
+# Pub/sub normally invalidates sooner; this bounds staleness if a message is lost.
+LOCAL_CACHE_TTL = float(os.getenv("PROVIDER_STATE_CACHE_TTL", "5"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("PROVIDER_STATE_MAX_CONNECTIONS", "10"))
+# Reconnect backoff after Redis failures: base, 2x base, ... up to max seconds
+REDIS_RETRY_BASE = float(os.getenv("PROVIDER_STATE_RETRY_BASE", "1"))
+REDIS_RETRY_MAX = float(os.getenv("PROVIDER_STATE_RETRY_MAX", "60"))
+
 # In-memory fallback storage
 _memory_state: Dict[str, float] = {}  # provider_name -> unix timestamp when restriction expires
 
@@ -25,122 +53,256 @@ _memory_state: Dict[str, float] = {}  # provider_name -> unix timestamp when res
 class ProviderState:
     """
     Manages provider state (rate limits, restrictions) with Redis or in-memory fallback.
+
+    All public methods are coroutines. The Redis connection is opened lazily
+    on first use and reopened (with backoff) after failures; call close() on
+    shutdown to stop the pub/sub listener.
     """
-    
-    def __init__(self):
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url if redis_url is not None else os.getenv("REDIS_URL")
         self.redis_client = None
         self.use_redis = False
-        
-        if REDIS_AVAILABLE:
-            redis_url = os.getenv("REDIS_URL")
-            if redis_url:
+        self._failures = 0
+        self._retry_at = 0.0  # time.monotonic() before which connect() does not retry
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        # provider -> (expires_at or 0.0 if not restricted, cached_at)
+        self._local_cache: Dict[str, Tuple[float, float]] = {}
+
+        if not REDIS_AVAILABLE:
+            logger.info("ProviderState: Redis not installed, using in-memory storage")
+        elif not self.redis_url:
+            logger.info("ProviderState: REDIS_URL not set, using in-memory storage")
+
+    async def connect(self) -> None:
+        """
+        Open the pooled Redis connection and start the pub/sub listener.
+
+        Safe to call repeatedly: a no-op while connected, without REDIS_URL, or
+        while waiting out the backoff after a failed attempt. Until Redis is
+        reachable the in-memory fallback is used.
+        """
+        if self.use_redis or not (REDIS_AVAILABLE and self.redis_url):
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.use_redis or time.monotonic() < self._retry_at:
+                return
+            try:
+                pool = aioredis.ConnectionPool.from_url(
+                    self.redis_url,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    socket_connect_timeout=2,
+                    socket_timeout=2,
+                    decode_responses=True,
+                )
+                client = aioredis.Redis(connection_pool=pool)
+                await client.ping()
+            except Exception as e:
+                self._degrade(e)
+                return
+            self.redis_client = client
+            self.use_redis = True
+            self._listener_task = asyncio.create_task(self._listen())
+            if self._failures:
+                logger.info(f"✅ ProviderState: Redis reachable again after {self._failures} failed attempt(s), restrictions are shared again")
+                self._failures = 0
+                await self._publish_memory_state()
+            else:
+                logger.info("✅ ProviderState: Using Redis for rate limit tracking")
+
+    def _degrade(self, error: Exception) -> None:
+        """Switch to in-memory state and schedule the next reconnect attempt."""
+        self._failures += 1
+        delay = min(REDIS_RETRY_MAX, REDIS_RETRY_BASE * 2 ** (self._failures - 1))
+        self._retry_at = time.monotonic() + delay
+        if self._failures == 1:
+            logger.warning(
+                f"⚠️  ProviderState: Redis unavailable ({error}), degraded to in-memory state - "
+                f"restrictions are not shared with other workers until it is back (retrying in {delay:.0f}s)"
+            )
+        else:
+            logger.debug(f"ProviderState: Redis reconnect attempt {self._failures} failed ({error}), next in {delay:.0f}s")
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        client, self.redis_client, self.use_redis = self.redis_client, None, False
+        if client is not None:
+            asyncio.ensure_future(client.aclose())
+
+    async def _publish_memory_state(self) -> None:
+        """Share restrictions recorded in memory while Redis was unreachable."""
+        now = time.time()
+        for provider, expires_at in list(_memory_state.items()):
+            if expires_at > now:
                 try:
-                    self.redis_client = redis.from_url(
-                        redis_url,
-                        socket_connect_timeout=2,
-                        socket_timeout=2,
-                        decode_responses=True
-                    )
-                    # Test connection
-                    self.redis_client.ping()
-                    self.use_redis = True
-                    logger.info("✅ ProviderState: Using Redis for rate limit tracking")
+                    await self._publish(provider, expires_at, math.ceil(expires_at - now))
                 except Exception as e:
-                    logger.warning(f"⚠️  ProviderState: Redis connection failed ({e}), using in-memory fallback")
-                    self.use_redis = False
+                    logger.error(f"❌ [PROVIDER_STATE] Failed to publish in-memory restriction for {provider}: {e}")
+
+    async def close(self) -> None:
+        """Stop the pub/sub listener and release pooled connections."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            # A cancel that lands while the subscription is being confirmed can be
+            # swallowed by the client; don't let that hang shutdown
+            await asyncio.wait({self._listener_task}, timeout=1)
+            self._listener_task = None
+        if self.redis_client:
+            try:
+                await self.redis_client.aclose()
+            except Exception as e:
+                logger.debug(f"ProviderState: error closing Redis client: {e}")
+        self.redis_client = None
+        self.use_redis = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._local_cache.clear()
+
+    async def _listen(self) -> None:
+        """Apply restriction changes published by other workers to the local cache."""
+        pubsub = self.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(RESTRICTION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    event = json.loads(message["data"])
+                    provider = event["provider"]
+                    expires_at = float(event.get("expires_at") or 0.0)
+                except (ValueError, KeyError, TypeError):
+                    logger.debug(f"ProviderState: ignoring malformed message {message.get('data')!r}")
+                    continue
+                self._local_cache[provider] = (expires_at, time.time())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Listener loss only means slower propagation (LOCAL_CACHE_TTL)
+            logger.warning(f"⚠️  [PROVIDER_STATE] Pub/sub listener stopped: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def _publish(self, provider: str, expires_at: float, seconds: Optional[int] = None) -> None:
+        """Write (or delete) the restriction key and notify workers in one pipeline."""
+        key = f"{RESTRICTION_KEY_PREFIX}{provider}"
+        payload = json.dumps({"provider": provider, "expires_at": expires_at})
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            if seconds:
+                pipe.set(key, str(expires_at), ex=seconds)
             else:
-                logger.info("ProviderState: REDIS_URL not set, using in-memory storage")
-        else:
-            logger.info("ProviderState: Redis not installed, using in-memory storage")
-    
-    def set_restricted(self, provider: str, seconds: Optional[int] = None) -> None:
+                pipe.delete(key)
+            pipe.publish(RESTRICTION_CHANNEL, payload)
+            await pipe.execute()
+
+    async def set_restricted(self, provider: str, seconds: Optional[int] = None) -> None:
         """
         Mark a provider as restricted (rate-limited) for a specified duration.
-        
+
         Args:
             provider: Provider name (e.g., "hunter")
             seconds: Duration in seconds (default: 3600 = 1 hour)
         """
         if seconds is None:
             seconds = 3600  # Default: 1 hour
-        
+
+        await self.connect()
         expires_at = time.time() + seconds
-        
+        self._local_cache[provider] = (expires_at, time.time())
+        expires_iso = datetime.fromtimestamp(expires_at, tz=timezone.utc).isoformat()
+
         if self.use_redis and self.redis_client:
             try:
-                key = f"provider:restricted:{provider}"
-                self.redis_client.setex(key, seconds, str(expires_at))
-                logger.warning(f"🚫 [PROVIDER_STATE] Marked {provider} as restricted for {seconds}s (expires at {datetime.fromtimestamp(expires_at, tz=timezone.utc).isoformat()})")
+                await self._publish(provider, expires_at, seconds)
+                logger.warning(f"🚫 [PROVIDER_STATE] Marked {provider} as restricted for {seconds}s (expires at {expires_iso})")
             except Exception as e:
                 logger.error(f"❌ [PROVIDER_STATE] Failed to set Redis restriction for {provider}: {e}")
-                # Fallback to memory
+                self._degrade(e)
+                # Fallback to memory (published on reconnect)
                 _memory_state[provider] = expires_at
         else:
             _memory_state[provider] = expires_at
-            logger.warning(f"🚫 [PROVIDER_STATE] Marked {provider} as restricted for {seconds}s (in-memory, expires at {datetime.fromtimestamp(expires_at, tz=timezone.utc).isoformat()})")
-    
-    def is_restricted(self, provider: str) -> bool:
+            logger.warning(f"🚫 [PROVIDER_STATE] Marked {provider} as restricted for {seconds}s (in-memory, expires at {expires_iso})")
+
+    async def get_restriction_expiry(self, provider: str) -> Optional[float]:
         """
-        Check if a provider is currently restricted (rate-limited).
-        
+        Get the unix timestamp when a provider's restriction expires.
+
         Args:
             provider: Provider name (e.g., "hunter")
-        
+
         Returns:
-            True if provider is restricted, False otherwise
+            Expiry timestamp, or None if the provider is not restricted
         """
+        now = time.time()
+
+        cached = self._local_cache.get(provider)
+        if cached:
+            expires_at, cached_at = cached
+            if expires_at > now:
+                return expires_at
+            if now - cached_at < LOCAL_CACHE_TTL:
+                return None
+
+        await self.connect()
+
         if self.use_redis and self.redis_client:
             try:
-                key = f"provider:restricted:{provider}"
-                expires_at_str = self.redis_client.get(key)
-                if expires_at_str:
-                    expires_at = float(expires_at_str)
-                    if time.time() < expires_at:
-                        return True
-                    else:
-                        # Expired, clean up
-                        self.redis_client.delete(key)
-                        return False
-                return False
+                expires_at_str = await self.redis_client.get(f"{RESTRICTION_KEY_PREFIX}{provider}")
+                expires_at = float(expires_at_str) if expires_at_str else 0.0
+                self._local_cache[provider] = (expires_at, now)
+                return expires_at if expires_at > now else None
             except Exception as e:
                 logger.error(f"❌ [PROVIDER_STATE] Failed to check Redis restriction for {provider}: {e}")
-                # Fallback to memory
-                if provider in _memory_state:
-                    expires_at = _memory_state[provider]
-                    if time.time() < expires_at:
-                        return True
-                    else:
-                        # Expired, clean up
-                        del _memory_state[provider]
-                        return False
-                return False
-        else:
-            # In-memory check
-            if provider in _memory_state:
-                expires_at = _memory_state[provider]
-                if time.time() < expires_at:
-                    return True
-                else:
-                    # Expired, clean up
-                    del _memory_state[provider]
-                    return False
-            return False
-    
-    def clear_restriction(self, provider: str) -> None:
+                self._degrade(e)
+                # Fall through to memory
+
+        expires_at = _memory_state.get(provider)
+        if expires_at is None:
+            return None
+        if now < expires_at:
+            return expires_at
+        # Expired, clean up
+        del _memory_state[provider]
+        return None
+
+    async def is_restricted(self, provider: str) -> bool:
+        """
+        Check if a provider is currently restricted (rate-limited).
+
+        Args:
+            provider: Provider name (e.g., "hunter")
+
+        Returns:
+            True if provider is restricted, False otherwise
+        """
+        return await self.get_restriction_expiry(provider) is not None
+
+    async def clear_restriction(self, provider: str) -> None:
         """
         Clear restriction for a provider (manual override).
-        
+
         Args:
             provider: Provider name
         """
+        await self.connect()
+        self._local_cache[provider] = (0.0, time.time())
+
         if self.use_redis and self.redis_client:
             try:
-                key = f"provider:restricted:{provider}"
-                self.redis_client.delete(key)
+                await self._publish(provider, 0.0)
                 logger.info(f"✅ [PROVIDER_STATE] Cleared restriction for {provider}")
             except Exception as e:
                 logger.error(f"❌ [PROVIDER_STATE] Failed to clear Redis restriction for {provider}: {e}")
-        
+                self._degrade(e)
+
         if provider in _memory_state:
             del _memory_state[provider]
             logger.info(f"✅ [PROVIDER_STATE] Cleared in-memory restriction for {provider}")
@@ -153,7 +315,7 @@ _provider_state_instance: Optional[ProviderState] = None
 def get_provider_state() -> ProviderState:
     """
     Get the global ProviderState instance (singleton).
-    
+
     Returns:
         ProviderState instance
     """
@@ -162,3 +324,10 @@ def get_provider_state() -> ProviderState:
         _provider_state_instance = ProviderState()
     return _provider_state_instance
 
+
+async def close_provider_state() -> None:
+    """Close the global ProviderState instance (called on app shutdown)."""
+    global _provider_state_instance
+    if _provider_state_instance is not None:
+        await _provider_state_instance.close()
+        _provider_state_instance = None
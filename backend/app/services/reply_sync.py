@@ -0,0 +1,293 @@
+"""
+Incremental Gmail reply detection.
+
+Instead of walking every sent prospect, the mailbox is read as a change feed:
+- The last processed Gmail historyId is stored in the settings table
+  (key "gmail_reply_sync"); each run only fetches history records after it
+  (users.history.list, messageAdded), so the cost follows new mail, not the
+  number of emails ever sent
+- Gmail Pub/Sub push notifications (api/webhooks.py) trigger the same sync;
+  a notification whose historyId is already processed costs no API call
+- New messages are matched to prospects with ONE query on the indexed
+  email_logs.gmail_thread_id; messages outside known threads fall back to
+  their In-Reply-To / References headers against email_logs.message_id_header
+- Matched prospects are moved from "sent" to "replied" in one UPDATE, in the
+  same transaction that advances the stored historyId
+- If the stored historyId has expired (history.list returns 404), inbox
+  messages since the last successful sync are listed instead
+- The settings row is locked (FOR UPDATE SKIP LOCKED) for the duration of a
+  run, so a push and the periodic check never process the same delta twice
+"""
+import asyncio
+import base64
+import binascii
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+import logging
+import uuid
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.email_log import EmailLog
+from app.models.prospect import Prospect
+from app.models.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+SYNC_STATE_KEY = "gmail_reply_sync"
+
+# Look up In-Reply-To / References for messages outside known threads
+HEADER_LOOKUP_ENABLED = os.getenv("REPLY_SYNC_HEADER_LOOKUP", "true").lower() == "true"
+# Concurrent messages.get calls during header lookup
+HEADER_LOOKUP_CONCURRENCY = int(os.getenv("REPLY_SYNC_HEADER_CONCURRENCY", "5"))
+
+# Labels of messages we wrote ourselves
+OWN_MESSAGE_LABELS = {"SENT", "DRAFT"}
+
+_MESSAGE_ID_RE = re.compile(r"<[^<>\s]+>")
+
+
+def decode_push_notification(body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a Gmail Pub/Sub push envelope.
+
+    {"message": {"data": base64({"emailAddress": ..., "historyId": ...})}, "subscription": ...}
+
+    Returns:
+        {"email_address", "history_id"} or None if the payload is not a Gmail notification
+    """
+    data = ((body or {}).get("message") or {}).get("data")
+    if not data:
+        return None
+    try:
+        padded = data + "=" * (-len(data) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(payload, dict) or not payload.get("historyId"):
+        return None
+    return {"email_address": payload.get("emailAddress"), "history_id": str(payload["historyId"])}
+
+
+def _history_newer(candidate: Optional[str], current: Optional[str]) -> bool:
+    """historyIds are increasing integers sent as strings"""
+    if not candidate:
+        return False
+    if not current:
+        return True
+    return int(candidate) > int(current)
+
+
+async def _lock_state(db: AsyncSession) -> Optional[Settings]:
+    """Create the state row if needed and lock it; None if another sync holds it"""
+    await db.execute(
+        insert(Settings)
+        .values(id=uuid.uuid4(), key=SYNC_STATE_KEY, value={})
+        .on_conflict_do_nothing(index_elements=["key"])
+    )
+    await db.commit()
+    result = await db.execute(
+        select(Settings).where(Settings.key == SYNC_STATE_KEY).with_for_update(skip_locked=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _current_history_id(gmail_client) -> str:
+    profile = await gmail_client.get_user_profile()
+    if not profile.get("success"):
+        raise RuntimeError(f"Failed to read Gmail profile: {profile.get('error')}")
+    return str(profile["profile"]["historyId"])
+
+
+async def _history_delta(gmail_client, start_history_id: str) -> Dict[str, Any]:
+    """Messages added since start_history_id, excluding our own sends"""
+    messages: Dict[str, str] = {}  # message id -> thread id
+    latest = start_history_id
+    page_token = None
+    pages = 0
+    while True:
+        page = await gmail_client.list_history(start_history_id, page_token, history_types=["messageAdded"])
+        pages += 1
+        for record in page.get("history") or []:
+            for added in record.get("messagesAdded") or []:
+                message = added.get("message") or {}
+                if OWN_MESSAGE_LABELS.intersection(message.get("labelIds") or []):
+                    continue
+                if message.get("id") and message.get("threadId"):
+                    messages[message["id"]] = message["threadId"]
+        if _history_newer(page.get("historyId"), latest):
+            latest = str(page["historyId"])
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            break
+    return {"messages": messages, "history_id": latest, "pages": pages}
+
+
+async def _inbox_since(gmail_client, since: Optional[str]) -> Dict[str, str]:
+    """Full-sync fallback: inbox messages received after the last successful sync"""
+    query = "in:inbox"
+    if since:
+        query += f" after:{int(datetime.fromisoformat(since).timestamp())}"
+    messages: Dict[str, str] = {}
+    page_token = None
+    while True:
+        page = await gmail_client.list_messages(query, page_token)
+        for message in page.get("messages") or []:
+            messages[message["id"]] = message["threadId"]
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            break
+    return messages
+
+
+async def _referenced_message_ids(gmail_client, message_ids: List[str]) -> Dict[str, Set[str]]:
+    """{gmail message id: Message-IDs it replies to}, from In-Reply-To / References"""
+    semaphore = asyncio.Semaphore(HEADER_LOOKUP_CONCURRENCY)
+
+    async def fetch(message_id: str):
+        async with semaphore:
+            try:
+                headers = await gmail_client.get_message_headers(message_id, ["In-Reply-To", "References"])
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:  # deleted since the notification
+                    return message_id, set()
+                raise
+        refs = f"{headers.get('in-reply-to', '')} {headers.get('references', '')}"
+        return message_id, set(_MESSAGE_ID_RE.findall(refs))
+
+    return dict(await asyncio.gather(*(fetch(message_id) for message_id in message_ids)))
+
+
+async def match_replies(db: AsyncSession, gmail_client, messages: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Map new messages to prospects.
+
+    Args:
+        messages: {gmail message id: thread id}
+
+    Returns:
+        {"prospect_ids": set, "by_thread": int, "by_header": int}
+    """
+    thread_ids = set(messages.values())
+    by_thread: Dict[str, Any] = {}
+    if thread_ids:
+        rows = await db.execute(
+            select(EmailLog.gmail_thread_id, EmailLog.prospect_id).where(
+                EmailLog.gmail_thread_id.in_(thread_ids)
+            )
+        )
+        by_thread = {thread_id: prospect_id for thread_id, prospect_id in rows.all()}
+    prospect_ids = {by_thread[t] for t in thread_ids if t in by_thread}
+
+    by_header: Set[Any] = set()
+    unmatched = [m for m, t in messages.items() if t not in by_thread]
+    if unmatched and HEADER_LOOKUP_ENABLED:
+        references = await _referenced_message_ids(gmail_client, unmatched)
+        wanted = set().union(*references.values()) if references else set()
+        if wanted:
+            rows = await db.execute(
+                select(EmailLog.prospect_id).where(EmailLog.message_id_header.in_(wanted))
+            )
+            by_header = set(rows.scalars())
+    return {
+        "prospect_ids": prospect_ids | by_header,
+        "by_thread": len(prospect_ids),
+        "by_header": len(by_header - prospect_ids),
+    }
+
+
+async def mark_replied(db: AsyncSession, prospect_ids: Set[Any]) -> List[Any]:
+    """Move prospects still in "sent" to "replied" in one statement; returns updated ids"""
+    if not prospect_ids:
+        return []
+    result = await db.execute(
+        update(Prospect)
+        .where(Prospect.id.in_(prospect_ids), Prospect.outreach_status == "sent")
+        .values(outreach_status="replied")
+        .returning(Prospect.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars())
+
+
+async def sync_replies(
+    db: AsyncSession,
+    gmail_client,
+    notified_history_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Process mailbox changes since the last sync and mark replied prospects.
+
+    Args:
+        db: Database session (committed by this function)
+        gmail_client: GmailClient (or anything with the same read methods)
+        notified_history_id: historyId from a push notification; skips the run
+            when it is already processed
+
+    Returns:
+        Stats dict: success, mode (initialized / history / full_resync / skipped),
+        messages, matched_by_thread, matched_by_header, replied, history_id
+    """
+    state = await _lock_state(db)
+    if state is None:
+        logger.info("📬 [REPLIES] Another reply sync is running - skipped")
+        return {"success": True, "mode": "skipped", "reason": "sync already running"}
+
+    try:
+        value = dict(state.value or {})
+        stored = value.get("history_id")
+        stats: Dict[str, Any] = {"success": True, "messages": 0, "matched_by_thread": 0,
+                                 "matched_by_header": 0, "replied": 0}
+
+        if stored and notified_history_id and not _history_newer(notified_history_id, stored):
+            await db.rollback()
+            return {**stats, "mode": "skipped", "reason": "already processed", "history_id": stored}
+
+        if not stored:
+            # First run: start from the current mailbox position
+            new_history_id = await _current_history_id(gmail_client)
+            stats["mode"] = "initialized"
+            messages: Dict[str, str] = {}
+        else:
+            try:
+                delta = await _history_delta(gmail_client, stored)
+                messages = delta["messages"]
+                new_history_id = delta["history_id"]
+                stats["mode"] = "history"
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                logger.warning(f"📬 [REPLIES] historyId {stored} expired - listing inbox since last sync")
+                new_history_id = await _current_history_id(gmail_client)
+                messages = await _inbox_since(gmail_client, value.get("synced_at"))
+                stats["mode"] = "full_resync"
+
+        stats["messages"] = len(messages)
+        if messages:
+            matched = await match_replies(db, gmail_client, messages)
+            stats["matched_by_thread"] = matched["by_thread"]
+            stats["matched_by_header"] = matched["by_header"]
+            stats["replied"] = len(await mark_replied(db, matched["prospect_ids"]))
+
+        state.value = {
+            **value,
+            "history_id": new_history_id,
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    stats["history_id"] = new_history_id
+    logger.info(
+        f"📬 [REPLIES] {stats['mode']}: {stats['messages']} new messages, "
+        f"{stats['replied']} prospects marked replied (historyId {new_history_id})"
+    )
+    return stats
@@ -0,0 +1,142 @@
+"""
+Per-prospect research dossier.
+
+compose_email, the draft chat and compose_followup_email each fetched the
+prospect's website, asked Gemini for a positioning summary and searched the
+web for Liquid Canvas on every call - several round-trips before the model
+saw the actual request, on every chat turn. Now:
+- The research (cleaned site text, positioning summary, key facts) is built
+  once per prospect, stored in prospect_dossiers and passed to the Gemini
+  client by every drafting and chat path
+- A dossier is rebuilt when it expires (DOSSIER_TTL_DAYS; DOSSIER_RETRY_HOURS
+  if the site could not be fetched), when the prospect's URL changed, or when
+  DOSSIER_VERSION is bumped because the way it is built changed
+- The Liquid Canvas search result is cached process-wide by the client, so a
+  chat turn with a stored dossier costs one model call
+- Social prospects have no website research; they get no dossier
+- If the table is missing (migration not applied yet) the research is still
+  returned for the current call, just not stored
+"""
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.prospect_dossier import ProspectDossier
+from app.services.prospect_payloads import get_payloads, snippet_from_payload
+
+logger = logging.getLogger(__name__)
+
+# Bump when build_research or the stored fields change; older dossiers are rebuilt
+DOSSIER_VERSION = 1
+DOSSIER_TTL_DAYS = float(os.getenv("DOSSIER_TTL_DAYS", "30"))
+# Shorter lifetime when the site could not be fetched, so it is retried soon
+DOSSIER_RETRY_HOURS = float(os.getenv("DOSSIER_RETRY_HOURS", "6"))
+
+
+def _source_url(prospect) -> str:
+    return getattr(prospect, "page_url", None) or f"https://{getattr(prospect, 'domain', '')}"
+
+
+async def _page_snippet(db: AsyncSession, prospect_id) -> Optional[str]:
+    """SERP description from the prospect's DataForSEO payload (None if unavailable)"""
+    try:
+        async with db.begin_nested():
+            payloads = await get_payloads(db, prospect_id, "dataforseo_payload")
+    except SQLAlchemyError as e:
+        logger.warning(f"⚠️  [DOSSIER] Could not load payloads of {prospect_id}: {e}")
+        return None
+    return snippet_from_payload(payloads["dataforseo_payload"])
+
+
+def is_fresh(dossier: ProspectDossier, prospect, now: Optional[datetime] = None) -> bool:
+    """Current version, not expired, and built from the prospect's current URL"""
+    now = now or datetime.now(timezone.utc)
+    return (
+        dossier.version == DOSSIER_VERSION
+        and dossier.expires_at is not None
+        and dossier.expires_at > now
+        and dossier.source_url == _source_url(prospect)
+    )
+
+
+async def get_dossier(db: AsyncSession, prospect_id) -> Optional[ProspectDossier]:
+    """The stored dossier of a prospect (fresh or not); None if there is none or the table is missing"""
+    try:
+        async with db.begin_nested():
+            result = await db.execute(select(ProspectDossier).where(ProspectDossier.prospect_id == prospect_id))
+            return result.scalar_one_or_none()
+    except SQLAlchemyError as e:
+        logger.warning(f"⚠️  [DOSSIER] Could not read dossier for {prospect_id}: {e}")
+        return None
+
+
+async def build_dossier_values(prospect, gemini_client, page_snippet: Optional[str] = None) -> Dict[str, Any]:
+    """Research the prospect's website; returns the column values of its dossier"""
+    source_url = _source_url(prospect)
+    research = await gemini_client.build_research(
+        source_url, prospect.domain, prospect.page_title, page_snippet
+    )
+    now = datetime.now(timezone.utc)
+    lifetime = timedelta(days=DOSSIER_TTL_DAYS) if research["site_text"] else timedelta(hours=DOSSIER_RETRY_HOURS)
+    return {
+        "version": DOSSIER_VERSION,
+        "source_url": source_url,
+        "site_text": research["site_text"],
+        "positioning_summary": research["positioning_summary"],
+        "key_facts": {
+            "domain": prospect.domain,
+            "page_title": prospect.page_title,
+            "page_snippet": page_snippet,
+            "category": getattr(prospect, "discovery_category", None),
+            "site_fetched": research["site_text"] is not None,
+        },
+        "built_at": now,
+        "expires_at": now + lifetime,
+    }
+
+
+async def get_or_build_dossier(
+    db: AsyncSession,
+    prospect,
+    gemini_client,
+    refresh: bool = False,
+) -> Optional[ProspectDossier]:
+    """
+    The prospect's research dossier, built and stored if missing or stale.
+
+    A new dossier is written inside a savepoint and never committed here:
+    the caller's commit persists it together with the caller's own changes
+    (and a rollback discards both). Returns None for social prospects;
+    callers then let the Gemini client build its own context.
+    """
+    if getattr(prospect, "source_type", None) == "social":
+        return None
+
+    dossier = await get_dossier(db, prospect.id)
+    if dossier is not None and not refresh and is_fresh(dossier, prospect):
+        return dossier
+
+    values = await build_dossier_values(prospect, gemini_client, await _page_snippet(db, prospect.id))
+    stmt = (
+        pg_insert(ProspectDossier)
+        .values(id=uuid.uuid4(), prospect_id=prospect.id, **values)
+        .on_conflict_do_update(index_elements=[ProspectDossier.prospect_id], set_=values)
+        .returning(ProspectDossier)
+    )
+    try:
+        async with db.begin_nested():
+            result = await db.execute(stmt, execution_options={"populate_existing": True})
+            dossier = result.scalar_one()
+        logger.info(f"✅ [DOSSIER] Stored research dossier for {prospect.domain}")
+        return dossier
+    except SQLAlchemyError as e:
+        logger.warning(f"⚠️  [DOSSIER] Could not store dossier for {prospect.domain}: {e}")
+        # Still usable for this call
+        return ProspectDossier(prospect_id=prospect.id, **values)
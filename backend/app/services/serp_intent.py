@@ -8,6 +8,8 @@ import re
 import logging
 from typing import Dict, List, Optional
 
+from app.utils.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,42 @@ KNOWN_PLATFORMS = {
 }
 
 
+# Intent keyword groups and how many matched keywords each contributes as signals
+INTENT_KEYWORDS = {
+    # Service intent signals
+    "service": [
+        "services", "service", "company", "studio", "agency", "solutions",
+        "consulting", "consultancy", "firm", "group", "partners", "team",
+        "professional", "experts", "specialists", "providers"
+    ],
+    # Brand intent signals (business names, official sites)
+    "brand": [
+        "official", "homepage", "home page", "welcome", "about us",
+        "our company", "our team", "who we are"
+    ],
+    # Blog intent signals
+    "blog": [
+        "blog", "guide", "tips", "ideas", "article", "post", "tutorial",
+        "how to", "learn", "read", "writing", "author", "editorial"
+    ],
+    # Media intent signals
+    "media": [
+        "news", "press", "magazine", "journal", "publication", "media",
+        "reporter", "journalist", "editorial", "press release"
+    ],
+    # Marketplace intent signals
+    "marketplace": [
+        "shop", "buy", "marketplace", "store", "cart", "checkout",
+        "purchase", "order", "product", "products", "catalog",
+        "add to cart", "shopping", "retail"
+    ],
+}
+SIGNAL_LIMITS = {"service": 3, "brand": 2, "blog": 3, "media": 2, "marketplace": 3}
+
+# Built once at import - one regex pass per text instead of one scan per keyword
+_INTENT_MATCHER = KeywordMatcher(INTENT_KEYWORDS)
+
+
 def infer_serp_intent(
     url: str,
     title: str,
@@ -48,11 +86,36 @@ def infer_serp_intent(
     - "platform": Known platform domains (YouTube, Medium, Shopify, etc.)
     - "unknown": No clear signals
     """
+    return infer_serp_intents([{"url": url, "title": title, "description": snippet}], category)[0]
+
+
+def infer_serp_intents(results: List[Dict], category: str = "") -> List[dict]:
+    """
+    Infer intent for a whole SERP page in one call.
+    
+    Args:
+        results: SERP items with "url", "title" and "description" (snippet)
+        category: Discovery category of the query
+    
+    Returns:
+        One infer_serp_intent() result per item, in order
+    """
+    texts = []
+    for item in results:
+        title = item.get("title") or ""
+        snippet = item.get("description") or ""
+        texts.append(f"{title.lower()} {snippet.lower()}".strip())
+    
+    return [
+        _classify(item.get("url") or "", hits)
+        for item, hits in zip(results, _INTENT_MATCHER.found_many(texts))
+    ]
+
+
+def _classify(url: str, hits: set) -> dict:
+    """Turn the keyword hits for one result into intent, confidence and signals"""
     signals: List[str] = []
     url_lower = url.lower()
-    title_lower = title.lower() if title else ""
-    snippet_lower = (snippet or "").lower()
-    combined_text = f"{title_lower} {snippet_lower}".strip()
     
     # Check for known platforms first (highest confidence)
     domain = _extract_domain(url)
@@ -64,52 +127,9 @@ def infer_serp_intent(
             "signals": signals
         }
     
-    # Service intent signals
-    service_keywords = [
-        "services", "service", "company", "studio", "agency", "solutions",
-        "consulting", "consultancy", "firm", "group", "partners", "team",
-        "professional", "experts", "specialists", "providers"
-    ]
-    service_matches = [kw for kw in service_keywords if kw in combined_text]
-    if service_matches:
-        signals.extend([f"service_keyword:{kw}" for kw in service_matches[:3]])  # Limit to 3
-    
-    # Brand intent signals (business names, official sites)
-    brand_keywords = [
-        "official", "homepage", "home page", "welcome", "about us",
-        "our company", "our team", "who we are"
-    ]
-    brand_matches = [kw for kw in brand_keywords if kw in combined_text]
-    if brand_matches:
-        signals.extend([f"brand_keyword:{kw}" for kw in brand_matches[:2]])
-    
-    # Blog intent signals
-    blog_keywords = [
-        "blog", "guide", "tips", "ideas", "article", "post", "tutorial",
-        "how to", "learn", "read", "writing", "author", "editorial"
-    ]
-    blog_matches = [kw for kw in blog_keywords if kw in combined_text]
-    if blog_matches:
-        signals.extend([f"blog_keyword:{kw}" for kw in blog_matches[:3]])
-    
-    # Media intent signals
-    media_keywords = [
-        "news", "press", "magazine", "journal", "publication", "media",
-        "reporter", "journalist", "editorial", "press release"
-    ]
-    media_matches = [kw for kw in media_keywords if kw in combined_text]
-    if media_matches:
-        signals.extend([f"media_keyword:{kw}" for kw in media_matches[:2]])
-    
-    # Marketplace intent signals
-    marketplace_keywords = [
-        "shop", "buy", "marketplace", "store", "cart", "checkout",
-        "purchase", "order", "product", "products", "catalog",
-        "add to cart", "shopping", "retail"
-    ]
-    marketplace_matches = [kw for kw in marketplace_keywords if kw in combined_text]
-    if marketplace_matches:
-        signals.extend([f"marketplace_keyword:{kw}" for kw in marketplace_matches[:3]])
+    intent_matches = _INTENT_MATCHER.grouped(hits)
+    for intent, limit in SIGNAL_LIMITS.items():
+        signals.extend([f"{intent}_keyword:{kw}" for kw in intent_matches[intent][:limit]])
     
     # URL path patterns
     url_path = url_lower.split("/")[-1] if "/" in url_lower else ""
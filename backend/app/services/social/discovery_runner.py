@@ -12,11 +12,10 @@ from sqlalchemy import select
 
 from app.models.social import (
     SocialDiscoveryJob,
-    SocialProfile,
     SocialPlatform,
-    DiscoveryStatus,
     DiscoveryJobStatus,
 )
+from .profile_ingestion import resolve_max_results, upsert_social_profiles
 from .linkedin_discovery import LinkedInDiscoveryService
 from .instagram_discovery import InstagramDiscoveryService
 from .tiktok_discovery import TikTokDiscoveryService
@@ -80,53 +79,33 @@ class SocialDiscoveryRunner:
             keywords = job.keywords or []
             parameters = job.parameters or job.filters or {}
             
+            max_results = resolve_max_results(parameters)
+            
             # Run discovery
             profiles_data = await service.discover_profiles(
                 categories=categories,
                 locations=locations,
                 keywords=keywords,
                 parameters=parameters,
-                max_results=100  # TODO: Make configurable
+                max_results=max_results
             )
             
-            # Create profile records
-            profiles_created = 0
-            for profile_data in profiles_data:
-                # Check if profile already exists
-                existing = await db.execute(
-                    select(SocialProfile).where(
-                        SocialProfile.profile_url == profile_data["profile_url"]
-                    )
-                )
-                if existing.scalar_one_or_none():
-                    # Profile already exists - skip
-                    continue
-                
-                # Create new profile
-                profile = SocialProfile(
-                    platform=job.platform,
-                    username=profile_data["username"],
-                    full_name=profile_data.get("full_name"),
-                    profile_url=profile_data["profile_url"],
-                    bio=profile_data.get("bio"),
-                    location=profile_data.get("location"),
-                    category=profile_data.get("category"),
-                    followers_count=profile_data.get("followers_count", 0),
-                    engagement_score=profile_data.get("engagement_score", 0.0),
-                    discovery_status=DiscoveryStatus.DISCOVERED.value,
-                    discovery_job_id=job.id,
-                    is_manual=False,
-                )
-                
-                db.add(profile)
-                profiles_created += 1
+            # Create/refresh profile records - one upsert statement per batch
+            # instead of one SELECT per discovered profile
+            ingest_stats = await upsert_social_profiles(
+                db,
+                profiles_data,
+                platform=job.platform,
+                discovery_job_id=job.id,
+            )
+            profiles_created = ingest_stats["created"]
             
             # Update job status
             job.status = DiscoveryJobStatus.COMPLETED.value
             job.results_count = profiles_created
             await db.commit()
             
-            logger.info(f"✅ [SOCIAL DISCOVERY] Job {job_id} completed: {profiles_created} profiles created")
+            logger.info(f"✅ [SOCIAL DISCOVERY] Job {job_id} completed: {profiles_created} profiles created, {ingest_stats['updated']} refreshed")
             
         except Exception as e:
             logger.error(f"❌ [SOCIAL DISCOVERY] Job {job_id} failed: {e}", exc_info=True)
@@ -0,0 +1,256 @@
+"""
+Bulk ingestion for discovered social profiles.
+
+Replaces the per-profile "SELECT ... WHERE profile_url = ?" + db.add() loop
+with batched writes:
+- Profiles are deduplicated by profile_url inside the batch first
+- SocialProfile rows go through one multi-row
+  INSERT ... ON CONFLICT (profile_url) DO UPDATE per batch, which refreshes
+  follower counts and bio on existing rows and reports created vs updated
+  counts in the same round-trip (xmax = 0 only for freshly inserted rows)
+- Social Prospect rows (prospects.profile_url has no unique constraint) are
+  keyed on profile_url only and use one existence SELECT per batch, one bulk
+  UPDATE for known profiles whose counts changed and one add_all() for new
+  ones
+"""
+import os
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+import logging
+
+from sqlalchemy import func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.prospect import Prospect
+from app.models.social import SocialProfile, SocialPlatform, DiscoveryStatus
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement. Each row binds ~11 parameters, well under the
+# 32767 bind-parameter limit of asyncpg.
+INGEST_BATCH_SIZE = int(os.getenv("SOCIAL_INGEST_BATCH_SIZE", "500"))
+
+# Default cap for discovered profiles per job (overridable per job via
+# parameters["max_results"])
+DEFAULT_MAX_RESULTS = int(os.getenv("SOCIAL_DISCOVERY_MAX_RESULTS", "100"))
+
+
+def resolve_max_results(parameters: Optional[Dict[str, Any]], default: int = DEFAULT_MAX_RESULTS) -> int:
+    """
+    Read max_results from job parameters, falling back to the configured default.
+
+    Invalid or non-positive values fall back to the default.
+    """
+    if parameters:
+        try:
+            value = int(parameters.get("max_results") or 0)
+        except (TypeError, ValueError):
+            value = 0
+        if value > 0:
+            return value
+    return default
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def dedupe_profiles(profiles_data: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Deduplicate discovered profiles by profile_url, keeping first-seen order.
+
+    Later duplicates fill in fields the first occurrence was missing and
+    raise followers_count if they report a higher value.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for profile in profiles_data:
+        url = (profile.get("profile_url") or "").strip()
+        if not url or not profile.get("username"):
+            continue
+        existing = merged.get(url)
+        if existing is None:
+            merged[url] = {**profile, "profile_url": url}
+            continue
+        for key, value in profile.items():
+            if value in (None, "") or key == "profile_url":
+                continue
+            if key == "followers_count":
+                existing[key] = max(existing.get(key) or 0, value or 0)
+            elif existing.get(key) in (None, ""):
+                existing[key] = value
+    return list(merged.values())
+
+
+def build_profile_upsert(rows: List[Dict[str, Any]]):
+    """
+    Build the multi-row INSERT ... ON CONFLICT (profile_url) DO UPDATE statement.
+
+    RETURNING (xmax = 0) is true for inserted rows and false for updated rows.
+    """
+    stmt = pg_insert(SocialProfile).values(rows)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SocialProfile.profile_url],
+        set_={
+            "followers_count": excluded.followers_count,
+            "engagement_score": excluded.engagement_score,
+            # Keep the stored bio/name when the new crawl didn't return one
+            "bio": func.coalesce(func.nullif(excluded.bio, ""), SocialProfile.bio),
+            "full_name": func.coalesce(func.nullif(excluded.full_name, ""), SocialProfile.full_name),
+            "updated_at": func.now(),
+        },
+    )
+    return stmt.returning(literal_column("(xmax = 0)").label("inserted"))
+
+
+async def upsert_social_profiles(
+    db: AsyncSession,
+    profiles_data: Iterable[Dict[str, Any]],
+    platform: SocialPlatform,
+    discovery_job_id: Optional[UUID] = None,
+    batch_size: int = INGEST_BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Insert or refresh discovered SocialProfile rows in bulk.
+
+    Args:
+        db: Database session (caller commits)
+        profiles_data: Normalized profile dicts from a discovery service
+        platform: Platform the profiles were discovered on
+        discovery_job_id: Optional SocialDiscoveryJob id to link new rows to
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        {"created": int, "updated": int, "skipped_duplicates": int}
+    """
+    profiles_data = list(profiles_data)
+    unique_profiles = dedupe_profiles(profiles_data)
+
+    rows = [
+        {
+            "platform": platform,
+            "username": profile["username"],
+            "full_name": profile.get("full_name"),
+            "profile_url": profile["profile_url"],
+            "bio": profile.get("bio"),
+            "location": profile.get("location"),
+            "category": profile.get("category"),
+            "followers_count": profile.get("followers_count") or 0,
+            "engagement_score": profile.get("engagement_score") or 0.0,
+            "discovery_status": DiscoveryStatus.DISCOVERED,
+            "discovery_job_id": discovery_job_id,
+            "is_manual": False,
+        }
+        for profile in unique_profiles
+    ]
+
+    created = 0
+    updated = 0
+    for batch in _chunks(rows, batch_size):
+        result = await db.execute(build_profile_upsert(batch))
+        for inserted in result.scalars():
+            if inserted:
+                created += 1
+            else:
+                updated += 1
+
+    stats = {
+        "created": created,
+        "updated": updated,
+        "skipped_duplicates": len(profiles_data) - len(unique_profiles),
+    }
+    logger.info(f"💾 [SOCIAL INGEST] {platform.value}: {created} created, {updated} updated, {stats['skipped_duplicates']} in-batch duplicates")
+    return stats
+
+
+def _as_rate(value: Any) -> Decimal:
+    """engagement_rate as stored (Numeric(5, 2))"""
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+async def ingest_social_prospects(
+    db: AsyncSession,
+    prospects: List[Prospect],
+    batch_size: int = INGEST_BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Save social Prospect objects returned by the discovery adapters in bulk.
+
+    prospects.profile_url is not unique, so ON CONFLICT is not available here.
+    Instead each batch costs one existence SELECT, one bulk UPDATE (follower
+    count / engagement rate refresh, only where they changed) and one add_all().
+    Prospects without a profile_url cannot be matched and are skipped.
+
+    Args:
+        db: Database session (caller commits)
+        prospects: Transient Prospect objects with profile_url set
+        batch_size: Profiles per round-trip
+
+    Returns:
+        {"created": int, "updated": int, "unchanged": int,
+         "skipped_duplicates": int, "skipped_no_url": int}
+    """
+    unique: Dict[str, Prospect] = {}
+    skipped_no_url = 0
+    for prospect in prospects:
+        url = (prospect.profile_url or "").strip()
+        if not url:
+            skipped_no_url += 1
+            continue
+        if url not in unique:
+            prospect.profile_url = url
+            unique[url] = prospect
+
+    created = 0
+    updated = 0
+    unchanged = 0
+    for batch in _chunks(list(unique.items()), batch_size):
+        urls = [url for url, _ in batch]
+        result = await db.execute(
+            select(Prospect.id, Prospect.profile_url, Prospect.follower_count, Prospect.engagement_rate).where(
+                Prospect.source_type == "social",
+                Prospect.profile_url.in_(urls),
+            )
+        )
+        existing = {row.profile_url: row for row in result}
+
+        refreshes = []
+        new_prospects = []
+        for url, prospect in batch:
+            row = existing.get(url)
+            if row is None:
+                new_prospects.append(prospect)
+                continue
+            refresh = {"id": row.id}
+            if prospect.follower_count is not None and prospect.follower_count != row.follower_count:
+                refresh["follower_count"] = prospect.follower_count
+            if prospect.engagement_rate is not None and _as_rate(prospect.engagement_rate) != row.engagement_rate:
+                refresh["engagement_rate"] = prospect.engagement_rate
+            if len(refresh) > 1:
+                refreshes.append(refresh)
+            else:
+                unchanged += 1
+
+        if refreshes:
+            # ORM bulk UPDATE by primary key - one executemany round-trip
+            await db.execute(update(Prospect), refreshes)
+            updated += len(refreshes)
+        if new_prospects:
+            db.add_all(new_prospects)
+            created += len(new_prospects)
+
+    stats = {
+        "created": created,
+        "updated": updated,
+        "unchanged": unchanged,
+        "skipped_duplicates": len(prospects) - skipped_no_url - len(unique),
+        "skipped_no_url": skipped_no_url,
+    }
+    logger.info(
+        f"💾 [SOCIAL INGEST] prospects: {created} created, {updated} updated, {unchanged} unchanged, "
+        f"{stats['skipped_duplicates']} in-batch duplicates, {skipped_no_url} without profile_url"
+    )
+    return stats
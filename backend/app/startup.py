@@ -0,0 +1,303 @@
+"""
+Staged application startup
+
+Startup used to finish all schema work before the server accepted traffic
+(in-process alembic, a sync-engine schema check, information_schema
+introspection, ALTER TABLE repairs), so cold starts regularly outlived the
+health check. It now runs in stages:
+- "imports": importing app.main (routers, models), measured from the moment
+  this module is first imported
+- "pool_warmup" (blocking): DB_POOL_WARM_CONNECTIONS pooled connections are
+  opened concurrently so the first requests skip connection setup. The app
+  is ready as soon as this stage finishes
+- "migrations" (blocking, only with AUTO_MIGRATE=true): alembic upgrade head,
+  run in a worker thread
+- Schema maintenance (background task after ready; STARTUP_SCHEMA_CHECKS=off
+  disables it): the smart auto-migrate check (AUTO_MIGRATE unset), the
+  discovery_query_id repair and prospect schema validation. The same stage
+  can run as a deploy step instead: `python -m app.startup [--migrate]`
+
+Every stage's status and duration is kept in `startup_state` and reported by
+/health/ready. Heavy client modules (Playwright, BeautifulSoup, Gemini, the
+Gmail client) are imported by the endpoints and tasks that use them, not at
+startup.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pooled connections opened before the app reports ready
+DB_POOL_WARM_CONNECTIONS = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "2"))
+DB_POOL_WARM_TIMEOUT = float(os.getenv("DB_POOL_WARM_TIMEOUT", "10"))
+# "background" (default) or "off"; use `python -m app.startup` as a deploy step with "off"
+STARTUP_SCHEMA_CHECKS = os.getenv("STARTUP_SCHEMA_CHECKS", "background").lower()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def auto_migrate_mode() -> Optional[bool]:
+    """AUTO_MIGRATE: True (always), False (never) or None (smart: only if the schema is behind)"""
+    value = os.getenv("AUTO_MIGRATE", "").lower()
+    if value in ("true", "1", "yes"):
+        return True
+    if value in ("false", "0", "no"):
+        return False
+    return None
+
+
+class StartupState:
+    """Per-phase timings and readiness of this process"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.ready = False
+        self.ready_after_ms: Optional[float] = None
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.background = "pending"
+        self.background_task: Optional[asyncio.Task] = None
+
+    def record(self, name: str, seconds: float, status: str = "ok", stage: str = "blocking", **details) -> None:
+        self.phases[name] = {
+            "stage": stage,
+            "status": status,
+            "duration_ms": round(seconds * 1000, 1),
+            **details,
+        }
+
+    @asynccontextmanager
+    async def phase(self, name: str, stage: str = "blocking") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Time a phase. Errors are recorded, logged and swallowed - startup never
+        fails on them. The yielded dict collects extra details for the report.
+        """
+        details: Dict[str, Any] = {}
+        self.phases[name] = {"stage": stage, "status": "running"}
+        started = time.perf_counter()
+        try:
+            yield details
+        except Exception as e:
+            logger.error(f"❌ [STARTUP] {name} failed: {type(e).__name__}: {e}")
+            details.pop("status", None)
+            self.record(name, time.perf_counter() - started, "failed", stage, error=str(e), **details)
+        else:
+            self.record(name, time.perf_counter() - started, details.pop("status", "ok"), stage, **details)
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.ready_after_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        logger.info(f"✅ [STARTUP] Ready after {self.ready_after_ms}ms")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "ready_after_ms": self.ready_after_ms,
+            "started_at": self.started_at.isoformat(),
+            "background": self.background,
+            "phases": {name: dict(phase) for name, phase in self.phases.items()},
+        }
+
+
+startup_state = StartupState()
+
+
+async def warm_pool(engine=None, connections: int = DB_POOL_WARM_CONNECTIONS) -> int:
+    """Open `connections` pooled connections concurrently; returns how many were opened"""
+    from sqlalchemy import text
+
+    if engine is None:
+        from app.db.database import engine
+
+    async def checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    count = max(connections, 1)
+    await asyncio.wait_for(asyncio.gather(*(checkout() for _ in range(count))), DB_POOL_WARM_TIMEOUT)
+    return count
+
+
+def _alembic_url(database_url: str) -> str:
+    """asyncpg URL -> psycopg2 URL without the parameters psycopg2 rejects"""
+    sync_url = database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    if "?" in sync_url:
+        base_url, query_string = sync_url.split("?", 1)
+        params = [p for p in query_string.split("&") if not p.lower().startswith(("pgbouncer=", "sslmode="))]
+        sync_url = f"{base_url}?{'&'.join(params)}" if params else base_url
+    return sync_url
+
+
+def run_alembic_upgrade(revision: str = "head") -> None:
+    """
+    alembic upgrade (blocking; call through asyncio.to_thread).
+
+    The script location is set to an absolute path instead of changing the
+    working directory, which would affect the whole process.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        alembic_cfg.set_main_option("sqlalchemy.url", _alembic_url(database_url))
+    try:
+        command.upgrade(alembic_cfg, revision)
+    except SystemExit as e:
+        # Alembic may call sys.exit() on errors
+        raise RuntimeError(f"Alembic migration failed with exit code {e.code}") from e
+
+
+async def needs_migration(engine) -> bool:
+    """Smart auto-migrate indicator: prospects.bio_text missing means the schema is behind"""
+    from sqlalchemy import text
+
+    async with engine.connect() as conn:
+        result = await conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'prospects' AND column_name = 'bio_text'
+            AND table_schema = current_schema()
+        """))
+        return result.first() is None
+
+
+async def repair_discovery_query_id(engine) -> bool:
+    """Add prospects.discovery_query_id (and its index) if missing; returns True if added"""
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        result = await conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'prospects' AND column_name = 'discovery_query_id'
+            AND table_schema = current_schema()
+        """))
+        if result.first() is not None:
+            return False
+        await conn.execute(text("ALTER TABLE prospects ADD COLUMN IF NOT EXISTS discovery_query_id UUID"))
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_prospects_discovery_query_id ON prospects(discovery_query_id)"
+        ))
+    logger.info("✅ [STARTUP] Added missing prospects.discovery_query_id column and index")
+    return True
+
+
+async def run_schema_maintenance(
+    state: StartupState = startup_state,
+    engine=None,
+    auto_migrate: Optional[bool] = None,
+    stage: str = "background",
+) -> bool:
+    """
+    Schema checks and repairs that used to block startup.
+
+    Args:
+        auto_migrate: True runs migrations, None runs them only if the schema is
+            behind, False never does
+        stage: label for the recorded phases ("background" or "cli")
+
+    Returns:
+        True if the prospects schema validated
+    """
+    if engine is None:
+        from app.db.database import engine
+    state.background = "running"
+    valid = False
+
+    if auto_migrate is None:
+        async with state.phase("migration_check", stage) as details:
+            auto_migrate = details["needed"] = await needs_migration(engine)
+            if auto_migrate:
+                logger.warning("⚠️  [STARTUP] Schema mismatch (bio_text missing) - running migrations")
+    if auto_migrate:
+        async with state.phase("migrations", stage):
+            await asyncio.to_thread(run_alembic_upgrade)
+
+    async with state.phase("discovery_query_id_repair", stage) as details:
+        details["added"] = await repair_discovery_query_id(engine)
+
+    async with state.phase("schema_validation", stage) as details:
+        from sqlalchemy.ext.asyncio import AsyncSession
+        from app.utils.schema_validator import validate_prospect_schema
+
+        async with AsyncSession(engine) as db:
+            result = await validate_prospect_schema(db)
+        valid = bool(result.get("valid"))
+        if not valid:
+            details["status"] = "invalid"
+            details["missing_columns"] = result.get("missing_columns", [])
+
+    failed = [name for name, phase in state.phases.items()
+              if phase["stage"] == stage and phase["status"] != "ok"]
+    state.background = "failed" if failed else "done"
+    if failed:
+        logger.warning(f"⚠️  [STARTUP] Schema maintenance finished with issues: {', '.join(failed)}")
+    else:
+        logger.info("✅ [STARTUP] Schema maintenance finished - schema valid")
+    return valid
+
+
+async def start_application(state: StartupState = startup_state) -> None:
+    """Blocking startup stages; schedules schema maintenance and returns once ready"""
+    auto_migrate = auto_migrate_mode()
+
+    async with state.phase("pool_warmup") as details:
+        details["connections"] = await warm_pool()
+
+    if auto_migrate:
+        logger.info("🔄 [STARTUP] AUTO_MIGRATE=true - running migrations before accepting traffic")
+        async with state.phase("migrations"):
+            await asyncio.to_thread(run_alembic_upgrade)
+
+    state.mark_ready()
+
+    if STARTUP_SCHEMA_CHECKS == "off":
+        state.background = "disabled"
+        logger.info("🔍 [STARTUP] STARTUP_SCHEMA_CHECKS=off - run `python -m app.startup` at deploy time")
+        return
+    state.background_task = asyncio.create_task(
+        # Migrations already ran above when AUTO_MIGRATE=true
+        run_schema_maintenance(state, auto_migrate=None if auto_migrate is None else False)
+    )
+
+
+async def stop_application(state: StartupState = startup_state) -> None:
+    task = state.background_task
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+async def _cli(migrate: bool) -> int:
+    from app.db.database import engine
+
+    state = StartupState()
+    try:
+        valid = await run_schema_maintenance(
+            state, engine, auto_migrate=True if migrate else auto_migrate_mode(), stage="cli"
+        )
+    finally:
+        await engine.dispose()
+    print(json.dumps(state.snapshot()["phases"], indent=2))
+    return 0 if valid and state.background == "done" else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the startup schema maintenance (checks, repairs, optional migrations) once"
+    )
+    parser.add_argument("--migrate", action="store_true", help="always run alembic upgrade head first")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_cli(args.migrate)))
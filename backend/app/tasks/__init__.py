@@ -1,15 +1,22 @@
 """
 Background tasks module - processes jobs directly in backend
 Free tier compatible - no separate worker service needed
+
+Task modules are imported on first attribute access (see app.clients).
 """
-from app.tasks.discovery import process_discovery_job, discover_websites_async
-from app.tasks.enrichment import process_enrichment_job
-from app.tasks.send import process_send_job
+from importlib import import_module
+
+_TASKS = {
+    "process_discovery_job": "app.tasks.discovery",
+    "discover_websites_async": "app.tasks.discovery",
+    "process_enrichment_job": "app.tasks.enrichment",
+    "process_send_job": "app.tasks.send",
+}
+
+__all__ = list(_TASKS)
 
-__all__ = [
-    "process_discovery_job",
-    "discover_websites_async",
-    "process_enrichment_job",
-    "process_send_job"
-]
 
+def __getattr__(name):
+    if name in _TASKS:
+        return getattr(import_module(_TASKS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,80 @@
+"""
+Categorization task - runs the set-based categorization (services/categorization.py)
+in the background for /auto_categorize and /migrate_categories
+
+The endpoints create a "categorize" job and return its id right away; this
+task reports progress on the job after every step and chunk. params["migrate"]
+maps legacy category values first (migrate_legacy_categories), otherwise only
+uncategorized prospects are categorized.
+"""
+import logging
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.db.database import AsyncSessionLocal
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.services.categorization import categorize_prospects, migrate_legacy_categories
+
+logger = logging.getLogger(__name__)
+
+
+async def _category_distribution(db) -> dict:
+    rows = await db.execute(
+        select(Prospect.discovery_category, func.count(Prospect.id)).group_by(Prospect.discovery_category)
+    )
+    return {category or "NULL": count for category, count in rows.all()}
+
+
+async def categorize_prospects_async(job_id: str):
+    """Run a categorize job to completion in its own session"""
+    async with AsyncSessionLocal() as db:
+        try:
+            job = (await db.execute(select(Job).where(Job.id == UUID(job_id)))).scalar_one_or_none()
+            if not job:
+                logger.error(f"❌ [CATEGORIZE] Job {job_id} not found")
+                return {"error": "Job not found"}
+
+            job.status = "running"
+            await db.commit()
+
+            if (job.params or {}).get("migrate"):
+                logger.info(f"📊 [MIGRATE CATEGORIES] Categories before migration: {await _category_distribution(db)}")
+                # Old values are mapped once per distinct value (CATEGORY_MAPPING); placeholder
+                # values ('Unknown', 'N/A', blank) are then auto-categorized
+                stats = await migrate_legacy_categories(db, job=job)
+                result = {
+                    "migrated": stats["migrated"],
+                    "mapped": stats["mapped"],
+                    "category_mapping": stats["changes"],
+                    **stats["categorize"],
+                }
+                logger.info(f"✅ [MIGRATE CATEGORIES] Migrated {stats['migrated']} prospect(s)")
+                logger.info(f"📊 [MIGRATE CATEGORIES] Categories after migration: {await _category_distribution(db)}")
+            else:
+                stats = await categorize_prospects(db, job=job)
+                stats.pop("changes")
+                result = stats
+                logger.info(
+                    f"✅ [AUTO CATEGORIZE] Automatically categorized {stats['categorized']} prospects "
+                    f"(inherited {stats['inherited']}, same-domain {stats['propagated']}, "
+                    f"classified {stats['classified']}, unmatched {stats['unmatched']})"
+                )
+
+            job.status = "completed"
+            job.result = result
+            await db.commit()
+            return result
+        except Exception as e:
+            logger.error(f"❌ [CATEGORIZE] Job {job_id} failed: {e}", exc_info=True)
+            try:
+                await db.rollback()
+                job = (await db.execute(select(Job).where(Job.id == UUID(job_id)))).scalar_one_or_none()
+                if job:
+                    job.status = "failed"
+                    job.error_message = str(e)
+                    await db.commit()
+            except Exception as commit_err:
+                logger.error(f"❌ [CATEGORIZE] Failed to commit error status: {commit_err}", exc_info=True)
+            return {"error": str(e)}
@@ -33,6 +33,22 @@ if 'logger' not in locals():
 # Import database session from backend
 from app.db.database import AsyncSessionLocal
 from app.db.transaction_helpers import safe_commit, safe_flush
+from app.utils.keyword_matcher import KeywordMatcher
+from app.utils.metrics import start_job_timings
+
+# Keywords used to infer a query's category when the category name itself is not in the query
+QUERY_CATEGORY_KEYWORDS = {
+    "Art Gallery": ["art gallery", "gallery", "art exhibition"],
+    "Museums": ["museum", "museums", "art museum"],
+    "Art Studio": ["art studio", "studio", "artist studio"],
+    "Art School": ["art school", "art academy", "art institute"],
+    "Art Fair": ["art fair", "art exhibition", "art show"],
+    "Art Dealer": ["art dealer", "art dealer", "art broker"],
+    "Art Consultant": ["art consultant", "art advisor", "art advisory"],
+    "Art Publisher": ["art publisher", "art publishing", "art press"],
+    "Art Magazine": ["art magazine", "art publication", "art journal"]
+}
+_QUERY_CATEGORY_MATCHER = KeywordMatcher(QUERY_CATEGORY_KEYWORDS)
 
 
 def _generate_search_queries(keywords: str, categories: List[str], locations: List[str]) -> List[str]:
@@ -173,6 +189,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
         ProspectStage,
     )
     from app.models.discovery_query import DiscoveryQuery
+    from app.models.prospect_payload import ProspectPayload
     from uuid import UUID
     from datetime import datetime, timezone, timedelta
     
@@ -199,6 +216,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
         # Update job status and record start time
         job.status = "running"
         start_time = datetime.now(timezone.utc)
+        timings = start_job_timings()
         if not await safe_commit(db, f"starting job {job_id}"):
             logger.error(f"❌ [DISCOVERY] Failed to commit job start status for {job_id}")
             return {"error": "Failed to update job status"}
@@ -350,22 +368,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                     
                     # If no direct match, try to infer from keywords
                     if not query_category:
-                        category_keywords = {
-                            "Art Gallery": ["art gallery", "gallery", "art exhibition"],
-                            "Museums": ["museum", "museums", "art museum"],
-                            "Art Studio": ["art studio", "studio", "artist studio"],
-                            "Art School": ["art school", "art academy", "art institute"],
-                            "Art Fair": ["art fair", "art exhibition", "art show"],
-                            "Art Dealer": ["art dealer", "art dealer", "art broker"],
-                            "Art Consultant": ["art consultant", "art advisor", "art advisory"],
-                            "Art Publisher": ["art publisher", "art publishing", "art press"],
-                            "Art Magazine": ["art magazine", "art publication", "art journal"]
-                        }
-                        for cat in categories:
-                            if cat in category_keywords:
-                                if any(kw in query_lower for kw in category_keywords[cat]):
-                                    query_category = cat
-                                    break
+                        query_category = _QUERY_CATEGORY_MATCHER.first_group(query_lower, order=categories)
                     
                     # Fallback: use first category if no match found
                     if not query_category and categories:
@@ -487,7 +490,18 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                         discovery_query.results_found = len(results)
                         logger.info(f"✅ Found {len(results)} results for '{query}' in {loc}")
                         
-                        for result_item in results:
+                        # Infer SERP intent for the whole page in one pass (same truncation as below)
+                        from app.services.serp_intent import infer_serp_intents
+                        page_intents = infer_serp_intents([
+                            {
+                                "url": item.get("url") or "",
+                                "title": (item.get("title") or "")[:500],
+                                "description": (item.get("description") or "")[:1000],
+                            } if isinstance(item, dict) else {}
+                            for item in results
+                        ], category=query_category or "")
+                        
+                        for result_index, result_item in enumerate(results):
                             # Check if job was cancelled before processing each result
                             await db.refresh(job)
                             if job.status == "cancelled":
@@ -538,7 +552,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                             
                             # Create prospect
                             # NOTE: Prospect model doesn't have page_snippet or country fields
-                            # Store description in dataforseo_payload if needed
+                            # Store description in the DataForSEO payload (prospect_payloads) if needed
                             # Safely get description - handle None values
                             description = result_item.get("description") or ""
                             description = description[:1000] if description else ""
@@ -548,13 +562,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                             title = title[:500] if title else ""
                             
                             # Step 1: Infer SERP intent BEFORE enrichment
-                            from app.services.serp_intent import infer_serp_intent
-                            intent_result = infer_serp_intent(
-                                url=normalized_url,
-                                title=title,
-                                snippet=description,
-                                category=query_category or ""
-                            )
+                            intent_result = page_intents[result_index]
                             serp_intent = intent_result.get("intent", "unknown")
                             serp_confidence = float(intent_result.get("confidence", 0.0))
                             serp_signals = intent_result.get("signals", [])
@@ -590,7 +598,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                                 try:
                                     logger.info(f"🔍 [DISCOVERY] Enriching {domain} before saving (intent: {serp_intent})...")
                                     # STRICT MODE: Pass page_url to enrichment
-                                    enrich_result = await enrich_prospect_email(domain, None, normalized_url)
+                                    enrich_result = await enrich_prospect_email(domain, None, normalized_url, category=query_category)
                                     
                                     if enrich_result:
                                         email_status = enrich_result.get("email_status", "no_email_found")
@@ -656,16 +664,19 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                                 contact_method="snov_io" if contact_email else ("pending_retry" if should_enrich else "skipped_intent"),
                                 outreach_status="pending",
                                 discovery_query_id=discovery_query.id,
-                                snov_payload=snov_payload,
                                 serp_intent=serp_intent,
                                 serp_confidence=serp_confidence,
                                 serp_signals=serp_signals,
-                                dataforseo_payload={
-                                    "description": description,
-                                    "location": loc,
-                                    "url": normalized_url,
-                                    "title": title
-                                },
+                                # Raw payloads go to prospect_payloads, inserted with the prospect
+                                payloads=ProspectPayload(
+                                    snov_payload=snov_payload,
+                                    dataforseo_payload={
+                                        "description": description,
+                                        "location": loc,
+                                        "url": normalized_url,
+                                        "title": title
+                                    },
+                                ),
                                 # PIPELINE MODE: Set discovery status, store metadata, NO enrichment
                                 # Canonical status: DISCOVERED (pipeline mode) or NEW (legacy mode)
                                 discovery_status=DiscoveryStatus.DISCOVERED.value
@@ -774,6 +785,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
             job.status = "completed"
             job.result = {
                 "prospects_discovered": len(all_prospects),
+                "timings": timings.snapshot(),
                 "locations": locations,
                 "categories": categories,
                 "keywords": keywords,
@@ -12,6 +12,9 @@ from app.db.database import AsyncSessionLocal
 from app.models.prospect import Prospect, ScrapeStatus, DraftStatus, ProspectStage
 from app.models.job import Job
 from app.clients.gemini import GeminiClient
+from app.services.prospect_payloads import get_payloads_many, snippet_from_payload
+from app.services.research_dossier import get_or_build_dossier
+from app.utils.metrics import start_job_timings
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +130,7 @@ async def draft_prospects_async(job_id: str):
                 )
                 await db.commit()
 
+            timings = start_job_timings()
             prospect_ids = job_params.get("prospect_ids") if isinstance(job_params, dict) else None
             auto_mode = bool(job_params.get("auto_mode")) if isinstance(job_params, dict) else False
             if not prospect_ids:
@@ -340,6 +344,9 @@ async def draft_prospects_async(job_id: str):
             failed_count = existing_failed_count
             skipped_count = 0
 
+            # SERP snippets of all targets in one query (payloads are not on the prospects row)
+            target_payloads = await get_payloads_many(db, [p.id for p in prospects], "dataforseo_payload")
+
             for idx, prospect in enumerate(prospects, 1):
                 try:
                     if has_progress_columns and job:
@@ -369,12 +376,12 @@ async def draft_prospects_async(job_id: str):
                         f"✍️  [DRAFTING] [{idx}/{total_targets}] Drafting email for {prospect.domain}..."
                     )
 
-                    page_snippet = None
-                    if isinstance(prospect.dataforseo_payload, dict):
-                        page_snippet = prospect.dataforseo_payload.get("description") or prospect.dataforseo_payload.get(
-                            "snippet"
-                        )
+                    page_snippet = snippet_from_payload(
+                        target_payloads.get(prospect.id, {}).get("dataforseo_payload")
+                    )
 
+                    # Stored for the draft chat and follow-ups as well
+                    dossier = await get_or_build_dossier(db, prospect, gemini_client)
                     gemini_result = await gemini_client.compose_email(
                         domain=prospect.domain,
                         page_title=prospect.page_title,
@@ -382,6 +389,7 @@ async def draft_prospects_async(job_id: str):
                         page_snippet=page_snippet,
                         contact_name=None,
                         category=prospect.discovery_category,
+                        dossier=dossier,
                     )
 
                     if gemini_result.get("success"):
@@ -504,6 +512,7 @@ async def draft_prospects_async(job_id: str):
                 "drafts_created": drafted_count,
                 "total_targets": total_targets,
                 "skipped": skipped_count,
+                "timings": timings.snapshot(),
             }
 
             if drafted_count == 0:
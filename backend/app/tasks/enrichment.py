@@ -11,9 +11,11 @@ from sqlalchemy import select
 from app.db.database import AsyncSessionLocal
 from app.models.prospect import Prospect
 from app.models.job import Job
+from app.utils.metrics import start_job_timings
 from app.clients.snov import SnovIOClient
 from app.utils.email_validation import is_plausible_email, format_job_error
 from app.services.exceptions import RateLimitError
+from app.services.prospect_payloads import save_payloads
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -45,6 +47,7 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
             job.status = "running"
             await db.commit()
             await db.refresh(job)
+            timings = start_job_timings()
             
             logger.info(f"🔍 Starting enrichment job {job_id}...")
             
@@ -147,7 +150,7 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                     # Call STRICT MODE enrichment service
                     try:
                         from app.services.enrichment import enrich_prospect_email
-                        enrich_result = await enrich_prospect_email(domain, None, prospect.page_url)
+                        enrich_result = await enrich_prospect_email(domain, None, prospect.page_url, category=prospect.discovery_category)
                         
                         # STRICT MODE: Handle new response format
                         if not enrich_result:
@@ -164,6 +167,10 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                                 "source": "no_email_found",
                             }
                         
+                        if enrich_result.get("dns_status"):
+                            prospect.dns_status = enrich_result["dns_status"]
+                            prospect.dns_checked_at = datetime.now(timezone.utc)
+                        
                         # Log enrichment results
                         email_status = enrich_result.get("email_status", "no_email_found")
                         emails_found = enrich_result.get("emails", [])
@@ -182,14 +189,14 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                             # Store "no_email_found" status
                             prospect.contact_email = None
                             prospect.contact_method = "no_email_found"
-                            prospect.snov_payload = {
+                            await save_payloads(db, prospect.id, snov_payload={
                                 "email_status": "no_email_found",
                                 "pages_crawled": pages_crawled,
                                 "emails_by_page": enrich_result.get("emails_by_page", {}),
                                 "snov_emails_accepted": snov_accepted,
                                 "snov_emails_rejected": snov_rejected,
                                 "source": enrich_result.get("source", "no_email_found"),
-                            }
+                            })
                             no_email_count += 1
                             await db.commit()
                             await db.refresh(prospect)
@@ -217,11 +224,11 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                         # On error, mark as no_email_found
                         prospect.contact_email = None
                         prospect.contact_method = "no_email_found"
-                        prospect.snov_payload = {
+                        await save_payloads(db, prospect.id, snov_payload={
                             "email_status": "no_email_found",
                             "error": str(enrich_err),
                             "source": "error",
-                        }
+                        })
                         no_email_count += 1
                         await db.commit()
                         await db.refresh(prospect)
@@ -239,7 +246,7 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                             logger.warning(f"🚫 [ENRICHMENT] Rejecting implausible email before save: {new_email}")
                             prospect.contact_email = None
                             prospect.contact_method = "no_email_found"
-                            prospect.snov_payload = enrich_result
+                            await save_payloads(db, prospect.id, snov_payload=enrich_result)
                             no_email_count += 1
                             await db.commit()
                             await db.refresh(prospect)
@@ -256,7 +263,7 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                         prospect.contact_email = new_email
                         prospect.contact_method = provider_source
                         # Store full enrichment result in snov_payload
-                        prospect.snov_payload = enrich_result
+                        await save_payloads(db, prospect.id, snov_payload=enrich_result)
                         # Update scrape_status to ENRICHED when email is successfully found
                         prospect.scrape_status = "ENRICHED"
                         enriched_count += 1
@@ -267,7 +274,7 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                         )
                         prospect.contact_email = None
                         prospect.contact_method = "no_email_found"
-                        prospect.snov_payload = enrich_result
+                        await save_payloads(db, prospect.id, snov_payload=enrich_result)
                         no_email_count += 1
                     
                     await db.commit()
@@ -292,7 +299,8 @@ async def process_enrichment_job(job_id: str) -> Dict[str, Any]:
                 "prospects_enriched": enriched_count,
                 "prospects_failed": failed_count,
                 "prospects_no_email": no_email_count,
-                "total_processed": len(prospects)
+                "total_processed": len(prospects),
+                "timings": timings.snapshot(),
             }
             await db.commit()
             
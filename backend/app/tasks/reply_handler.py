@@ -0,0 +1,35 @@
+"""
+Reply handler task - incremental Gmail reply detection
+Runs directly in backend; triggered by Gmail push notifications and a periodic safety-net check
+"""
+import logging
+from typing import Dict, Any, Optional
+from app.db.database import AsyncSessionLocal
+from app.clients.gmail import GmailClient
+from app.services.reply_sync import sync_replies
+
+logger = logging.getLogger(__name__)
+
+
+async def process_reply_check_job(notified_history_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Sync mailbox changes since the last processed historyId and mark replied prospects
+
+    Args:
+        notified_history_id: historyId from a Gmail push notification (None for periodic checks)
+
+    Returns:
+        Dict with sync stats or error
+    """
+    try:
+        gmail_client = GmailClient()
+    except ValueError as e:
+        logger.warning(f"📬 [REPLIES] Gmail not configured, reply check skipped: {e}")
+        return {"success": False, "error": str(e)}
+
+    async with AsyncSessionLocal() as db:
+        try:
+            return await sync_replies(db, gmail_client, notified_history_id=notified_history_id)
+        except Exception as e:
+            logger.error(f"❌ [REPLIES] Reply sync failed: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
@@ -4,7 +4,8 @@ Scrapes approved websites for emails (homepage + contact/about pages)
 """
 import asyncio
 import logging
-from typing import List
+import os
+from typing import Dict
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
@@ -13,12 +14,18 @@ from datetime import datetime, timezone
 from app.db.database import AsyncSessionLocal
 from app.models.prospect import Prospect, ScrapeStatus, ProspectStage
 from app.models.job import Job
+from app.utils.metrics import start_job_timings
 from app.models.discovery_query import DiscoveryQuery
 from app.services.enrichment import _scrape_emails_from_domain
+from app.services.dns_preflight import get_dns_preflight
+from app.services.prospect_payloads import save_payloads
 from app.api.pipeline import auto_categorize_prospect
 
 logger = logging.getLogger(__name__)
 
+# Prospects crawled at the same time; per-host politeness is enforced by the crawl scheduler
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+
 
 async def scrape_prospects_async(job_id: str):
     """
@@ -30,7 +37,12 @@ async def scrape_prospects_async(job_id: str):
     - Extracts visible emails only
     - Sets scrape_status = "SCRAPED" or "NO_EMAIL_FOUND"
     - Commits state updates immediately after each prospect
+    - Crawls up to SCRAPE_CONCURRENCY prospects ahead of the (sequential)
+      state updates; all fetches go through the crawl scheduler
+    - DNS preflight first: domains that do not resolve (nxdomain / no_address)
+      are not crawled and end as NO_EMAIL_FOUND
     """
+    crawls: Dict[UUID, asyncio.Task] = {}
     async with AsyncSessionLocal() as db:
         try:
             # Get job
@@ -43,6 +55,7 @@ async def scrape_prospects_async(job_id: str):
             
             job.status = "running"
             await db.commit()
+            timings = start_job_timings()
             
             # Get prospects to scrape
             prospect_ids = job.params.get("prospect_ids", [])
@@ -79,12 +92,36 @@ async def scrape_prospects_async(job_id: str):
             no_email_count = 0
             failed_count = 0
             
+            crawl_slots = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+            
+            async def crawl(domain: str, page_url):
+                async with crawl_slots:
+                    return await _scrape_emails_from_domain(domain, page_url)
+            
+            # DNS / MX preflight: dead domains cost one lookup instead of ~60 URL timeouts
+            checked_at = datetime.now(timezone.utc)
+            dns_results = await get_dns_preflight().check_many(p.domain for p in prospects)
+            for prospect in prospects:
+                preflight = dns_results.get(prospect.domain)
+                if preflight is None:
+                    continue
+                prospect.dns_status = preflight.status
+                prospect.dns_checked_at = checked_at
+                if not preflight.is_dead:
+                    crawls[prospect.id] = asyncio.create_task(crawl(prospect.domain, prospect.page_url))
+            dead_count = sum(1 for p in prospects if p.id not in crawls)
+            if dead_count:
+                logger.info(f"🪦 [SCRAPING] DNS preflight: {dead_count}/{len(prospects)} domains do not resolve - skipping their crawl")
+            
             for idx, prospect in enumerate(prospects, 1):
                 try:
                     logger.info(f"🔍 [SCRAPING] [{idx}/{len(prospects)}] Scraping {prospect.domain}...")
                     
-                    # Scrape emails from domain
-                    emails_by_page = await _scrape_emails_from_domain(prospect.domain, prospect.page_url)
+                    # Scrape emails from domain (crawled concurrently, results taken in order)
+                    crawl_task = crawls.get(prospect.id)
+                    if crawl_task is None:
+                        logger.info(f"🪦 [SCRAPING] {prospect.domain}: DNS {prospect.dns_status} - not crawled")
+                    emails_by_page = await crawl_task if crawl_task is not None else {}
                     
                     # Collect all unique emails
                     all_emails = []
@@ -98,7 +135,7 @@ async def scrape_prospects_async(job_id: str):
                         # Emails found - update prospect state and set EMAIL_FOUND stage
                         prospect.contact_email = all_emails[0]  # Primary email
                         prospect.scrape_source_url = source_url
-                        prospect.scrape_payload = emails_by_page
+                        await save_payloads(db, prospect.id, scrape_payload=emails_by_page)
                         prospect.scrape_status = ScrapeStatus.SCRAPED.value
                         
                         # CRITICAL: Inherit category from discovery query if not already set
@@ -163,7 +200,7 @@ async def scrape_prospects_async(job_id: str):
                     else:
                         # No emails found - update prospect state (remain at SCRAPED stage, not promoted to LEAD)
                         prospect.scrape_status = ScrapeStatus.NO_EMAIL_FOUND.value
-                        prospect.scrape_payload = {}
+                        await save_payloads(db, prospect.id, scrape_payload={})
                         
                         # CRITICAL: Inherit category from discovery query if not already set
                         if not prospect.discovery_category or prospect.discovery_category in ['', 'N/A', 'Unknown']:
@@ -230,9 +267,6 @@ async def scrape_prospects_async(job_id: str):
                     await db.refresh(prospect)
                     logger.debug(f"💾 [SCRAPING] Committed state update for prospect {prospect.id} (scrape_status={prospect.scrape_status})")
                     
-                    # Rate limiting
-                    await asyncio.sleep(1)
-                    
                 except Exception as e:
                     logger.error(
                         f"❌ [SCRAPING] Failed to scrape {prospect.domain}: {e}",
@@ -268,7 +302,8 @@ async def scrape_prospects_async(job_id: str):
                 "scraped": scraped_count,
                 "no_email": no_email_count,
                 "failed": failed_count,
-                "total": len(prospects)
+                "total": len(prospects),
+                "timings": timings.snapshot(),
             }
             await db.commit()
             
@@ -299,4 +334,7 @@ async def scrape_prospects_async(job_id: str):
             except Exception as commit_err:
                 logger.error(f"❌ [SCRAPING] Failed to commit error status: {commit_err}", exc_info=True)
             return {"error": str(e)}
+        finally:
+            for task in crawls.values():
+                task.cancel()
 
@@ -12,9 +12,12 @@ from sqlalchemy import select
 from app.db.database import AsyncSessionLocal
 from app.models.prospect import Prospect
 from app.models.job import Job
+from app.utils.metrics import start_job_timings
 from app.models.email_log import EmailLog
 from app.clients.gmail import GmailClient
 from app.clients.gemini import GeminiClient
+from app.services.prospect_payloads import get_payloads, snippet_from_payload
+from app.services.research_dossier import get_or_build_dossier
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +46,7 @@ async def process_send_job(job_id: str) -> Dict[str, Any]:
             job.status = "running"
             await db.commit()
             await db.refresh(job)
+            timings = start_job_timings()
             
             import time
             send_start_time = time.time()
@@ -70,7 +74,8 @@ async def process_send_job(job_id: str) -> Dict[str, Any]:
             if prospect_ids:
                 query = query.where(Prospect.id.in_([UUID(pid) for pid in prospect_ids]))
             
-            query = query.limit(max_prospects)
+            # Oldest first - served by the ix_prospects_send_queue partial index
+            query = query.order_by(Prospect.created_at.asc()).limit(max_prospects)
             
             result = await db.execute(query)
             prospects = result.scalars().all()
@@ -130,13 +135,14 @@ async def process_send_job(job_id: str) -> Dict[str, Any]:
                         logger.info(f"📝 [{idx}/{len(prospects)}] Composing email for {prospect.domain}...")
                         
                         # Extract context for email composition
-                        page_snippet = None
-                        if prospect.dataforseo_payload:
-                            page_snippet = prospect.dataforseo_payload.get("description") or prospect.dataforseo_payload.get("snippet")
+                        payloads = await get_payloads(db, prospect.id, "dataforseo_payload", "snov_payload")
+                        page_snippet = snippet_from_payload(payloads["dataforseo_payload"])
                         
+                        # Email provider payload (Snov.io, formerly Hunter.io)
                         contact_name = None
-                        if prospect.hunter_payload and prospect.hunter_payload.get("emails"):
-                            emails = prospect.hunter_payload["emails"]
+                        provider_payload = payloads["snov_payload"]
+                        if isinstance(provider_payload, dict) and provider_payload.get("emails"):
+                            emails = provider_payload["emails"]
                             if emails and len(emails) > 0:
                                 first_email = emails[0]
                                 first_name = first_email.get("first_name")
@@ -144,13 +150,15 @@ async def process_send_job(job_id: str) -> Dict[str, Any]:
                                 if first_name or last_name:
                                     contact_name = f"{first_name or ''} {last_name or ''}".strip()
                         
-                        # Compose email using Gemini
+                        # Compose email using Gemini (with the stored research dossier)
+                        dossier = await get_or_build_dossier(db, prospect, gemini_client)
                         gemini_result = await gemini_client.compose_email(
                             domain=prospect.domain,
                             page_title=prospect.page_title,
                             page_url=prospect.page_url,
                             page_snippet=page_snippet,
-                            contact_name=contact_name
+                            contact_name=contact_name,
+                            dossier=dossier
                         )
                         
                         if gemini_result.get("success"):
@@ -216,7 +224,8 @@ async def process_send_job(job_id: str) -> Dict[str, Any]:
                 "emails_sent": sent_count,
                 "emails_failed": failed_count,
                 "emails_skipped": skipped_count,
-                "total_processed": len(prospects)
+                "total_processed": len(prospects),
+                "timings": timings.snapshot(),
             }
             await db.commit()
             
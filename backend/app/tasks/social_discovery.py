@@ -20,6 +20,7 @@ from app.adapters.social_discovery import (
     TikTokDiscoveryAdapter
 )
 from app.models.prospect import Prospect, DiscoveryStatus
+from app.services.social.profile_ingestion import ingest_social_prospects, resolve_max_results
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,7 @@ async def discover_social_profiles_async(job_id: str) -> dict:
         categories = params.get("categories", [])
         locations = params.get("locations", [])
         keywords = params.get("keywords", [])
-        max_results = params.get("max_results", 100)
+        max_results = resolve_max_results(params)
         
         logger.info(f"🚀 [SOCIAL DISCOVERY] Starting discovery job {job_id} for platform {platform}")
         logger.info(f"📋 [SOCIAL DISCOVERY] Categories: {categories}, Locations: {locations}, Keywords: {keywords}")
@@ -124,7 +125,6 @@ async def discover_social_profiles_async(job_id: str) -> dict:
             
             # Save ALL profiles to database (do not filter out)
             # Eligibility is checked at API/UI level, not at discovery time
-            saved_count = 0
             for prospect in prospects:
                 # Check eligibility (for reporting only, not filtering)
                 follower_count = prospect.follower_count or 0
@@ -155,9 +155,11 @@ async def discover_social_profiles_async(job_id: str) -> dict:
                     prospect.external_links = None
                 if hasattr(prospect, 'scraped_at'):
                     prospect.scraped_at = None
-                
-                db.add(prospect)
-                saved_count += 1
+            
+            # Bulk save: in-batch dedupe + one existence check per batch instead of
+            # a round-trip per profile; already-known profiles get refreshed counts
+            ingest_stats = await ingest_social_prospects(db, prospects)
+            saved_count = ingest_stats["created"] + ingest_stats["updated"] + ingest_stats["unchanged"]
             
             logger.info(f"📊 [SOCIAL DISCOVERY] Eligibility results: {qualified_count} eligible, {ineligible_count} ineligible out of {saved_count} saved profiles")
             
@@ -167,6 +169,9 @@ async def discover_social_profiles_async(job_id: str) -> dict:
             job.status = "completed"
             job.result = {
                 "prospects_count": saved_count,
+                "created_count": ingest_stats["created"],
+                "updated_count": ingest_stats["updated"],
+                "unchanged_count": ingest_stats["unchanged"],
                 "qualified_count": qualified_count,
                 "disqualified_count": ineligible_count,  # Fixed: use ineligible_count instead of undefined disqualified_count
                 "platform": platform,
@@ -1,23 +1,99 @@
 """
 Verification task - STEP 4 of strict pipeline
 Verifies scraped emails using Snov.io
+
+VERIFY_MODE (or the job's "verify_mode" param) picks how:
+- batch (default): all addresses of the job go through the bulk verifiers
+  (services/bulk_verification.py) and the results are written with one
+  bulk UPDATE and one payload upsert
+- per_prospect: a Snov.io domain search per prospect, 1s apart
 """
 import asyncio
 import logging
-from typing import List
+import os
+from typing import Dict, List, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from datetime import datetime, timezone
 
 from app.db.database import AsyncSessionLocal
 from app.models.prospect import Prospect, ScrapeStatus, VerificationStatus, ProspectStage
 from app.models.job import Job
+from app.utils.metrics import start_job_timings
 from app.clients.snov import SnovIOClient
 from app.services.enrichment import _is_snov_email_from_website
+from app.services.dns_preflight import DEAD_STATUSES, get_dns_preflight
+from app.services.bulk_verification import UNDELIVERABLE, verify_emails
+from app.services.prospect_payloads import save_payloads, save_payloads_many
 
 logger = logging.getLogger(__name__)
 
+VERIFY_MODE = os.getenv("VERIFY_MODE", "batch")
+
+# Confidence when the verifier gives no score (same scale as the 0.5 "scraped, not confirmed")
+VERDICT_CONFIDENCE = {"deliverable": 1.0, "risky": 0.5, "unknown": 0.5, UNDELIVERABLE: 0.0}
+
+
+async def _verify_in_bulk(db: AsyncSession, prospects: List[Prospect], email_domains: Dict, mail_dns: Dict) -> Tuple[int, int, List[Prospect]]:
+    """
+    Verify every prospect with an email in one batch and write the outcome
+    with one bulk UPDATE + one payload upsert + one commit.
+
+    Same policy as the per-prospect path: an address scraped from the website
+    is verified unless its domain has no mail server or a verifier says it is
+    undeliverable; without an answer it is verified with confidence 0.5.
+    NO_EMAIL_FOUND prospects on a dead domain are marked unverified.
+
+    Returns (verified, unverified, prospects left for the per-prospect path).
+    """
+    updates: List[Dict] = []
+    payloads: Dict[UUID, Dict] = {}
+    remaining: List[Prospect] = []
+    to_verify: List[Prospect] = []
+
+    for prospect in prospects:
+        if prospect.contact_email:
+            email_dns = mail_dns.get(email_domains.get(prospect.id))
+            if email_dns is not None and email_dns.accepts_mail is False:
+                updates.append({"id": prospect.id, "verification_status": VerificationStatus.UNVERIFIED_LOWER.value,
+                                "verification_confidence": 0.0})
+                payloads[prospect.id] = {"verification_payload": {"dns_status": email_dns.status, "mx": []}}
+            else:
+                to_verify.append(prospect)
+        elif prospect.scrape_status == ScrapeStatus.NO_EMAIL_FOUND.value and prospect.dns_status in DEAD_STATUSES:
+            updates.append({"id": prospect.id, "verification_status": VerificationStatus.UNVERIFIED_LOWER.value,
+                            "verification_confidence": 0.0})
+            payloads[prospect.id] = {"verification_payload": {"dns_status": prospect.dns_status}}
+        else:
+            remaining.append(prospect)
+
+    verdicts = await verify_emails(p.contact_email.strip() for p in to_verify)
+    for prospect in to_verify:
+        verdict = verdicts.get(prospect.contact_email.strip())
+        if verdict is None:
+            status, confidence, payload = VerificationStatus.VERIFIED.value, 0.5, {"result": None, "provider": None}
+        else:
+            status = VerificationStatus.UNVERIFIED_LOWER.value if verdict.result == UNDELIVERABLE else VerificationStatus.VERIFIED.value
+            # verdict.score is the provider's 0-100 score; verification_confidence is 0-1
+            confidence = verdict.score / 100 if verdict.score is not None else VERDICT_CONFIDENCE.get(verdict.result, 0.5)
+            payload = verdict.to_payload()
+        updates.append({"id": prospect.id, "verification_status": status, "verification_confidence": confidence})
+        payloads[prospect.id] = {"verification_payload": payload}
+
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany for the whole batch
+        await db.execute(update(Prospect), updates)
+        await save_payloads_many(db, payloads)
+        await db.commit()
+
+    verified = sum(1 for u in updates if u["verification_status"] == VerificationStatus.VERIFIED.value)
+    logger.info(
+        f"✅ [VERIFICATION] Bulk: {len(to_verify)} address(es) checked, {len(verdicts)} answered by a verifier, "
+        f"{verified} verified, {len(updates) - verified} unverified, {len(remaining)} left for domain search"
+    )
+    return verified, len(updates) - verified, remaining
+
 
 async def verify_prospects_async(job_id: str):
     """
@@ -29,6 +105,9 @@ async def verify_prospects_async(job_id: str):
     - Else → attempt domain search via Snov
     - Sets verification_status = "verified" or "unverified"
     - Never overwrites scraped emails without confirmation
+    - Emails whose domain has no mail server (DNS MX preflight) are marked
+      unverified without a Snov.io call; so are NO_EMAIL_FOUND prospects whose
+      domain does not resolve
     """
     async with AsyncSessionLocal() as db:
         try:
@@ -42,6 +121,7 @@ async def verify_prospects_async(job_id: str):
             
             job.status = "running"
             await db.commit()
+            timings = start_job_timings()
             
             # Get prospects to verify
             prospect_ids = job.params.get("prospect_ids", [])
@@ -131,23 +211,37 @@ async def verify_prospects_async(job_id: str):
                     "message": "No prospects found to verify"
                 }
             
-            # Initialize Snov client
-            try:
-                snov_client = SnovIOClient()
-            except Exception as e:
-                logger.error(f"❌ [VERIFICATION] Failed to initialize Snov client: {e}")
-                job.status = "failed"
-                job.error_message = f"Snov.io not configured: {e}"
-                await db.commit()
-                return {"error": f"Snov.io not configured: {e}"}
-            
             verified_count = 0
             unverified_count = 0
             failed_count = 0
             
-            for idx, prospect in enumerate(prospects, 1):
+            # MX preflight of every email domain at once (cached, concurrent)
+            email_domains = {
+                p.id: p.contact_email.rsplit("@", 1)[-1].strip().lower()
+                for p in prospects if p.contact_email and "@" in p.contact_email
+            }
+            mail_dns = await get_dns_preflight().check_many(email_domains.values())
+            
+            # Batch mode: every address through the bulk verifiers at once, one bulk update;
+            # only NO_EMAIL_FOUND prospects that need a domain search go one by one below
+            remaining = prospects
+            if (job.params.get("verify_mode") or VERIFY_MODE) == "batch":
+                verified_count, unverified_count, remaining = await _verify_in_bulk(db, prospects, email_domains, mail_dns)
+            
+            # Initialize Snov client (per-prospect verification / domain search)
+            if remaining:
                 try:
-                    logger.info(f"🔍 [VERIFICATION] [{idx}/{len(prospects)}] Verifying {prospect.domain} (email: {prospect.contact_email}, scrape_status: {prospect.scrape_status}, verification_status: {prospect.verification_status})...")
+                    snov_client = SnovIOClient()
+                except Exception as e:
+                    logger.error(f"❌ [VERIFICATION] Failed to initialize Snov client: {e}")
+                    job.status = "failed"
+                    job.error_message = f"Snov.io not configured: {e}"
+                    await db.commit()
+                    return {"error": f"Snov.io not configured: {e}"}
+            
+            for idx, prospect in enumerate(remaining, 1):
+                try:
+                    logger.info(f"🔍 [VERIFICATION] [{idx}/{len(remaining)}] Verifying {prospect.domain} (email: {prospect.contact_email}, scrape_status: {prospect.scrape_status}, verification_status: {prospect.verification_status})...")
                     
                     # If prospect has scraped email, verify it
                     # CRITICAL: Process both SCRAPED and ENRICHED prospects (matches verify endpoint logic)
@@ -164,6 +258,16 @@ async def verify_prospects_async(job_id: str):
                             logger.warning(f"⚠️  [VERIFICATION] Prospect {prospect.id} has email but scrape_status is '{prospect.scrape_status}' (not SCRAPED/ENRICHED). Verifying anyway since email exists.")
                             should_verify = True
                         
+                        email_dns = mail_dns.get(email_domains.get(prospect.id))
+                        if should_verify and email_dns is not None and email_dns.accepts_mail is False:
+                            prospect.verification_status = VerificationStatus.UNVERIFIED_LOWER.value
+                            prospect.verification_confidence = 0.0
+                            await save_payloads(db, prospect.id, verification_payload={"dns_status": email_dns.status, "mx": []})
+                            unverified_count += 1
+                            logger.warning(f"📭 [VERIFICATION] {prospect.contact_email}: domain has no mail server (DNS {email_dns.status}) - skipped Snov.io")
+                            await db.commit()
+                            continue
+                        
                         if should_verify:
                             # Verify existing scraped email
                             logger.debug(f"🔍 [VERIFICATION] Calling Snov.io domain_search for {prospect.domain}...")
@@ -227,7 +331,7 @@ async def verify_prospects_async(job_id: str):
                             # Always verify scraped emails (we found them on the website, so they're valid)
                             prospect.verification_status = VerificationStatus.VERIFIED.value
                             prospect.verification_confidence = confidence
-                            prospect.verification_payload = snov_result
+                            await save_payloads(db, prospect.id, verification_payload=snov_result)
                             verified_count += 1
                             logger.info(f"✅ [VERIFICATION] Verified scraped email for {prospect.domain}: {prospect.contact_email} (confidence: {confidence})")
                             logger.info(f"📝 [VERIFICATION] Updated prospect {prospect.id} - verification_status=VERIFIED, stage=LEAD")
@@ -237,6 +341,19 @@ async def verify_prospects_async(job_id: str):
                             await db.refresh(prospect)
                             logger.debug(f"💾 [VERIFICATION] Committed verification for prospect {prospect.id}, verification_status is now: {prospect.verification_status}")
                     
+                    elif (
+                        prospect.scrape_status == ScrapeStatus.NO_EMAIL_FOUND.value
+                        and prospect.dns_status in DEAD_STATUSES
+                    ):
+                        # The domain does not resolve - a Snov.io domain search would only spend a credit
+                        prospect.verification_status = VerificationStatus.UNVERIFIED_LOWER.value
+                        prospect.verification_confidence = 0.0
+                        await save_payloads(db, prospect.id, verification_payload={"dns_status": prospect.dns_status})
+                        unverified_count += 1
+                        logger.warning(f"🪦 [VERIFICATION] {prospect.domain}: DNS {prospect.dns_status} - skipped Snov.io domain search")
+                        await db.commit()
+                        continue
+                    
                     elif (
                         prospect.scrape_status == ScrapeStatus.NO_EMAIL_FOUND.value
                     ):
@@ -266,7 +383,7 @@ async def verify_prospects_async(job_id: str):
                                 # Keep stage as LEAD (don't change to VERIFIED) - stage=LEAD + verification_status=verified = ready for drafting
                                 # Stage remains LEAD to match drafting_ready_count query requirement
                                 prospect.verification_confidence = confidence
-                                prospect.verification_payload = snov_result
+                                await save_payloads(db, prospect.id, verification_payload=snov_result)
                                 verified_count += 1
                                 logger.info(f"✅ [VERIFICATION] Found email via Snov for {prospect.domain}: {found_email} (confidence: {confidence})")
                                 logger.info(f"📝 [VERIFICATION] Updated prospect {prospect.id} - verification_status=VERIFIED, stage remains LEAD")
@@ -275,7 +392,7 @@ async def verify_prospects_async(job_id: str):
                                     VerificationStatus.UNVERIFIED_LOWER.value
                                 )
                                 prospect.verification_confidence = 0.0
-                                prospect.verification_payload = snov_result
+                                await save_payloads(db, prospect.id, verification_payload=snov_result)
                                 unverified_count += 1
                                 logger.warning(f"⚠️  [VERIFICATION] No website-source email found for {prospect.domain}")
                         else:
@@ -283,7 +400,7 @@ async def verify_prospects_async(job_id: str):
                                 VerificationStatus.UNVERIFIED_LOWER.value
                             )
                             prospect.verification_confidence = 0.0
-                            prospect.verification_payload = snov_result
+                            await save_payloads(db, prospect.id, verification_payload=snov_result)
                             unverified_count += 1
                             logger.warning(f"⚠️  [VERIFICATION] Snov returned no results for {prospect.domain}")
                     
@@ -311,7 +428,8 @@ async def verify_prospects_async(job_id: str):
                 "verified": verified_count,
                 "unverified": unverified_count,
                 "failed": failed_count,
-                "total": len(prospects)
+                "total": len(prospects),
+                "timings": timings.snapshot(),
             }
             await db.commit()
             
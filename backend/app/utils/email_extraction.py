@@ -0,0 +1,232 @@
+"""
+Single-pass email extraction engine for scraped HTML.
+
+The HTML is first run through one substitution pass that decodes the common
+obfuscations we see on contact pages (bracketed words are collapsed by a
+cheap follow-up scan that starts at the bracket):
+- HTML entities for email characters (&#64;, &#x40;, &commat;, fully
+  entity-encoded addresses like &#105;&#110;&#102;&#111;...) and for the
+  colon of an encoded mailto&#58; / mailto&colon;
+- Bracketed words: info [at] domain [dot] com, info(at)domain.com
+- Percent-encoded "@" in mailto links (mailto:info%40domain.com)
+- Cloudflare email protection (data-cfemail="..." and
+  /cdn-cgi/l/email-protection#...)
+- JS string concatenation ('info' + '@' + 'domain.com')
+
+The decoded stream is then scanned ONCE, anchored on "@" signs, picking up
+both mailto: links and plain-text addresses. Every unique candidate is
+validated exactly once with is_plausible_email().
+"""
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.utils.email_validation import is_plausible_email
+
+
+# Priority scores (kept identical to the original enrichment extractor)
+PRIORITY_MAILTO_DOMAIN = 100
+PRIORITY_MAILTO = 90
+PRIORITY_DOMAIN_CONTACT = 80
+PRIORITY_DOMAIN = 70
+PRIORITY_CONTACT = 60
+PRIORITY_OTHER = 50
+
+COMMON_CONTACT_LOCALS = frozenset([
+    "info", "contact", "support", "hello", "hi", "sales", "help", "admin", "team"
+])
+
+# Characters that may legitimately appear in an email address, plus ":" so an
+# encoded mailto&#58; keeps mailto priority; numeric entities outside this set
+# are left untouched by the decoder.
+_EMAIL_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@._%+-:"
+)
+
+_NAMED_ENTITIES = {
+    "commat": "@",
+    "period": ".",
+    "hyphen": "-",
+    "dash": "-",
+    "lowbar": "_",
+    "plus": "+",
+    "colon": ":",
+}
+
+# Obfuscation decoder - one alternation, one re.sub() pass over the HTML.
+# The leading lookahead rejects positions that cannot start any alternative
+# before the (comparatively expensive) alternation is tried.
+_DECODE_RE = re.compile(
+    r"(?=[dD/&\"'%])(?:"
+    r"data-cfemail\s*=\s*[\"']?(?P<cf>[0-9a-fA-F]{4,})[\"']?"
+    r"|/cdn-cgi/l/email-protection#(?P<cfhref>[0-9a-fA-F]{4,})"
+    r"|&#(?:x(?P<hex>[0-9a-fA-F]{1,4})|(?P<dec>[0-9]{1,5}));?"
+    r"|&(?P<named>commat|period|hyphen|dash|lowbar|plus|colon);"
+    r"|(?P<concat>[\"']\s*\+\s*[\"'])"
+    r"|(?P<pct>%40)"
+    r")",
+    re.IGNORECASE,
+)
+
+# "[at]" / "(dot)" words swallow the whitespace around them. A leading \s*
+# would make the regex engine try every whitespace position, so the pattern
+# starts at the bracket and the preceding whitespace is trimmed by hand.
+_BRACKET_WORD_RE = re.compile(r"[\[\(\{]\s*(?P<word>at|dot)\s*[\]\)\}]\s*", re.IGNORECASE)
+
+# Extraction is anchored on "@": cost scales with the number of "@" signs, not
+# with page size. The local part is matched backwards on a reversed window.
+MAX_LOCAL_LENGTH = 64
+_LOCAL_REVERSED_RE = re.compile(r"[a-zA-Z0-9._%+-]{1," + str(MAX_LOCAL_LENGTH + 1) + "}")
+_DOMAIN_RE = re.compile(r"[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b")
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+# Plain-text (non-mailto) matches containing these are placeholders, not contacts
+_PLAIN_SKIP_RE = re.compile(r"example\.com|test@|noreply|no-reply|donotreply")
+
+
+def decode_cfemail(encoded: str) -> str:
+    """
+    Decode a Cloudflare-protected email (hex string, first byte is the XOR key).
+
+    Returns empty string if the payload is not valid hex.
+    """
+    try:
+        data = bytes.fromhex(encoded)
+    except ValueError:
+        return ""
+    if len(data) < 2:
+        return ""
+    key = data[0]
+    return bytes(b ^ key for b in data[1:]).decode("utf-8", errors="ignore")
+
+
+def _decode_match(match: "re.Match[str]") -> str:
+    group = match.lastgroup
+    if group in ("cf", "cfhref"):
+        decoded = decode_cfemail(match.group(group))
+        # Cloudflare only protects mailto links, so keep mailto priority
+        return f" mailto:{decoded} " if decoded else " "
+    if group in ("hex", "dec"):
+        value = match.group(group)
+        try:
+            char = chr(int(value, 16 if group == "hex" else 10))
+        except (ValueError, OverflowError):
+            return match.group(0)
+        return char if char in _EMAIL_CHARS else match.group(0)
+    if group == "named":
+        return _NAMED_ENTITIES[match.group("named").lower()]
+    if group == "pct":
+        return "@"
+    if group == "concat":
+        return ""
+    return match.group(0)
+
+
+def decode_obfuscations(html_content: str) -> str:
+    """
+    Decode email obfuscations in HTML in a single pass.
+
+    Args:
+        html_content: Raw HTML (or text) content
+
+    Returns:
+        Text with obfuscated addresses rewritten to plain form
+    """
+    if not html_content:
+        return ""
+    decoded = _DECODE_RE.sub(_decode_match, html_content)
+
+    parts: List[str] = []
+    last = 0
+    for match in _BRACKET_WORD_RE.finditer(decoded):
+        parts.append(decoded[last:match.start()].rstrip())
+        parts.append("@" if match.group("word").lower() == "at" else ".")
+        last = match.end()
+    if not parts:
+        return decoded
+    parts.append(decoded[last:])
+    return "".join(parts)
+
+
+def iter_email_candidates(text: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Yield (candidate, is_mailto) for every address-shaped token in decoded text.
+
+    Equivalent to scanning with
+    (mailto:)?\\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}\\b
+    but only does work at "@" positions.
+    """
+    find = text.find
+    at = find("@")
+    while at != -1:
+        domain_match = _DOMAIN_RE.match(text, at + 1)
+        if domain_match:
+            window = text[max(0, at - MAX_LOCAL_LENGTH - 1):at][::-1]
+            local_match = _LOCAL_REVERSED_RE.match(window)
+            if local_match and local_match.end() <= MAX_LOCAL_LENGTH:
+                start = at - local_match.end()
+                # Word boundary: the address starts at the first word character
+                while start < at and text[start] not in _WORD_CHARS:
+                    start += 1
+                if start < at:
+                    is_mailto = text[max(0, start - 7):start].lower() == "mailto:"
+                    yield text[start:domain_match.end()], is_mailto
+        at = find("@", at + 1)
+
+
+def extract_emails_with_priority(html_content: str, domain: Optional[str] = None) -> List[Tuple[str, int]]:
+    """
+    Extract email addresses from HTML content in a single scan.
+
+    Priority scoring:
+    - 100: Email from mailto: link AND matches domain
+    - 90: Email from mailto: link
+    - 80: Email matches domain AND is common contact email (info, contact, support, hello, etc.)
+    - 70: Email matches domain
+    - 60: Common contact email (info, contact, support, hello, etc.)
+    - 50: Other valid email
+
+    Args:
+        html_content: Raw HTML content
+        domain: Optional website domain used for domain-match scoring
+
+    Returns:
+        List of (email, priority) tuples sorted by priority (highest first),
+        deduplicated, in first-seen order within the same priority
+    """
+    if not html_content:
+        return []
+
+    decoded = decode_obfuscations(html_content)
+    domain_lower = domain.lower() if domain else None
+
+    best: Dict[str, int] = {}
+    # Validation verdict per candidate so each address is checked once
+    verdicts: Dict[str, bool] = {}
+
+    for candidate, is_mailto in iter_email_candidates(decoded):
+        email = candidate.lower()
+
+        plausible = verdicts.get(email)
+        if plausible is None:
+            plausible = is_plausible_email(email)
+            verdicts[email] = plausible
+        if not plausible:
+            continue
+
+        domain_match = bool(domain_lower) and domain_lower in email
+        if is_mailto:
+            priority = PRIORITY_MAILTO_DOMAIN if domain_match else PRIORITY_MAILTO
+        else:
+            if _PLAIN_SKIP_RE.search(email):
+                continue
+            is_contact = email.split("@", 1)[0] in COMMON_CONTACT_LOCALS
+            if domain_match:
+                priority = PRIORITY_DOMAIN_CONTACT if is_contact else PRIORITY_DOMAIN
+            else:
+                priority = PRIORITY_CONTACT if is_contact else PRIORITY_OTHER
+
+        if priority > best.get(email, 0):
+            best[email] = priority
+
+    # sorted() is stable, so first-seen order is kept within a priority level
+    return sorted(best.items(), key=lambda item: item[1], reverse=True)
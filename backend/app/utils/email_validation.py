@@ -14,6 +14,40 @@ EMAIL_REGEX = re.compile(
     r"[a-zA-Z]{2,63})"
 )
 
+# Asset/file extensions that show up as fake "TLDs" in scraped HTML
+# (e.g. "logo@2x.png", "chunk@vendor.min.js")
+FILE_EXTENSIONS = frozenset([
+    ".css", ".js", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp",
+    ".pdf", ".zip", ".tar", ".gz", ".mp4", ".mp3", ".avi", ".mov",
+    ".woff", ".woff2", ".ttf", ".eot", ".ico", ".xml", ".json"
+])
+
+# CSS selectors and class-name fragments that look like emails
+CSS_GARBAGE_PATTERNS = frozenset([
+    ".maplibregl-", ".ctrl-", "@media", "@import", "@keyframes",
+    "acceler@ed-", "backwards-compat", "white-chocol@e"
+])
+
+# Placeholder domains that are never real contacts
+FALSE_POSITIVE_DOMAINS = frozenset([
+    "example.com", "test.com", "localhost", "domain.com",
+    "company.com", "email.com", "your.email", "noreply",
+    "no-reply", "donotreply"
+])
+
+INVALID_LOCAL_CHARS = frozenset('/\\:*?"<>|')
+
+# One alternation instead of a linear any(... in ...) scan per blacklist entry.
+# Longest alternatives first so ".woff2" is tried before ".woff".
+_GARBAGE_SUBSTRING_RE = re.compile(
+    "|".join(
+        re.escape(fragment)
+        for fragment in sorted(FILE_EXTENSIONS | CSS_GARBAGE_PATTERNS, key=len, reverse=True)
+    )
+)
+
+_DOMAIN_CHARS_RE = re.compile(r'^[a-zA-Z0-9.-]+$')
+
 
 def is_plausible_email(email: str) -> bool:
     """
@@ -42,20 +76,8 @@ def is_plausible_email(email: str) -> bool:
     
     lowered = email.lower()
     
-    # Hard reject obvious asset/file paths
-    file_extensions = [
-        ".css", ".js", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp",
-        ".pdf", ".zip", ".tar", ".gz", ".mp4", ".mp3", ".avi", ".mov",
-        ".woff", ".woff2", ".ttf", ".eot", ".ico", ".xml", ".json"
-    ]
-    if any(ext in lowered for ext in file_extensions):
-        return False
-    
-    # Reject CSS selectors and class patterns
-    if any(pattern in lowered for pattern in [
-        ".maplibregl-", ".ctrl-", "@media", "@import", "@keyframes",
-        "acceler@ed-", "backwards-compat", "white-chocol@e"
-    ]):
+    # Hard reject obvious asset/file paths and CSS selectors/class patterns
+    if _GARBAGE_SUBSTRING_RE.search(lowered):
         return False
     
     # Must contain @
@@ -111,20 +133,15 @@ def is_plausible_email(email: str) -> bool:
         return False
     
     # Reject common false positives
-    false_positives = [
-        "example.com", "test.com", "localhost", "domain.com",
-        "company.com", "email.com", "your.email", "noreply",
-        "no-reply", "donotreply"
-    ]
-    if domain.lower() in false_positives:
+    if domain.lower() in FALSE_POSITIVE_DOMAINS:
         return False
     
     # Reject if local part looks like a file path segment
-    if any(char in local for char in ["/", "\\", ":", "*", "?", '"', "<", ">", "|"]):
+    if not INVALID_LOCAL_CHARS.isdisjoint(local):
         return False
     
     # Reject if domain contains invalid characters
-    if not re.match(r'^[a-zA-Z0-9.-]+$', domain):
+    if not _DOMAIN_CHARS_RE.match(domain):
         return False
     
     return True
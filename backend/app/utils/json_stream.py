@@ -0,0 +1,180 @@
+"""
+Incremental parser for a streamed flat JSON object
+
+Gemini streams JSON mode responses ({"subject": "...", "body": "..."}) in
+arbitrary text fragments. JsonObjectStream decodes string values as the
+characters arrive, so a caller can forward the subject while the body is
+still being generated:
+
+    stream = JsonObjectStream()
+    for fragment in fragments:
+        for kind, key, value in stream.feed(fragment):
+            # ("delta", "subject", "Hello") - newly decoded characters of a string value
+            # ("end", "subject", "Hello there") - the complete value of a field
+
+Escapes (including \\uXXXX surrogate pairs) may be split across fragments.
+Non-string values are collected raw and reported once with their parsed
+value. Text before the opening brace (e.g. a ```json fence) is ignored.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+Event = Tuple[str, str, Any]
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Parser states
+_BEFORE_OBJECT, _BEFORE_KEY, _KEY, _COLON, _BEFORE_VALUE, _STRING, _RAW, _AFTER_VALUE, _DONE = range(9)
+
+
+class JsonObjectStream:
+    """Feed fragments of one JSON object; returns events for its top-level fields"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self._state = _BEFORE_OBJECT
+        self._key: Optional[str] = None
+        self._buffer: List[str] = []
+        self._escape: Optional[str] = None  # None, "\\" or "\\u" + collected hex digits
+        self._high_surrogate: Optional[int] = None
+        # Raw (non-string) values: nesting depth and whether inside a nested string
+        self._depth = 0
+        self._raw_in_string = False
+        self._raw_escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, fragment: str) -> List[Event]:
+        events: List[Event] = []
+        delta: List[str] = []
+        for char in fragment:
+            state = self._state
+            if state == _STRING:
+                if self._decode(char, delta):
+                    continue
+                # closing quote
+                if delta:
+                    events.append(("delta", self._key, "".join(delta)))
+                    delta = []
+                value = "".join(self._buffer)
+                self.values[self._key] = value
+                events.append(("end", self._key, value))
+                self._buffer = []
+                self._state = _AFTER_VALUE
+            elif state == _KEY:
+                if self._decode(char, self._buffer):
+                    continue
+                self._key = "".join(self._buffer)
+                self._buffer = []
+                self._state = _COLON
+            elif state == _RAW:
+                if self._raw(char):
+                    continue
+                self._finish_raw(events)
+                if char == "}":
+                    self._state = _DONE
+                else:
+                    self._state = _BEFORE_KEY
+            elif state == _BEFORE_OBJECT:
+                if char == "{":
+                    self._state = _BEFORE_KEY
+            elif state == _BEFORE_KEY:
+                if char == '"':
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+            elif state == _COLON:
+                if char == ":":
+                    self._state = _BEFORE_VALUE
+            elif state == _BEFORE_VALUE:
+                if char == '"':
+                    self._state = _STRING
+                elif not char.isspace():
+                    self._state = _RAW
+                    self._raw(char)
+            elif state == _AFTER_VALUE:
+                if char == ",":
+                    self._state = _BEFORE_KEY
+                elif char == "}":
+                    self._state = _DONE
+        if delta:
+            events.append(("delta", self._key, "".join(delta)))
+        return events
+
+    def _decode(self, char: str, out: List[str]) -> bool:
+        """
+        Decode one character of a JSON string into `out` (and the value buffer).
+        Returns False on the closing quote.
+        """
+        escape = self._escape
+        if escape is None:
+            if char == "\\":
+                self._escape = "\\"
+                return True
+            if char == '"':
+                return False
+            self._emit(char, out)
+            return True
+        if escape == "\\":
+            if char == "u":
+                self._escape = "\\u"
+            else:
+                self._escape = None
+                self._emit(_ESCAPES.get(char, char), out)
+            return True
+        escape += char
+        if len(escape) < 6:
+            self._escape = escape
+            return True
+        self._escape = None
+        try:
+            code = int(escape[2:], 16)
+        except ValueError:
+            return True
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return True
+        if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        self._emit(chr(code), out)
+        return True
+
+    def _emit(self, char: str, out: List[str]) -> None:
+        out.append(char)
+        if out is not self._buffer:
+            self._buffer.append(char)
+
+    def _raw(self, char: str) -> bool:
+        """Collect a character of a non-string value; False once the value has ended"""
+        if self._raw_in_string:
+            if self._raw_escape:
+                self._raw_escape = False
+            elif char == "\\":
+                self._raw_escape = True
+            elif char == '"':
+                self._raw_in_string = False
+        elif char == '"':
+            self._raw_in_string = True
+        elif char in "[{":
+            self._depth += 1
+        elif char in "]}":
+            if self._depth == 0:
+                return False
+            self._depth -= 1
+        elif char == "," and self._depth == 0:
+            return False
+        self._buffer.append(char)
+        return True
+
+    def _finish_raw(self, events: List[Event]) -> None:
+        raw = "".join(self._buffer).strip()
+        self._buffer = []
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        self.values[self._key] = value
+        events.append(("end", self._key, value))
@@ -0,0 +1,153 @@
+"""
+Compiled multi-keyword matcher
+
+Replaces repeated `any(kw in text for kw in keywords)` scans (one pass over the
+text per keyword, per group) with a single scan per text, built once per
+keyword table.
+
+With pyahocorasick installed the keywords go into an Aho-Corasick automaton,
+which reports every occurrence (overlapping ones included) in one pass.
+
+Without it, all keywords are compiled into one trie-shaped regex alternation, so each scan
+position costs one branch per character and the regex engine can skip straight
+to characters that start a keyword. A consuming scan reports the longest
+keyword at each match; the hits are then expanded so the result is exactly the
+set a substring scan would find:
+- keywords contained in a matched keyword ("service" in "services") come from
+  a precomputed containment table
+- keywords that could start inside a match and run past its end (precomputed
+  from the keyword list) are verified with a plain substring check
+
+Matching is case-sensitive; callers lowercase text and keywords as before.
+
+The automaton / regex and the expansion tables are built on the first scan, not
+in the constructor: matchers are module-level singletons and building them at
+import time was a measurable part of application startup.
+"""
+import re
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+# Try to import the Aho-Corasick automaton (C extension)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+    logger.info("pyahocorasick not available, keyword matching uses the compiled regex")
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie; matches the longest keyword at a position"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Match named keyword groups against text in one pass"""
+
+    def __init__(self, groups: Mapping[str, Sequence[str]], use_automaton: bool = AHOCORASICK_AVAILABLE):
+        self.groups: Dict[str, List[str]] = {name: list(keywords) for name, keywords in groups.items()}
+        # keyword -> [(group, position in group)], to rebuild per-group lists from hits
+        self._positions: Dict[str, List[tuple]] = {}
+        for name, group in self.groups.items():
+            for position, kw in enumerate(group):
+                self._positions.setdefault(kw, []).append((name, position))
+        self._use_automaton = use_automaton
+        self._compiled = False
+        self._automaton = None
+        self._regex = None
+
+    def _compile(self) -> None:
+        """Build the scanner and expansion tables (once, on first use)"""
+        keywords = sorted({kw for group in self.groups.values() for kw in group if kw})
+        if self._use_automaton and keywords:
+            self._automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+        self._regex = re.compile(_trie_pattern(keywords)) if keywords else None
+        # Every keyword contained in each keyword (itself included)
+        self._contained: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in keywords if other in kw) for kw in keywords
+        }
+        # Keywords that could start inside each keyword's match and run past its end
+        # (a proper suffix of one is a proper prefix of the other); the consuming
+        # scan can miss those, so they are verified with a plain substring check
+        self._straddling: Dict[str, FrozenSet[str]] = {}
+        for kw in keywords:
+            suffixes = {kw[i:] for i in range(1, len(kw))}
+            candidates = frozenset(
+                other for other in keywords
+                if any(other[:j] in suffixes for j in range(1, len(other)))
+            )
+            if candidates:
+                self._straddling[kw] = candidates
+        self._compiled = True
+
+    def found(self, text: str) -> Set[str]:
+        """All keywords occurring in text"""
+        if not self._compiled:
+            self._compile()
+        if not text or self._regex is None:
+            return set()
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text)}
+        hits: Set[str] = set()
+        candidates: Set[str] = set()
+        for keyword in set(self._regex.findall(text)):
+            hits |= self._contained[keyword]
+            candidates |= self._straddling.get(keyword, frozenset())
+        for keyword in candidates - hits:
+            if keyword in text:
+                hits |= self._contained[keyword]
+        return hits
+
+    def found_many(self, texts: Sequence[str]) -> List[Set[str]]:
+        """found() for a batch of texts, e.g. every result of a SERP page"""
+        return [self.found(text) for text in texts]
+
+    def matches(self, hits: Set[str], group: str) -> List[str]:
+        """Keywords of a group present in hits, in the group's declared order"""
+        return [kw for kw in self.groups.get(group, ()) if kw in hits]
+
+    def grouped(self, hits: Set[str]) -> Dict[str, List[str]]:
+        """{group: keywords present in hits, in declared order} for every group"""
+        placed: Dict[str, List[tuple]] = {name: [] for name in self.groups}
+        for kw in hits:
+            for name, position in self._positions.get(kw, ()):
+                placed[name].append((position, kw))
+        return {name: [kw for _, kw in sorted(entries)] for name, entries in placed.items()}
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """{group: matched keywords in declared order} for every group"""
+        return self.grouped(self.found(text))
+
+    def first_group(self, text: str, order: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        First group (in `order`, default declaration order) with any keyword in text.
+
+        Groups in `order` that the matcher does not know are skipped.
+        """
+        hits = self.found(text)
+        if not hits:
+            return None
+        for name in (order if order is not None else self.groups):
+            if any(kw in hits for kw in self.groups.get(name, ())):
+                return name
+        return None
@@ -0,0 +1,92 @@
+"""
+In-process latency histograms
+
+Fixed millisecond buckets, cheap enough to record on every request. Used to
+compare the database session dependencies (get_db vs get_read_db); exposed
+at /health/latency and, in Prometheus format, /metrics.
+
+Usage:
+    with timed("db.get_read_db.teardown"):
+        await session.close()
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Counts of observations per latency bucket, plus count and sum"""
+
+    def __init__(self, buckets_ms=BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self.counts[bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the q-quantile; None if empty or beyond the last bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets_ms, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return float(bound)
+        return None
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {
+                **{f"le_{bound}ms": c for bound, c in zip(self.buckets_ms, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+
+
+def record_latency(name: str, seconds: float) -> None:
+    histogram = _histograms.get(name)
+    if histogram is None:
+        histogram = _histograms[name] = LatencyHistogram()
+    histogram.observe(seconds)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record the duration of the block under `name` (also when it raises)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(name, time.perf_counter() - started)
+
+
+def latency_snapshot() -> Dict[str, Dict]:
+    return {name: histogram.snapshot() for name, histogram in sorted(_histograms.items())}
+
+
+def latency_histograms() -> Dict[str, LatencyHistogram]:
+    """The histograms themselves, e.g. for the Prometheus export in app.utils.metrics"""
+    return dict(_histograms)
+
+
+def reset_latency() -> None:
+    _histograms.clear()
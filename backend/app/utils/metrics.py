@@ -0,0 +1,225 @@
+"""
+Pipeline instrumentation: stage spans, provider counters, Prometheus export
+
+Replaces ad-hoc `time.time()` arithmetic in log lines with one layer:
+- span("page.fetch") times a block; @instrument("snov.domain_search",
+  provider="snov") times an async client call and counts its failures (an
+  exception, or a {"success": False} result) per provider
+- Durations go to the pipeline_stage_seconds histogram (label: stage) and
+  to the timing breakdown of the job running in the current task
+- record_provider_retry / record_provider_error count retries and failures
+  per provider where a client handles them itself
+- start_job_timings() opens the breakdown for a job task; tasks and
+  gathers started from it share it (contextvars). Its snapshot is stored in
+  Job.result["timings"]
+- render_prometheus() renders everything (plus the app.utils.latency
+  histograms) in the Prometheus text format for GET /metrics
+
+METRICS_ENABLED=false turns span() into a shared no-op context manager and
+every recorder into an early return.
+"""
+import functools
+import os
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from app.utils.latency import BUCKETS_MS, LatencyHistogram, latency_histograms
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+_NOOP = nullcontext()
+
+_stage_histograms: Dict[str, LatencyHistogram] = {}
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+COUNTER_HELP = {
+    "pipeline_stage_errors_total": "Pipeline stage executions that raised",
+    "provider_requests_total": "Instrumented provider calls",
+    "provider_errors_total": "Failed provider calls by reason",
+    "provider_retries_total": "Provider calls retried by the client",
+}
+
+
+class JobTimings:
+    """Per-stage totals for one job"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {}  # stage -> [count, seconds]
+
+    def add(self, stage: str, seconds: float) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "stages": {
+                stage: {"count": count, "total_ms": round(seconds * 1000, 1)}
+                for stage, (count, seconds) in sorted(self.stages.items())
+            },
+        }
+
+
+_job_timings: ContextVar[Optional[JobTimings]] = ContextVar("job_timings", default=None)
+
+
+def start_job_timings() -> JobTimings:
+    """Start the timing breakdown for the job running in the current task"""
+    timings = JobTimings()
+    _job_timings.set(timings)
+    return timings
+
+
+def current_job_timings() -> Optional[JobTimings]:
+    return _job_timings.get()
+
+
+def observe_stage(stage: str, seconds: float, failed: bool = False) -> None:
+    if not METRICS_ENABLED:
+        return
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms[stage] = LatencyHistogram()
+    histogram.observe(seconds)
+    if failed:
+        increment("pipeline_stage_errors_total", stage=stage)
+    timings = _job_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+class _Span:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe_stage(self.stage, time.perf_counter() - self.started, failed=exc_type is not None)
+        return False
+
+
+def span(stage: str):
+    """Time a block as one execution of `stage` (usable in sync and async code)"""
+    return _Span(stage) if METRICS_ENABLED else _NOOP
+
+
+def increment(name: str, amount: float = 1, **labels: str) -> None:
+    if not METRICS_ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    _counters[key] = _counters.get(key, 0) + amount
+
+
+def record_provider_error(provider: str, reason: str) -> None:
+    increment("provider_errors_total", provider=provider, reason=reason)
+
+
+def record_provider_retry(provider: str) -> None:
+    increment("provider_retries_total", provider=provider)
+
+
+def error_reason(exc: BaseException) -> str:
+    """Counter label for a failed provider call"""
+    if type(exc).__name__ == "RateLimitError":
+        return "rate_limited"
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return f"http_{status}" if status else type(exc).__name__
+
+
+def instrument(stage: str, provider: Optional[str] = None):
+    """
+    Decorator for async calls: span(stage) plus, with a provider, request and
+    error counters. A dict result with success=False counts as an error.
+    """
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                observe_stage(stage, time.perf_counter() - started, failed=True)
+                if provider:
+                    increment("provider_requests_total", provider=provider)
+                    record_provider_error(provider, error_reason(e))
+                raise
+            observe_stage(stage, time.perf_counter() - started)
+            if provider:
+                increment("provider_requests_total", provider=provider)
+                if isinstance(result, dict) and result.get("success") is False:
+                    record_provider_error(provider, "unsuccessful")
+            return result
+        return wrapper
+    return decorator
+
+
+def stage_snapshot() -> Dict[str, Dict]:
+    """Latency summary per stage (count, mean, p50/p95/p99 bucket bounds)"""
+    return {stage: histogram.snapshot() for stage, histogram in sorted(_stage_histograms.items())}
+
+
+def counter_snapshot() -> Dict[str, float]:
+    """Counters as {'name{labels}': value}"""
+    return {f"{name}{_labels(labels)}": value for (name, labels), value in sorted(_counters.items())}
+
+
+def reset_metrics() -> None:
+    _stage_histograms.clear()
+    _counters.clear()
+
+
+# --- Prometheus text exposition -------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + "}"
+
+
+def _render_histogram(lines: list, name: str, label: str, histograms: Dict[str, LatencyHistogram]) -> None:
+    if not histograms:
+        return
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS_MS, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels([(label, key), ('le', repr(bound / 1000))])} {cumulative}")
+        lines.append(f"{name}_bucket{_labels([(label, key), ('le', '+Inf')])} {histogram.count}")
+        lines.append(f"{name}_sum{_labels([(label, key)])} {histogram.total_ms / 1000:.6f}")
+        lines.append(f"{name}_count{_labels([(label, key)])} {histogram.count}")
+
+
+def render_prometheus() -> str:
+    lines: list = []
+    _render_histogram(lines, "pipeline_stage_seconds", "stage", _stage_histograms)
+    _render_histogram(lines, "app_latency_seconds", "name", latency_histograms())
+    by_name: Dict[str, list] = {}
+    for (name, labels), value in _counters.items():
+        by_name.setdefault(name, []).append((labels, value))
+    for name in sorted(by_name):
+        if name in COUNTER_HELP:
+            lines.append(f"# HELP {name} {COUNTER_HELP[name]}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in sorted(by_name[name]):
+            lines.append(f"{name}{_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,88 @@
+"""
+SQL statement counting
+
+Counts the statements the code inside a block sends to the database, by
+hooking SQLAlchemy's before_cursor_execute event on every engine (the
+async engines' sync_engine included):
+- count_queries() opens a scope; scopes are per task (contextvars), so a
+  background task started inside the block keeps counting into it (also
+  after the block exits), concurrent requests started outside it do not
+- Nested scopes all see the statements of the inner block
+- keep_statements=True also records the SQL text and its parameters, for
+  assertion messages and EXPLAIN
+
+Used by the pipeline benchmark (scripts/benchmark_pipeline.py), the
+dashboard load test and query-count tests (tests/test_dashboard_queries.py).
+Outside a scope the listener is a single ContextVar lookup.
+
+Usage:
+    with count_queries() as queries:
+        await db.execute(select(Prospect))
+    assert queries.total == 1
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+VERBS = ("select", "insert", "update", "delete")
+
+
+class QueryCount:
+    """Statements seen in one count_queries() scope"""
+
+    def __init__(self, keep_statements: bool = False):
+        self.total = 0
+        self.by_verb: Dict[str, int] = {}
+        self.keep_statements = keep_statements
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+
+    def record(self, statement: str, parameters: Any, executemany: bool) -> None:
+        self.total += 1
+        verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else "other"
+        if verb not in VERBS:
+            # CTEs are counted under the statement they end in
+            verb = next((v for v in VERBS if verb == "with" and f" {v} " in statement.lower()), "other")
+        if executemany:
+            verb = f"{verb}_many"
+        self.by_verb[verb] = self.by_verb.get(verb, 0) + 1
+        if self.keep_statements:
+            self.statements.append(statement)
+            self.parameters.append(parameters)
+
+    def snapshot(self) -> Dict:
+        return {"total": self.total, **dict(sorted(self.by_verb.items()))}
+
+    def __repr__(self) -> str:
+        return f"QueryCount({self.snapshot()})"
+
+
+_scopes: ContextVar[Tuple[QueryCount, ...]] = ContextVar("query_count_scopes", default=())
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for scope in _scopes.get():
+        scope.record(statement, parameters, executemany)
+
+
+def _install() -> None:
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        _installed = True
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False) -> Iterator[QueryCount]:
+    """Count the SQL statements executed inside the block (see module docstring)"""
+    _install()
+    scope = QueryCount(keep_statements=keep_statements)
+    token = _scopes.set(_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _scopes.reset(token)
@@ -6,26 +6,186 @@ Provides rate limiting for API calls to prevent:
 - Cost overruns
 - Service overload
 - Terms of Service violations
+
+Token-bucket limiter shared by every API and worker process:
+- With REDIS_URL set, each provider's bucket lives in Redis and is updated
+  atomically by a Lua script, so all processes draw from ONE quota
+- Without Redis (single-node setups) buckets live in process memory
+- Limits are parsed once at startup; wait times are computed exactly from the
+  bucket state instead of sleeping a fixed interval
+- Buckets allow bursts up to their capacity, then refill at the sustained rate
+- Remaining tokens per provider are published to the ratelimit:remaining hash
+  (Redis) and available via get_quota_snapshot()
+- If Redis is unreachable the limiter uses per-process buckets and reconnects
+  with exponential backoff (RATE_LIMIT_REDIS_RETRY_BASE doubling up to
+  RATE_LIMIT_REDIS_RETRY_MAX seconds)
+
+Defaults follow each provider's documented quota (sustained rate + burst stay
+within it). Override per provider with environment variables:
+    RATE_LIMIT_SNOV="120/minute"     sustained rate: <count>/<second|minute|hour|day>
+    RATE_LIMIT_SNOV_BURST="20"       bucket capacity (back-to-back requests)
+
+Usage:
+    async with get_rate_limiter().limit("snov"):
+        response = await client.get(...)
 """
 import asyncio
+import os
 import time
-from typing import Optional, Dict
-from limits import storage, strategies
-from limits.storage import MemoryStorage
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+BUCKET_KEY_PREFIX = "ratelimit:bucket:"
+REMAINING_HASH_KEY = "ratelimit:remaining"
+
+# Reconnect backoff after Redis failures: base, 2x base, ... up to max seconds
+REDIS_RETRY_BASE = float(os.getenv("RATE_LIMIT_REDIS_RETRY_BASE", "1"))
+REDIS_RETRY_MAX = float(os.getenv("RATE_LIMIT_REDIS_RETRY_MAX", "60"))
+
+# Restriction window for an upstream 429 that carries no Retry-After header
+DEFAULT_RETRY_AFTER = 60
+
+_PERIOD_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+# KEYS[1] = bucket hash, KEYS[2] = remaining-quota hash
+# ARGV = capacity, refill tokens/second, tokens requested, provider name
+# Returns {allowed (0/1), tokens left (string), seconds to wait (string)}
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= requested then
+  tokens = tokens - requested
+  allowed = 1
+else
+  wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+redis.call('HSET', KEYS[2], ARGV[4], tostring(math.floor(tokens)))
+return {allowed, tostring(tokens), tostring(wait)}
+"""
+
+
+@dataclass(frozen=True)
+class BucketConfig:
+    """Parsed token-bucket settings for one provider."""
+
+    rate: int  # sustained requests per period
+    period_seconds: int
+    capacity: int  # burst size
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.rate / self.period_seconds
+
+
+def parse_limit(limit_str: str, burst: Optional[int] = None) -> BucketConfig:
+    """
+    Parse a "100/hour" style limit into a BucketConfig.
+
+    Args:
+        limit_str: "<count>/<second|minute|hour|day>"
+        burst: Bucket capacity; defaults to the full per-period count
+
+    Raises:
+        ValueError: If the string is malformed
+    """
+    try:
+        count_str, period = limit_str.strip().split("/", 1)
+        rate = int(count_str)
+        period_seconds = _PERIOD_SECONDS[period.strip().lower().rstrip("s")]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit: {limit_str!r}")
+    if rate <= 0:
+        raise ValueError(f"Invalid rate limit: {limit_str!r}")
+    capacity = burst if burst and burst > 0 else rate
+    return BucketConfig(rate=rate, period_seconds=period_seconds, capacity=min(capacity, rate))
+
+
+def _restriction_for(error: BaseException, platform: str) -> Tuple[str, Optional[int]]:
+    """Provider and restriction window (seconds) for an upstream rate-limit error, else None."""
+    from app.services.exceptions import RateLimitError
+    if isinstance(error, RateLimitError):
+        return error.provider or platform, error.retry_after
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return platform, None
+    try:
+        return platform, max(1, int(float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))))
+    except (TypeError, ValueError):
+        return platform, DEFAULT_RETRY_AFTER
+
+
+class _MemoryBuckets:
+    """Process-local token buckets (single-node fallback)."""
+
+    def __init__(self):
+        # platform -> (tokens, last refill timestamp)
+        self._state: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, platform: str, config: BucketConfig, requested: float = 1.0) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        tokens, ts = self._state.get(platform, (float(config.capacity), now))
+        tokens = min(config.capacity, tokens + max(0.0, now - ts) * config.refill_per_second)
+        if tokens >= requested:
+            self._state[platform] = (tokens - requested, now)
+            return True, tokens - requested, 0.0
+        self._state[platform] = (tokens, now)
+        return False, tokens, (requested - tokens) / config.refill_per_second
+
+    def peek(self, platform: str, config: BucketConfig) -> float:
+        now = time.monotonic()
+        tokens, ts = self._state.get(platform, (float(config.capacity), now))
+        return min(config.capacity, tokens + max(0.0, now - ts) * config.refill_per_second)
+
+    def reset(self, platform: Optional[str] = None) -> None:
+        if platform:
+            self._state.pop(platform, None)
+        else:
+            self._state.clear()
+
 
 class RateLimiter:
     """
-    Rate limiter for API calls.
-    
-    Uses the 'limits' library to enforce rate limits per API endpoint.
-    Automatically queues requests when limits are exceeded.
+    Distributed token-bucket rate limiter for API calls.
+
+    Automatically queues requests when a provider's bucket is empty, sleeping
+    exactly until the next token is available.
     """
-    
-    # Per-platform rate limits (requests per hour)
+
+    # Per-platform sustained rate limits
     # These are conservative limits to stay well below API maximums
     RATE_LIMITS = {
         "linkedin": "100/hour",      # LinkedIn: ~100/hour
@@ -33,157 +193,242 @@ class RateLimiter:
         "facebook": "180/hour",      # Facebook: ~200/hour (90% of limit)
         "tiktok": "90/hour",         # TikTok: ~100/hour (90% of limit)
         "dataforseo": "900/hour",    # DataForSEO: varies by plan (conservative)
-        "snov": "100/hour",          # Snov.io: varies by plan
-        "hunter": "100/hour",        # Hunter.io: varies by plan
+        "snov": "50/minute",         # Snov.io: 60 requests/minute (50 + burst 10)
+        "hunter": "290/minute",      # Hunter.io: email-verifier 10/second and 300/minute (the strictest endpoint)
         "gemini": "60/minute",       # Gemini: 60 requests/minute
     }
-    
-    def __init__(self):
-        """Initialize rate limiter with in-memory storage"""
-        self.storage = MemoryStorage()
-        self.strategies: Dict[str, strategies.MovingWindowRateLimiter] = {}
-        
-        # Initialize rate limiters for each platform
+
+    # Burst capacity per platform (requests that may go out back-to-back)
+    BURSTS = {
+        "linkedin": 10,
+        "instagram": 20,
+        "facebook": 20,
+        "tiktok": 10,
+        "dataforseo": 50,
+        "snov": 10,
+        "hunter": 10,
+        "gemini": 10,
+    }
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """Parse limits once and prepare the shared (Redis) or local backend"""
+        self.configs: Dict[str, BucketConfig] = {}
         for platform, limit in self.RATE_LIMITS.items():
-            self.strategies[platform] = strategies.MovingWindowRateLimiter(self.storage)
-    
+            # Overrides: RATE_LIMIT_SNOV="200/hour", RATE_LIMIT_SNOV_BURST="20"
+            env_prefix = f"RATE_LIMIT_{platform.upper()}"
+            limit = os.getenv(env_prefix, limit)
+            burst = int(os.getenv(f"{env_prefix}_BURST", self.BURSTS.get(platform, 0)))
+            self.configs[platform] = parse_limit(limit, burst)
+
+        self.redis_url = redis_url if redis_url is not None else os.getenv("REDIS_URL")
+        self.redis_client = None
+        self.use_redis = False
+        self._script = None
+        self._failures = 0
+        self._retry_at = 0.0  # time.monotonic() before which _connect() does not retry
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._memory = _MemoryBuckets()
+        if not (REDIS_AVAILABLE and self.redis_url):
+            logger.info("RateLimiter: REDIS_URL not set, using per-process token buckets")
+
+    async def _connect(self) -> None:
+        """Connect to Redis unless connected, not configured, or backing off after a failure"""
+        if self.use_redis or not (REDIS_AVAILABLE and self.redis_url):
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.use_redis or time.monotonic() < self._retry_at:
+                return
+            try:
+                client = aioredis.from_url(
+                    self.redis_url,
+                    max_connections=10,
+                    socket_connect_timeout=2,
+                    socket_timeout=2,
+                    decode_responses=True,
+                )
+                await client.ping()
+            except Exception as e:
+                self._degrade(e)
+                return
+            self._script = client.register_script(_TOKEN_BUCKET_LUA)
+            self.redis_client = client
+            self.use_redis = True
+            if self._failures:
+                logger.info(f"✅ RateLimiter: Redis reachable again after {self._failures} failed attempt(s), buckets are shared again")
+                self._failures = 0
+            else:
+                logger.info("✅ RateLimiter: Using shared Redis token buckets")
+
+    def _degrade(self, error: Exception) -> None:
+        """Fall back to per-process buckets and schedule the next reconnect attempt"""
+        self._failures += 1
+        delay = min(REDIS_RETRY_MAX, REDIS_RETRY_BASE * 2 ** (self._failures - 1))
+        self._retry_at = time.monotonic() + delay
+        if self._failures == 1:
+            logger.warning(
+                f"⚠️  RateLimiter: Redis unavailable ({error}), using per-process token buckets "
+                f"(retrying in {delay:.0f}s)"
+            )
+        else:
+            logger.debug(f"RateLimiter: Redis reconnect attempt {self._failures} failed ({error}), next in {delay:.0f}s")
+        client, self.redis_client, self._script, self.use_redis = self.redis_client, None, None, False
+        if client is not None:
+            asyncio.ensure_future(client.aclose())
+
+    def _get_config(self, platform: str) -> BucketConfig:
+        config = self.configs.get(platform)
+        if config is None:
+            raise ValueError(f"Rate limiter not configured for platform: {platform}")
+        return config
+
+    async def try_acquire(self, platform: str, tokens: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take tokens from a provider's bucket without waiting.
+
+        Returns:
+            (allowed, seconds_to_wait) - seconds_to_wait is 0 when allowed
+        """
+        config = self._get_config(platform)
+        await self._connect()
+
+        if self.use_redis and self._script is not None:
+            try:
+                allowed, _, wait = await self._script(
+                    keys=[f"{BUCKET_KEY_PREFIX}{platform}", REMAINING_HASH_KEY],
+                    args=[config.capacity, config.refill_per_second, tokens, platform],
+                )
+                return bool(int(allowed)), float(wait)
+            except Exception as e:
+                # Fall back to local limiting rather than failing open
+                logger.error(f"❌ [RATE LIMIT] Redis bucket error for {platform}, using local bucket: {e}")
+                self._degrade(e)
+
+        allowed, _, wait = self._memory.take(platform, config, tokens)
+        return allowed, wait
+
     async def wait_if_needed(self, platform: str) -> None:
         """
-        Check rate limit and wait if necessary.
-        
+        Take one token for the platform, sleeping until one is available.
+
         Args:
             platform: Platform name (linkedin, instagram, facebook, tiktok, dataforseo, etc.)
-        
+
         Raises:
             ValueError: If platform is not configured
         """
-        if platform not in self.strategies:
-            raise ValueError(f"Rate limiter not configured for platform: {platform}")
-        
-        strategy = self.strategies[platform]
-        limit_str = self.RATE_LIMITS[platform]
-        
-        # Check if we can make a request
-        # CRITICAL FIX: limits library hit() method expects (limit, key) where limit can be a string
-        # But the library internally may call .key_for() on the limit if it thinks it's an enum
-        # Solution: Ensure we pass a plain string for the limit, not an enum-like object
-        from limits import parse
-        
-        key = f"{platform}_api"
-        
-        try:
-            # Parse the limit string into a RateLimitItem object
-            # This ensures proper format and prevents the key_for() error
-            rate_limit_item = parse(limit_str)
-            
-            # CORRECT USAGE: hit(rate_limit_item, key)
-            # The rate_limit_item is a parsed RateLimitItem object, key is a string identifier
-            can_proceed = strategy.hit(rate_limit_item, key)
-            
-        except Exception as parse_err:
-            # If parsing fails, log error but allow request (fail open to prevent blocking discovery)
-            logger.error(
-                f"❌ [RATE LIMIT] Error parsing rate limit '{limit_str}' for {platform}: {parse_err}\n"
-                f"This is likely the 'key_for' bug - allowing request to proceed",
-                exc_info=True
-            )
-            logger.warning(f"⚠️  [RATE LIMIT] Allowing request to proceed despite rate limit parsing error")
-            # Fail open: allow the request to proceed
-            return
-        
-        if not can_proceed:
-            # Calculate wait time (approximate)
-            # Moving window: wait until oldest request expires
-            wait_seconds = self._calculate_wait_time(limit_str)
-            
+        while True:
+            allowed, wait_seconds = await self.try_acquire(platform)
+            if allowed:
+                return
             logger.warning(
-                f"⚠️  [RATE LIMIT] {platform.upper()} rate limit exceeded. "
-                f"Waiting {wait_seconds} seconds before next request."
+                f"⚠️  [RATE LIMIT] {platform.upper()} bucket empty. "
+                f"Waiting {wait_seconds:.2f} seconds before next request."
             )
-            
-            await asyncio.sleep(wait_seconds)
-            
-            # Try again with correct usage
-            try:
-                rate_limit_item = parse(limit_str)
-                can_proceed = strategy.hit(rate_limit_item, key)
-            except Exception:
-                # Fail open if parsing fails
-                can_proceed = True
-                logger.warning(f"⚠️  [RATE LIMIT] Retry parsing failed, allowing request to proceed")
-            if not can_proceed:
-                logger.error(f"❌ [RATE LIMIT] Still rate limited after wait for {platform}")
-    
-    def _calculate_wait_time(self, limit_str: str) -> float:
+            # Another process may take the token first, so loop and re-check
+            await asyncio.sleep(max(wait_seconds, 0.01))
+
+    @asynccontextmanager
+    async def limit(self, platform: str) -> AsyncIterator[None]:
         """
-        Calculate approximate wait time based on rate limit string.
-        
-        Args:
-            limit_str: Rate limit string (e.g., "100/hour", "60/minute")
-        
-        Returns:
-            Wait time in seconds
+        Async context manager that waits for a token before the wrapped call.
+
+        If the wrapped call raises RateLimitError, or lets an httpx 429
+        HTTPStatusError escape (raise_for_status() inside the block), the
+        provider is marked restricted in ProviderState for the retry_after /
+        Retry-After window (DEFAULT_RETRY_AFTER when absent) so other workers
+        back off too. Clients must therefore raise while still inside the block.
         """
-        if "/hour" in limit_str:
-            # For hourly limits, wait 1/100th of an hour (36 seconds)
-            return 36.0
-        elif "/minute" in limit_str:
-            # For minute limits, wait 1/60th of a minute (1 second)
-            return 1.0
-        elif "/day" in limit_str:
-            # For daily limits, wait 1/1000th of a day (86 seconds)
-            return 86.0
-        else:
-            # Default: wait 10 seconds
-            return 10.0
-    
-    def get_remaining_requests(self, platform: str) -> Optional[int]:
+        await self.wait_if_needed(platform)
+        try:
+            yield
+        except Exception as e:
+            provider, retry_after = _restriction_for(e, platform)
+            if retry_after:
+                from app.services.provider_state import get_provider_state
+                try:
+                    await get_provider_state().set_restricted(provider, retry_after)
+                except Exception as state_err:
+                    logger.warning(f"⚠️  [RATE LIMIT] Could not record restriction for {platform}: {state_err}")
+            raise
+
+    async def get_remaining_requests(self, platform: str) -> Optional[int]:
         """
-        Get approximate number of remaining requests for a platform.
-        
+        Get the number of requests that can be made right now for a platform.
+
         Args:
             platform: Platform name
-        
+
         Returns:
-            Approximate remaining requests, or None if not available
+            Whole tokens left in the bucket, or None if the platform is unknown
         """
-        if platform not in self.strategies:
+        config = self.configs.get(platform)
+        if config is None:
             return None
-        
-        # Note: The 'limits' library doesn't provide a direct way to get remaining count
-        # This is an approximation based on the rate limit
-        limit_str = self.RATE_LIMITS[platform]
-        
-        if "/hour" in limit_str:
-            limit_num = int(limit_str.split("/")[0])
-            # This is a rough estimate - actual remaining depends on request history
-            return limit_num  # Simplified - would need to track actual usage
-        elif "/minute" in limit_str:
-            limit_num = int(limit_str.split("/")[0])
-            return limit_num
-        
-        return None
-    
-    def reset(self, platform: Optional[str] = None) -> None:
+        await self._connect()
+        if self.use_redis and self.redis_client:
+            try:
+                tokens, ts = await self.redis_client.hmget(f"{BUCKET_KEY_PREFIX}{platform}", "tokens", "ts")
+                if tokens is None:
+                    return config.capacity
+                redis_now = await self.redis_client.time()
+                now = redis_now[0] + redis_now[1] / 1_000_000
+                refilled = float(tokens) + max(0.0, now - float(ts)) * config.refill_per_second
+                return int(min(config.capacity, refilled))
+            except Exception as e:
+                logger.debug(f"RateLimiter: could not read Redis bucket for {platform}: {e}")
+        return int(self._memory.peek(platform, config))
+
+    async def get_quota_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Remaining quota for every configured provider.
+
+        Returns:
+            {platform: {"remaining": int, "capacity": int, "limit": str, "shared": bool}}
+        """
+        snapshot = {}
+        for platform, config in self.configs.items():
+            snapshot[platform] = {
+                "remaining": await self.get_remaining_requests(platform),
+                "capacity": config.capacity,
+                "limit": f"{config.rate}/{config.period_seconds}s",
+                "shared": self.use_redis,
+            }
+        return snapshot
+
+    async def reset(self, platform: Optional[str] = None) -> None:
         """
         Reset rate limiter for a platform (or all platforms).
-        
+
         Args:
             platform: Platform name, or None to reset all
         """
-        if platform:
-            if platform in self.strategies:
-                # Clear storage for this platform
-                key = f"{platform}_api"
-                # Note: MemoryStorage doesn't have a direct clear method
-                # This would require reinitializing the storage
-                logger.info(f"🔄 [RATE LIMIT] Reset rate limiter for {platform}")
-        else:
-            # Reset all
-            self.storage = MemoryStorage()
-            for platform_name in self.RATE_LIMITS.keys():
-                self.strategies[platform_name] = strategies.MovingWindowRateLimiter(self.storage)
-            logger.info("🔄 [RATE LIMIT] Reset all rate limiters")
+        platforms = [platform] if platform else list(self.configs.keys())
+        self._memory.reset(platform)
+        await self._connect()
+        if self.use_redis and self.redis_client:
+            try:
+                await self.redis_client.delete(*[f"{BUCKET_KEY_PREFIX}{p}" for p in platforms])
+                await self.redis_client.hdel(REMAINING_HASH_KEY, *platforms)
+            except Exception as e:
+                logger.warning(f"⚠️  [RATE LIMIT] Could not reset Redis buckets: {e}")
+        logger.info(f"🔄 [RATE LIMIT] Reset rate limiter for {platform or 'all platforms'}")
+
+    async def close(self) -> None:
+        """Release the Redis connection pool."""
+        if self.redis_client:
+            try:
+                await self.redis_client.aclose()
+            except Exception as e:
+                logger.debug(f"RateLimiter: error closing Redis client: {e}")
+        self.redis_client = None
+        self._script = None
+        self.use_redis = False
+        self._failures = 0
+        self._retry_at = 0.0
 
 
 # Global rate limiter instance
@@ -198,10 +443,18 @@ def get_rate_limiter() -> RateLimiter:
     return _rate_limiter
 
 
+async def close_rate_limiter() -> None:
+    """Close the global rate limiter (called on app shutdown)"""
+    global _rate_limiter
+    if _rate_limiter is not None:
+        await _rate_limiter.close()
+        _rate_limiter = None
+
+
 def rate_limit(platform: str):
     """
     Decorator to add rate limiting to async functions.
-    
+
     Usage:
         @rate_limit("linkedin")
         async def search_linkedin():
@@ -209,9 +462,7 @@ def rate_limit(platform: str):
     """
     def decorator(func):
         async def wrapper(*args, **kwargs):
-            limiter = get_rate_limiter()
-            await limiter.wait_if_needed(platform)
-            return await func(*args, **kwargs)
+            async with get_rate_limiter().limit(platform):
+                return await func(*args, **kwargs)
         return wrapper
     return decorator
-
@@ -29,13 +29,10 @@ REQUIRED_PROSPECT_COLUMNS = {
     'discovery_query_id', 'discovery_category', 'discovery_location', 'discovery_keywords',
     
     # Scraping metadata
-    'scrape_payload', 'scrape_source_url',
+    'scrape_source_url', 'dns_status', 'dns_checked_at',
     
-    # Verification metadata
-    'verification_confidence', 'verification_payload',
-    
-    # API responses
-    'dataforseo_payload', 'snov_payload',
+    # Verification metadata (raw provider payloads are in prospect_payloads)
+    'verification_confidence',
     
     # SERP intent
     'serp_intent', 'serp_confidence', 'serp_signals',
@@ -0,0 +1,6 @@
+"""
+Local fakes of external services (providers, DNS, datasets)
+
+Kept outside tests/ so the offline scripts (scripts/benchmark_pipeline.py,
+scripts/loadtest_dashboard.py) and the test suite import the same fakes.
+"""
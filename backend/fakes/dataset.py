@@ -0,0 +1,109 @@
+"""
+Synthetic prospect datasets and throwaway databases
+
+seed_prospects() fills prospects (plus prospect_payloads and a few jobs)
+with a realistic backlog: most rows have finished the pipeline, each queue
+holds a few percent, queued rows are the most recent, a fifth of the rows
+are social profiles spread over the four platforms. One INSERT ... SELECT
+per table, so 1M rows take seconds, not minutes.
+
+throwaway_database() creates an empty database on a Postgres server and
+drops it afterwards (benchmarks and load tests that need the app's own
+engine to point somewhere disposable).
+"""
+import contextlib
+import uuid
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# b = recency bucket (0 = newest 1%); social rows are b 8..27
+PROSPECTS_SEED_SQL = """
+INSERT INTO prospects (
+    id, domain, page_url, page_title, contact_email, source_type, source_platform, username, follower_count,
+    discovery_status, scrape_status, approval_status, verification_status, draft_status, send_status,
+    outreach_status, stage, sequence_index, discovery_category, serp_intent,
+    draft_subject, draft_body, created_at
+)
+SELECT
+    gen_random_uuid(),
+    'site' || i || '.example.org',
+    'https://site' || i || '.example.org/',
+    'Site ' || i,
+    CASE WHEN b BETWEEN 3 AND 4 OR b BETWEEN 6 AND 7 OR b >= 28 OR b BETWEEN 20 AND 27
+         THEN 'info@site' || i || '.example.org' END,
+    CASE WHEN b BETWEEN 8 AND 27 THEN 'social' ELSE 'website' END,
+    CASE WHEN b BETWEEN 8 AND 27 THEN (ARRAY['linkedin', 'instagram', 'facebook', 'tiktok'])[i % 4 + 1] END,
+    CASE WHEN b BETWEEN 8 AND 27 THEN 'user' || i END,
+    CASE WHEN b BETWEEN 8 AND 27 THEN i % 50000 END,
+    'DISCOVERED',
+    CASE WHEN b <= 2 OR b BETWEEN 8 AND 17 THEN 'DISCOVERED'
+         WHEN b = 5 THEN 'NO_EMAIL_FOUND'
+         ELSE 'SCRAPED' END,
+    CASE WHEN b <= 1 OR b BETWEEN 9 AND 17 THEN 'PENDING' ELSE 'approved' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'verified' ELSE 'UNVERIFIED' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'drafted' ELSE 'pending' END,
+    CASE WHEN b >= 28 OR b BETWEEN 24 AND 27 THEN 'sent' ELSE 'pending' END,
+    CASE WHEN b >= 24 THEN 'sent' ELSE 'pending' END,
+    CASE WHEN b = 3 THEN 'LEAD' WHEN b = 4 THEN 'EMAIL_FOUND' WHEN b = 5 THEN 'SCRAPED'
+         WHEN b BETWEEN 6 AND 7 THEN 'DRAFTED' WHEN b >= 24 THEN 'SENT'
+         WHEN b BETWEEN 18 AND 23 THEN 'DRAFTED' ELSE 'DISCOVERED' END,
+    0,
+    (ARRAY['Art Gallery', 'Museum', 'Art Studio', 'Interior Design'])[i % 4 + 1],
+    CASE WHEN b < 8 OR b >= 28 THEN 'service' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'Hello from Liquid Canvas' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'We would love to collaborate on a mural.' END,
+    now() - (i || ' minutes')::interval
+FROM (SELECT i, (i - 1) * 100 / :rows AS b FROM generate_series(1, :rows) AS i) AS seed
+"""
+
+# Raw payloads for the scraped share, roughly the size real providers return
+PAYLOADS_SEED_SQL = """
+INSERT INTO prospect_payloads (prospect_id, dataforseo_payload, scrape_payload)
+SELECT id,
+       json_build_object('url', page_url, 'title', page_title, 'description', repeat('Murals and art. ', 40)),
+       json_build_object(page_url, json_build_array(contact_email))
+FROM prospects
+WHERE contact_email IS NOT NULL AND source_type = 'website'
+"""
+
+JOBS_SEED_SQL = """
+INSERT INTO jobs (id, job_type, params, status, created_at)
+SELECT gen_random_uuid(), (ARRAY['discover', 'scrape', 'verify', 'draft', 'send', 'social_discover'])[i % 6 + 1],
+       '{}'::json, CASE WHEN i <= 2 THEN 'running' ELSE 'completed' END, now() - (i || ' hours')::interval
+FROM generate_series(1, :jobs) AS i
+"""
+
+
+def seed_prospects(conn, rows: int, jobs: int = 200) -> None:
+    """Seed through a sync connection (tables must exist); ANALYZEs afterwards"""
+    conn.execute(text(PROSPECTS_SEED_SQL), {"rows": rows})
+    conn.execute(text(PAYLOADS_SEED_SQL))
+    conn.execute(text(JOBS_SEED_SQL), {"jobs": jobs})
+    conn.execute(text("ANALYZE prospects"))
+    conn.execute(text("ANALYZE prospect_payloads"))
+    conn.execute(text("ANALYZE jobs"))
+
+
+def _asyncpg_url(url: str) -> str:
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+
+@contextlib.asynccontextmanager
+async def throwaway_database(server_url: str, keep: bool = False) -> AsyncIterator[str]:
+    """An empty database next to server_url's, dropped on exit; yields its URL"""
+    name = f"bench_{uuid.uuid4().hex[:10]}"
+    admin = create_async_engine(_asyncpg_url(server_url), isolation_level="AUTOCOMMIT")
+    async with admin.connect() as conn:
+        await conn.execute(text(f'CREATE DATABASE "{name}"'))
+    try:
+        yield server_url.rsplit("/", 1)[0] + f"/{name}"
+    finally:
+        if not keep:
+            async with admin.connect() as conn:
+                await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        await admin.dispose()
@@ -0,0 +1,59 @@
+"""
+Stub DNS server on 127.0.0.1 (UDP) for the DNS / MX preflight
+
+Answers from a zone {(name, type): [rdata, ...]}. Names in the zone exist
+(NOERROR with an empty answer for types they have no records of); every
+other name is NXDOMAIN. for_hosts() builds the zone of a website farm: A
+records from a {name: [addresses]} map plus "10 mail.<name>." MX records.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+
+class FakeDnsServer(asyncio.DatagramProtocol):
+    def __init__(self, zone: Dict[Tuple[str, str], List[str]], ttl: int = 300):
+        self.zone = {(name.lower(), rdtype.upper()): answers for (name, rdtype), answers in zone.items()}
+        self.names = {name for name, _ in self.zone}
+        self.ttl = ttl
+        self.queries: List[Tuple[str, str]] = []
+        self.port: Optional[int] = None
+        self._transport = None
+
+    @classmethod
+    def for_hosts(cls, records: Dict[str, List[str]], ttl: int = 300) -> "FakeDnsServer":
+        zone = {}
+        for name, addresses in records.items():
+            zone[(name, "A")] = addresses
+            zone[(name, "MX")] = [f"10 mail.{name.lower()}."]
+        return cls(zone, ttl)
+
+    async def start(self) -> "FakeDnsServer":
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=("127.0.0.1", 0))
+        self.port = self._transport.get_extra_info("sockname")[1]
+        return self
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data, addr):
+        query = dns.message.from_wire(data)
+        question = query.question[0]
+        name = question.name.to_text().rstrip(".").lower()
+        rdtype = dns.rdatatype.to_text(question.rdtype)
+        self.queries.append((name, rdtype))
+        response = dns.message.make_response(query)
+        if name not in self.names:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        elif (name, rdtype) in self.zone:
+            response.answer.append(dns.rrset.from_text_list(question.name, self.ttl, "IN", rdtype, self.zone[(name, rdtype)]))
+        self._transport.sendto(response.to_wire(), addr)
@@ -0,0 +1,350 @@
+"""
+Local fakes of the pipeline's HTTP providers, served from one ASGI app
+
+The request's Host header picks the provider, so the real clients run
+unchanged once their traffic is routed here (route_httpx_to):
+- DataForSEO: serp/google/organic task_post + task_get (results are drawn
+  from the website farm)
+- Snov.io: oauth/access_token, get-domain-emails-with-info,
+  add-emails-to-verification + get-emails-verification-status (bulk
+  verifier; an address is "in_progress" for verify_polls status calls)
+- Hunter.io: domain-search, email-verifier
+- Gemini: models, generateContent (a JSON subject/body draft)
+- Gmail: users/me/messages/send, users/me/profile, oauth2 token
+- Any other host: the synthetic website farm - a homepage linking to
+  /contact and /about, an email on a share of the sites, robots.txt
+
+Each provider gets a latency (seconds, drawn uniformly from 0.5x-1.5x) and
+an error rate (HTTP 503 / 500). Answers are deterministic for a seed.
+"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
+
+PROVIDER_HOSTS = {
+    "api.dataforseo.com": "dataforseo",
+    "api.snov.io": "snov",
+    "api.hunter.io": "hunter",
+    "generativelanguage.googleapis.com": "gemini",
+    "gmail.googleapis.com": "gmail",
+    "oauth2.googleapis.com": "gmail",
+}
+PROVIDERS = ("dataforseo", "snov", "hunter", "gemini", "gmail", "website")
+
+SITE_KINDS = ("Art Studio", "Design Agency", "Gallery Services", "Mural Company", "Framing Studio")
+
+
+class FakeSite:
+    __slots__ = ("domain", "title", "email", "dead")
+
+    def __init__(self, domain: str, title: str, email: Optional[str], dead: bool):
+        self.domain = domain
+        self.title = title
+        self.email = email
+        self.dead = dead
+
+
+class FakeProviders:
+    """ASGI app answering for every provider plus the website farm"""
+
+    def __init__(
+        self,
+        sites: int = 50,
+        results_per_query: int = 10,
+        email_rate: float = 0.8,
+        dead_rate: float = 0.1,
+        latency: Optional[Dict[str, float]] = None,
+        error_rate: Optional[Dict[str, float]] = None,
+        seed: int = 1,
+        verify_polls: int = 0,
+    ):
+        self.rng = random.Random(seed)
+        self.verify_polls = verify_polls
+        self.results_per_query = results_per_query
+        self.latency = {provider: 0.0 for provider in PROVIDERS}
+        self.latency.update(latency or {})
+        self.error_rate = {provider: 0.0 for provider in PROVIDERS}
+        self.error_rate.update(error_rate or {})
+        self.sites: List[FakeSite] = []
+        for i in range(sites):
+            kind = SITE_KINDS[i % len(SITE_KINDS)]
+            domain = f"{kind.lower().replace(' ', '')}{i:04d}.com"
+            email = f"hello@{domain}" if self.rng.random() < email_rate else None
+            dead = self.rng.random() < dead_rate
+            self.sites.append(FakeSite(domain, f"{kind} {i:04d} - Professional art services", email, dead))
+        self.by_domain = {site.domain: site for site in self.sites}
+        self._tasks: Dict[str, str] = {}
+        self._verifications: Dict[str, int] = {}  # queued address -> status calls left before "complete"
+        self.requests: Dict[str, int] = {provider: 0 for provider in PROVIDERS}
+        self.errors: Dict[str, int] = {provider: 0 for provider in PROVIDERS}
+        self.endpoints: Dict[str, int] = {}  # "provider last-path-segment" -> requests
+        self.sent: List[str] = []
+
+    # --- ASGI ---------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        request = Request(scope, receive)
+        host = (request.headers.get("host") or "").split(":")[0].lower()
+        provider = PROVIDER_HOSTS.get(host, "website")
+        self.requests[provider] += 1
+        endpoint = f"{provider} {request.url.path.rsplit('/', 1)[-1]}"
+        self.endpoints[endpoint] = self.endpoints.get(endpoint, 0) + 1
+        delay = self.latency[provider]
+        if delay:
+            await asyncio.sleep(delay * (0.5 + self.rng.random()))
+        if self.error_rate[provider] and self.rng.random() < self.error_rate[provider]:
+            self.errors[provider] += 1
+            response: Response = PlainTextResponse("fake outage", status_code=503 if provider == "website" else 500)
+        else:
+            handler = getattr(self, f"_{provider}")
+            response = await handler(request, host)
+        await response(scope, receive, send)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"requests": dict(self.requests), "errors": dict(self.errors), "endpoints": dict(sorted(self.endpoints.items()))}
+
+    # --- Providers ----------------------------------------------------------
+
+    def _serp_items(self, keyword: str) -> List[Dict]:
+        if not self.sites:
+            return []
+        start = int(hashlib.sha1(keyword.encode()).hexdigest(), 16) % len(self.sites)
+        count = min(self.results_per_query, len(self.sites))
+        picked = [self.sites[(start + i) % len(self.sites)] for i in range(count)]
+        return [
+            {
+                "type": "organic",
+                "rank_group": rank,
+                "domain": site.domain,
+                "url": f"https://{site.domain}/",
+                "title": site.title,
+                "description": f"{site.title}. Our team of specialists works with galleries and brands.",
+            }
+            for rank, site in enumerate(picked, 1)
+        ]
+
+    async def _dataforseo(self, request: Request, host: str) -> Response:
+        path = request.url.path
+        if path.endswith("/task_post"):
+            tasks = []
+            for task in await request.json():
+                task_id = str(uuid.uuid4())
+                self._tasks[task_id] = task.get("keyword", "")
+                tasks.append({"id": task_id, "status_code": 20100, "status_message": "Task Created.", "data": task})
+            return JSONResponse({"status_code": 20000, "status_message": "Ok.", "tasks_count": len(tasks), "tasks": tasks})
+        if "/task_get/" in path:
+            task_id = path.rsplit("/", 1)[-1]
+            if task_id not in self._tasks:
+                return JSONResponse({"status_code": 20000, "tasks": [{"id": task_id, "status_code": 40400, "status_message": "Not Found."}]})
+            keyword = self._tasks[task_id]
+            items = self._serp_items(keyword)
+            return JSONResponse({
+                "status_code": 20000,
+                "status_message": "Ok.",
+                "tasks": [{
+                    "id": task_id,
+                    "status_code": 20000,
+                    "status_message": "Ok.",
+                    "result": [{"keyword": keyword, "items_count": len(items), "items": items}],
+                }],
+            })
+        return JSONResponse({"status_code": 40400, "status_message": "Not Found."}, status_code=404)
+
+    async def _snov(self, request: Request, host: str) -> Response:
+        path = request.url.path
+        if path.endswith("/oauth/access_token"):
+            return JSONResponse({"access_token": "fake-snov-token", "token_type": "Bearer", "expires_in": 3600})
+        if path.endswith("/get-domain-emails-with-info"):
+            domain = request.query_params.get("domain", "")
+            site = self.by_domain.get(domain)
+            emails = []
+            if site is not None and site.email:
+                emails.append({
+                    "email": site.email,
+                    "type": "generic",
+                    "confidence": 90,
+                    "source": "website",
+                    "page_url": f"https://{domain}/contact",
+                })
+            return JSONResponse({"success": True, "domain": domain, "emails": emails, "result": len(emails)})
+        if path.endswith("/add-emails-to-verification"):
+            for email in (await request.form()).getlist("emails[]"):
+                self._verifications[email] = self.verify_polls
+            return JSONResponse({"success": True})
+        if path.endswith("/get-emails-verification-status"):
+            body: Dict = {"success": True}
+            for email in request.query_params.getlist("emails[]"):
+                if email not in self._verifications:
+                    body[email] = {"status": {"identifier": "not_verified"}}
+                elif self._verifications[email] > 0:
+                    self._verifications[email] -= 1
+                    body[email] = {"status": {"identifier": "in_progress"}}
+                else:
+                    body[email] = {"status": {"identifier": "complete"}, "data": {
+                        "email": email,
+                        "isValidFormat": True,
+                        "smtpStatus": "valid" if self._is_farm_email(email) else "not_valid",
+                    }}
+            return JSONResponse(body)
+        return JSONResponse({"success": False, "error": "not found"}, status_code=404)
+
+    def _is_farm_email(self, email: str) -> bool:
+        site = self.by_domain.get(email.rsplit("@", 1)[-1])
+        return site is not None and site.email == email
+
+    async def _hunter(self, request: Request, host: str) -> Response:
+        path = request.url.path
+        if path.endswith("/domain-search"):
+            domain = request.query_params.get("domain", "")
+            site = self.by_domain.get(domain)
+            emails = [{
+                "value": site.email,
+                "type": "generic",
+                "confidence": 90,
+                "sources": [{"domain": domain, "uri": f"https://{domain}/contact"}],
+            }] if site and site.email else []
+            return JSONResponse({"data": {"domain": domain, "emails": emails}, "meta": {"results": len(emails)}})
+        if path.endswith("/email-verifier"):
+            email = request.query_params.get("email", "")
+            valid = self._is_farm_email(email)
+            return JSONResponse({"data": {
+                "email": email,
+                "status": "valid" if valid else "invalid",
+                "result": "deliverable" if valid else "undeliverable",
+                "score": 95 if valid else 10,
+            }})
+        return JSONResponse({"errors": [{"id": "not_found"}]}, status_code=404)
+
+    async def _gemini(self, request: Request, host: str) -> Response:
+        path = request.url.path
+        if path.endswith("/models"):
+            return JSONResponse({"models": [{"name": "models/gemini-1.5-flash"}]})
+        if path.endswith(":generateContent"):
+            draft = {
+                "subject": "A mural partnership idea",
+                "body": "Hi there,\n\nWe loved your recent work and would like to collaborate.\n\nBest,\nLiquid Canvas",
+            }
+            return JSONResponse({"candidates": [{"content": {"parts": [{"text": json.dumps(draft)}], "role": "model"}}]})
+        return JSONResponse({"error": {"code": 404}}, status_code=404)
+
+    async def _gmail(self, request: Request, host: str) -> Response:
+        path = request.url.path
+        if host.startswith("oauth2."):
+            return JSONResponse({"access_token": "fake-gmail-token", "expires_in": 3600, "token_type": "Bearer"})
+        if path.endswith("/users/me/profile"):
+            return JSONResponse({"emailAddress": "outreach@liquidcanvas.art", "messagesTotal": len(self.sent)})
+        if path.endswith("/users/me/messages/send"):
+            message_id = uuid.uuid4().hex[:16]
+            self.sent.append(message_id)
+            return JSONResponse({"id": message_id, "threadId": message_id, "labelIds": ["SENT"]})
+        return JSONResponse({"error": {"code": 404}}, status_code=404)
+
+    async def _website(self, request: Request, host: str) -> Response:
+        site = self.by_domain.get(host.removeprefix("www."))
+        if site is None or site.dead:
+            return PlainTextResponse("no such site", status_code=404)
+        path = request.url.path.rstrip("/") or "/"
+        if path == "/robots.txt":
+            return PlainTextResponse("User-agent: *\nAllow: /\n")
+        if path == "/":
+            body = (
+                f"<h1>{site.title}</h1><p>We paint murals and run workshops for galleries and brands.</p>"
+                '<a href="/contact">Contact</a> <a href="/about">About us</a>'
+            )
+        elif path == "/contact":
+            contact = f'<a href="mailto:{site.email}">{site.email}</a>' if site.email else "Use the form below."
+            body = f"<h1>Contact</h1><p>{contact}</p>"
+        elif path == "/about":
+            body = "<h1>About us</h1><p>Founded in 2009 by two painters.</p>"
+        else:
+            return HTMLResponse("<h1>Not found</h1>", status_code=404)
+        return HTMLResponse(f"<html><head><title>{site.title}</title></head><body>{body}</body></html>")
+
+
+# --- Serving and routing ------------------------------------------------------
+
+class FakeServer:
+    """Runs an ASGI app with uvicorn on 127.0.0.1 in a background thread"""
+
+    def __init__(self, app):
+        import uvicorn
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self.port = self._sock.getsockname()[1]
+        self._server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False, lifespan="off"))
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [self._sock]}, daemon=True)
+
+    def __enter__(self) -> "FakeServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake provider server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+        self._sock.close()
+
+
+class RoutedTransport(httpx.AsyncBaseTransport):
+    """Sends every request to one local port, keeping the original Host header"""
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self._target = (host, port)
+        self._inner = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=200, max_keepalive_connections=50))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host=self._target[0], port=self._target[1])
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Clients closing is a no-op: the connection pool is shared (see shutdown)"""
+
+    async def shutdown(self) -> None:
+        await self._inner.aclose()
+
+
+@contextlib.contextmanager
+def route_httpx_to(port: int) -> Iterator[RoutedTransport]:
+    """
+    Make every httpx.AsyncClient created inside the block (without its own
+    transport) talk to the fake server on `port`
+    """
+    transport = RoutedTransport(port)
+    original = httpx.AsyncClient
+
+    class RoutedAsyncClient(original):
+        def __init__(self, *args, **kwargs):
+            if kwargs.get("transport") is None and not kwargs.get("mounts"):
+                kwargs["transport"] = transport
+            super().__init__(*args, **kwargs)
+
+    httpx.AsyncClient = RoutedAsyncClient
+    try:
+        yield transport
+    finally:
+        httpx.AsyncClient = original
+
+
+def farm_dns(providers: FakeProviders) -> Tuple[Dict[str, List[str]], set]:
+    """A records of the live sites and the dead domains, for FakeDnsServer.for_hosts()"""
+    records = {site.domain: ["127.0.0.1"] for site in providers.sites if not site.dead}
+    return records, {site.domain for site in providers.sites if site.dead}
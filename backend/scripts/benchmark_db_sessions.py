@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: read-only session dependency vs the default one
+
+Drives the get_db and get_read_db dependencies the way FastAPI does for a
+typical dashboard GET (one small SELECT per request) and prints the latency
+histograms each dependency recorded.
+
+Usage (from backend/, against a disposable or staging database):
+    DATABASE_URL=postgresql://... python scripts/benchmark_db_sessions.py [--requests 500]
+
+Set DB_POOL_PRE_PING=true to reproduce the previous engine configuration.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.db.database import get_db, get_read_db  # noqa: E402
+from app.utils.latency import latency_snapshot, reset_latency  # noqa: E402
+
+
+async def _drive(dependency, requests: int) -> None:
+    for _ in range(requests):
+        generator = dependency()
+        session = await generator.__anext__()
+        await session.execute(text("SELECT 1"))
+        # Resume after the yield, like FastAPI does once the endpoint returned
+        try:
+            await generator.__anext__()
+        except StopAsyncIteration:
+            pass
+
+
+async def main(requests: int) -> None:
+    await _drive(get_db, 10)  # warm both pools
+    await _drive(get_read_db, 10)
+    reset_latency()
+    await _drive(get_db, requests)
+    await _drive(get_read_db, requests)
+    for name, stats in latency_snapshot().items():
+        stats.pop("buckets")
+        print(f"{name:<28} {json.dumps(stats)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end pipeline benchmark
+
+Runs discover -> scrape -> verify -> draft -> send through the real API
+endpoints and background tasks, with every provider replaced by the local
+fakes in backend/fakes/ (DataForSEO, Snov.io, Hunter.io, Gemini, Gmail, a
+synthetic website farm and a stub DNS server for the MX preflight). The
+data goes to a throwaway database created on the given Postgres server and
+dropped afterwards. No network access, no provider credits.
+
+Reports:
+- prospects/minute (prospects sent per minute of pipeline wall time)
+- per stage: wall time, prospects out, SQL statements (by verb)
+- p50/p95 of every instrumented span (page.fetch, snov.domain_search,
+  gemini.compose, db.commit, ...) - bucket upper bounds, see app.utils.latency
+- requests and injected errors per fake provider
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql://postgres@127.0.0.1:5432/postgres \\
+        python scripts/benchmark_pipeline.py [--sites 20] [--latency 0.05] [--error-rate 0.02]
+
+    --json report.json       write the report
+    --baseline report.json   exit 1 when prospects/minute dropped, or SQL
+                             statements per prospect grew, by more than
+                             --tolerance (default 20%) against that report
+
+The pipeline's own pacing (DataForSEO polling, per-prospect sleeps, rate
+limits) is kept - it is part of what the benchmark measures.
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from fakes.dataset import throwaway_database  # noqa: E402
+from fakes.providers import FakeProviders, FakeServer, farm_dns, route_httpx_to  # noqa: E402
+
+STAGES = (
+    ("discover", "/api/pipeline/discover"),
+    ("scrape", "/api/pipeline/scrape"),
+    ("verify", "/api/pipeline/verify"),
+    ("draft", "/api/pipeline/draft"),
+    ("send", "/api/pipeline/send"),
+)
+FINISHED = {"completed", "failed", "cancelled"}
+
+# Prospect counts after each stage (what the stage produced)
+STAGE_OUTPUT_SQL = {
+    "discover": "SELECT count(*) FROM prospects",
+    "scrape": "SELECT count(*) FROM prospects WHERE contact_email IS NOT NULL",
+    "verify": "SELECT count(*) FROM prospects WHERE verification_status = 'verified'",
+    "draft": "SELECT count(*) FROM prospects WHERE draft_subject IS NOT NULL",
+    "send": "SELECT count(*) FROM prospects WHERE send_status = 'sent'",
+}
+
+# Credentials the clients insist on; the fakes accept anything
+FAKE_CREDENTIALS = {
+    "DATAFORSEO_LOGIN": "bench",
+    "DATAFORSEO_PASSWORD": "bench",
+    "SNOV_USER_ID": "bench",
+    "SNOV_SECRET": "bench",
+    "HUNTER_IO_API_KEY": "bench",
+    "GEMINI_API_KEY": "bench",
+    "GMAIL_ACCESS_TOKEN": "bench",
+    "GMAIL_REFRESH_TOKEN": "bench",
+    "GMAIL_CLIENT_ID": "bench",
+    "GMAIL_CLIENT_SECRET": "bench",
+}
+
+
+async def _wait_for_job(job_id: str, timeout: float) -> Dict:
+    from app.db.database import AsyncSessionLocal
+
+    deadline = time.monotonic() + timeout
+    while True:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                text("SELECT status, error_message FROM jobs WHERE id = :id"), {"id": job_id}
+            )).one()
+        if row.status in FINISHED or time.monotonic() > deadline:
+            return {"status": row.status if row.status in FINISHED else "timeout", "error": row.error_message}
+        await asyncio.sleep(0.2)
+
+
+async def _count(sql: str) -> int:
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(text(sql))).scalar_one()
+
+
+async def _run_stage(client: httpx.AsyncClient, name: str, path: str, body: Dict, timeout: float) -> Dict:
+    from app.utils.query_counter import count_queries
+
+    started = time.perf_counter()
+    # The stage's background task is created inside this scope and keeps counting into it
+    with count_queries() as queries:
+        response = await client.post(path, json=body)
+    if response.status_code != 200:
+        return {
+            "status": f"http_{response.status_code}",
+            "error": response.text[:300],
+            "wall_s": round(time.perf_counter() - started, 3),
+            "statements": queries.snapshot(),
+        }
+    job_id = response.json()["job_id"]
+    # Poll from an empty context so the polling queries are not counted
+    job = await asyncio.create_task(_wait_for_job(job_id, timeout), context=contextvars.Context())
+    wall = time.perf_counter() - started
+    produced = await asyncio.create_task(_count(STAGE_OUTPUT_SQL[name]), context=contextvars.Context())
+    return {
+        "status": job["status"],
+        "error": job["error"],
+        "wall_s": round(wall, 3),
+        "prospects": produced,
+        "statements": queries.snapshot(),
+    }
+
+
+async def run(args) -> Dict:
+    from app.db.database import Base, get_engine
+    import app.models  # noqa: F401 - registers every table
+    from app.main import app
+    from app.services import dns_preflight
+    from app.utils.metrics import reset_metrics, stage_snapshot
+
+    # Website pipeline tables only (the social tables are not exercised here)
+    tables = [table for name, table in Base.metadata.tables.items() if not name.startswith("social_")]
+    async with get_engine().begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+
+    fakes = FakeProviders(
+        sites=args.sites,
+        results_per_query=args.results_per_query,
+        email_rate=args.email_rate,
+        dead_rate=args.dead_rate,
+        latency={"website": args.latency, "dataforseo": args.latency, "snov": args.latency,
+                 "hunter": args.latency, "gemini": args.latency * 10, "gmail": args.latency},
+        error_rate={provider: args.error_rate for provider in ("website", "snov", "hunter", "gemini", "gmail")},
+        seed=args.seed,
+    )
+    dns_server = None
+    if dns_preflight.dns is not None:
+        from fakes.dns_server import FakeDnsServer
+
+        dns_server = await FakeDnsServer.for_hosts(farm_dns(fakes)[0]).start()
+        dns_preflight._preflight = dns_preflight.DnsPreflight(nameservers=["127.0.0.1"], port=dns_server.port)
+
+    stages: Dict[str, Dict] = {}
+    with FakeServer(fakes) as server, route_httpx_to(server.port) as transport:
+        api = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+        try:
+            response = await api.post("/api/scraper/master", json={"enabled": True})
+            response.raise_for_status()
+            reset_metrics()
+            bodies = {"discover": {
+                "categories": ["Art Gallery"],
+                "locations": ["usa"],
+                "keywords": args.keywords,
+                "max_results": args.sites,
+            }}
+            for name, path in STAGES:
+                stage = await _run_stage(api, name, path, bodies.get(name, {}), args.stage_timeout)
+                stages[name] = stage
+                print(f"  {name:<9} {stage['status']:<10} {stage['wall_s']:>8.2f}s  "
+                      f"prospects={stage.get('prospects', '-')}  statements={stage['statements']['total']}",
+                      file=sys.stderr)
+                if stage["status"] != "completed":
+                    break
+        finally:
+            await api.aclose()
+            await transport.shutdown()
+            if dns_server is not None:
+                dns_server.close()
+    await get_engine().dispose()
+
+    wall = sum(stage["wall_s"] for stage in stages.values())
+    sent = stages.get("send", {}).get("prospects", 0) or 0
+    statements = sum(stage["statements"]["total"] for stage in stages.values())
+    spans = {}
+    for span, snapshot in stage_snapshot().items():
+        spans[span] = {key: snapshot[key] for key in ("count", "mean_ms", "p50_ms", "p95_ms")}
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "baseline")},
+        "prospects_sent": sent,
+        "wall_s": round(wall, 3),
+        "prospects_per_minute": round(sent / wall * 60, 2) if wall else 0.0,
+        "statements_per_prospect": round(statements / sent, 1) if sent else None,
+        "stages": stages,
+        "spans": spans,
+        "providers": fakes.stats(),
+    }
+
+
+def _print_report(report: Dict) -> None:
+    print(f"\nprospects sent: {report['prospects_sent']} in {report['wall_s']:.1f}s "
+          f"-> {report['prospects_per_minute']} prospects/minute, "
+          f"{report['statements_per_prospect']} SQL statements/prospect")
+    print(f"\n{'stage':<10}{'status':<11}{'wall_s':>9}{'prospects':>11}{'statements':>12}  by verb")
+    for name, stage in report["stages"].items():
+        verbs = {k: v for k, v in stage["statements"].items() if k != "total"}
+        print(f"{name:<10}{stage['status']:<11}{stage['wall_s']:>9.2f}{stage.get('prospects', '-'):>11}"
+              f"{stage['statements']['total']:>12}  {json.dumps(verbs)}")
+    print(f"\n{'span':<28}{'count':>7}{'mean_ms':>10}{'p50_ms':>9}{'p95_ms':>9}")
+    for span, stats in report["spans"].items():
+        print(f"{span:<28}{stats['count']:>7}{str(stats['mean_ms']):>10}{str(stats['p50_ms']):>9}{str(stats['p95_ms']):>9}")
+    print(f"\n{'provider':<12}{'requests':>9}{'errors':>8}")
+    for provider, count in report["providers"]["requests"].items():
+        print(f"{provider:<12}{count:>9}{report['providers']['errors'][provider]:>8}")
+
+
+def _regressions(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    problems = []
+    if report["prospects_per_minute"] < baseline["prospects_per_minute"] * (1 - tolerance):
+        problems.append(
+            f"prospects/minute {report['prospects_per_minute']} < baseline {baseline['prospects_per_minute']}"
+        )
+    current, before = report["statements_per_prospect"], baseline.get("statements_per_prospect")
+    if current is None:
+        problems.append("no prospect made it through the pipeline")
+    elif before and current > before * (1 + tolerance):
+        problems.append(f"SQL statements/prospect {current} > baseline {before}")
+    for name, stage in report["stages"].items():
+        if stage["status"] != "completed":
+            problems.append(f"stage {name} {stage['status']}: {stage.get('error')}")
+    return problems
+
+
+async def main(args) -> int:
+    server_url = args.database_url
+    if not server_url:
+        print("Set BENCH_DATABASE_URL (or TEST_DATABASE_URL / --database-url) to a Postgres server", file=sys.stderr)
+        return 2
+    async with throwaway_database(server_url, keep=args.keep_db) as database_url:
+        os.environ["DATABASE_URL"] = database_url
+        os.environ.pop("DATABASE_READ_URL", None)
+        os.environ.pop("REDIS_URL", None)
+        for key, value in FAKE_CREDENTIALS.items():
+            os.environ.setdefault(key, value)
+        print(f"Benchmark database: {database_url.rsplit('/', 1)[1]}", file=sys.stderr)
+        report = await run(args)
+
+    _print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, default=str))
+    if args.baseline:
+        problems = _regressions(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL") or os.getenv("TEST_DATABASE_URL"))
+    parser.add_argument("--sites", type=int, default=20, help="websites in the farm (and max_results)")
+    parser.add_argument("--results-per-query", type=int, default=10)
+    parser.add_argument("--keywords", default="mural studio")
+    parser.add_argument("--email-rate", type=float, default=0.8, help="share of sites with an email")
+    parser.add_argument("--dead-rate", type=float, default=0.1, help="share of sites whose domain is NXDOMAIN")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean provider latency in seconds (Gemini: 10x)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of provider requests that fail")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--stage-timeout", type=float, default=1800)
+    parser.add_argument("--keep-db", action="store_true", help="do not drop the benchmark database")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: SERP intent + category keyword classification
+
+Compares the compiled KeywordMatcher path (infer_serp_intents / classify_category)
+with the previous per-keyword `kw in text` scans on synthetic SERP results.
+
+Usage (from backend/):
+    python scripts/benchmark_serp_classifier.py [--results 10000] [--page-size 100]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.categorization import CATEGORY_PATTERNS, classify_category  # noqa: E402
+from app.utils.keyword_matcher import AHOCORASICK_AVAILABLE  # noqa: E402
+from app.services.serp_intent import (  # noqa: E402
+    _INTENT_MATCHER,
+    INTENT_KEYWORDS,
+    SIGNAL_LIMITS,
+    infer_serp_intents,
+)
+
+# Mostly neutral words with a sprinkling of intent/category keywords, like real snippets
+FILLER = [
+    "the", "best", "of", "in", "new", "york", "art", "gallery", "prints", "design", "home",
+    "contact", "local", "2024", "and", "with", "for", "your", "from", "collection", "modern",
+    "original", "paintings", "artists", "city", "located", "visit", "today", "works", "open",
+    "guide", "studio", "shop", "official", "news", "kids",
+]
+
+
+def _synthetic_results(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        title = " ".join(rng.choice(FILLER) for _ in range(rng.randint(4, 10))).title()
+        snippet = " ".join(rng.choice(FILLER) for _ in range(rng.randint(15, 40)))
+        domain = f"{rng.choice(FILLER)}{rng.choice(FILLER)}{i}.com"
+        results.append({"url": f"https://{domain}/{rng.choice(FILLER)}", "title": title, "description": snippet})
+    return results
+
+
+def _legacy_intent_signals(item):
+    """The previous approach: one substring scan per keyword, per intent"""
+    text = f"{(item['title'] or '').lower()} {(item['description'] or '').lower()}".strip()
+    signals = []
+    for intent, keywords in INTENT_KEYWORDS.items():
+        found = [kw for kw in keywords if kw in text]
+        signals.extend(f"{intent}_keyword:{kw}" for kw in found[:SIGNAL_LIMITS[intent]])
+    return signals
+
+
+def _compiled_intent_signals(page):
+    """The same signals from the compiled matcher, one call per SERP page"""
+    texts = [f"{(item['title'] or '').lower()} {(item['description'] or '').lower()}".strip() for item in page]
+    page_signals = []
+    for hits in _INTENT_MATCHER.found_many(texts):
+        signals = []
+        grouped = _INTENT_MATCHER.grouped(hits)
+        for intent, limit in SIGNAL_LIMITS.items():
+            signals.extend(f"{intent}_keyword:{kw}" for kw in grouped[intent][:limit])
+        page_signals.append(signals)
+    return page_signals
+
+
+def _legacy_category(domain, title, url):
+    domain, title, url = domain.lower(), title.lower(), url.lower()
+    for category, patterns in CATEGORY_PATTERNS.items():
+        if any(p in domain for p in patterns):
+            return category
+    for category, patterns in CATEGORY_PATTERNS.items():
+        if any(p in title or p in url for p in patterns):
+            return category
+    combined = f"{domain} {title} {url}"
+    for category, patterns in CATEGORY_PATTERNS.items():
+        if any(p in combined for p in patterns):
+            return category
+    return None
+
+
+def _time(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed * 1000:9.1f} ms total  {elapsed / count * 1e6:8.2f} µs/result")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100, help="SERP results per infer_serp_intents call")
+    args = parser.parse_args()
+
+    results = _synthetic_results(args.results)
+    pages = [results[i:i + args.page_size] for i in range(0, len(results), args.page_size)]
+    rows = [(r["url"].split("/")[2], r["title"], r["url"]) for r in results]
+
+    print(f"Matcher backend: {'Aho-Corasick automaton' if AHOCORASICK_AVAILABLE else 'compiled regex'}")
+    print(f"SERP intent keyword signals ({args.results} results, pages of {args.page_size}):")
+    legacy = _time("legacy any(kw in text) scans", args.results, lambda: [_legacy_intent_signals(r) for r in results])
+    compiled = _time("compiled matcher, batch per page", args.results, lambda: [_compiled_intent_signals(p) for p in pages])
+    print(f"  speed-up: {legacy / compiled:.1f}x")
+    _time("full infer_serp_intents", args.results, lambda: [infer_serp_intents(p) for p in pages])
+
+    print(f"Category classification ({args.results} rows):")
+    legacy = _time("legacy nested pattern loops", args.results, lambda: [_legacy_category(*row) for row in rows])
+    compiled = _time("classify_category (compiled)", args.results, lambda: [classify_category(*row) for row in rows])
+    print(f"  speed-up: {legacy / compiled:.1f}x")
+
+    compiled_signals = [signals for page in pages for signals in _compiled_intent_signals(page)]
+    mismatches = sum(_legacy_intent_signals(r) != signals for r, signals in zip(results, compiled_signals))
+    mismatches += sum(_legacy_category(*row) != classify_category(*row) for row in rows)
+    print(f"Mismatches vs legacy: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Dashboard API load test
+
+Drives the dashboard endpoints (pipeline status, prospect lists, social
+profiles/stats) at a fixed concurrency and reports, per endpoint, latency
+p50/p95/p99 (bucket upper bounds, see app.utils.latency), requests/second,
+errors and SQL statements per request.
+
+By default the app runs in-process against a throwaway database seeded with
+--rows synthetic prospects (fakes/dataset.py; 100k by default, 1M
+takes about a minute to seed). With --url it load-tests a running server
+instead; statement counts are then not available.
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql://postgres@127.0.0.1:5432/postgres \\
+        python scripts/loadtest_dashboard.py [--rows 100000] [--concurrency 20] [--requests 2000]
+    python scripts/loadtest_dashboard.py --url http://localhost:8000 --duration 60
+
+    --json report.json       write the report
+    --baseline report.json   exit 1 when an endpoint's p95 or statements per
+                             request grew by more than --tolerance (default
+                             20%) against that report
+
+Statement budgets and query plans are enforced in CI by
+tests/test_dashboard_queries.py; this script is for latency under load.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from app.utils.latency import LatencyHistogram  # noqa: E402
+from fakes.dataset import seed_prospects, throwaway_database  # noqa: E402
+
+ENDPOINTS = (
+    "/api/pipeline/status",
+    "/api/prospects?limit=50",
+    "/api/prospects/leads?limit=50",
+    "/api/prospects/scraped-emails?limit=50",
+    "/api/social/profiles?limit=50",
+    "/api/social/stats",
+)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.statements = 0
+
+    def snapshot(self, wall_s: float) -> Dict:
+        latency = self.latency.snapshot()
+        return {
+            "requests": self.latency.count,
+            "rps": round(self.latency.count / wall_s, 1) if wall_s else None,
+            "errors": self.errors,
+            "mean_ms": latency["mean_ms"],
+            "p50_ms": latency["p50_ms"],
+            "p95_ms": latency["p95_ms"],
+            "p99_ms": latency["p99_ms"],
+            "statements_per_request": round(self.statements / self.latency.count, 1) if self.latency.count else None,
+        }
+
+
+async def _drive(client: httpx.AsyncClient, args, count_statements: bool) -> Dict:
+    if count_statements:
+        from app.utils.query_counter import count_queries
+    stats = {endpoint: EndpointStats() for endpoint in ENDPOINTS}
+    schedule = itertools.cycle(ENDPOINTS)
+    issued = 0
+    deadline = time.monotonic() + args.duration if args.duration else None
+
+    async def worker():
+        nonlocal issued
+        while (deadline is None and issued < args.requests) or (deadline is not None and time.monotonic() < deadline):
+            issued += 1
+            endpoint = next(schedule)
+            started = time.perf_counter()
+            if count_statements:
+                with count_queries() as queries:
+                    response = await client.get(endpoint)
+                stats[endpoint].statements += queries.total
+            else:
+                response = await client.get(endpoint)
+            stats[endpoint].latency.observe(time.perf_counter() - started)
+            if response.status_code != 200:
+                stats[endpoint].errors += 1
+
+    # One untimed round first: connection pool, imports, plan caches
+    for endpoint in ENDPOINTS:
+        await client.get(endpoint)
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    wall_s = time.monotonic() - started
+    endpoints = {endpoint: s.snapshot(wall_s) for endpoint, s in stats.items()}
+    total = sum(s["requests"] for s in endpoints.values())
+    return {
+        "rows": None if args.url else args.rows,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall_s, 2),
+        "requests": total,
+        "rps": round(total / wall_s, 1) if wall_s else None,
+        "endpoints": endpoints,
+    }
+
+
+async def run_in_process(args) -> Dict:
+    from app.db.database import Base, get_engine
+    import app.models  # noqa: F401 - registers every table
+    from app.main import app
+
+    tables = [table for name, table in Base.metadata.tables.items() if not name.startswith("social_")]
+    seeded = time.monotonic()
+    async with get_engine().begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+        await conn.run_sync(seed_prospects, args.rows)
+    print(f"Seeded {args.rows} prospects in {time.monotonic() - seeded:.1f}s", file=sys.stderr)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+        return await _drive(client, args, count_statements=True)
+
+
+async def run_remote(args) -> Dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else None
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, headers=headers, timeout=120) as client:
+        return await _drive(client, args, count_statements=False)
+
+
+def _print_report(report: Dict) -> None:
+    print(f"\n{report['requests']} requests at concurrency {report['concurrency']} in {report['wall_s']}s "
+          f"-> {report['rps']} requests/s" + (f" ({report['rows']} prospects)" if report["rows"] else ""))
+    print(f"\n{'endpoint':<42}{'requests':>9}{'rps':>8}{'errors':>7}{'p50_ms':>8}{'p95_ms':>8}{'p99_ms':>8}{'stmts':>7}")
+    for endpoint, s in report["endpoints"].items():
+        print(f"{endpoint:<42}{s['requests']:>9}{str(s['rps']):>8}{s['errors']:>7}{str(s['p50_ms']):>8}"
+              f"{str(s['p95_ms']):>8}{str(s['p99_ms']):>8}{str(s['statements_per_request']):>7}")
+
+
+def _regressions(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    problems = []
+    for endpoint, current in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint)
+        if current["errors"]:
+            problems.append(f"{endpoint}: {current['errors']} failed requests")
+        if not before:
+            continue
+        for key in ("p95_ms", "statements_per_request"):
+            if current[key] is not None and before.get(key) and current[key] > before[key] * (1 + tolerance):
+                problems.append(f"{endpoint}: {key} {current[key]} > baseline {before[key]}")
+    return problems
+
+
+async def main(args) -> int:
+    if args.url:
+        report = await run_remote(args)
+    else:
+        server_url: Optional[str] = args.database_url
+        if not server_url:
+            print("Set BENCH_DATABASE_URL (or TEST_DATABASE_URL / --database-url), or pass --url", file=sys.stderr)
+            return 2
+        async with throwaway_database(server_url, keep=args.keep_db) as database_url:
+            os.environ["DATABASE_URL"] = database_url
+            os.environ.pop("DATABASE_READ_URL", None)
+            os.environ.pop("REDIS_URL", None)
+            print(f"Load test database: {database_url.rsplit('/', 1)[1]}", file=sys.stderr)
+            report = await run_in_process(args)
+
+    _print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        problems = _regressions(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL") or os.getenv("TEST_DATABASE_URL"))
+    parser.add_argument("--url", help="load-test a running server instead of the in-process app")
+    parser.add_argument("--token", default=os.getenv("LOADTEST_TOKEN"), help="bearer token for --url")
+    parser.add_argument("--rows", type=int, default=100_000, help="prospects to seed (in-process only)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000, help="total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead")
+    parser.add_argument("--keep-db", action="store_true", help="do not drop the load test database")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,75 @@
+"""
+Shared test fixtures.
+
+pg_schema / module_pg_schema: a throwaway PostgreSQL schema, dropped with
+everything in it afterwards. Tests using them are skipped unless
+TEST_DATABASE_URL is set, e.g.
+    TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest tests
+"""
+import asyncio
+import contextlib
+import os
+import uuid
+from typing import Iterator
+
+import pytest
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.database import Base
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def async_database_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+class PgSchema:
+    """One throwaway schema; engine() connections resolve unqualified tables in it"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.url = async_database_url(TEST_DATABASE_URL)
+
+    def engine(self, **kwargs) -> AsyncEngine:
+        """New engine scoped to the schema (create it in the event loop that uses it, dispose it there)"""
+        return create_async_engine(self.url, connect_args={"server_settings": {"search_path": self.name}}, **kwargs)
+
+    async def create_tables(self, engine: AsyncEngine, *tables: Table) -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=list(tables)))
+
+
+async def _execute(sql: str) -> None:
+    engine = create_async_engine(async_database_url(TEST_DATABASE_URL))
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(sql))
+            await conn.commit()
+    finally:
+        await engine.dispose()
+
+
+@contextlib.contextmanager
+def _throwaway_schema() -> Iterator[PgSchema]:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set (PostgreSQL required)")
+    schema = PgSchema(f"test_{uuid.uuid4().hex[:8]}")
+    asyncio.run(_execute(f"CREATE SCHEMA {schema.name}"))
+    try:
+        yield schema
+    finally:
+        asyncio.run(_execute(f"DROP SCHEMA {schema.name} CASCADE"))
+
+
+@pytest.fixture
+def pg_schema() -> Iterator[PgSchema]:
+    with _throwaway_schema() as schema:
+        yield schema
+
+
+@pytest.fixture(scope="module")
+def module_pg_schema() -> Iterator[PgSchema]:
+    with _throwaway_schema() as schema:
+        yield schema
@@ -0,0 +1,237 @@
+"""
+Tests for the attachment blob store and the pre-encoded MIME part cache.
+
+The legacy-offload and migration tests require PostgreSQL; skipped unless
+TEST_DATABASE_URL is set.
+"""
+import asyncio
+import importlib.util
+import os
+import uuid
+from email import encoders
+from email.mime.base import MIMEBase
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import Base
+from app.models.discovery_query import DiscoveryQuery
+from app.models.email_attachment import EmailAttachment
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.services import attachment_store
+from app.services.attachment_store import (
+    AttachmentBlobMissing,
+    EncodedPartCache,
+    LocalBlobStore,
+    build_mime_part,
+    content_hash,
+    encoded_body,
+    load_attachment_parts,
+    release_blob,
+    store_attachment_data,
+)
+from tests.conftest import TEST_DATABASE_URL
+
+MIGRATION_PATH = Path(__file__).parent.parent / "alembic" / "versions" / "add_email_attachment_content_hash.py"
+
+
+class CountingStore(LocalBlobStore):
+    def __init__(self, root, durable=False):
+        super().__init__(root, durable=durable)
+        self.reads = 0
+
+    async def get(self, digest):
+        self.reads += 1
+        return await super().get(digest)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(attachment_store, "_part_cache", EncodedPartCache())
+
+
+def test_local_store_roundtrip(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    data = os.urandom(5000)
+
+    async def scenario():
+        digest = await store.put(data)
+        assert digest == content_hash(data)
+        assert await store.put(data) == digest  # idempotent
+        assert await store.get(digest) == data
+        await store.delete(digest)
+        assert not await store.exists(digest)
+        with pytest.raises(AttachmentBlobMissing):
+            await store.get(digest)
+
+    asyncio.run(scenario())
+
+
+def test_cached_part_matches_encoders_output(tmp_path):
+    """Same wire format as the previous encode-per-send path, store read once per batch"""
+    store = CountingStore(str(tmp_path))
+    data = os.urandom(100_000)
+
+    reference = MIMEBase("application", "pdf")
+    reference.set_payload(data)
+    encoders.encode_base64(reference)
+
+    async def scenario():
+        digest = await store.put(data)
+        return [await encoded_body(digest, store) for _ in range(50)]
+
+    bodies = asyncio.run(scenario())
+    assert store.reads == 1
+    part = build_mime_part("brochure.pdf", "application/pdf", bodies[-1])
+    assert part.get_payload() == reference.get_payload()
+    assert part.get_payload(decode=True) == data
+    assert part.get_filename() == "brochure.pdf"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EncodedPartCache(max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"
+    cache.put("c", "cccc")  # over budget: "b" is the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa" and cache.get("c") == "cccc"
+    cache.put("huge", "x" * 11)  # larger than the whole cache: not cached
+    assert cache.get("huge") is None
+
+
+async def _run_scenario(pg_schema, root, durable):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, EmailAttachment.__table__)
+
+        store = CountingStore(root, durable=durable)
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            prospect_ids = [uuid.uuid4() for _ in range(3)]
+            db.add_all([Prospect(id=pid, domain=f"{pid.hex[:8]}.com") for pid in prospect_ids])
+            await db.flush()
+            brochure = os.urandom(20_000)
+            own = os.urandom(300)
+            db.add_all([
+                # Legacy row: bytes still in the table
+                EmailAttachment(filename="brochure.pdf", content_type="application/pdf",
+                                size_bytes=len(brochure), scope="global", data=brochure),
+                EmailAttachment(filename="note.txt", content_type="text/plain", size_bytes=len(own),
+                                scope="prospect", prospect_id=prospect_ids[0],
+                                content_hash=await store.put(own)),
+            ])
+            await db.commit()
+
+            batch = []
+            for pid in prospect_ids:
+                batch.append(await load_attachment_parts(db, str(pid), store))
+                await db.commit()
+
+            assert [len(parts) for parts in batch] == [2, 1, 1]
+            assert all(parts[0].get_payload(decode=True) == brochure for parts in batch)
+            assert batch[0][1].get_payload(decode=True) == own
+            # Each blob read from the store once for the whole batch
+            assert store.reads == 2
+
+            row = (await db.execute(
+                text("SELECT content_hash, data FROM email_attachments WHERE filename = 'brochure.pdf'")
+            )).one()
+            assert row.content_hash == content_hash(brochure)
+            if durable:
+                assert row.data is None
+                return
+
+            # Non-durable store: Postgres keeps the bytes, a lost blob is refilled from the row
+            assert row.data == brochure
+            await store.delete(row.content_hash)
+            attachment_store._part_cache.discard(row.content_hash)
+            parts = await load_attachment_parts(db, str(prospect_ids[1]), store)
+            assert parts[0].get_payload(decode=True) == brochure
+            assert await store.exists(row.content_hash)
+    finally:
+        await scoped.dispose()
+
+
+@pytest.mark.parametrize("durable", [True, False])
+def test_legacy_rows_move_to_blob_store(pg_schema, tmp_path, durable):
+    asyncio.run(_run_scenario(pg_schema, str(tmp_path), durable))
+
+
+async def _release_during_upload(pg_schema, root):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, EmailAttachment.__table__)
+        store = LocalBlobStore(root, durable=True)
+        data = os.urandom(1000)
+        async with AsyncSession(scoped) as uploader, AsyncSession(scoped) as deleter:
+            # An earlier copy of the same file was deleted; its blob is being released
+            # while a new upload of that content has written the blob but not committed
+            digest, _ = await store_attachment_data(uploader, data, store)
+            uploader.add(EmailAttachment(filename="again.pdf", content_type="application/pdf",
+                                         size_bytes=len(data), scope="global", content_hash=digest))
+            await uploader.flush()
+            release = asyncio.create_task(release_blob(deleter, digest, store))
+            await asyncio.sleep(0.2)
+            assert not release.done()  # waits for the upload's lock
+
+            await uploader.commit()
+            assert await release is False
+            assert await store.get(digest) == data
+
+            # With no upload in flight the blob goes once unreferenced
+            await uploader.execute(text("DELETE FROM email_attachments"))
+            await uploader.commit()
+            assert await release_blob(deleter, digest, store) is True
+            assert not await store.exists(digest)
+    finally:
+        await scoped.dispose()
+
+
+def test_release_waits_for_concurrent_upload_of_the_same_blob(pg_schema, tmp_path):
+    asyncio.run(_release_during_upload(pg_schema, str(tmp_path)))
+
+
+def _downgrade(engine):
+    spec = importlib.util.spec_from_file_location(MIGRATION_PATH.stem, MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.downgrade()
+
+
+def test_downgrade_restores_blobs_or_refuses(pg_schema, tmp_path, monkeypatch):
+    monkeypatch.setenv("ATTACHMENT_STORE_DIR", str(tmp_path))
+    sync_url = TEST_DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
+    engine = create_engine(sync_url, connect_args={"options": f"-csearch_path={pg_schema.name}"})
+    try:
+        with engine.begin() as conn:
+            Base.metadata.create_all(conn, tables=[
+                Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, EmailAttachment.__table__,
+            ])
+            stored, legacy = os.urandom(500), os.urandom(200)
+            conn.execute(text(
+                "INSERT INTO email_attachments (id, filename, content_type, size_bytes, scope, content_hash, data) VALUES "
+                "(:a, 'stored.pdf', 'application/pdf', 500, 'global', :h, NULL), "
+                "(:b, 'legacy.pdf', 'application/pdf', 200, 'global', NULL, :legacy)"
+            ), {"a": uuid.uuid4(), "b": uuid.uuid4(), "h": content_hash(stored), "legacy": legacy})
+
+        # Blob not in ATTACHMENT_STORE_DIR: nothing is changed or deleted
+        with pytest.raises(RuntimeError, match="Refusing to downgrade"):
+            _downgrade(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM email_attachments")).scalar() == 2
+
+        asyncio.run(LocalBlobStore(str(tmp_path)).put(stored))
+        _downgrade(engine)
+        with engine.connect() as conn:
+            rows = {name: bytes(data) for name, data in conn.execute(text("SELECT filename, data FROM email_attachments"))}
+            assert rows == {"stored.pdf": stored, "legacy.pdf": legacy}
+            assert "content_hash" not in {col["name"] for col in inspect(conn).get_columns("email_attachments")}
+    finally:
+        engine.dispose()
@@ -0,0 +1,106 @@
+"""
+Parity tests for the vectorized prospect scorer (worker/services/scoring.py)
+
+The write-back test requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import random
+import sys
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# The worker package lives next to backend/
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from worker.services.scoring import ProspectScorer  # noqa: E402
+
+
+def _random_prospect(rng):
+    dataforseo = rng.choice([
+        None,
+        {},
+        {"metrics": {}},
+        {"metrics": {"backlinks": rng.randint(0, 5000)}},
+        {"metrics": {"backlinks": rng.random() * 10_000}},
+        {"metrics": None},  # scalar path raises on this
+    ])
+    hunter = rng.choice([
+        None,
+        {"emails": []},
+        {"emails": [{"confidence_score": rng.randint(0, 100)}]},
+        {"emails": [{"value": "a@b.com"}]},
+        {"emails": [{"confidence_score": None}]},  # scalar path raises on this
+    ])
+    return {
+        "domain_authority": rng.choice([None, 0.0, rng.random() * 100, rng.randint(1, 100)]),
+        "has_email": rng.random() < 0.6,
+        "email_confidence": rng.choice([None, None, rng.randint(0, 100), rng.random() * 100]),
+        "page_title": rng.choice([None, "", "   ", "Smart Home Decor Ideas", "Family Holiday Gift Guide"]),
+        "page_url": rng.choice([None, "", "https://example.com/tech/smart-home", "https://kids.example.org"]),
+        "dataforseo_payload": dataforseo,
+        "hunter_payload": hunter,
+    }
+
+
+def _scalar(scorer, prospect, categories):
+    try:
+        return scorer.calculate_score(categories=categories, **prospect)
+    except Exception:
+        return None
+
+
+@pytest.mark.parametrize("categories", [None, ["home_decor", "tech_innovation"], ["parenting", "holiday"]])
+def test_batch_scores_identical_to_scalar(categories):
+    scorer = ProspectScorer()
+    rng = random.Random(11)
+    prospects = [_random_prospect(rng) for _ in range(3000)]
+
+    batch = scorer.calculate_scores(prospects, categories=categories)
+
+    expected = [_scalar(scorer, p, categories) for p in prospects]
+    assert batch == expected
+    assert any(score is None for score in batch)  # invalid rows are reported, not guessed
+    assert all(isinstance(score, Decimal) for score in batch if score is not None)
+
+
+def test_empty_batch():
+    assert ProspectScorer().calculate_scores([]) == []
+
+
+async def _write_back_scenario(pg_schema):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.models.discovery_query import DiscoveryQuery
+    from app.models.job import Job
+    from app.models.prospect import Prospect
+    from worker.tasks.scoring import _write_scores
+
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            db.add_all([
+                Prospect(id=first, domain="a.com", score=Decimal("10.00")),
+                Prospect(id=second, domain="b.com", score=Decimal("42.50")),
+            ])
+            await db.commit()
+
+            changed = await _write_scores(db, [(first, Decimal("61.25")), (second, Decimal("42.50"))])
+            await db.commit()
+            assert changed == 1  # unchanged scores are not rewritten
+
+            scores = dict((await db.execute(text("SELECT id, score FROM prospects"))).all())
+            assert scores == {first: Decimal("61.25"), second: Decimal("42.50")}
+    finally:
+        await scoped.dispose()
+
+
+def test_write_scores_single_update(pg_schema):
+    asyncio.run(_write_back_scenario(pg_schema))
@@ -0,0 +1,197 @@
+"""
+Tests for bulk email verification against the local provider fakes
+(fakes/providers.py): batch submit + poll for Snov.io, Hunter.io
+fan-out, and the verification task's batch mode writing one bulk update.
+
+The task test requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import time
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.discovery_query import DiscoveryQuery
+from app.models.job import Job
+from app.models.prospect import Prospect, ProspectStage, ScrapeStatus
+from app.models.prospect_payload import ProspectPayload
+from app.services import bulk_verification
+from app.services.dns_preflight import NO_MX, NXDOMAIN, OK, DomainDns
+from app.services.prospect_payloads import get_payloads_many
+from app.tasks import verification
+from app.utils import rate_limiter
+from app.utils.query_counter import count_queries
+from app.utils.rate_limiter import RateLimiter
+from fakes.providers import FakeProviders, FakeServer, route_httpx_to
+
+@pytest.fixture
+def fakes(monkeypatch):
+    for name in ("SNOV_USER_ID", "SNOV_SECRET", "HUNTER_IO_API_KEY"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setattr(bulk_verification, "BULK_VERIFY_POLL_INTERVAL", 0.01)
+    # A fresh Snov.io token bucket per test
+    monkeypatch.setattr(rate_limiter, "_rate_limiter", RateLimiter(redis_url=""))
+    providers = FakeProviders(sites=30, email_rate=1.0, verify_polls=1)
+    with FakeServer(providers) as server, route_httpx_to(server.port) as transport:
+        providers.transport = transport
+        yield providers
+
+
+def _run(fakes, coro):
+    """Run coro in one event loop; the pooled connections belong to that loop"""
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            await fakes.transport.shutdown()
+
+    return asyncio.run(scenario())
+
+
+def _emails(providers, count):
+    return [site.email for site in providers.sites[:count]]
+
+
+def test_snov_batch_is_submitted_in_chunks_and_polled_per_batch(fakes):
+    emails = _emails(fakes, 20) + ["nobody@artstudio0000.com", "x@unknown-domain.com", "nobody@artstudio0000.com"]
+
+    verdicts = _run(fakes, bulk_verification.verify_emails(emails))
+
+    assert set(verdicts) == set(emails)
+    assert {verdicts[e].result for e in _emails(fakes, 20)} == {"deliverable"}
+    assert verdicts["x@unknown-domain.com"].result == "undeliverable"
+    assert {v.provider for v in verdicts.values()} == {"snov"}
+    # 22 unique addresses: 3 submit requests, then every address is "in_progress"
+    # once (verify_polls=1) - two polling rounds of 3 status requests
+    assert fakes.endpoints["snov add-emails-to-verification"] == 3
+    assert fakes.endpoints["snov get-emails-verification-status"] == 6
+    assert "hunter email-verifier" not in fakes.endpoints
+
+
+def test_snov_batch_sized_to_rate_limit_budget(fakes, monkeypatch):
+    """Default Snov.io bucket (50/minute, burst 10): within 2s it can queue and poll 5 chunks"""
+    monkeypatch.setattr(bulk_verification, "BULK_VERIFY_TIMEOUT", 2)
+    monkeypatch.delenv("HUNTER_IO_API_KEY")
+    fakes.verify_polls = 0
+    emails = [f"user{i}@artstudio{i:04d}.com" for i in range(100)]
+
+    started = time.monotonic()
+    verdicts = _run(fakes, bulk_verification.verify_emails(emails))
+
+    assert time.monotonic() - started < 2
+    assert set(verdicts) == set(emails[:50])
+    assert fakes.endpoints["snov add-emails-to-verification"] == 5
+    assert fakes.endpoints["snov get-emails-verification-status"] == 5
+
+
+def test_snov_submission_bounded_by_timeout(fakes, monkeypatch):
+    """An empty default bucket refills slower than the deadline: give up instead of waiting it out"""
+    monkeypatch.setattr(bulk_verification, "BULK_VERIFY_TIMEOUT", 0.5)
+    monkeypatch.delenv("HUNTER_IO_API_KEY")
+
+    async def drained_then_verify():
+        await rate_limiter.get_rate_limiter().try_acquire("snov", 10)
+        return await bulk_verification.verify_emails(_emails(fakes, 5))
+
+    started = time.monotonic()
+    verdicts = _run(fakes, drained_then_verify())
+
+    assert time.monotonic() - started < 1
+    assert verdicts == {}
+    assert "snov add-emails-to-verification" not in fakes.endpoints
+
+
+def test_hunter_fans_out_when_snov_is_unavailable(fakes, monkeypatch):
+    monkeypatch.delenv("SNOV_SECRET")
+    emails = _emails(fakes, 4) + ["x@unknown-domain.com"]
+
+    verdicts = _run(fakes, bulk_verification.verify_emails(emails))
+
+    assert {e: v.result for e, v in verdicts.items()} == {
+        **{e: "deliverable" for e in _emails(fakes, 4)},
+        "x@unknown-domain.com": "undeliverable",
+    }
+    assert verdicts[emails[0]].score == 95
+    assert fakes.endpoints["hunter email-verifier"] == 5
+    assert not any(endpoint.startswith("snov") for endpoint in fakes.endpoints)
+
+
+class _Preflight:
+    """MX answers: nomail.com has no mail server, everything else does"""
+
+    async def check_many(self, domains):
+        return {
+            d: DomainDns(d, NO_MX, ["127.0.0.1"], []) if d == "nomail.com" else DomainDns(d, OK, ["127.0.0.1"], ["mail." + d])
+            for d in domains
+        }
+
+
+async def _run_task(pg_schema, fakes, monkeypatch):
+    scoped = pg_schema.engine()
+    sessions = async_sessionmaker(scoped, expire_on_commit=False)
+    monkeypatch.setattr(verification, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(verification, "get_dns_preflight", lambda: _Preflight())
+    try:
+        await pg_schema.create_tables(
+            scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, ProspectPayload.__table__
+        )
+
+        good, bad, no_mx, dead = (uuid.uuid4() for _ in range(4))
+        farm = fakes.sites[0]
+        async with sessions() as db:
+            db.add_all([
+                Prospect(id=good, domain=farm.domain, contact_email=farm.email, stage=ProspectStage.LEAD.value,
+                         scrape_status=ScrapeStatus.SCRAPED.value, verification_status="UNVERIFIED"),
+                Prospect(id=bad, domain="gone.com", contact_email="info@gone.com", stage=ProspectStage.LEAD.value,
+                         scrape_status=ScrapeStatus.SCRAPED.value, verification_status="UNVERIFIED"),
+                Prospect(id=no_mx, domain="nomail.com", contact_email="hi@nomail.com", stage=ProspectStage.LEAD.value,
+                         scrape_status=ScrapeStatus.SCRAPED.value, verification_status="UNVERIFIED"),
+                Prospect(id=dead, domain="dead.com", stage=ProspectStage.LEAD.value, dns_status=NXDOMAIN,
+                         scrape_status=ScrapeStatus.NO_EMAIL_FOUND.value, verification_status="UNVERIFIED"),
+            ])
+            job = Job(job_type="verify", status="pending",
+                      params={"prospect_ids": [str(i) for i in (good, bad, no_mx, dead)], "verify_mode": "batch"})
+            db.add(job)
+            await db.commit()
+
+        with count_queries() as queries:
+            result = await verification.verify_prospects_async(str(job.id))
+
+        async with sessions() as db:
+            rows = (await db.execute(select(Prospect.id, Prospect.verification_status, Prospect.verification_confidence))).all()
+            payloads = await get_payloads_many(db, [good, bad, no_mx, dead], "verification_payload")
+        statuses = {row[0]: (row[1], float(row[2])) for row in rows}
+        return result, queries, statuses, payloads, (good, bad, no_mx, dead)
+    finally:
+        await scoped.dispose()
+
+
+def test_verification_task_batch_mode(pg_schema, fakes, monkeypatch):
+    result, queries, statuses, payloads, (good, bad, no_mx, dead) = _run(fakes, _run_task(pg_schema, fakes, monkeypatch))
+
+    assert (result["verified"], result["unverified"], result["failed"]) == (1, 3, 0)
+    assert statuses[good] == ("verified", 1.0)
+    assert statuses[bad] == ("unverified", 0.0)
+    assert statuses[no_mx] == ("unverified", 0.0)
+    assert statuses[dead] == ("unverified", 0.0)
+    assert payloads[good]["verification_payload"]["provider"] == "snov"
+    assert payloads[no_mx]["verification_payload"] == {"dns_status": NO_MX, "mx": []}
+    # Only the two live addresses went to the verifier; no per-prospect domain search
+    assert fakes.endpoints["snov add-emails-to-verification"] == 1
+    assert "snov get-domain-emails-with-info" not in fakes.endpoints
+    # All four outcomes in one bulk UPDATE and one payload upsert
+    assert queries.by_verb.get("update_many") == 1
+    assert queries.by_verb.get("insert") == 1
+
+
+def test_verification_task_stores_scores_on_the_confidence_scale(pg_schema, fakes, monkeypatch):
+    """Hunter.io's 0-100 score is stored as a 0-1 verification_confidence"""
+    monkeypatch.delenv("SNOV_SECRET")
+    result, _, statuses, payloads, (good, bad, no_mx, dead) = _run(fakes, _run_task(pg_schema, fakes, monkeypatch))
+
+    assert statuses[good] == ("verified", 0.95)
+    assert statuses[bad] == ("unverified", 0.1)
+    assert payloads[good]["verification_payload"]["provider"] == "hunter"
+    assert payloads[good]["verification_payload"]["score"] == 95
@@ -0,0 +1,159 @@
+"""
+Tests for set-based prospect categorization.
+
+The end-to-end test requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.discovery_query import DiscoveryQuery
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.tasks import categorization as categorization_task
+from app.services.categorization import (
+    CATEGORY_PATTERNS,
+    categorize_prospects,
+    classify_category,
+    migrate_legacy_categories,
+    resolve_legacy_category,
+)
+
+
+def _reference_classify(domain, title, url):
+    """The original nested-loop matcher from api/pipeline.py"""
+    domain_lower = (domain or '').lower()
+    title_lower = (title or '').lower()
+    url_lower = (url or '').lower()
+    combined_text = f"{domain_lower} {title_lower} {url_lower}"
+    for category, patterns in CATEGORY_PATTERNS.items():
+        if any(pattern in domain_lower for pattern in patterns):
+            return category
+    for category, patterns in CATEGORY_PATTERNS.items():
+        if any(pattern in title_lower or pattern in url_lower for pattern in patterns):
+            return category
+    for category, patterns in CATEGORY_PATTERNS.items():
+        if any(pattern in combined_text for pattern in patterns):
+            return category
+    return None
+
+
+@pytest.mark.parametrize("domain,title,url", [
+    ("citymuseum.org", None, None),
+    ("example.com", "Smart Home Reviews", "https://example.com/"),
+    ("kidsblog.net", "Home Decor for kids", None),
+    ("randomsite.io", "Welcome", "https://randomsite.io/about"),
+    ("fur-parents.co", "Dog and cat owners", None),
+    ("example.com", "fur", "parent"),  # only matches across the combined text
+    (None, None, None),
+])
+def test_classify_matches_reference(domain, title, url):
+    assert classify_category(domain, title, url) == _reference_classify(domain, title, url)
+
+
+def test_resolve_legacy_category():
+    assert resolve_legacy_category("tech_blog") == (True, "Home Tech")
+    assert resolve_legacy_category("  TECH_BLOG ") == (True, "Home Tech")
+    assert resolve_legacy_category("Unknown") == (True, None)
+    assert resolve_legacy_category("something else") == (False, None)
+
+
+async def _run_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__)
+
+        # Same as the app's session factory
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            job = Job(job_type="discover", status="completed")
+            db.add(job)
+            await db.flush()
+            query = DiscoveryQuery(job_id=job.id, keyword="art", location="usa", category="Art Lovers")
+            db.add(query)
+            await db.flush()
+            inherited, shared, sibling, keyword, unmatched, legacy = (uuid.uuid4() for _ in range(6))
+            db.add_all([
+                Prospect(id=inherited, domain="gallery.com", discovery_query_id=query.id, discovery_category="N/A"),
+                Prospect(id=shared, domain="shared.com", discovery_category="Parenting"),
+                Prospect(id=sibling, domain="shared.com", discovery_category="Unknown"),
+                Prospect(id=keyword, domain="nftdrops.io", discovery_category=" "),
+                Prospect(id=unmatched, domain="plain.com", page_title="Welcome"),
+                Prospect(id=legacy, domain="legacy.com", discovery_category="tech_blog"),
+            ])
+            await db.commit()
+
+            progress = Job(job_type="categorize", status="running")
+            db.add(progress)
+            await db.commit()
+
+            # Chunk size 1 exercises keyset pagination past unmatched rows
+            stats = await categorize_prospects(db, job=progress, chunk_size=1)
+            assert stats["inherited"] == 1
+            assert stats["propagated"] == 1
+            assert stats["classified"] == 1
+            assert stats["unmatched"] == 1
+            assert stats["categorized"] == 3
+            assert progress.total_targets == 2
+            assert progress.result["scanned"] == 2
+
+            categories = dict((await db.execute(
+                text("SELECT id, discovery_category FROM prospects")
+            )).all())
+            assert categories[inherited] == "Art Lovers"
+            assert categories[sibling] == "Parenting"
+            assert categories[keyword] == "NFTs"
+            assert categories[unmatched] is None
+            assert categories[legacy] == "tech_blog"
+
+            migrated = await migrate_legacy_categories(db)
+            assert migrated["mapped"] == 1
+            assert migrated["changes"] == {"tech_blog": {"to": "Home Tech", "count": 1}}
+            category = (await db.execute(
+                text("SELECT discovery_category FROM prospects WHERE id = :id"), {"id": legacy}
+            )).scalar()
+            assert category == "Home Tech"
+    finally:
+        await scoped.dispose()
+
+
+def test_categorize_prospects_set_based(pg_schema):
+    asyncio.run(_run_scenario(pg_schema))
+
+
+async def _run_task(pg_schema, monkeypatch):
+    scoped = pg_schema.engine()
+    sessions = async_sessionmaker(scoped, expire_on_commit=False)
+    monkeypatch.setattr(categorization_task, "AsyncSessionLocal", sessions)
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__)
+        async with sessions() as db:
+            db.add_all([
+                Prospect(domain="legacy.com", discovery_category="tech_blog"),
+                Prospect(domain="nftdrops.io", discovery_category="Unknown"),
+            ])
+            job = Job(job_type="categorize", params={"migrate": True}, status="pending")
+            db.add(job)
+            await db.commit()
+
+        await categorization_task.categorize_prospects_async(str(job.id))
+
+        async with sessions() as db:
+            finished = await db.get(Job, job.id)
+            categories = sorted((await db.execute(text("SELECT discovery_category FROM prospects"))).scalars())
+        return finished, categories
+    finally:
+        await scoped.dispose()
+
+
+def test_categorize_task_records_result_on_job(pg_schema, monkeypatch):
+    job, categories = asyncio.run(_run_task(pg_schema, monkeypatch))
+
+    assert job.status == "completed"
+    assert job.result["mapped"] == 1
+    assert job.result["classified"] == 1
+    assert job.result["category_mapping"]["tech_blog"] == {"to": "Home Tech", "count": 1}
+    assert categories == ["Home Tech", "NFTs"]
+
@@ -0,0 +1,139 @@
+"""
+Tests for the crawl politeness scheduler (mock transport, no network)
+"""
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from app.services.crawl_scheduler import CrawlScheduler, parse_retry_after
+from app.services.exceptions import CrawlDisallowed, UnsupportedContent
+
+
+def _scheduler(handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    kwargs.setdefault("host_delay", 0.0)
+    return CrawlScheduler(client=client, resolve=False, **kwargs)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    now = time.time()
+    assert parse_retry_after(formatdate(now + 30, usegmt=True), now=now) == pytest.approx(30, abs=1)
+
+
+def test_robots_rules_are_cached_and_enforced():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /private\n")
+        return httpx.Response(200, text="ok")
+
+    async def scenario():
+        scheduler = _scheduler(handler)
+        assert (await scheduler.fetch("https://a.com/")).text == "ok"
+        assert (await scheduler.fetch("https://a.com/contact")).status_code == 200
+        with pytest.raises(CrawlDisallowed):
+            await scheduler.fetch("https://a.com/private/page")
+        await scheduler.close()
+        return scheduler.stats
+
+    stats = asyncio.run(scenario())
+    assert seen == ["/robots.txt", "/", "/contact"]
+    assert stats["robots_blocked"] == 1
+
+
+def test_per_host_slots_and_crawl_delay():
+    active = {}
+    peak = {}
+    starts = []
+
+    async def handler(request):
+        host = request.url.host
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nCrawl-delay: 1\n" if host == "slow.com" else "")
+        starts.append((host, time.monotonic()))
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(200)
+
+    async def scenario():
+        scheduler = _scheduler(handler, per_host=1)
+        urls = [f"https://{host}/{i}" for host in ("slow.com", "fast.com") for i in range(2)]
+        await asyncio.gather(*(scheduler.fetch(url) for url in urls))
+        await scheduler.close()
+
+    asyncio.run(scenario())
+    assert peak == {"slow.com": 1, "fast.com": 1}
+    slow = [at for host, at in starts if host == "slow.com"]
+    # Crawl-delay (whole seconds, as urllib.robotparser reads it) spaces the requests to slow.com
+    assert all(b - a >= 0.95 for a, b in zip(slow, slow[1:]))
+
+
+def test_retry_after_backoff_then_success():
+    calls = []
+
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, text="done")
+
+    async def scenario():
+        scheduler = _scheduler(handler)
+        response = await scheduler.fetch("https://busy.com/")
+        await scheduler.close()
+        return response, scheduler.stats
+
+    response, stats = asyncio.run(scenario())
+    assert response.text == "done"
+    assert stats["retries"] == 1 and len(calls) == 2
+
+
+def test_fetch_html_streams_with_guards():
+    served = {"pdf": 0, "big": 0}
+
+    def chunks(kind, count, chunk=b"<p>" + b"x" * 1021):
+        async def body():
+            for _ in range(count):
+                served[kind] += 1
+                yield chunk
+        return body()
+
+    def handler(request):
+        path = request.url.path
+        if path == "/robots.txt":
+            return httpx.Response(404)
+        if path == "/brochure.pdf":
+            return httpx.Response(200, headers={"content-type": "application/pdf"}, content=chunks("pdf", 100))
+        if path == "/big":
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=chunks("big", 100))
+        html = '<html><head><meta charset="iso-8859-1"></head><body>Café contact@a.com</body></html>'
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=html.encode("latin-1"))
+
+    async def scenario():
+        scheduler = _scheduler(handler)
+        with pytest.raises(UnsupportedContent):
+            await scheduler.fetch_html("https://a.com/brochure.pdf")
+        big = await scheduler.fetch_html("https://a.com/big", max_bytes=4096)
+        page = await scheduler.fetch_html("https://a.com/")
+        await scheduler.close()
+        return big, page, scheduler.stats
+
+    big, page, stats = asyncio.run(scenario())
+    # The PDF body is never read; the big page stops at the cap and keeps its partial text
+    assert served["pdf"] == 0
+    assert big.truncated and big.bytes_read == 4096 and served["big"] < 10
+    assert big.text.startswith("<p>xxx")
+    assert page.encoding == "iso8859-1" and "Café contact@a.com" in page.text and not page.truncated
+    assert stats["non_html_aborted"] == 1 and stats["truncated"] == 1
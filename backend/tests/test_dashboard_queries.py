@@ -0,0 +1,113 @@
+"""
+Query-count and query-plan regression tests for the dashboard endpoints.
+
+Seeds 100k prospects (fakes/dataset.py) in a throwaway schema, calls
+each dashboard endpoint in-process and checks:
+- the number of SQL statements per request stays within its budget
+- the count does not grow with the page size (no N+1 per row)
+- no page query (the statements with a LIMIT) seq-scans prospects or
+  prospect_payloads; full-table counts may, they read most rows anyway
+
+Latency under concurrency is measured by scripts/loadtest_dashboard.py.
+
+Requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.database import get_db, get_read_db
+from app.main import app
+from app.models.discovery_query import DiscoveryQuery
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.models.prospect_payload import ProspectPayload
+from app.utils.query_counter import count_queries
+from fakes.dataset import seed_prospects
+
+SEED_ROWS = 100_000
+
+# Statements per request; lower a budget when an endpoint gets cheaper
+STATEMENT_BUDGETS = {
+    "/api/pipeline/status": 15,
+    "/api/prospects": 2,
+    "/api/prospects/leads": 2,
+    "/api/prospects/scraped-emails": 2,
+    "/api/social/profiles": 2,
+    "/api/social/stats": 23,
+}
+PAGED = ["/api/prospects", "/api/prospects/leads", "/api/prospects/scraped-emails", "/api/social/profiles"]
+SCANNED_TABLES = ("prospects", "prospect_payloads")
+
+
+async def _seq_scans(conn, queries):
+    """Seq Scan plan lines of the captured page queries"""
+    found = []
+    for statement, parameters in zip(queries.statements, queries.parameters):
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")) or "LIMIT" not in statement.upper():
+            continue
+        plan = [row[0] for row in await conn.exec_driver_sql("EXPLAIN " + statement, parameters)]
+        found += [line.strip() for line in plan if any(f"Seq Scan on {t} " in line for t in SCANNED_TABLES)]
+    return found
+
+
+async def _measure(pg_schema):
+    scoped = pg_schema.engine()
+    session_factory = async_sessionmaker(scoped, expire_on_commit=False)
+
+    async def scoped_db():
+        async with session_factory() as session:
+            yield session
+
+    results = {}
+    try:
+        await pg_schema.create_tables(
+            scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, ProspectPayload.__table__
+        )
+        async with scoped.begin() as conn:
+            await conn.run_sync(seed_prospects, SEED_ROWS)
+
+        app.dependency_overrides[get_db] = scoped_db
+        app.dependency_overrides[get_read_db] = scoped_db
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://dashboard.test") as client:
+            for path in STATEMENT_BUDGETS:
+                for limit in (10, 50) if path in PAGED else (None,):
+                    with count_queries(keep_statements=True) as queries:
+                        response = await client.get(path, params={"limit": limit} if limit else None)
+                    async with scoped.connect() as conn:
+                        scans = await _seq_scans(conn, queries)
+                    results[(path, limit)] = (response.status_code, queries, scans)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await scoped.dispose()
+    return results
+
+
+@pytest.fixture(scope="module")
+def measured(module_pg_schema):
+    return asyncio.run(_measure(module_pg_schema))
+
+
+@pytest.mark.parametrize("path", list(STATEMENT_BUDGETS))
+def test_dashboard_statement_budget(measured, path):
+    for (measured_path, _), (status, queries, _) in measured.items():
+        if measured_path != path:
+            continue
+        assert status == 200
+        assert queries.total <= STATEMENT_BUDGETS[path], "\n\n".join(queries.statements)
+
+
+@pytest.mark.parametrize("path", PAGED)
+def test_dashboard_no_n_plus_one(measured, path):
+    small, large = measured[(path, 10)][1], measured[(path, 50)][1]
+    assert small.snapshot() == large.snapshot()
+
+
+@pytest.mark.parametrize("path", list(STATEMENT_BUDGETS))
+def test_dashboard_page_queries_use_indexes(measured, path):
+    for (measured_path, _), (_, _, scans) in measured.items():
+        if measured_path == path:
+            assert scans == []
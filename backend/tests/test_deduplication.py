@@ -0,0 +1,97 @@
+"""
+Tests for set-based prospect deduplication.
+
+The end-to-end test requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.discovery_query import DiscoveryQuery
+from app.models.email_attachment import EmailAttachment
+from app.models.email_log import EmailLog
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.models.prospect_payload import ProspectPayload
+from app.services.deduplication import MERGE_COLUMNS, deduplicate_prospects_by_domain
+
+
+def test_merge_columns_exist_on_prospect():
+    columns = set(Prospect.__table__.columns.keys())
+    assert set(MERGE_COLUMNS) <= columns
+
+
+async def _run_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(
+            scoped,
+            Job.__table__, DiscoveryQuery.__table__, Prospect.__table__,
+            ProspectPayload.__table__, EmailLog.__table__, EmailAttachment.__table__,
+        )
+
+        now = datetime.now(timezone.utc)
+        survivor_id, stale_id, dup_id, unique_id = (uuid.uuid4() for _ in range(4))
+        async with AsyncSession(scoped) as db:
+            db.add_all([
+                # Has email -> survivor, even though it is older
+                Prospect(id=survivor_id, domain="Acme.com", contact_email="info@acme.com",
+                         updated_at=now - timedelta(days=3), da_est=20,
+                         payloads=ProspectPayload(dataforseo_payload={"description": "kept"})),
+                # Newer but no email; carries category + payload to merge
+                Prospect(id=stale_id, domain="acme.com", discovery_category="Museum",
+                         payloads=ProspectPayload(snov_payload={"emails": []}, dataforseo_payload={"description": "lost"}),
+                         updated_at=now, da_est=45),
+                Prospect(id=dup_id, domain="ACME.COM", discovery_category="Gallery",
+                         updated_at=now - timedelta(days=1)),
+                Prospect(id=unique_id, domain="solo.org"),
+            ])
+            await db.flush()
+            db.add(EmailLog(prospect_id=stale_id, subject="hi", body="hello"))
+            await db.commit()
+
+            preview = await deduplicate_prospects_by_domain(db, dry_run=True)
+            assert preview["duplicates_found"] == 2
+            assert preview["domains"] == 1
+            assert preview["deleted"] == 0
+
+            stats = await deduplicate_prospects_by_domain(db, batch_domains=1)
+            assert stats["deleted"] == 2
+            assert stats["merged"] == 1
+            assert stats["merged_payloads"] == 1
+            assert stats["moved_email_logs"] == 1
+
+            remaining = (await db.execute(text("SELECT id FROM prospects"))).scalars().all()
+            assert set(remaining) == {survivor_id, unique_id}
+
+            survivor = (await db.execute(
+                text(
+                    "SELECT contact_email, discovery_category, snov_payload, dataforseo_payload, da_est "
+                    "FROM prospects JOIN prospect_payloads ON prospect_id = id WHERE id = :id"
+                ),
+                {"id": survivor_id},
+            )).one()
+            assert survivor.contact_email == "info@acme.com"
+            # Best-ranked loser (most recently updated) wins the merge
+            assert survivor.discovery_category == "Museum"
+            assert survivor.snov_payload == {"emails": []}
+            assert survivor.dataforseo_payload == {"description": "kept"}
+            # The losers' payload rows are gone with them
+            payload_owners = (await db.execute(text("SELECT prospect_id FROM prospect_payloads"))).scalars().all()
+            assert payload_owners == [survivor_id]
+            assert float(survivor.da_est) == 45.0
+
+            log_owner = (await db.execute(text("SELECT prospect_id FROM email_logs"))).scalar()
+            assert log_owner == survivor_id
+
+            again = await deduplicate_prospects_by_domain(db)
+            assert again["deleted"] == 0
+    finally:
+        await scoped.dispose()
+
+
+def test_deduplicate_merges_and_deletes(pg_schema):
+    asyncio.run(_run_scenario(pg_schema))
@@ -0,0 +1,65 @@
+"""
+Tests for the DNS / MX preflight against the local stub DNS server
+(fakes/dns_server.py: UDP on 127.0.0.1, answers built with dnspython; no network).
+"""
+import asyncio
+import time
+
+from app.services.dns_preflight import DnsPreflight
+from fakes.dns_server import FakeDnsServer
+
+# Names in the zone exist (NOERROR with an empty answer for other types); anything else is NXDOMAIN
+ZONE = {
+    ("gallery.com", "A"): ["203.0.113.10"],
+    ("gallery.com", "MX"): ["10 mail.gallery.com."],
+    ("parked.com", "A"): ["203.0.113.20"],
+    ("nullmx.com", "A"): ["203.0.113.30"],
+    ("nullmx.com", "MX"): ["0 ."],
+    ("mailonly.com", "MX"): ["10 mx.mailonly.com."],
+}
+
+
+async def _with_server(scenario):
+    server = await FakeDnsServer(ZONE).start()
+    try:
+        preflight = DnsPreflight(nameservers=["127.0.0.1"], port=server.port, timeout=2.0)
+        return await scenario(preflight, server)
+    finally:
+        server.close()
+
+
+def test_domains_are_classified():
+    async def scenario(preflight, server):
+        return await preflight.check_many(["gallery.com", "parked.com", "nullmx.com", "mailonly.com", "expired.com"])
+
+    results = asyncio.run(_with_server(scenario))
+    assert {domain: r.status for domain, r in results.items()} == {
+        "gallery.com": "ok",
+        "parked.com": "no_mx",
+        "nullmx.com": "no_mx",
+        "mailonly.com": "no_address",
+        "expired.com": "nxdomain",
+    }
+    assert results["gallery.com"].addresses == ["203.0.113.10"]
+    assert results["gallery.com"].mx == ["mail.gallery.com"]
+    assert results["mailonly.com"].is_dead and results["mailonly.com"].accepts_mail
+    assert results["expired.com"].is_dead and results["expired.com"].accepts_mail is False
+    assert not results["parked.com"].is_dead and results["parked.com"].accepts_mail is False
+
+
+def test_answers_are_cached_and_shared():
+    async def scenario(preflight, server):
+        started = time.monotonic()
+        first = await asyncio.gather(*(preflight.check("expired.com") for _ in range(5)))
+        elapsed = time.monotonic() - started
+        queries_after_first = len(server.queries)
+        again = await preflight.check("Expired.com.")
+        return first, again, elapsed, queries_after_first, len(server.queries), preflight.stats
+
+    first, again, elapsed, queries_after_first, queries_total, stats = asyncio.run(_with_server(scenario))
+    assert all(r.status == "nxdomain" for r in first) and again.status == "nxdomain"
+    # One A/AAAA/MX round for five concurrent callers; the repeat is served from the cache
+    assert queries_after_first == queries_total == 3
+    assert stats == {"lookups": 1, "cache_hits": 1}
+    # A dead domain costs milliseconds, not connect timeouts
+    assert elapsed < 1.0
@@ -0,0 +1,119 @@
+"""
+Accuracy tests for the single-pass email extraction engine
+
+Throughput on a ~1MB page: scripts/benchmark_email_extraction.py
+"""
+import json
+from pathlib import Path
+
+import pytest
+from app.utils.email_extraction import (
+    decode_cfemail,
+    decode_obfuscations,
+    extract_emails_with_priority,
+)
+
+
+CORPUS_PATH = Path(__file__).parent / "fixtures" / "email_corpus.json"
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("case", load_corpus(), ids=lambda case: case["name"])
+def test_corpus_case(case):
+    """Each corpus page yields exactly the expected emails, best one first"""
+    results = extract_emails_with_priority(case["html"], case["domain"])
+    found = [email for email, _ in results]
+
+    assert set(found) == set(case["expected"]), f"{case['name']}: got {found}"
+    if case["best"]:
+        assert found[0] == case["best"]
+    else:
+        assert found == []
+
+
+def test_corpus_precision_and_recall():
+    """Aggregate accuracy over the whole corpus"""
+    true_positives = false_positives = false_negatives = 0
+    for case in load_corpus():
+        found = {email for email, _ in extract_emails_with_priority(case["html"], case["domain"])}
+        expected = set(case["expected"])
+        true_positives += len(found & expected)
+        false_positives += len(found - expected)
+        false_negatives += len(expected - found)
+
+    precision = true_positives / max(true_positives + false_positives, 1)
+    recall = true_positives / max(true_positives + false_negatives, 1)
+    assert precision == 1.0, f"precision={precision:.2f}"
+    assert recall == 1.0, f"recall={recall:.2f}"
+
+
+def test_priority_scoring():
+    """Priority scores match the original enrichment extractor"""
+    html = (
+        '<a href="mailto:owner@acme.com">x</a>'
+        '<a href="mailto:agent@other.com">y</a>'
+        "info@acme.com jane@acme.com support@other.com bob@other.com"
+    )
+    results = dict(extract_emails_with_priority(html, "acme.com"))
+
+    assert results == {
+        "owner@acme.com": 100,
+        "agent@other.com": 90,
+        "info@acme.com": 80,
+        "jane@acme.com": 70,
+        "support@other.com": 60,
+        "bob@other.com": 50,
+    }
+
+
+def test_results_are_deduplicated_and_sorted():
+    html = "Info@Acme.com info@acme.com <a href='mailto:INFO@acme.com'>mail</a>"
+    results = extract_emails_with_priority(html, "acme.com")
+    assert results == [("info@acme.com", 100)]
+
+
+def test_decode_cfemail():
+    assert decode_cfemail("422a272e2e2d02313637262b2d6f233036276c212d2f") == "hello@studio-arte.com"
+    assert decode_cfemail("not-hex") == ""
+    assert decode_cfemail("42") == ""
+
+
+def test_decode_leaves_non_email_entities_alone():
+    """Only entities for email characters are decoded"""
+    decoded = decode_obfuscations("a&#160;b &amp; c&#64;d")
+    assert decoded == "a&#160;b &amp; c@d"
+
+
+def test_empty_input():
+    assert extract_emails_with_priority("") == []
+    assert extract_emails_with_priority(None) == []
+
+
+def test_encoded_mailto_colon_keeps_mailto_priority():
+    """mailto&#58; / mailto&colon; decode to mailto: like a plain link"""
+    html = '<a href="mailto&#58;owner@acme.com">x</a><a href="mailto&colon;sales@acme.com">y</a>'
+    assert dict(extract_emails_with_priority(html, "acme.com")) == {
+        "owner@acme.com": 100,
+        "sales@acme.com": 100,
+    }
+
+
+def test_large_page_finds_every_corpus_email():
+    """All corpus pages concatenated with markup noise still yield every expected email"""
+    filler = (
+        '<div class="card"><img src="/assets/hero@2x.png" alt="">'
+        "<p>Follow @studio on social. Prices from $100 (at) launch.</p></div>\n"
+    )
+    corpus = load_corpus()
+    page = "".join(case["html"] + filler for case in corpus) * 3
+    expected = {email for case in corpus for email in case["expected"]}
+
+    assert {email for email, _ in extract_emails_with_priority(page)} == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
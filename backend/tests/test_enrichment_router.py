@@ -0,0 +1,119 @@
+"""
+Unit tests for the enrichment provider router and the routed enrich_prospect_email
+"""
+import asyncio
+import random
+
+import pytest
+
+from app.services import enrichment, enrichment_router
+from app.services.dns_preflight import OK, DomainDns
+from app.services.enrichment_router import HUNTER, SCRAPE, SNOV, EnrichmentRouter
+from app.services.provider_state import get_provider_state
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    for name in ("SNOV_USER_ID", "SNOV_SECRET", "HUNTER_IO_API_KEY"):
+        monkeypatch.setenv(name, "test")
+
+
+def _router():
+    # random() of Random(0) starts at 0.84: no exploration in these tests
+    return EnrichmentRouter(providers=[SCRAPE, SNOV, HUNTER], rng=random.Random(0))
+
+
+def test_default_order_without_history():
+    """Priors keep the old order: scraping (free) before the credit-based providers"""
+    plan = asyncio.run(_router().plan("gallery.com", "Art Gallery"))
+    assert plan.order == [SCRAPE, SNOV, HUNTER]
+    assert plan.skipped == {}
+    assert plan.segments == ["category:art gallery", "tld:com"]
+
+
+def test_unconfigured_provider_is_skipped(monkeypatch):
+    monkeypatch.delenv("HUNTER_IO_API_KEY")
+    plan = asyncio.run(_router().plan("gallery.com"))
+    assert plan.order == [SCRAPE, SNOV]
+    assert plan.skipped == {HUNTER: "not_configured"}
+
+
+def test_history_skips_provider_only_in_its_segment():
+    router = _router()
+    for i in range(enrichment_router.ROUTER_MIN_SAMPLES):
+        router.record(SCRAPE, f"museum{i}.org", "Museum", found=False, seconds=8.0)
+
+    museum = asyncio.run(router.plan("new-museum.org", "Museum"))
+    assert SCRAPE not in museum.order
+    assert museum.skipped[SCRAPE] == "low_hit_rate"
+
+    # Elsewhere scraping is only demoted by the lower overall hit rate
+    gallery = asyncio.run(router.plan("gallery.com", "Art Gallery"))
+    assert gallery.order == [SNOV, HUNTER, SCRAPE]
+
+
+def test_fast_accurate_provider_moves_first():
+    router = _router()
+    for i in range(30):
+        router.record(SCRAPE, f"site{i}.com", None, found=i % 5 == 0, seconds=10.0)
+        router.record(SNOV, f"site{i}.com", None, found=i % 10 != 0, seconds=0.5)
+    plan = asyncio.run(router.plan("studio.com"))
+    assert plan.order[:2] == [SNOV, SCRAPE]
+    assert plan.estimates[SNOV]["cost_per_email"] < plan.estimates[SCRAPE]["cost_per_email"]
+    assert plan.estimates[SCRAPE]["p95_s"] == 10.0
+
+
+def test_restricted_and_exhausted_providers_are_skipped(monkeypatch):
+    monkeypatch.setitem(enrichment_router.DAILY_CREDITS, SNOV, 2)
+    router = _router()
+    router.record(SNOV, "a.com", None, found=True, seconds=1.0)
+    router.record(SNOV, "b.com", None, found=True, seconds=1.0)
+
+    async def scenario():
+        await get_provider_state().set_restricted(HUNTER, 60)
+        try:
+            return await router.plan("c.com")
+        finally:
+            await get_provider_state().clear_restriction(HUNTER)
+
+    plan = asyncio.run(scenario())
+    assert plan.order == [SCRAPE]
+    assert plan.skipped == {SNOV: "quota_exhausted", HUNTER: "restricted"}
+    assert router.credits_spent(SNOV) == 2
+
+
+def test_enrichment_stops_at_first_hit_and_records_routing(monkeypatch):
+    router = _router()
+    calls = []
+
+    class Preflight:
+        async def check(self, domain):
+            return DomainDns(domain, OK, ["127.0.0.1"], ["mail." + domain])
+
+    async def scrape(domain, page_url):
+        calls.append(SCRAPE)
+        return {"emails": [], "emails_by_page": {}, "pages_crawled": [f"https://{domain}"]}
+
+    async def snov(domain):
+        calls.append(SNOV)
+        return {"emails": [f"hello@{domain}"], "rejected": 1}
+
+    async def hunter(domain):
+        calls.append(HUNTER)
+        return {"emails": [], "rejected": 0}
+
+    monkeypatch.setattr(enrichment, "get_dns_preflight", lambda: Preflight())
+    monkeypatch.setattr(enrichment, "get_enrichment_router", lambda: router)
+    monkeypatch.setattr(enrichment, "_find_by_scraping", scrape)
+    monkeypatch.setattr(enrichment, "_find_by_snov", snov)
+    monkeypatch.setattr(enrichment, "_find_by_hunter", hunter)
+
+    result = asyncio.run(enrichment.enrich_prospect_email("https://www.Studio.com/", category="Art Studio"))
+
+    assert calls == [SCRAPE, SNOV]
+    assert result["primary_email"] == "hello@studio.com"
+    assert result["source"] == "snov_website"
+    assert (result["snov_emails_accepted"], result["snov_emails_rejected"]) == (1, 1)
+    assert result["routing"]["order"] == [SCRAPE, SNOV, HUNTER]
+    assert [a["provider"] for a in result["routing"]["attempts"]] == [SCRAPE, SNOV]
+    assert router.estimate(SNOV, ["category:art studio"])["attempts"] == 1
@@ -0,0 +1,82 @@
+"""
+Tests for streamed Gemini responses: the incremental JSON parser used by
+/compose/stream and GeminiClient.stream_generate (against a mock transport).
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.clients import gemini
+from app.utils.json_stream import JsonObjectStream
+
+
+def _feed_in_pieces(text, size):
+    stream = JsonObjectStream()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(stream.feed(text[start:start + size]))
+    return stream, events
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_subject_streams_before_body(size):
+    document = {"subject": 'Say "hi" 🎨', "body": "Line one\nLine two \\ end", "score": [1, {"x": "}"}]}
+    stream, events = _feed_in_pieces("```json\n" + json.dumps(document) + "\n```", size)
+
+    assert stream.complete
+    assert stream.values == document
+    ends = [(key, value) for kind, key, value in events if kind == "end"]
+    assert [key for key, _ in ends] == ["subject", "body", "score"]
+    subject = "".join(value for kind, key, value in events if kind == "delta" and key == "subject")
+    assert subject == document["subject"]
+    # Every subject delta precedes the first body delta
+    kinds = [key for kind, key, _ in events if kind == "delta"]
+    assert kinds.index("body") > max(i for i, key in enumerate(kinds) if key == "subject")
+
+
+def test_partial_value_is_reported_before_the_object_closes():
+    stream = JsonObjectStream()
+    assert stream.feed('{"subject": "Hel') == [("delta", "subject", "Hel")]
+    assert stream.feed('lo", "bo') == [("delta", "subject", "lo"), ("end", "subject", "Hello")]
+    assert not stream.complete
+
+
+def test_stream_generate_yields_text_fragments(monkeypatch):
+    chunks = ['{"subject": "Hi', '", "body": "There"}']
+
+    def handler(request):
+        assert ":streamGenerateContent" in request.url.path
+        assert request.url.params["alt"] == "sse"
+        body = "".join(
+            f"data: {json.dumps({'candidates': [{'content': {'parts': [{'text': chunk}]}}]})}\r\n\r\n"
+            for chunk in chunks
+        )
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        gemini.httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+
+    async def scenario():
+        client = gemini.GeminiClient(api_key="test-key")
+        return [fragment async for fragment in client.stream_generate({"contents": []})]
+
+    assert asyncio.run(scenario()) == chunks
+
+
+def test_stream_generate_raises_http_errors(monkeypatch):
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        gemini.httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(lambda request: httpx.Response(400, text="bad")), **kwargs),
+    )
+
+    async def scenario():
+        client = gemini.GeminiClient(api_key="test-key")
+        return [fragment async for fragment in client.stream_generate({"contents": []})]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scenario())
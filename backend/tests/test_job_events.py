@@ -0,0 +1,80 @@
+"""
+Tests for push-based job progress events (session hook, broker, LISTEN fan-out).
+
+Require PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import json
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.services.job_events import JOB_EVENTS_CHANNEL, JobEventListener, broker, format_sse
+
+
+def _drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+async def _run_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    listener = JobEventListener(broker, engine=scoped)
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__)
+
+        job_id = uuid.uuid4()
+        queue = broker.subscribe(str(job_id))
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            job = Job(id=job_id, job_type="draft", status="running")
+            db.add(job)
+            await db.commit()
+            assert [e["status"] for e in _drain(queue)] == ["running"]
+
+            # Progress committed -> one event with the scalar counters only
+            job.result = {"drafted": 3, "failed": 1, "total": 10, "prospect_ids": ["a", "b"]}
+            job.drafts_created = 3
+            await db.commit()
+            [progress] = _drain(queue)
+            assert progress["type"] == "progress"
+            assert progress["counts"] == {"drafted": 3, "failed": 1, "total": 10}
+            assert progress["drafts_created"] == 3
+
+            # Rolled back progress is never published; unrelated changes are not events
+            job.status = "failed"
+            await db.flush()
+            await db.rollback()
+            job.params = {"auto_mode": True}
+            await db.commit()
+            assert _drain(queue) == []
+
+            # Events from other processes arrive through LISTEN/NOTIFY
+            listener.ensure_started()
+            await asyncio.wait_for(listener.listening.wait(), 5)
+            foreign = {"type": "end", "job_id": str(job_id), "status": "completed", "origin": "other-worker"}
+            await db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": JOB_EVENTS_CHANNEL, "payload": json.dumps(foreign)},
+            )
+            # Our own commits are delivered once, not again via the listener
+            job.status = "completed"
+            await db.commit()
+            received = [await asyncio.wait_for(queue.get(), 5) for _ in range(2)]
+            await asyncio.sleep(0.2)
+            assert _drain(queue) == []
+            assert sorted(e["status"] for e in received) == ["completed", "completed"]
+            assert all("origin" not in e for e in received)
+            assert format_sse(received[0]).startswith("event: end\ndata: {")
+        broker.unsubscribe(str(job_id), queue)
+        assert broker.subscriber_count(str(job_id)) == 0
+    finally:
+        await listener.stop()
+        await scoped.dispose()
+
+
+def test_job_events_published_on_commit(pg_schema):
+    asyncio.run(_run_scenario(pg_schema))
@@ -0,0 +1,77 @@
+"""
+Tests for the compiled keyword matcher and the SERP intent classifier built on it
+"""
+import random
+
+import pytest
+from app.services.serp_intent import INTENT_KEYWORDS, infer_serp_intent, infer_serp_intents
+from app.utils.keyword_matcher import AHOCORASICK_AVAILABLE, KeywordMatcher
+
+# The regex fallback always runs; the automaton only when pyahocorasick is installed
+BACKENDS = [False] + ([True] if AHOCORASICK_AVAILABLE else [])
+
+
+def _naive_found(groups, text):
+    return {kw for keywords in groups.values() for kw in keywords if kw in text}
+
+
+@pytest.mark.parametrize("use_automaton", BACKENDS)
+def test_found_matches_substring_scan(use_automaton):
+    """Same hits as `kw in text`, including overlapping and nested keywords"""
+    matcher = KeywordMatcher(INTENT_KEYWORDS, use_automaton=use_automaton)
+    vocabulary = [kw for keywords in INTENT_KEYWORDS.values() for kw in keywords] + ["x", " ", "s"]
+    rng = random.Random(7)
+    for _ in range(500):
+        text = "".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8)))
+        assert matcher.found(text) == _naive_found(INTENT_KEYWORDS, text)
+
+
+@pytest.mark.parametrize("use_automaton", BACKENDS)
+def test_found_many_does_not_match_across_texts(use_automaton):
+    matcher = KeywordMatcher({"g": ["ab", "shop"]}, use_automaton=use_automaton)
+    assert matcher.found_many(["a", "b", "sh", "op", "shop"]) == [set(), set(), set(), set(), {"shop"}]
+    assert matcher.found_many([]) == []
+
+
+def test_first_group_respects_order():
+    matcher = KeywordMatcher({"museum": ["museum"], "art": ["art"]})
+    assert matcher.first_group("art museum") == "museum"
+    assert matcher.first_group("art museum", order=["art", "museum"]) == "art"
+    assert matcher.first_group("art museum", order=["unknown"]) is None
+    assert matcher.first_group("nothing here") is None
+
+
+def test_matches_keep_declared_order():
+    matcher = KeywordMatcher(INTENT_KEYWORDS)
+    hits = matcher.found("our team of professional services experts")
+    assert matcher.matches(hits, "service") == ["services", "service", "team", "professional", "experts"]
+    assert matcher.grouped(hits)["service"] == matcher.matches(hits, "service")
+    assert matcher.grouped(hits)["brand"] == ["our team"]
+
+
+def test_serp_intent_signals():
+    result = infer_serp_intent(
+        url="https://acme.com/blog/post",
+        title="Acme Design Studio - Our Team",
+        snippet="Professional services and tips",
+        category="Art Lovers",
+    )
+    assert result["intent"] == "service"
+    assert result["signals"] == [
+        "service_keyword:services", "service_keyword:service", "service_keyword:studio",
+        "brand_keyword:our team", "blog_keyword:tips", "url_path:blog",
+    ]
+    assert infer_serp_intent("https://www.youtube.com/watch", "Video", None, "")["intent"] == "platform"
+    assert infer_serp_intent("https://plain.org", "", None, "")["signals"] == ["no_signals"]
+
+
+def test_batch_matches_single_calls():
+    page = [
+        {"url": "https://shop.example.com/store/", "title": "Buy prints", "description": "Add to cart"},
+        {"url": "https://news.example.com/press/x", "title": "Art Journal", "description": None},
+        {"url": "https://example.com", "title": None, "description": "Welcome to our company"},
+    ]
+    expected = [
+        infer_serp_intent(item["url"], item["title"], item["description"], "Art Lovers") for item in page
+    ]
+    assert infer_serp_intents(page, "Art Lovers") == expected
@@ -0,0 +1,80 @@
+"""
+Tests for the pipeline instrumentation layer and its Prometheus export
+"""
+import asyncio
+
+import pytest
+
+from app.services.exceptions import RateLimitError
+from app.utils import metrics
+from app.utils.metrics import instrument, render_prometheus, span, start_job_timings
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def test_provider_calls_counted_and_timed():
+    @instrument("snov.domain_search", provider="snov")
+    async def call(outcome):
+        if outcome == "raise":
+            raise RateLimitError(provider="snov", message="429")
+        return {"success": outcome == "ok"}
+
+    async def scenario():
+        await call("ok")
+        await call("fail")
+        with pytest.raises(RateLimitError):
+            await call("raise")
+
+    asyncio.run(scenario())
+    text = render_prometheus()
+    assert 'provider_requests_total{provider="snov"} 3' in text
+    assert 'provider_errors_total{provider="snov",reason="unsuccessful"} 1' in text
+    assert 'provider_errors_total{provider="snov",reason="rate_limited"} 1' in text
+    assert 'pipeline_stage_errors_total{stage="snov.domain_search"} 1' in text
+    assert 'pipeline_stage_seconds_count{stage="snov.domain_search"} 3' in text
+    assert 'pipeline_stage_seconds_bucket{stage="snov.domain_search",le="+Inf"} 3' in text
+
+
+def test_job_timings_collect_spans_from_child_tasks():
+    async def fetch():
+        with span("page.fetch"):
+            await asyncio.sleep(0)
+
+    async def job():
+        timings = start_job_timings()
+        await asyncio.gather(fetch(), fetch())
+        with span("extraction"):
+            pass
+        return timings.snapshot()
+
+    async def unrelated():
+        with span("page.fetch"):
+            pass
+
+    async def scenario():
+        return await asyncio.gather(job(), unrelated())
+
+    snapshot, _ = asyncio.run(scenario())
+    assert snapshot["stages"]["page.fetch"]["count"] == 2
+    assert snapshot["stages"]["extraction"]["count"] == 1
+    assert snapshot["wall_ms"] >= 0
+    assert 'pipeline_stage_seconds_count{stage="page.fetch"} 3' in render_prometheus()
+
+
+def test_disabled_metrics_are_noops(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+
+    async def call():
+        return {"success": False}
+
+    assert instrument("gemini.generate", provider="gemini")(call) is call
+    assert span("send") is span("db.commit")
+    with span("send"):
+        metrics.record_provider_retry("gmail")
+    text = render_prometheus()
+    assert 'stage="send"' not in text and "provider_retries_total" not in text
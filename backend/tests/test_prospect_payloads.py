@@ -0,0 +1,130 @@
+"""
+Tests for the prospect_payloads side table: partial upserts, batch reads and
+prospects selected without their payloads, and the two-step migration.
+
+Requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import importlib.util
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import Base
+from app.models.discovery_query import DiscoveryQuery
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.models.prospect_payload import ProspectPayload
+from app.services.prospect_payloads import get_payloads, get_payloads_many, save_payloads
+from tests.conftest import TEST_DATABASE_URL
+
+VERSIONS = Path(__file__).parent.parent / "alembic" / "versions"
+PENDING = Path(__file__).parent.parent / "alembic" / "pending"
+
+
+async def _run_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(
+            scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, ProspectPayload.__table__
+        )
+
+        discovered_id, manual_id = uuid.uuid4(), uuid.uuid4()
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            # Discovery creates the payload row together with the prospect
+            db.add_all([
+                Prospect(id=discovered_id, domain="gallery.com",
+                         payloads=ProspectPayload(dataforseo_payload={"description": "A gallery"})),
+                Prospect(id=manual_id, domain="manual.com"),
+            ])
+            await db.commit()
+
+            # Upserts write only the given payloads
+            await save_payloads(db, discovered_id, scrape_payload={"https://gallery.com": ["a@gallery.com"]})
+            await save_payloads(db, manual_id, verification_payload={"success": True})
+            await db.commit()
+
+            assert await get_payloads(db, discovered_id) == {
+                "dataforseo_payload": {"description": "A gallery"},
+                "snov_payload": None,
+                "scrape_payload": {"https://gallery.com": ["a@gallery.com"]},
+                "verification_payload": None,
+            }
+            many = await get_payloads_many(db, [discovered_id, manual_id, uuid.uuid4()], "verification_payload")
+            assert many == {discovered_id: {"verification_payload": None}, manual_id: {"verification_payload": {"success": True}}}
+            assert await get_payloads(db, uuid.uuid4(), "snov_payload") == {"snov_payload": None}
+            with pytest.raises(ValueError):
+                await get_payloads(db, discovered_id, "hunter_payload")
+
+            # A plain select(Prospect) does not load them
+            db.expunge_all()
+            prospect = (await db.execute(select(Prospect).where(Prospect.id == discovered_id))).scalar_one()
+            with pytest.raises(Exception, match="lazy='raise'"):
+                prospect.payloads
+
+            await db.execute(text("DELETE FROM prospects WHERE id = :id"), {"id": manual_id})
+            await db.commit()
+            assert (await db.execute(text("SELECT count(*) FROM prospect_payloads"))).scalar_one() == 1
+    finally:
+        await scoped.dispose()
+
+
+def test_payloads_live_in_the_side_table(pg_schema):
+    asyncio.run(_run_scenario(pg_schema))
+
+
+def _migrate(conn, name, step="upgrade", directory=VERSIONS):
+    spec = importlib.util.spec_from_file_location(name, directory / f"{name}.py")
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    migration.BATCH_SIZE = 1
+    conn.commit()
+    context = MigrationContext.configure(conn)
+    # Same transaction handling as `alembic upgrade`, which autocommit_block() relies on
+    with Operations.context(context), context.begin_transaction():
+        getattr(migration, step)()
+
+
+def test_payload_columns_dropped_only_by_the_follow_up_revision(pg_schema):
+    sync_url = TEST_DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
+    engine = create_engine(sync_url, connect_args={"options": f"-csearch_path={pg_schema.name}"})
+    payload_columns = ["dataforseo_payload", "snov_payload", "scrape_payload", "verification_payload"]
+    try:
+        with engine.connect() as conn:
+            Base.metadata.create_all(conn, tables=[Job.__table__, DiscoveryQuery.__table__, Prospect.__table__])
+            for column in payload_columns:
+                conn.execute(text(f"ALTER TABLE prospects ADD COLUMN {column} JSON"))
+            old, late, empty = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+            conn.execute(Prospect.__table__.insert(), [
+                {"id": old, "domain": "old.com"}, {"id": late, "domain": "late.com"}, {"id": empty, "domain": "empty.com"},
+            ])
+            conn.execute(text("UPDATE prospects SET snov_payload = :p WHERE id = :old"),
+                         {"p": json.dumps({"emails": []}), "old": old})
+            conn.commit()
+
+            _migrate(conn, "add_prospect_payloads")
+            # Expand step: old columns kept for workers still on the previous release
+            assert set(payload_columns) <= {c["name"] for c in inspect(conn).get_columns("prospects")}
+            assert conn.execute(text("SELECT prospect_id FROM prospect_payloads")).scalars().all() == [old]
+
+            # Written by an old worker during the rollout
+            conn.execute(text("UPDATE prospects SET scrape_payload = :p WHERE id IN (:old, :late)"),
+                         {"p": json.dumps({"pages": 1}), "old": old, "late": late})
+            conn.commit()
+
+            # Contract step ships in a later release - not reachable from `upgrade head` yet
+            assert not (VERSIONS / "drop_prospect_payload_columns.py").exists()
+            _migrate(conn, "drop_prospect_payload_columns", directory=PENDING)
+            assert not set(payload_columns) & {c["name"] for c in inspect(conn).get_columns("prospects")}
+            rows = dict(conn.execute(text(
+                "SELECT prospect_id, json_build_array(snov_payload, scrape_payload)::text FROM prospect_payloads"
+            )).all())
+            assert rows == {old: '[{"emails": []}, {"pages": 1}]', late: '[null, {"pages": 1}]'}
+    finally:
+        engine.dispose()
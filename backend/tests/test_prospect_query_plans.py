@@ -0,0 +1,176 @@
+"""
+EXPLAIN-based regression tests for the prospects hot-path indexes.
+
+Seeds a 100k-row prospects table in a throwaway schema and checks that the
+pipeline's queue/list queries never fall back to a sequential scan.
+
+Requires a PostgreSQL database; skipped unless TEST_DATABASE_URL is set, e.g.
+    TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest tests/test_prospect_query_plans.py
+"""
+import importlib.util
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import and_, create_engine, func, or_, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db.database import Base
+from app.models.discovery_query import DiscoveryQuery
+from app.models.job import Job
+from app.models.prospect import (
+    DiscoveryStatus,
+    DraftStatus,
+    Prospect,
+    ProspectStage,
+    ScrapeStatus,
+    SendStatus,
+    VerificationStatus,
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SEED_ROWS = 100_000
+
+MIGRATION_PATHS = [
+    Path(__file__).parent.parent / "alembic" / "versions" / f"{name}.py"
+    for name in ("add_prospect_pipeline_indexes", "add_prospect_score_index")
+]
+
+WEBSITE_FILTER = or_(Prospect.source_type == "website", Prospect.source_type.is_(None))
+SCRAPED_STATES = [ScrapeStatus.SCRAPED.value, ScrapeStatus.ENRICHED.value]
+
+# Mirrors the pipeline queries in api/pipeline.py, api/prospects.py and tasks/*.py
+HOT_QUERIES = {
+    "scrape_queue": select(Prospect.id).where(
+        WEBSITE_FILTER,
+        Prospect.discovery_status == DiscoveryStatus.DISCOVERED.value,
+        or_(Prospect.approval_status.is_(None), Prospect.approval_status != "rejected"),
+        Prospect.scrape_status == ScrapeStatus.DISCOVERED.value,
+    ),
+    "verify_queue": select(Prospect.id).where(
+        WEBSITE_FILTER,
+        Prospect.scrape_status.in_(SCRAPED_STATES),
+        Prospect.contact_email.isnot(None),
+        Prospect.verification_status != VerificationStatus.VERIFIED.value,
+    ),
+    "send_queue": select(Prospect).where(
+        Prospect.contact_email.isnot(None),
+        Prospect.verification_status == VerificationStatus.VERIFIED.value,
+        Prospect.draft_subject.isnot(None),
+        Prospect.draft_body.isnot(None),
+        Prospect.send_status != SendStatus.SENT.value,
+    ).order_by(Prospect.created_at.asc()).limit(100),
+    "send_ready_count": select(func.count(Prospect.id)).where(
+        WEBSITE_FILTER,
+        Prospect.contact_email.isnot(None),
+        Prospect.verification_status == VerificationStatus.VERIFIED.value,
+        Prospect.draft_status == DraftStatus.DRAFTED.value,
+        Prospect.send_status != SendStatus.SENT.value,
+    ),
+    "lead_stage_count": select(func.count(Prospect.id)).where(
+        WEBSITE_FILTER,
+        Prospect.stage == ProspectStage.LEAD.value,
+    ),
+    "social_scrape_queue": select(Prospect.id).where(
+        Prospect.source_type == "social",
+        Prospect.approval_status == "approved",
+        Prospect.scrape_status.in_([ScrapeStatus.DISCOVERED.value, ScrapeStatus.NO_EMAIL_FOUND.value]),
+    ),
+    "scraped_emails_page": select(Prospect).where(
+        and_(Prospect.contact_email.isnot(None), Prospect.scrape_status.in_(SCRAPED_STATES), WEBSITE_FILTER)
+    ).order_by(Prospect.created_at.desc()).limit(50),
+    "website_list_page": select(Prospect).where(WEBSITE_FILTER).order_by(Prospect.created_at.desc()).limit(50),
+    "discovered_page": select(Prospect).where(
+        Prospect.discovery_status == DiscoveryStatus.DISCOVERED.value,
+        WEBSITE_FILTER,
+    ).order_by(Prospect.created_at.desc()).limit(50),
+}
+
+# Realistic backlog: most rows have finished the pipeline, each queue holds a few
+# percent and queued rows are the most recent ones (b = recency percentile).
+SEED_SQL = f"""
+INSERT INTO prospects (
+    id, domain, contact_email, source_type, discovery_status, scrape_status, approval_status,
+    verification_status, draft_status, send_status, stage, sequence_index,
+    draft_subject, draft_body, created_at
+)
+SELECT
+    gen_random_uuid(),
+    'site' || i || '.example.org',
+    CASE WHEN b BETWEEN 3 AND 4 OR b BETWEEN 6 AND 7 OR b >= 18 THEN 'info@site' || i || '.example.org' END,
+    CASE WHEN b BETWEEN 8 AND 17 THEN 'social' ELSE 'website' END,
+    'DISCOVERED',
+    CASE WHEN b <= 2 OR b BETWEEN 8 AND 17 THEN 'DISCOVERED'
+         WHEN b = 5 THEN 'NO_EMAIL_FOUND'
+         ELSE 'SCRAPED' END,
+    CASE WHEN b <= 1 OR b BETWEEN 9 AND 17 THEN 'PENDING' ELSE 'approved' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'verified' ELSE 'UNVERIFIED' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'drafted' ELSE 'pending' END,
+    CASE WHEN b >= 18 THEN 'sent' ELSE 'pending' END,
+    CASE WHEN b = 3 THEN 'LEAD' WHEN b = 4 THEN 'EMAIL_FOUND' WHEN b = 5 THEN 'SCRAPED'
+         WHEN b BETWEEN 6 AND 7 THEN 'DRAFTED' WHEN b >= 18 THEN 'SENT' ELSE 'DISCOVERED' END,
+    0,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'Hello' END,
+    CASE WHEN b BETWEEN 6 AND 7 OR b >= 18 THEN 'Body' END,
+    now() - (i || ' minutes')::interval
+FROM (SELECT i, (i - 1) * 100 / {SEED_ROWS} AS b FROM generate_series(1, {SEED_ROWS}) AS i) AS seed
+"""
+
+
+def _load_migration(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_migration_matches_model_indexes():
+    """The migrations create exactly the composite indexes declared on Prospect"""
+    migrated = [name for path in MIGRATION_PATHS for name, _, _ in _load_migration(path).PIPELINE_INDEXES]
+    model_indexes = {
+        index.name for index in Prospect.__table__.indexes if len(index.expressions) > 1
+    }
+    assert len(migrated) == len(set(migrated))
+    assert set(migrated) == model_indexes
+
+
+@pytest.fixture(scope="module")
+def seeded_connection():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set (PostgreSQL required for EXPLAIN tests)")
+
+    sync_url = TEST_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    sync_url = sync_url.replace("postgresql://", "postgresql+psycopg2://", 1)
+    engine = create_engine(sync_url)
+    schema = f"plan_test_{uuid.uuid4().hex[:8]}"
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}"))
+        conn.commit()
+        try:
+            Base.metadata.create_all(
+                conn, tables=[Job.__table__, DiscoveryQuery.__table__, Prospect.__table__]
+            )
+            conn.execute(text(SEED_SQL))
+            conn.execute(text("ANALYZE prospects"))
+            conn.commit()
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+            conn.commit()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(seeded_connection, name):
+    sql = HOT_QUERIES[name].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    plan = "\n".join(row[0] for row in seeded_connection.execute(text(f"EXPLAIN {sql}")))
+    assert "Seq Scan on prospects" not in plan, f"{name} fell back to a seq scan:\n{plan}"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
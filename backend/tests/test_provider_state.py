@@ -0,0 +1,126 @@
+"""
+Unit tests for the async provider state store: in-memory fallback, and the
+Redis path (pub/sub propagation, reconnect after an outage) on fakeredis
+"""
+import asyncio
+import time
+
+import pytest
+from app.services import provider_state
+from app.services.provider_state import ProviderState
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_state():
+    provider_state._memory_state.clear()
+    yield
+    provider_state._memory_state.clear()
+
+
+def test_in_memory_restriction_lifecycle():
+    """Without REDIS_URL restrictions are tracked in process memory"""
+    async def scenario():
+        state = ProviderState(redis_url="")
+        assert not await state.is_restricted("hunter")
+
+        await state.set_restricted("hunter", 60)
+        assert await state.is_restricted("hunter")
+        expiry = await state.get_restriction_expiry("hunter")
+        assert expiry == pytest.approx(time.time() + 60, abs=2)
+        assert not state.use_redis
+
+        await state.clear_restriction("hunter")
+        assert not await state.is_restricted("hunter")
+
+    asyncio.run(scenario())
+
+
+def test_restriction_is_shared_between_instances():
+    """In-memory fallback is process-wide, not per instance"""
+    async def scenario():
+        await ProviderState(redis_url="").set_restricted("snov", 30)
+        assert await ProviderState(redis_url="").is_restricted("snov")
+
+    asyncio.run(scenario())
+
+
+def test_expired_restriction_is_cleaned_up():
+    async def scenario():
+        state = ProviderState(redis_url="")
+        provider_state._memory_state["gemini"] = time.time() - 1
+        assert not await state.is_restricted("gemini")
+        assert "gemini" not in provider_state._memory_state
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point ProviderState's Redis client at one in-process fakeredis server"""
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+
+    class ConnectionPool(redis.asyncio.ConnectionPool):
+        @classmethod
+        def from_url(cls, url, **kwargs):
+            return cls(connection_class=fakeredis.aioredis.FakeConnection, server=server, **kwargs)
+
+    monkeypatch.setattr(provider_state.aioredis, "ConnectionPool", ConnectionPool)
+    monkeypatch.setattr(provider_state, "REDIS_RETRY_BASE", 0.05)
+    return server
+
+
+def test_restrictions_propagate_over_pubsub(fake_redis):
+    async def scenario():
+        first, second = ProviderState(redis_url="redis://fake"), ProviderState(redis_url="redis://fake")
+        try:
+            assert not await second.is_restricted("hunter")  # cached as unrestricted for LOCAL_CACHE_TTL
+            await asyncio.sleep(0.05)  # listeners subscribed
+            await first.set_restricted("hunter", 60)
+            await asyncio.sleep(0.05)
+            assert first.use_redis and second.use_redis
+            # Only the published message can have invalidated second's cache
+            assert await second.is_restricted("hunter")
+            assert provider_state._memory_state == {}
+
+            await second.clear_restriction("hunter")
+            await asyncio.sleep(0.05)
+            assert not await first.is_restricted("hunter")
+        finally:
+            await first.close()
+            await second.close()
+
+    asyncio.run(scenario())
+
+
+def test_reconnects_after_redis_outage(fake_redis):
+    async def scenario():
+        state = ProviderState(redis_url="redis://fake")
+        fake_redis.connected = False
+        try:
+            await state.set_restricted("snov", 60)
+            assert not state.use_redis
+            assert "snov" in provider_state._memory_state
+
+            fake_redis.connected = True
+            await state.connect()  # still inside the backoff window
+            assert not state.use_redis
+
+            await asyncio.sleep(0.06)
+            assert not await state.is_restricted("hunter")  # a Redis read reconnects
+            assert state.use_redis
+            # The restriction recorded during the outage is shared now
+            other = ProviderState(redis_url="redis://fake")
+            provider_state._memory_state.clear()
+            assert await other.is_restricted("snov")
+            await other.close()
+        finally:
+            await state.close()
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,51 @@
+"""
+Tests for SQL statement counting (app.utils.query_counter)
+
+Requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.utils.query_counter import count_queries
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+requires_postgres = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set (PostgreSQL required)"
+)
+
+
+async def _scenario():
+    engine = create_async_engine(TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1))
+    try:
+        async def query(sql):
+            async with engine.connect() as conn:
+                await conn.execute(text(sql))
+
+        await query("SELECT 1")  # connect outside any scope
+        with count_queries(keep_statements=True) as outer:
+            await query("SELECT 1")
+            with count_queries() as inner:
+                await query("WITH t AS (SELECT 1 AS x) SELECT x FROM t")
+            background = asyncio.create_task(query("SELECT 2"))
+        await query("SELECT 3")  # outside: not counted
+        await background  # started inside: counted
+        other = asyncio.create_task(query("SELECT 4"))
+        with count_queries() as concurrent:
+            await other  # started before the scope: not counted
+        return outer, inner, concurrent
+    finally:
+        await engine.dispose()
+
+
+@requires_postgres
+def test_statements_are_counted_per_scope():
+    outer, inner, concurrent = asyncio.run(_scenario())
+    assert inner.snapshot() == {"total": 1, "select": 1}
+    assert outer.snapshot() == {"total": 3, "select": 3}
+    assert outer.statements == ["SELECT 1", "WITH t AS (SELECT 1 AS x) SELECT x FROM t", "SELECT 2"]
+    assert concurrent.total == 0
@@ -0,0 +1,187 @@
+"""
+Unit tests for the token-bucket rate limiter (in-memory backend)
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from app.clients import snov
+from app.services.exceptions import RateLimitError
+from app.services import provider_state
+from app.utils import rate_limiter
+from app.utils.rate_limiter import RateLimiter, parse_limit
+
+
+def test_parse_limit():
+    config = parse_limit("60/minute", burst=10)
+    assert config.rate == 60
+    assert config.period_seconds == 60
+    assert config.capacity == 10
+    assert config.refill_per_second == pytest.approx(1.0)
+
+    # Burst defaults to (and is capped at) the per-period count
+    assert parse_limit("5/second").capacity == 5
+    assert parse_limit("5/second", burst=50).capacity == 5
+
+    with pytest.raises(ValueError):
+        parse_limit("sixty/minute")
+    with pytest.raises(ValueError):
+        parse_limit("60/fortnight")
+
+
+def test_burst_then_exact_wait():
+    """A full bucket allows a burst, then reports the exact time to the next token"""
+    async def scenario():
+        limiter = RateLimiter(redis_url="")
+        limiter.configs["gemini"] = parse_limit("60/minute", burst=3)
+
+        for _ in range(3):
+            assert await limiter.try_acquire("gemini") == (True, 0.0)
+        allowed, wait = await limiter.try_acquire("gemini")
+        assert not allowed
+        assert 0.9 < wait <= 1.0
+        assert await limiter.get_remaining_requests("gemini") == 0
+
+        await limiter.reset("gemini")
+        assert await limiter.get_remaining_requests("gemini") == 3
+
+    asyncio.run(scenario())
+
+
+def test_wait_if_needed_sleeps_until_refill():
+    async def scenario():
+        limiter = RateLimiter(redis_url="")
+        limiter.configs["snov"] = parse_limit("20/second", burst=1)
+
+        start = time.monotonic()
+        await limiter.wait_if_needed("snov")
+        await limiter.wait_if_needed("snov")
+        elapsed = time.monotonic() - start
+        # Second call waits ~1/20s instead of a fixed multi-second sleep
+        assert 0.03 < elapsed < 0.5
+
+    asyncio.run(scenario())
+
+
+def test_unknown_platform_raises():
+    async def scenario():
+        limiter = RateLimiter(redis_url="")
+        with pytest.raises(ValueError):
+            await limiter.wait_if_needed("myspace")
+        assert await limiter.get_remaining_requests("myspace") is None
+
+    asyncio.run(scenario())
+
+
+def test_limit_context_records_provider_restriction():
+    """A 429 raised inside limit() marks the provider restricted for retry_after"""
+    async def scenario():
+        provider_state._provider_state_instance = provider_state.ProviderState(redis_url="")
+        limiter = RateLimiter(redis_url="")
+        try:
+            with pytest.raises(RateLimitError):
+                async with limiter.limit("hunter"):
+                    raise RateLimitError(provider="hunter", retry_after=30)
+            assert await provider_state.get_provider_state().is_restricted("hunter")
+        finally:
+            await provider_state.close_provider_state()
+            provider_state._memory_state.clear()
+
+    asyncio.run(scenario())
+
+
+def test_limit_context_records_upstream_429():
+    """An httpx 429 escaping limit() restricts the provider for its Retry-After window"""
+    async def scenario():
+        provider_state._provider_state_instance = provider_state.ProviderState(redis_url="")
+        limiter = RateLimiter(redis_url="")
+        request = httpx.Request("GET", "https://api.snov.io/v2/domain-emails-with-info")
+        response = httpx.Response(429, headers={"Retry-After": "120"}, request=request)
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                async with limiter.limit("snov"):
+                    response.raise_for_status()
+            expires_at = await provider_state.get_provider_state().get_restriction_expiry("snov")
+            assert expires_at and expires_at - time.time() > 100
+        finally:
+            await provider_state.close_provider_state()
+            provider_state._memory_state.clear()
+
+    asyncio.run(scenario())
+
+
+def test_snov_domain_search_takes_a_token_per_request(monkeypatch):
+    """Each endpoint attempt draws its own token; a 429 stops the loop and restricts snov"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(404 if len(calls) == 1 else 429, request=request)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(snov.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+
+    async def scenario():
+        provider_state._provider_state_instance = provider_state.ProviderState(redis_url="")
+        limiter = RateLimiter(redis_url="")
+        monkeypatch.setattr(rate_limiter, "_rate_limiter", limiter)
+        client = snov.SnovIOClient(user_id="id", secret="secret")
+
+        async def access_token():
+            return "token"
+        monkeypatch.setattr(client, "_get_access_token", access_token)
+        capacity = limiter.configs["snov"].capacity
+        try:
+            with pytest.raises(RateLimitError):
+                await client.domain_search("example.com")
+            assert len(calls) == 2
+            assert capacity - await limiter.get_remaining_requests("snov") == 2
+            assert await provider_state.get_provider_state().is_restricted("snov")
+        finally:
+            await provider_state.close_provider_state()
+            provider_state._memory_state.clear()
+
+    asyncio.run(scenario())
+
+
+def test_quota_snapshot_lists_all_platforms():
+    async def scenario():
+        limiter = RateLimiter(redis_url="")
+        snapshot = await limiter.get_quota_snapshot()
+        assert set(snapshot) == set(RateLimiter.RATE_LIMITS)
+        assert snapshot["dataforseo"]["remaining"] == snapshot["dataforseo"]["capacity"]
+        assert snapshot["dataforseo"]["shared"] is False
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("platform,per_minute", [("snov", 60), ("hunter", 300)])
+def test_default_limits_stay_within_documented_quota(platform, per_minute):
+    """Sustained rate plus one full burst never exceeds the provider's per-minute quota"""
+    config = RateLimiter(redis_url="").configs[platform]
+    assert config.refill_per_second * 60 + config.capacity <= per_minute
+    # ...and is not throttled to a crawl either
+    assert config.refill_per_second * 60 >= per_minute * 0.8
+
+
+def test_redis_reconnect_backs_off(monkeypatch):
+    """An unreachable Redis falls back to local buckets and is retried after the backoff"""
+    monkeypatch.setattr(rate_limiter, "REDIS_RETRY_BASE", 0.05)
+
+    async def scenario():
+        limiter = RateLimiter(redis_url="redis://127.0.0.1:1/0")
+        assert await limiter.try_acquire("snov") == (True, 0.0)
+        assert not limiter.use_redis
+        assert limiter._failures == 1
+
+        await limiter.try_acquire("snov")  # inside the backoff window: no new attempt
+        assert limiter._failures == 1
+
+        await asyncio.sleep(0.06)
+        await limiter.try_acquire("snov")
+        assert limiter._failures == 2
+        assert limiter._retry_at - time.monotonic() > 0.05  # backoff doubled
+        await limiter.close()
+
+    asyncio.run(scenario())
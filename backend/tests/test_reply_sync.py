@@ -0,0 +1,184 @@
+"""
+Tests for incremental Gmail reply detection against a fake Gmail API.
+
+The sync tests require PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import base64
+import json
+import uuid
+
+import httpx
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from fastapi import FastAPI, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import scheduler as scheduler_module
+from app.clients.gmail import GmailClient
+from app.models.discovery_query import DiscoveryQuery
+from app.models.email_log import EmailLog
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.models.settings import Settings
+from app.services.reply_sync import decode_push_notification, sync_replies
+
+
+class FakeGmail:
+    """In-memory mailbox exposing the Gmail API endpoints the sync uses"""
+
+    def __init__(self):
+        self.history_id = 100
+        self.history = []  # [{"id", "messagesAdded": [...]}]
+        self.headers = {}  # message id -> [{"name", "value"}]
+        self.inbox = []  # [{"id", "threadId"}] for messages.list
+        self.expired = False
+        self.calls = []
+        self.app = FastAPI()
+
+        @self.app.get("/users/me/profile")
+        def profile():
+            self.calls.append("profile")
+            return {"emailAddress": "me@example.com", "historyId": str(self.history_id)}
+
+        @self.app.get("/users/me/history")
+        def history(startHistoryId: str, pageToken: str = None):
+            self.calls.append("history")
+            if self.expired:
+                raise HTTPException(status_code=404, detail="Requested entity was not found.")
+            records = [r for r in self.history if int(r["id"]) > int(startHistoryId)]
+            # One record per page to exercise pagination
+            offset = int(pageToken or 0)
+            page = {"history": records[offset:offset + 1], "historyId": str(self.history_id)}
+            if offset + 1 < len(records):
+                page["nextPageToken"] = str(offset + 1)
+            return page
+
+        @self.app.get("/users/me/messages")
+        def messages(q: str):
+            self.calls.append(f"list:{q.split()[0]}")
+            return {"messages": self.inbox}
+
+        @self.app.get("/users/me/messages/{message_id}")
+        def message(message_id: str, metadataHeaders: list[str] = Query(default=[])):
+            self.calls.append(f"get:{message_id}")
+            if message_id not in self.headers:
+                raise HTTPException(status_code=404)
+            return {"id": message_id, "payload": {"headers": self.headers[message_id]}}
+
+    def add(self, message_id, thread_id, labels=("INBOX", "UNREAD")):
+        self.history_id += 1
+        self.history.append({
+            "id": str(self.history_id),
+            "messagesAdded": [{"message": {"id": message_id, "threadId": thread_id, "labelIds": list(labels)}}],
+        })
+
+    def client(self):
+        return GmailClient(
+            access_token="test-token",
+            base_url="http://gmail.test",
+            transport=httpx.ASGITransport(app=self.app),
+        )
+
+
+def test_decode_push_notification():
+    data = base64.urlsafe_b64encode(json.dumps({"emailAddress": "me@example.com", "historyId": 1234}).encode())
+    body = {"message": {"data": data.decode().rstrip("="), "messageId": "1"}, "subscription": "s"}
+    assert decode_push_notification(body) == {"email_address": "me@example.com", "history_id": "1234"}
+    assert decode_push_notification({"message": {"data": "not base64 json"}}) is None
+    assert decode_push_notification({}) is None
+
+
+async def _run_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__, EmailLog.__table__, Settings.__table__)
+
+        gmail = FakeGmail()
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            by_thread, by_header, silent, bystander = (uuid.uuid4() for _ in range(4))
+            db.add_all([
+                Prospect(id=pid, domain=f"{pid.hex[:8]}.com", outreach_status="sent")
+                for pid in (by_thread, by_header, silent, bystander)
+            ])
+            await db.flush()
+            db.add_all([
+                EmailLog(prospect_id=by_thread, gmail_thread_id="t-1", message_id_header="<a@x>"),
+                EmailLog(prospect_id=by_header, gmail_thread_id="t-2", message_id_header="<b@x>"),
+                EmailLog(prospect_id=silent, gmail_thread_id="t-3", message_id_header="<c@x>"),
+            ])
+            await db.commit()
+
+            # First run only records the mailbox position
+            stats = await sync_replies(db, gmail.client())
+            assert stats["mode"] == "initialized"
+            assert stats["history_id"] == "100"
+
+            gmail.add("m-1", "t-1")                        # reply in our thread
+            gmail.add("m-2", "t-99")                       # reply that started a new thread
+            gmail.headers["m-2"] = [{"name": "In-Reply-To", "value": "<b@x>"}]
+            gmail.add("m-3", "t-3", labels=("SENT",))      # our own follow-up
+            gmail.add("m-4", "t-50")                       # unrelated mail
+            gmail.headers["m-4"] = []
+            gmail.calls.clear()
+
+            stats = await sync_replies(db, gmail.client(), notified_history_id="104")
+            assert stats["mode"] == "history"
+            assert stats["messages"] == 3
+            assert stats["matched_by_thread"] == 1
+            assert stats["matched_by_header"] == 1
+            assert stats["replied"] == 2
+            assert stats["history_id"] == "104"
+            # Paged history + one metadata fetch per message outside known threads
+            assert sorted(gmail.calls) == ["get:m-2", "get:m-4"] + ["history"] * 4
+
+            statuses = dict((await db.execute(text("SELECT id, outreach_status FROM prospects"))).all())
+            assert statuses == {by_thread: "replied", by_header: "replied", silent: "sent", bystander: "sent"}
+
+            # A redelivered / older push notification costs no API call
+            gmail.calls.clear()
+            stats = await sync_replies(db, gmail.client(), notified_history_id="103")
+            assert stats["mode"] == "skipped"
+            assert gmail.calls == []
+
+            # Expired historyId: fall back to the inbox since the last sync
+            gmail.expired = True
+            gmail.history_id = 500
+            gmail.inbox = [{"id": "m-5", "threadId": "t-3"}]
+            stats = await sync_replies(db, gmail.client())
+            assert stats["mode"] == "full_resync"
+            assert stats["replied"] == 1
+            assert stats["history_id"] == "500"
+            assert "list:in:inbox" in gmail.calls
+
+            state = (await db.execute(
+                text("SELECT value FROM settings WHERE key = 'gmail_reply_sync'")
+            )).scalar()
+            assert state["history_id"] == "500"
+    finally:
+        await scoped.dispose()
+
+
+def test_sync_replies_incremental(pg_schema):
+    asyncio.run(_run_scenario(pg_schema))
+
+
+async def _start_reply_checks():
+    scheduled = scheduler_module.start_reply_check_scheduler()
+    job = scheduler_module.scheduler.get_job("reply_checks")
+    scheduler_module.stop_scheduler()
+    return scheduled, job
+
+
+def test_reply_check_scheduled_on_startup_behind_flag(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "scheduler", AsyncIOScheduler())
+    monkeypatch.delenv("REPLY_CHECK_ENABLED", raising=False)
+    assert asyncio.run(_start_reply_checks()) == (False, None)
+
+    monkeypatch.setattr(scheduler_module, "scheduler", AsyncIOScheduler())
+    monkeypatch.setenv("REPLY_CHECK_ENABLED", "true")
+    monkeypatch.setenv("REPLY_CHECK_INTERVAL_MINUTES", "5")
+    scheduled, job = asyncio.run(_start_reply_checks())
+    assert scheduled
+    assert job.func is scheduler_module.schedule_reply_check
+    assert job.trigger.interval.total_seconds() == 300
@@ -0,0 +1,154 @@
+"""
+Tests for the per-prospect research dossier: built once, reused until it
+expires or the prospect's URL changes, not stored for social prospects, and
+kept by the streaming compose endpoint.
+
+Requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.prospects import compose_email_stream
+from app.clients import gemini
+from app.db import database
+
+from app.models.discovery_query import DiscoveryQuery
+from app.models.email_log import EmailLog
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.models.prospect_dossier import ProspectDossier
+from app.models.prospect_payload import ProspectPayload
+from app.services.research_dossier import DOSSIER_VERSION, get_or_build_dossier
+
+
+class FakeGeminiClient:
+    def __init__(self):
+        self.calls = []
+
+    async def build_research(self, page_url, domain, page_title=None, page_snippet=None):
+        self.calls.append(page_url)
+        return {"site_text": f"Site text of {domain}", "positioning_summary": f"Summary #{len(self.calls)}"}
+
+
+async def _run_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(
+            scoped,
+            Job.__table__, DiscoveryQuery.__table__, Prospect.__table__,
+            ProspectPayload.__table__, ProspectDossier.__table__,
+        )
+
+        client = FakeGeminiClient()
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            prospect = Prospect(id=uuid.uuid4(), domain="gallery.com", page_url="https://gallery.com/about",
+                                payloads=ProspectPayload(dataforseo_payload={"description": "A small gallery"}))
+            social = Prospect(id=uuid.uuid4(), domain="insta.com", source_type="social")
+            db.add_all([prospect, social])
+            await db.commit()
+
+            first = await get_or_build_dossier(db, prospect, client)
+            await db.commit()
+            assert (first.version, first.positioning_summary) == (DOSSIER_VERSION, "Summary #1")
+            assert first.key_facts["page_snippet"] == "A small gallery"
+            assert first.expires_at > datetime.now(timezone.utc) + timedelta(days=1)
+
+            # Stored: a second call (e.g. the next chat turn) does no research
+            again = await get_or_build_dossier(db, prospect, client)
+            assert again.positioning_summary == "Summary #1"
+            assert client.calls == ["https://gallery.com/about"]
+
+            # Expired or built from another URL: rebuilt in place
+            await db.execute(update(ProspectDossier).values(expires_at=datetime.now(timezone.utc)))
+            await db.commit()
+            assert (await get_or_build_dossier(db, prospect, client)).positioning_summary == "Summary #2"
+            prospect.page_url = "https://gallery.com/"
+            assert (await get_or_build_dossier(db, prospect, client)).positioning_summary == "Summary #3"
+            await db.commit()
+
+            assert await get_or_build_dossier(db, social, client) is None
+            count = (await db.execute(text("SELECT count(*) FROM prospect_dossiers"))).scalar_one()
+            assert count == 1
+
+            # The caller owns the transaction: its pending changes are not committed by the helper
+            prospect.thread_id = uuid.uuid4()
+            await get_or_build_dossier(db, prospect, client, refresh=True)
+            await db.rollback()
+            stored = (await db.execute(text(
+                "SELECT p.thread_id, d.positioning_summary FROM prospects p JOIN prospect_dossiers d ON d.prospect_id = p.id"
+            ))).one()
+            assert tuple(stored) == (None, "Summary #3")
+    finally:
+        await scoped.dispose()
+
+
+def test_dossier_built_once_and_rebuilt_when_stale(pg_schema):
+    asyncio.run(_run_scenario(pg_schema))
+
+
+class FakeStreamingClient(FakeGeminiClient):
+    """What compose_email_stream needs from GeminiClient"""
+
+    instances = []
+    model = "fake-model"
+
+    def __init__(self):
+        super().__init__()
+        FakeStreamingClient.instances.append(self)
+
+    async def validate_model(self):
+        return True
+
+    async def build_compose_request(self, **kwargs):
+        return {"dossier": kwargs["dossier"].positioning_summary}
+
+    async def stream_generate(self, payload, timeout=60.0):
+        yield json.dumps({"subject": "Hello", "body": f"About {payload['dossier']}"})
+
+
+async def _stream_twice(pg_schema, monkeypatch):
+    scoped = pg_schema.engine()
+    sessions = async_sessionmaker(scoped, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(gemini, "GeminiClient", FakeStreamingClient)
+    FakeStreamingClient.instances = []
+    try:
+        await pg_schema.create_tables(
+            scoped,
+            Job.__table__, DiscoveryQuery.__table__, Prospect.__table__,
+            ProspectPayload.__table__, ProspectDossier.__table__, EmailLog.__table__,
+        )
+        prospect_id = uuid.uuid4()
+        async with sessions() as db:
+            db.add(Prospect(id=prospect_id, domain="gallery.com", page_url="https://gallery.com/about",
+                            contact_email="hi@gallery.com"))
+            await db.commit()
+
+        streams = []
+        for _ in range(2):
+            async with sessions() as db:
+                response = await compose_email_stream(prospect_id, db=db)
+                streams.append("".join([chunk async for chunk in response.body_iterator]))
+
+        async with sessions() as db:
+            stored = (await db.execute(text(
+                "SELECT p.thread_id, p.draft_body, d.positioning_summary "
+                "FROM prospects p JOIN prospect_dossiers d ON d.prospect_id = p.id"
+            ))).one()
+        return prospect_id, streams, stored
+    finally:
+        await scoped.dispose()
+
+
+def test_streamed_compose_reuses_stored_dossier(pg_schema, monkeypatch):
+    prospect_id, streams, stored = asyncio.run(_stream_twice(pg_schema, monkeypatch))
+
+    assert all("event: done" in stream for stream in streams)
+    # The dossier built by the first call is committed; the second call does no research
+    assert [client.calls for client in FakeStreamingClient.instances] == [["https://gallery.com/about"], []]
+    assert tuple(stored) == (prospect_id, "About Summary #1", "Summary #1")
@@ -0,0 +1,121 @@
+"""
+Unit tests for bulk social profile ingestion
+
+The prospect ingestion test requires PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.discovery_query import DiscoveryQuery
+from app.models.job import Job
+from app.models.prospect import Prospect
+from app.models.social import SocialPlatform, DiscoveryStatus
+from app.services.social.profile_ingestion import (
+    build_profile_upsert,
+    dedupe_profiles,
+    ingest_social_prospects,
+    resolve_max_results,
+)
+
+
+def test_dedupe_profiles_merges_within_batch():
+    """Duplicates by profile_url collapse to one row, filling gaps"""
+    profiles = [
+        {"username": "ana", "profile_url": "https://instagram.com/ana", "bio": "", "followers_count": 1200},
+        {"username": "ben", "profile_url": "https://instagram.com/ben", "followers_count": 50},
+        {"username": "ana", "profile_url": "https://instagram.com/ana ", "bio": "Painter", "followers_count": 1500},
+        {"username": "", "profile_url": "https://instagram.com/nobody"},
+    ]
+
+    unique = dedupe_profiles(profiles)
+
+    assert [p["username"] for p in unique] == ["ana", "ben"]
+    assert unique[0]["bio"] == "Painter"
+    assert unique[0]["followers_count"] == 1500
+
+
+def test_resolve_max_results():
+    assert resolve_max_results({"max_results": 250}) == 250
+    assert resolve_max_results({"max_results": "40"}) == 40
+    assert resolve_max_results({"max_results": 0}, default=100) == 100
+    assert resolve_max_results({"max_results": "lots"}, default=100) == 100
+    assert resolve_max_results(None, default=75) == 75
+
+
+def test_profile_upsert_is_single_multi_row_statement():
+    """One INSERT ... ON CONFLICT (profile_url) DO UPDATE per batch"""
+    rows = [
+        {
+            "platform": SocialPlatform.INSTAGRAM,
+            "username": f"user{i}",
+            "profile_url": f"https://instagram.com/user{i}",
+            "followers_count": i,
+            "engagement_score": 0.0,
+            "discovery_status": DiscoveryStatus.DISCOVERED,
+            "is_manual": False,
+        }
+        for i in range(3)
+    ]
+
+    sql = str(build_profile_upsert(rows).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("INSERT INTO social_profiles") == 1
+    assert "ON CONFLICT (profile_url) DO UPDATE" in sql
+    assert "followers_count = excluded.followers_count" in sql
+    assert "bio = coalesce(nullif(excluded.bio" in sql
+    assert "RETURNING (xmax = 0)" in sql
+
+
+def _social(url, domain="instagram.com", followers=None, engagement=None):
+    return Prospect(domain=domain, profile_url=url, source_type="social",
+                    follower_count=followers, engagement_rate=engagement)
+
+
+async def _ingest_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        await pg_schema.create_tables(scoped, Job.__table__, DiscoveryQuery.__table__, Prospect.__table__)
+        async with AsyncSession(scoped, expire_on_commit=False) as db:
+            first = await ingest_social_prospects(db, [
+                _social("https://instagram.com/ana", followers=100, engagement=2.5),
+                _social("https://instagram.com/ben", followers=50),
+                _social("https://instagram.com/ana ", followers=120),
+                _social(None, domain="nourl.com"),
+            ])
+            await db.commit()
+
+            second = await ingest_social_prospects(db, [
+                _social("https://instagram.com/ana", followers=150, engagement=2.5),  # followers changed
+                _social("https://instagram.com/ben", followers=50),                   # nothing new
+                _social(None, domain="nourl.com"),                                    # still unmatchable
+                _social("https://instagram.com/cleo"),
+            ])
+            await db.commit()
+
+            rows = (await db.execute(
+                text("SELECT profile_url, follower_count, engagement_rate FROM prospects ORDER BY profile_url")
+            )).all()
+        return first, second, rows
+    finally:
+        await scoped.dispose()
+
+
+def test_ingest_social_prospects_keys_on_profile_url(pg_schema):
+    first, second, rows = asyncio.run(_ingest_scenario(pg_schema))
+
+    assert first == {"created": 2, "updated": 0, "unchanged": 0, "skipped_duplicates": 1, "skipped_no_url": 1}
+    assert second == {"created": 1, "updated": 1, "unchanged": 1, "skipped_duplicates": 0, "skipped_no_url": 1}
+    assert [tuple(row) for row in rows] == [
+        ("https://instagram.com/ana", 150, Decimal("2.50")),
+        ("https://instagram.com/ben", 50, None),
+        ("https://instagram.com/cleo", None, None),
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
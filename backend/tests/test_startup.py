@@ -0,0 +1,56 @@
+"""
+Tests for the staged startup: phase reporting, pool warm-up and the schema
+maintenance that moved to a background task.
+
+The database tests require PostgreSQL; skipped unless TEST_DATABASE_URL is set.
+"""
+import asyncio
+
+from sqlalchemy import text
+
+from app.startup import StartupState, repair_discovery_query_id, needs_migration, warm_pool
+
+
+def test_phases_record_status_and_swallow_errors():
+    async def scenario():
+        state = StartupState()
+        async with state.phase("pool_warmup") as details:
+            details["connections"] = 2
+        async with state.phase("schema_validation", "background"):
+            raise RuntimeError("boom")
+        state.mark_ready()
+        return state.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["ready"] is True
+    assert snapshot["ready_after_ms"] >= 0
+    warmup = snapshot["phases"]["pool_warmup"]
+    assert (warmup["stage"], warmup["status"], warmup["connections"]) == ("blocking", "ok", 2)
+    failed = snapshot["phases"]["schema_validation"]
+    assert (failed["stage"], failed["status"], failed["error"]) == ("background", "failed", "boom")
+
+
+async def _run_maintenance_scenario(pg_schema):
+    scoped = pg_schema.engine()
+    try:
+        assert await warm_pool(scoped, connections=3) == 3
+        assert scoped.pool.checkedin() == 3
+
+        # An old prospects table: no bio_text, no discovery_query_id
+        async with scoped.begin() as conn:
+            await conn.execute(text("CREATE TABLE prospects (id UUID PRIMARY KEY)"))
+        assert await needs_migration(scoped) is True
+        assert await repair_discovery_query_id(scoped) is True
+        assert await repair_discovery_query_id(scoped) is False
+
+        async with scoped.connect() as conn:
+            indexes = (await conn.execute(
+                text("SELECT indexname FROM pg_indexes WHERE schemaname = :schema"), {"schema": pg_schema.name}
+            )).scalars().all()
+        assert "ix_prospects_discovery_query_id" in indexes
+    finally:
+        await scoped.dispose()
+
+
+def test_pool_warmup_and_schema_repair(pg_schema):
+    asyncio.run(_run_maintenance_scenario(pg_schema))
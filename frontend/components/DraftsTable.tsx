@@ -2,7 +2,7 @@
 
 import { useEffect, useState, useCallback, useRef } from 'react'
 import { FileText, RefreshCw, Send, Edit, X, Loader2, Download, Mail, CheckCircle } from 'lucide-react'
-import { listProspects, pipelineDraft, pipelineSend, updateProspectDraft, exportProspectsCSV, getDraftJobStatus, type Prospect, type DraftJobStatusResponse } from '@/lib/api'
+import { listProspects, pipelineDraft, pipelineSend, updateProspectDraft, exportProspectsCSV, watchJob, type Prospect } from '@/lib/api'
 
 export default function DraftsTable() {
   const [prospects, setProspects] = useState<Prospect[]>([])
@@ -250,107 +250,78 @@ export default function DraftsTable() {
     loadDraftsRef.current = loadDrafts
   }, [loadDrafts])
 
-  // Polling for draft job progress
-  const pollingIntervalRef = useRef<NodeJS.Timeout | null>(null)
+  // Following draft job progress (job events stream, polling as a fallback)
+  const stopWatchingRef = useRef<(() => void) | null>(null)
   
   const startPollingProgress = useCallback((jobId: string) => {
-    // Clear any existing polling
-    if (pollingIntervalRef.current) {
-      clearInterval(pollingIntervalRef.current)
-    }
+    // Stop following any previous job
+    stopWatchingRef.current?.()
     
-    const pollProgress = async () => {
+    stopWatchingRef.current = watchJob(jobId, (status) => {
       if (!mountedRef.current) {
-        if (pollingIntervalRef.current) {
-          clearInterval(pollingIntervalRef.current)
-          pollingIntervalRef.current = null
-        }
+        stopWatchingRef.current?.()
+        stopWatchingRef.current = null
         return
       }
       
-      try {
-        const status = await getDraftJobStatus(jobId)
-        
-        if (!mountedRef.current) return
-        
-        // Update progress state
+      const draftsCreated = status.drafts_created ?? 0
+      
+      // Update progress state
+      setDraftState(prev => ({
+        ...prev,
+        progress: {
+          drafts_created: draftsCreated,
+          total_targets: status.total_targets,
+          status: status.status as 'pending' | 'running' | 'completed' | 'failed'
+        },
+        message: status.status === 'running' 
+          ? `Drafting in progress... ${draftsCreated}${status.total_targets ? ` / ${status.total_targets}` : ''} drafts created`
+          : status.status === 'pending'
+          ? 'Drafting job queued. Starting...'
+          : prev.message
+      }))
+      
+      // Refresh drafts list on each progress update while the job is running to show new drafts as they're created
+      if (status.status === 'running' && draftsCreated > 0) {
+        loadDraftsRef.current()
+      }
+      
+      // Handle completion
+      if (status.status === 'completed') {
         setDraftState(prev => ({
           ...prev,
-          progress: {
-            drafts_created: status.drafts_created,
-            total_targets: status.total_targets,
-            status: status.status
-          },
-          message: status.status === 'running' 
-            ? `Drafting in progress... ${status.drafts_created}${status.total_targets ? ` / ${status.total_targets}` : ''} drafts created`
-            : status.status === 'pending'
-            ? 'Drafting job queued. Starting...'
-            : prev.message
+          status: 'success',
+          message: `Drafting completed! ${draftsCreated} drafts created.`
         }))
         
-        // Refresh drafts list periodically while job is running to show new drafts as they're created
-        if (status.status === 'running' && status.drafts_created > 0) {
-          // Refresh drafts list every time we see progress (drafts_created increased)
-          // This ensures new drafts appear in the list as they're generated
-          loadDraftsRef.current()
-        }
-        
-        // Handle completion
-        if (status.status === 'completed') {
-          if (pollingIntervalRef.current) {
-            clearInterval(pollingIntervalRef.current)
-            pollingIntervalRef.current = null
-          }
-          
-          setDraftState(prev => ({
-            ...prev,
-            status: 'success',
-            message: `Drafting completed! ${status.drafts_created} drafts created.`
-          }))
-          
-          // Refresh drafts list
-          setTimeout(() => {
-            if (mountedRef.current) {
-              loadDrafts()
-              if (typeof window !== 'undefined') {
-                window.dispatchEvent(new CustomEvent('jobsCompleted'))
-              }
+        // Refresh drafts list
+        setTimeout(() => {
+          if (mountedRef.current) {
+            loadDrafts()
+            if (typeof window !== 'undefined') {
+              window.dispatchEvent(new CustomEvent('jobsCompleted'))
             }
-          }, 1000)
-        }
-        
-        // Handle failure
-        if (status.status === 'failed') {
-          if (pollingIntervalRef.current) {
-            clearInterval(pollingIntervalRef.current)
-            pollingIntervalRef.current = null
           }
-          
-          setDraftState(prev => ({
-            ...prev,
-            status: 'error',
-            message: status.error_message || 'Drafting job failed'
-          }))
-          setError(status.error_message || 'Drafting job failed')
-        }
-      } catch (err: any) {
-        // Don't stop polling on network errors - retry next interval
-        console.error('Failed to poll draft job status:', err)
+        }, 1000)
       }
-    }
-    
-    // Poll immediately, then every 3 seconds
-    pollProgress()
-    pollingIntervalRef.current = setInterval(pollProgress, 3000)
+      
+      // Handle failure
+      if (status.status === 'failed' || status.status === 'cancelled') {
+        setDraftState(prev => ({
+          ...prev,
+          status: 'error',
+          message: status.error || `Drafting job ${status.status}`
+        }))
+        setError(status.error || `Drafting job ${status.status}`)
+      }
+    })
   }, [loadDrafts])
   
-  // Cleanup polling on unmount
+  // Stop following the job on unmount
   useEffect(() => {
     return () => {
-      if (pollingIntervalRef.current) {
-        clearInterval(pollingIntervalRef.current)
-        pollingIntervalRef.current = null
-      }
+      stopWatchingRef.current?.()
+      stopWatchingRef.current = null
     }
   }, [])
 
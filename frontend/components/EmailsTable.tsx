@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from 'react'
 import { Mail, CheckCircle, XCircle, Clock, RefreshCw, X, Loader2, Users, Download } from 'lucide-react'
-import { listProspects, updateProspectCategory, autoCategorizeAll, migrateCategories, exportProspectsCSV, getAvailableCategories, type Prospect } from '@/lib/api'
+import { listProspects, updateProspectCategory, autoCategorizeAll, migrateCategories, waitForJob, summarizeCategorizeJob, exportProspectsCSV, getAvailableCategories, type Prospect } from '@/lib/api'
 
 export default function EmailsTable() {
   const [prospects, setProspects] = useState<Prospect[]>([])
@@ -154,10 +154,13 @@ export default function EmailsTable() {
     setError(null)
     try {
       const result = await autoCategorizeAll()
-      setTimeout(() => {
-        loadSentEmails().catch(err => console.error('Error reloading emails:', err))
-      }, 500)
       setError(`✅ ${result.message}`)
+      // Runs as a background job; reload once it has finished
+      if (result.job_id) {
+        const job = await waitForJob(result.job_id)
+        setError(`✅ ${summarizeCategorizeJob(job)}`)
+      }
+      await loadSentEmails()
       setTimeout(() => setError(null), 5000)
     } catch (err: any) {
       setError(err.message || 'Failed to auto-categorize')
@@ -172,20 +175,17 @@ export default function EmailsTable() {
     try {
       const result = await migrateCategories()
       console.log('✅ [MIGRATE CATEGORIES] Result:', result)
+      setError(`✅ ${result.message}`)
       
-      // Show migration details
-      const mappingDetails = Object.entries(result.category_mapping || {})
-        .map(([old, info]: [string, any]) => `"${old}" → "${info.to}" (${info.count} records)`)
-        .join(', ')
-      
-      setError(`✅ ${result.message} - Migrated ${result.migrated_count} records. ${mappingDetails ? `Mappings: ${mappingDetails}` : ''}`)
+      // Runs as a background job; the counts and mapping land in the job result
+      if (result.job_id) {
+        const job = await waitForJob(result.job_id)
+        setError(`✅ ${summarizeCategorizeJob(job)}`)
+      }
       
       // Reload categories after migration to reflect new category names in filter dropdown
       await loadCategories()
-      
-      setTimeout(() => {
-        loadSentEmails().catch(err => console.error('Error reloading emails:', err))
-      }, 1000)
+      await loadSentEmails()
       
       setTimeout(() => setError(null), 8000)
     } catch (err: any) {
@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from 'react'
 import { Mail, ExternalLink, RefreshCw, Send, X, Loader2, Users, Globe, CheckCircle, Eye, Edit2, Download, FileText } from 'lucide-react'
-import { listLeads, listScrapedEmails, promoteToLead, composeEmail, sendEmail, updateProspectDraft, manualScrape, manualVerify, updateProspectCategory, autoCategorizeAll, migrateCategories, exportLeadsCSV, exportScrapedEmailsCSV, pipelineDraft, getDraftJobStatus, type Prospect } from '@/lib/api'
+import { listLeads, listScrapedEmails, promoteToLead, composeEmail, sendEmail, updateProspectDraft, manualScrape, manualVerify, updateProspectCategory, autoCategorizeAll, migrateCategories, waitForJob, summarizeCategorizeJob, exportLeadsCSV, exportScrapedEmailsCSV, pipelineDraft, watchJob, type Prospect } from '@/lib/api'
 import GeminiChatPanel from '@/components/GeminiChatPanel'
 import { safeToFixed } from '@/lib/safe-utils'
 
@@ -312,75 +312,55 @@ export default function LeadsTable({ emailsOnly = false }: LeadsTableProps) {
       // Show success message
       setError('✅ Auto-drafting started! Checking progress...')
       
-      // Poll for job status until completion or failure
-      // Continue polling indefinitely until job completes or fails (drafting can take several minutes)
-      const pollInterval = setInterval(async () => {
-        try {
-          const status = await getDraftJobStatus(result.job_id)
+      // Follow the job until completion or failure (drafting can take several minutes)
+      const stopWatching = watchJob(result.job_id, (status) => {
+        if (status.status === 'failed' || status.status === 'cancelled') {
+          setIsAutoDrafting(false)
+          setError(`❌ Drafting ${status.status}: ${status.error || 'Unknown error'}`)
+          return
+        }
+        
+        if (status.status === 'completed') {
+          setIsAutoDrafting(false)
+          setError(`✅ Drafting completed! ${status.drafts_created} drafts created. Navigating to Drafts tab...`)
           
-          if (status.status === 'failed') {
-            clearInterval(pollInterval)
-            setIsAutoDrafting(false)
-            setError(`❌ Drafting failed: ${status.error_message || 'Unknown error'}`)
-            return
+          // Trigger pipeline status refresh
+          if (typeof window !== 'undefined') {
+            window.dispatchEvent(new CustomEvent('refreshPipelineStatus'))
+            window.dispatchEvent(new CustomEvent('jobsCompleted'))
+            window.dispatchEvent(new CustomEvent('refreshDrafts'))
           }
           
-          if (status.status === 'completed') {
-            clearInterval(pollInterval)
-            setIsAutoDrafting(false)
-            setError(`✅ Drafting completed! ${status.drafts_created} drafts created. Navigating to Drafts tab...`)
-            
-            // Trigger pipeline status refresh
+          // Navigate to drafts tab after a short delay
+          setTimeout(() => {
+            setError(null)
             if (typeof window !== 'undefined') {
-              window.dispatchEvent(new CustomEvent('refreshPipelineStatus'))
-              window.dispatchEvent(new CustomEvent('jobsCompleted'))
-              window.dispatchEvent(new CustomEvent('refreshDrafts'))
+              const event = new CustomEvent('change-tab', { detail: 'drafts' })
+              window.dispatchEvent(event)
             }
-            
-            // Navigate to drafts tab after a short delay
-            setTimeout(() => {
-              setError(null)
-              if (typeof window !== 'undefined') {
-                const event = new CustomEvent('change-tab', { detail: 'drafts' })
-                window.dispatchEvent(event)
-              }
-            }, 2000)
-            return
-          }
+          }, 2000)
+          return
+        }
+        
+        // Update progress message
+        if (status.status === 'running') {
+          const progressMsg = status.total_targets 
+            ? `⏳ Drafting in progress... ${status.drafts_created} / ${status.total_targets} drafts created`
+            : `⏳ Drafting in progress... ${status.drafts_created} drafts created so far`
+          setError(progressMsg)
           
-          // Update progress message
-          if (status.status === 'running') {
-            const progressMsg = status.total_targets 
-              ? `⏳ Drafting in progress... ${status.drafts_created} / ${status.total_targets} drafts created`
-              : `⏳ Drafting in progress... ${status.drafts_created} drafts created so far`
-            setError(progressMsg)
-            
-            // Refresh drafts list periodically while drafting to show new drafts as they're created
-            // Trigger refresh event so DraftsTable updates
-            if (typeof window !== 'undefined') {
-              window.dispatchEvent(new CustomEvent('refreshDrafts'))
-            }
-          } else if (status.status === 'pending') {
-            setError('⏳ Drafting job queued. Starting soon...')
-          }
-        } catch (pollErr: any) {
-          console.error('Error polling draft job status:', pollErr)
-          // Don't clear interval on poll error - job might still be running
-          // Just show a warning but keep polling
-          if (pollErr.message?.includes('500') || pollErr.message?.includes('Failed to get job status')) {
-            // If it's a 500 error, the columns might be missing - but job is still running
-            // Keep polling but show a different message
-            setError('⏳ Drafting in progress... (checking status)')
+          // Refresh drafts list periodically while drafting to show new drafts as they're created
+          // Trigger refresh event so DraftsTable updates
+          if (typeof window !== 'undefined') {
+            window.dispatchEvent(new CustomEvent('refreshDrafts'))
           }
+        } else if (status.status === 'pending') {
+          setError('⏳ Drafting job queued. Starting soon...')
         }
-      }, 3000) // Poll every 3 seconds
+      })
       
-      // Store interval ID so we can clear it on component unmount
-      const cleanup = () => {
-        if (pollInterval) {
-          clearInterval(pollInterval)
-        }
-      }
+      // Stop watching if the page is left
+      const cleanup = () => stopWatching()
       
       // Cleanup on unmount
       if (typeof window !== 'undefined') {
@@ -555,30 +535,18 @@ export default function LeadsTable({ emailsOnly = false }: LeadsTableProps) {
     try {
       const result = await autoCategorizeAll()
       console.log('✅ [AUTO CATEGORIZE] Result:', result)
-      setError(`✅ ${result.message} - Refreshing...`)
+      setError(`✅ ${result.message}`)
+      
+      // Runs as a background job; reload once it has finished
+      if (result.job_id) {
+        const job = await waitForJob(result.job_id)
+        setError(`✅ ${summarizeCategorizeJob(job)}`)
+      }
       
       // Reset to first page
       setSkip(0)
-      
-      // Wait for backend to commit, then reload multiple times to ensure we get fresh data
-      setTimeout(async () => {
-        try {
-          await loadProspects()
-          console.log('✅ [AUTO CATEGORIZE] First refresh complete')
-        } catch (err) {
-          console.error('❌ [AUTO CATEGORIZE] Error on first refresh:', err)
-        }
-      }, 1000)
-      
-      // Second refresh after a bit more time to ensure database is updated
-      setTimeout(async () => {
-        try {
-          await loadProspects()
-          console.log('✅ [AUTO CATEGORIZE] Second refresh complete')
-        } catch (err) {
-          console.error('❌ [AUTO CATEGORIZE] Error on second refresh:', err)
-        }
-      }, 2500)
+      await loadProspects()
+      console.log('✅ [AUTO CATEGORIZE] Refresh complete')
       
       setTimeout(() => setError(null), 5000)
     } catch (err: any) {
@@ -595,29 +563,21 @@ export default function LeadsTable({ emailsOnly = false }: LeadsTableProps) {
     try {
       const result = await migrateCategories()
       console.log('✅ [MIGRATE CATEGORIES] Result:', result)
+      setError(`✅ ${result.message}`)
       
-      // Show migration details
-      const mappingDetails = Object.entries(result.category_mapping || {})
-        .map(([old, info]: [string, any]) => `"${old}" → "${info.to}" (${info.count} records)`)
-        .join(', ')
-      
-      setError(`✅ ${result.message} - Migrated ${result.migrated_count} records. ${mappingDetails ? `Mappings: ${mappingDetails}` : ''} - Refreshing...`)
+      // Runs as a background job; the counts and mapping land in the job result
+      if (result.job_id) {
+        const job = await waitForJob(result.job_id)
+        setError(`✅ ${summarizeCategorizeJob(job)}`)
+      }
       
       // Reload categories after migration to reflect new category names in filter dropdown
       // await loadCategories() // TODO: implement if needed
       
       // Reset to first page
       setSkip(0)
-      
-      // Wait for backend to commit, then reload
-      setTimeout(async () => {
-        try {
-          await loadProspects()
-          console.log('✅ [MIGRATE CATEGORIES] Refresh complete')
-        } catch (err) {
-          console.error('❌ [MIGRATE CATEGORIES] Error on refresh:', err)
-        }
-      }, 1000)
+      await loadProspects()
+      console.log('✅ [MIGRATE CATEGORIES] Refresh complete')
       
       setTimeout(() => setError(null), 8000)
     } catch (err: any) {
@@ -229,46 +229,37 @@ export default function Pipeline() {
       // Show success message
       console.log('✅ Drafting job started:', result.job_id)
       
-      // Start polling for job status (same as LeadsTable) - continue until completion
-      const { getDraftJobStatus } = await import('@/lib/api')
-      const pollInterval = setInterval(async () => {
-        try {
-          const status = await getDraftJobStatus(result.job_id)
-          
-          if (status.status === 'failed') {
-            clearInterval(pollInterval)
-            console.error('❌ Drafting failed:', status.error_message)
-            return
-          }
+      // Follow the job (same as LeadsTable) until completion
+      const { watchJob } = await import('@/lib/api')
+      watchJob(result.job_id, async (status) => {
+        if (status.status === 'failed' || status.status === 'cancelled') {
+          console.error(`❌ Drafting ${status.status}:`, status.error)
+          return
+        }
+        
+        if (status.status === 'completed') {
+          console.log(`✅ Drafting completed! ${status.drafts_created} drafts created.`)
           
-          if (status.status === 'completed') {
-            clearInterval(pollInterval)
-            console.log(`✅ Drafting completed! ${status.drafts_created} drafts created.`)
-            
-            // Trigger pipeline status refresh
-            await loadStatus()
-            if (typeof window !== 'undefined') {
-              window.dispatchEvent(new CustomEvent('refreshPipelineStatus'))
-              window.dispatchEvent(new CustomEvent('jobsCompleted'))
-              window.dispatchEvent(new CustomEvent('refreshDrafts'))
-            }
-            return
+          // Trigger pipeline status refresh
+          await loadStatus()
+          if (typeof window !== 'undefined') {
+            window.dispatchEvent(new CustomEvent('refreshPipelineStatus'))
+            window.dispatchEvent(new CustomEvent('jobsCompleted'))
+            window.dispatchEvent(new CustomEvent('refreshDrafts'))
           }
+          return
+        }
+        
+        // Update progress
+        if (status.status === 'running') {
+          console.log(`⏳ Drafting in progress... ${status.drafts_created}${status.total_targets ? ` / ${status.total_targets}` : ''} drafts created`)
           
-          // Update progress
-          if (status.status === 'running') {
-            console.log(`⏳ Drafting in progress... ${status.drafts_created}${status.total_targets ? ` / ${status.total_targets}` : ''} drafts created`)
-            
-            // Refresh drafts list periodically while drafting
-            if (typeof window !== 'undefined') {
-              window.dispatchEvent(new CustomEvent('refreshDrafts'))
-            }
+          // Refresh drafts list periodically while drafting
+          if (typeof window !== 'undefined') {
+            window.dispatchEvent(new CustomEvent('refreshDrafts'))
           }
-        } catch (pollErr: any) {
-          console.error('Error polling draft job status:', pollErr)
-          // Keep polling on error - job might still be running
         }
-      }, 3000) // Poll every 3 seconds
+      })
       
       // Trigger pipeline status refresh immediately
       await loadStatus()
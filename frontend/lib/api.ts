@@ -192,6 +192,8 @@ export interface Job {
   params?: any
   result?: any
   error_message?: string
+  drafts_created?: number
+  total_targets?: number | null
   created_at: string
   updated_at: string
 }
@@ -446,6 +448,128 @@ export async function getJobStatus(jobId: string): Promise<Job> {
   return res.json()
 }
 
+export async function getJob(jobId: string): Promise<Job> {
+  const res = await authenticatedFetch(`${API_BASE}/jobs/${jobId}`)
+  if (!res.ok) {
+    const error = await res.json().catch(() => ({ detail: 'Failed to get job' }))
+    throw new Error(error.detail || 'Failed to get job')
+  }
+  return res.json()
+}
+
+const TERMINAL_JOB_STATUSES = ['completed', 'failed', 'cancelled']
+
+/**
+ * Progress of a job: an event from /api/jobs/{job_id}/events, or the job row when polling
+ */
+export interface JobProgress {
+  job_id: string
+  job_type: string
+  status: string
+  counts: Record<string, any>
+  drafts_created: number | null
+  total_targets: number | null
+  error: string | null
+}
+
+function jobProgressFromJob(job: Job): JobProgress {
+  return {
+    job_id: job.id,
+    job_type: job.job_type,
+    status: job.status,
+    counts: job.result || {},
+    drafts_created: job.drafts_created ?? null,
+    total_targets: job.total_targets ?? null,
+    error: job.error_message || null,
+  }
+}
+
+/**
+ * Follow a job until it ends. Uses the Server-Sent Events stream
+ * (/api/jobs/{job_id}/events); if EventSource is unavailable or the stream
+ * fails, falls back to polling /api/jobs/{job_id} every pollIntervalMs.
+ * onProgress gets the current state first, then every change; the last call
+ * has a terminal status (completed / failed / cancelled).
+ * Returns a function that stops watching.
+ */
+export function watchJob(jobId: string, onProgress: (progress: JobProgress) => void, pollIntervalMs = 3000): () => void {
+  let stopped = false
+  let source: EventSource | null = null
+  let pollTimer: ReturnType<typeof setTimeout> | null = null
+
+  const stop = () => {
+    stopped = true
+    source?.close()
+    source = null
+    if (pollTimer) {
+      clearTimeout(pollTimer)
+      pollTimer = null
+    }
+  }
+
+  const poll = async () => {
+    if (stopped) return
+    try {
+      const progress = jobProgressFromJob(await getJob(jobId))
+      if (stopped) return
+      onProgress(progress)
+      if (TERMINAL_JOB_STATUSES.includes(progress.status)) {
+        stop()
+        return
+      }
+    } catch (err) {
+      // Keep polling - the job may still be running
+      console.error(`Failed to poll job ${jobId}:`, err)
+    }
+    if (!stopped) {
+      pollTimer = setTimeout(poll, pollIntervalMs)
+    }
+  }
+
+  if (typeof EventSource === 'undefined') {
+    poll()
+    return stop
+  }
+
+  source = new EventSource(`${API_BASE}/jobs/${jobId}/events`)
+  const handle = (message: MessageEvent) => {
+    if (stopped) return
+    const progress: JobProgress = JSON.parse(message.data)
+    onProgress(progress)
+    if (TERMINAL_JOB_STATUSES.includes(progress.status)) {
+      stop()
+    }
+  }
+  source.addEventListener('progress', handle as EventListener)
+  source.addEventListener('end', handle as EventListener)
+  source.onerror = () => {
+    if (stopped) return
+    console.warn(`⚠️ Job ${jobId} event stream failed, polling instead`)
+    source?.close()
+    source = null
+    poll()
+  }
+  return stop
+}
+
+/**
+ * Wait for a background job to end (watchJob: events, polling as a fallback).
+ * Resolves with the completed job (its result holds the counts); throws if it failed or was cancelled.
+ */
+export function waitForJob(jobId: string): Promise<Job> {
+  return new Promise((resolve, reject) => {
+    watchJob(jobId, progress => {
+      if (!TERMINAL_JOB_STATUSES.includes(progress.status)) return
+      if (progress.status !== 'completed') {
+        reject(new Error(progress.error || `Job ${progress.status}`))
+        return
+      }
+      // Events only carry scalar counts; read the full result once
+      getJob(jobId).then(resolve, reject)
+    })
+  })
+}
+
 export type EnrichmentResult = {
   email?: string
   domain?: string
@@ -1460,6 +1584,7 @@ export async function updateProspectCategory(request: UpdateCategoryRequest): Pr
 export interface AutoCategorizeResponse {
   success: boolean
   categorized_count: number
+  job_id?: string
   message: string
 }
 
@@ -1478,6 +1603,7 @@ export interface MigrateCategoriesResponse {
   success: boolean
   migrated_count: number
   category_mapping: Record<string, { to: string; count: number }>
+  job_id?: string
   message: string
 }
 
@@ -1492,6 +1618,21 @@ export async function migrateCategories(): Promise<MigrateCategoriesResponse> {
   return res.json()
 }
 
+/**
+ * One-line summary of a finished "categorize" job (auto_categorize / migrate_categories)
+ */
+export function summarizeCategorizeJob(job: Job): string {
+  const result = job.result || {}
+  const categorized = `categorized ${result.categorized ?? 0} prospect(s)`
+  if (!job.params?.migrate) {
+    return `Auto-${categorized}`
+  }
+  const mapping = Object.entries((result.category_mapping || {}) as MigrateCategoriesResponse['category_mapping'])
+    .map(([from, change]) => `${from} → ${change.to} (${change.count})`)
+    .join(', ')
+  return `Migrated ${result.migrated ?? 0} prospect(s)${mapping ? `: ${mapping}` : ''}; ${categorized}`
+}
+
 // ============================================
 // MASTER SWITCH & AUTOMATION CONTROL
 // ============================================
@@ -5,7 +5,7 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Optional, Dict, Any, Tuple
 from utils.config import settings
-from scraper.rate_limiter import RateLimiter
+from scraper.rate_limiter import RateLimiter, RobotsCache, retry_after_seconds
 import time
 import logging
 
@@ -23,6 +23,7 @@ class BaseScraper:
         self.timeout = settings.SCRAPER_TIMEOUT
         self.max_retries = settings.SCRAPER_MAX_RETRIES
         self.rate_limiter = RateLimiter(max_requests=10, time_window=60)
+        self.robots = RobotsCache(self.session)
     
     def fetch_page(self, url: str, use_rate_limit: bool = True, silent_404: bool = False) -> Tuple[Optional[BeautifulSoup], Optional[str]]:
         """
@@ -38,15 +39,20 @@ class BaseScraper:
         """
         from urllib.parse import urlparse
         
-        # Apply rate limiting
-        if use_rate_limit:
-            domain = urlparse(url).netloc
-            self.rate_limiter.wait_if_needed(domain)
+        # Respect robots.txt (cached per origin)
+        if not self.robots.allowed(url):
+            logger.debug(f"Disallowed by robots.txt: {url}")
+            return None, None
+        
+        domain = urlparse(url).netloc
         
         # Retry logic
         last_error = None
         is_404 = False
         for attempt in range(self.max_retries):
+            # Apply rate limiting (and the site's Crawl-delay) before every attempt
+            if use_rate_limit:
+                self.rate_limiter.wait_if_needed(domain, min_interval=self.robots.crawl_delay(url))
             try:
                 response = self.session.get(
                     url,
@@ -82,7 +88,11 @@ class BaseScraper:
                 else:
                     last_error = f"HTTP error: {str(e)}"
                     if attempt < self.max_retries - 1:
-                        time.sleep(1)
+                        # 429 / 503: wait as long as the site asks (Retry-After)
+                        wait = 1
+                        if status_code in (429, 503):
+                            wait = retry_after_seconds(e.response.headers.get("Retry-After"), default=2 ** (attempt + 1))
+                        time.sleep(wait)
             except requests.exceptions.Timeout as e:
                 last_error = f"Timeout: {str(e)}"
                 if attempt < self.max_retries - 1:
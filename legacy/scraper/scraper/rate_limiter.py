@@ -2,9 +2,16 @@
 Rate limiting utilities for scrapers
 """
 import time
+from email.utils import parsedate_to_datetime
 from threading import Lock
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from collections import defaultdict
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+# Cap for Crawl-delay and Retry-After waits (seconds)
+MAX_POLITENESS_WAIT = 60
+ROBOTS_TTL = 3600
 
 
 class RateLimiter:
@@ -23,15 +30,22 @@ class RateLimiter:
         self.requests: Dict[str, list] = defaultdict(list)
         self.lock = Lock()
     
-    def wait_if_needed(self, key: str = "default"):
+    def wait_if_needed(self, key: str = "default", min_interval: float = 0.0):
         """
         Wait if rate limit would be exceeded
         
         Args:
             key: Key to track rate limits (e.g., domain name)
+            min_interval: Minimum seconds since the previous request for this key
+                (e.g. a robots.txt Crawl-delay)
         """
         with self.lock:
             now = time.time()
+            if min_interval and self.requests[key]:
+                wait_time = max(self.requests[key]) + min_interval - now
+                if wait_time > 0:
+                    time.sleep(wait_time)
+                    now = time.time()
             # Remove old requests outside time window
             self.requests[key] = [
                 req_time for req_time in self.requests[key]
@@ -60,3 +74,57 @@ class RateLimiter:
             if key in self.requests:
                 del self.requests[key]
 
+
+
+class RobotsCache:
+    """robots.txt rules per origin, fetched once and cached for ROBOTS_TTL seconds"""
+    
+    def __init__(self, session, agent: str = "*", timeout: int = 5):
+        self.session = session
+        self.agent = agent
+        self.timeout = timeout
+        self._rules: Dict[str, Tuple[float, Optional[RobotFileParser]]] = {}
+        self.lock = Lock()
+    
+    def _rules_for(self, url: str) -> Optional[RobotFileParser]:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self.lock:
+            cached = self._rules.get(origin)
+            if cached and time.time() - cached[0] < ROBOTS_TTL:
+                return cached[1]
+        parser = None
+        try:
+            response = self.session.get(f"{origin}/robots.txt", timeout=self.timeout)
+            if response.status_code == 200:
+                parser = RobotFileParser()
+                parser.parse(response.text.splitlines())
+                parser.modified()  # marks the rules as loaded (crawl_delay() needs it)
+        except Exception:
+            parser = None  # unreachable robots.txt: no rules
+        with self.lock:
+            self._rules[origin] = (time.time(), parser)
+        return parser
+    
+    def allowed(self, url: str) -> bool:
+        parser = self._rules_for(url)
+        return parser is None or parser.can_fetch(self.agent, url)
+    
+    def crawl_delay(self, url: str) -> float:
+        parser = self._rules_for(url)
+        delay = parser.crawl_delay(self.agent) if parser is not None else None
+        return min(float(delay), MAX_POLITENESS_WAIT) if delay else 0.0
+
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    """Seconds to wait from a Retry-After header (seconds or HTTP date), capped at MAX_POLITENESS_WAIT"""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_POLITENESS_WAIT)
+    try:
+        wait = parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return default
+    return min(max(wait, 0.0), MAX_POLITENESS_WAIT)
@@ -5,6 +5,7 @@ import base64
 import json
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import make_msgid
 from typing import Dict, Any, Optional
 import os
 from dotenv import load_dotenv
@@ -120,6 +121,9 @@ class GmailClient:
         message["subject"] = subject
         if from_email:
             message["from"] = from_email
+        # Our own Message-ID, so replies can be matched by In-Reply-To / References
+        message_id_header = make_msgid(domain=from_email.split("@")[-1] if from_email else None)
+        message["Message-ID"] = message_id_header
         
         # Add body
         message.attach(MIMEText(body, "plain"))
@@ -160,6 +164,7 @@ class GmailClient:
                     "success": True,
                     "message_id": message_id,
                     "thread_id": result.get("threadId"),
+                    "message_id_header": message_id_header,
                     "raw_response": result
                 }
         
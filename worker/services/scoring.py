@@ -2,9 +2,11 @@
 Scoring service - calculates prospect scores based on multiple factors
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from decimal import Decimal
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +32,17 @@ class ProspectScorer:
         "gift_guides": ["gift", "guide", "present", "shopping", "buy", "purchase"],
         "tech_innovation": ["tech", "technology", "innovation", "gadget", "digital", "smart"]
     }
+    _keyword_matcher = None  # compiled CATEGORY_KEYWORDS, see _category_matcher()
+    
+    @classmethod
+    def _category_matcher(cls):
+        """KeywordMatcher over CATEGORY_KEYWORDS, compiled on first use"""
+        if cls._keyword_matcher is None:
+            # Shared with the backend; imported here so this module does not
+            # need backend/ on sys.path at import time (worker tasks add it)
+            from app.utils.keyword_matcher import KeywordMatcher
+            cls._keyword_matcher = KeywordMatcher(cls.CATEGORY_KEYWORDS)
+        return cls._keyword_matcher
     
     def calculate_score(
         self,
@@ -144,17 +157,16 @@ class ProspectScorer:
         if not text_to_check:
             return 50.0
         
-        # Count keyword matches
+        # Count keyword matches (one pass over the text for all categories)
+        matcher = self._category_matcher()
+        hits = matcher.found(text_to_check)
         matches = 0
         total_keywords = 0
         
         for category in categories:
             if category in self.CATEGORY_KEYWORDS:
-                keywords = self.CATEGORY_KEYWORDS[category]
-                total_keywords += len(keywords)
-                for keyword in keywords:
-                    if keyword in text_to_check:
-                        matches += 1
+                total_keywords += len(self.CATEGORY_KEYWORDS[category])
+                matches += len(matcher.matches(hits, category))
         
         if total_keywords == 0:
             return 50.0
@@ -208,6 +220,108 @@ class ProspectScorer:
         return min(100.0, max(0.0, score))
 
 
+    def calculate_scores(
+        self,
+        prospects: Sequence[Dict[str, Any]],
+        categories: Optional[list] = None
+    ) -> List[Optional[Decimal]]:
+        """
+        Columnar equivalent of calculate_score for many prospects at once
+        
+        Payload fields are extracted per row (JSON can't be vectorized), then every
+        weighted component is computed on NumPy arrays with the same float
+        operations, in the same order, as the scalar path - so scores are identical.
+        
+        Args:
+            prospects: Dicts with calculate_score's keyword arguments
+                (domain_authority, has_email, email_confidence, page_title,
+                page_url, dataforseo_payload, hunter_payload)
+            categories: Categories for relevance scoring (applied to every row)
+        
+        Returns:
+            Decimal score per prospect, or None where the scalar path would raise
+        """
+        count = len(prospects)
+        da_given = np.zeros(count, dtype=bool)
+        da_value = np.zeros(count)
+        backlinks = np.zeros(count)
+        has_dataforseo = np.zeros(count, dtype=bool)
+        has_email = np.zeros(count, dtype=bool)
+        confidence_given = np.zeros(count, dtype=bool)
+        confidence_value = np.zeros(count)
+        has_hunter = np.zeros(count, dtype=bool)
+        hunter_confidence = np.zeros(count)
+        has_title = np.zeros(count, dtype=bool)
+        has_url = np.zeros(count, dtype=bool)
+        relevance = np.full(count, 50.0)
+        failed = np.zeros(count, dtype=bool)
+        
+        for i, prospect in enumerate(prospects):
+            try:
+                domain_authority = prospect.get("domain_authority")
+                dataforseo_payload = prospect.get("dataforseo_payload")
+                hunter_payload = prospect.get("hunter_payload")
+                email_confidence = prospect.get("email_confidence")
+                page_title = prospect.get("page_title")
+                page_url = prospect.get("page_url")
+                
+                if domain_authority is not None:
+                    da_given[i] = True
+                    da_value[i] = float(domain_authority)
+                elif dataforseo_payload:
+                    value = dataforseo_payload.get("metrics", {}).get("backlinks", 0)
+                    backlinks[i] = float(value) if value > 0 else 0.0
+                has_dataforseo[i] = bool(dataforseo_payload)
+                
+                has_email[i] = bool(prospect.get("has_email"))
+                if email_confidence is not None:
+                    confidence_given[i] = True
+                    confidence_value[i] = float(email_confidence)
+                elif has_email[i] and hunter_payload:
+                    emails = hunter_payload.get("emails", [])
+                    hunter_confidence[i] = float(emails[0].get("confidence_score", 50)) if emails else 50.0
+                has_hunter[i] = bool(hunter_payload)
+                
+                has_title[i] = bool(page_title and len(page_title.strip()) > 0)
+                has_url[i] = bool(page_url and len(page_url.strip()) > 0)
+                if categories:
+                    relevance[i] = self._calculate_relevance_score(page_title, page_url, categories)
+            except Exception as e:
+                failed[i] = True
+                logger.debug(f"Could not extract scoring inputs for row {i}: {e}")
+        
+        scores = {
+            "domain_authority": np.where(
+                da_given,
+                da_value,
+                np.where(has_dataforseo & (backlinks > 0), np.minimum(100.0, (backlinks / 1000) * 50), 20.0)
+            ),
+            "has_email": np.where(has_email, 100.0, 0.0),
+            "email_confidence": np.where(
+                confidence_given,
+                confidence_value,
+                np.where(has_email & has_hunter, hunter_confidence, 0.0)
+            ),
+            "topical_relevance": relevance,
+            "data_quality": np.clip(
+                ((has_title * 20.0 + has_url * 20.0 + has_dataforseo * 30.0 + has_hunter * 30.0) / 4) * 2.5,
+                0.0,
+                100.0
+            ),
+            "recency": np.full(count, 100.0),
+        }
+        
+        # Accumulate in WEIGHTS order, exactly like the scalar loop
+        total = np.zeros(count)
+        for factor, weight in self.WEIGHTS.items():
+            total += scores[factor] * weight
+        
+        return [
+            None if failed[i] else Decimal(str(round(value, 2)))
+            for i, value in enumerate(total.tolist())
+        ]
+
+
 def calculate_prospect_score(prospect_data: Dict[str, Any]) -> Decimal:
     """
     Convenience function to calculate score for a prospect
@@ -21,6 +21,7 @@ sys.path.insert(0, str(backend_path))
 from worker.clients.dataforseo import DataForSEOClient
 from app.models.job import Job
 from app.models.prospect import Prospect
+from app.models.prospect_payload import ProspectPayload
 
 load_dotenv()
 
@@ -137,7 +138,7 @@ async def discover_websites_async(job_id: str) -> Dict[str, Any]:
                                     da_est=None,  # Will be enriched later
                                     score=0,  # Will be calculated later
                                     outreach_status="pending",
-                                    dataforseo_payload=item
+                                    payloads=ProspectPayload(dataforseo_payload=item)
                                 )
                                 
                                 db.add(prospect)
@@ -22,6 +22,7 @@ from worker.clients.gemini import GeminiClient
 from app.models.job import Job
 from app.models.prospect import Prospect
 from app.models.email_log import EmailLog
+from app.services.prospect_payloads import get_payloads_many, snippet_from_payload
 
 load_dotenv()
 
@@ -98,6 +99,9 @@ async def send_followups_async(job_id: str) -> Dict[str, Any]:
             failed_count = 0
             errors = []
             
+            # SERP snippets of all prospects in one query (payloads are not on the prospects row)
+            snippets = await get_payloads_many(db, [p.id for p in prospects], "dataforseo_payload")
+            
             # Send follow-up to each prospect
             for prospect in prospects:
                 try:
@@ -105,9 +109,7 @@ async def send_followups_async(job_id: str) -> Dict[str, Any]:
                     
                     # Compose follow-up email using Gemini
                     # Extract snippet from DataForSEO payload
-                    page_snippet = None
-                    if prospect.dataforseo_payload:
-                        page_snippet = prospect.dataforseo_payload.get("description") or prospect.dataforseo_payload.get("snippet")
+                    page_snippet = snippet_from_payload(snippets.get(prospect.id, {}).get("dataforseo_payload"))
                     
                     # Compose follow-up email
                     followup_result = await gemini_client.compose_email(
@@ -155,7 +157,10 @@ Best regards"""
                             prospect_id=prospect.id,
                             subject=subject,
                             body=followup_body,
-                            response=send_result
+                            response=send_result,
+                            gmail_thread_id=send_result.get("thread_id"),
+                            gmail_message_id=send_result.get("message_id") if send_result.get("thread_id") else None,
+                            message_id_header=send_result.get("message_id_header")
                         )
                         db.add(email_log)
                         
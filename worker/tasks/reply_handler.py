@@ -3,11 +3,10 @@ Reply handler task - checks for email replies and updates prospect status
 """
 import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select, and_, or_
-from datetime import datetime, timedelta
+from sqlalchemy import select
 import os
 from dotenv import load_dotenv
 import sys
@@ -17,9 +16,10 @@ from pathlib import Path
 backend_path = Path(__file__).resolve().parents[2] / "backend"
 sys.path.insert(0, str(backend_path))
 
-from worker.clients.gmail import GmailClient
+# The backend client also implements the history/message reads used for reply sync
+from app.clients.gmail import GmailClient as GmailReaderClient
 from app.models.prospect import Prospect
-from app.models.email_log import EmailLog
+from app.services.reply_sync import sync_replies
 
 load_dotenv()
 
@@ -31,90 +31,31 @@ engine = create_async_engine(DATABASE_URL, echo=False)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
-async def check_replies_async() -> Dict[str, Any]:
+async def check_replies_async(notified_history_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Check Gmail for replies to sent emails and update prospect status
     
+    Only the mailbox changes since the last processed Gmail historyId are
+    fetched (see app/services/reply_sync.py), so the cost follows new mail
+    rather than the number of prospects ever emailed.
+    
+    Args:
+        notified_history_id: historyId from a Gmail push notification, if any
+    
     Returns:
         Dictionary with results
     """
+    try:
+        gmail_client = GmailReaderClient()
+    except ValueError as e:
+        logger.error(f"Gmail client initialization failed: {e}")
+        return {"success": False, "error": str(e)}
+    
     async with AsyncSessionLocal() as db:
         try:
-            # Initialize Gmail client
-            try:
-                gmail_client = GmailClient()
-            except ValueError as e:
-                logger.error(f"Gmail client initialization failed: {e}")
-                return {"success": False, "error": str(e)}
-            
-            # Get prospects with sent emails
-            query = select(Prospect).where(
-                and_(
-                    Prospect.outreach_status == "sent",
-                    Prospect.contact_email.isnot(None)
-                )
-            )
-            
-            result = await db.execute(query)
-            prospects = result.scalars().all()
-            
-            logger.info(f"Checking for replies to {len(prospects)} prospects")
-            
-            replied_count = 0
-            errors = []
-            
-            # Check each prospect for replies
-            for prospect in prospects:
-                try:
-                    # Get email logs for this prospect
-                    email_logs_query = select(EmailLog).where(
-                        EmailLog.prospect_id == prospect.id
-                    ).order_by(EmailLog.sent_at.desc())
-                    
-                    email_logs_result = await db.execute(email_logs_query)
-                    email_logs = email_logs_result.scalars().all()
-                    
-                    if not email_logs:
-                        continue
-                    
-                    # Check for replies using Gmail API
-                    # Search for emails from this contact
-                    from_email = prospect.contact_email
-                    
-                    # Use Gmail API to search for replies
-                    # This is a simplified version - in production, use Gmail webhooks or better search
-                    search_query = f'from:{from_email} in:inbox'
-                    
-                    # For now, we'll use a simple approach:
-                    # Check if there are any new emails from this contact since we sent
-                    # In production, implement proper Gmail search API or webhooks
-                    
-                    # Placeholder: In production, implement Gmail search
-                    # For now, we'll mark this as a TODO
-                    logger.debug(f"Checking for replies from {from_email} for prospect {prospect.domain}")
-                    
-                    # TODO: Implement actual Gmail search/thread checking
-                    # This would require:
-                    # 1. Getting thread ID from sent email
-                    # 2. Checking thread for new messages
-                    # 3. Detecting if it's a reply
-                    # 4. Updating prospect status
-                    
-                except Exception as e:
-                    error_msg = f"Error checking replies for prospect {prospect.id}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
-            
-            await db.commit()
-            
-            logger.info(f"Reply check completed: {replied_count} replies found")
-            
-            return {
-                "success": True,
-                "replied_count": replied_count,
-                "errors": errors[:10] if errors else []
-            }
+            result = await sync_replies(db, gmail_client, notified_history_id=notified_history_id)
+            logger.info(f"Reply check completed: {result.get('replied', 0)} replies found")
+            return {**result, "replied_count": result.get("replied", 0)}
         
         except Exception as e:
             logger.error(f"Error in reply check: {str(e)}", exc_info=True)
@@ -3,10 +3,11 @@ Scoring task - calculates and updates prospect scores
 """
 import asyncio
 import logging
-from typing import Dict, Any
+from decimal import Decimal
+from typing import Dict, Any, List, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, text
 import os
 from dotenv import load_dotenv
 import sys
@@ -19,6 +20,7 @@ sys.path.insert(0, str(backend_path))
 from worker.services.scoring import ProspectScorer
 from app.models.job import Job
 from app.models.prospect import Prospect
+from app.models.prospect_payload import ProspectPayload
 
 load_dotenv()
 
@@ -30,10 +32,74 @@ engine = create_async_engine(DATABASE_URL, echo=False)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+# Prospects scored and written back per chunk
+SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "2000"))
+
+# Only the columns the scorer needs - no ORM objects are loaded
+SCORING_COLUMNS = (
+    Prospect.id,
+    Prospect.da_est,
+    Prospect.contact_email,
+    Prospect.page_title,
+    Prospect.page_url,
+    ProspectPayload.dataforseo_payload,
+    ProspectPayload.snov_payload,
+)
+
+
+def _scoring_inputs(row) -> Dict[str, Any]:
+    """Map a projected prospect row to calculate_score()'s arguments"""
+    # Email provider payload: {"emails": [{"confidence_score": ...}]} (Snov, formerly Hunter.io)
+    provider_payload = row.snov_payload
+    email_confidence = None
+    if isinstance(provider_payload, dict) and provider_payload.get("emails"):
+        emails = provider_payload["emails"]
+        if emails and isinstance(emails[0], dict):
+            email_confidence = emails[0].get("confidence_score")
+    return {
+        "domain_authority": float(row.da_est) if row.da_est else None,
+        "has_email": bool(row.contact_email),
+        "email_confidence": email_confidence,
+        "page_title": row.page_title,
+        "page_url": row.page_url,
+        "dataforseo_payload": row.dataforseo_payload,
+        "hunter_payload": provider_payload,
+    }
+
+
+async def _write_scores(db: AsyncSession, scored: List[Tuple[UUID, Decimal]]) -> int:
+    """Write a chunk of scores with one UPDATE ... FROM (VALUES ...); returns rows changed"""
+    if not scored:
+        return 0
+    values = ", ".join(
+        f"(CAST(:id_{i} AS uuid), CAST(:score_{i} AS numeric))" for i in range(len(scored))
+    )
+    params: Dict[str, Any] = {}
+    for i, (prospect_id, score) in enumerate(scored):
+        params[f"id_{i}"] = prospect_id
+        params[f"score_{i}"] = score
+    result = await db.execute(
+        text(f"""
+            UPDATE prospects p SET score = v.score
+            FROM (VALUES {values}) AS v(id, score)
+            WHERE p.id = v.id AND p.score IS DISTINCT FROM v.score
+        """),
+        params
+    )
+    return result.rowcount
+
+
 async def score_prospects_async(job_id: str) -> Dict[str, Any]:
     """
     Async function to calculate and update prospect scores
     
+    Prospects are processed in chunks: one projected query, one vectorized
+    ProspectScorer.calculate_scores() call and one UPDATE per chunk.
+    
+    Job params:
+        prospect_ids: Optional list of specific prospects to score
+        max_prospects: Limit when no IDs are given (default 1000, None = whole table)
+    
     Args:
         job_id: UUID of the job to process
     
@@ -55,7 +121,7 @@ async def score_prospects_async(job_id: str) -> Dict[str, Any]:
             await db.commit()
             
             params = job.params or {}
-            prospect_ids = params.get("prospect_ids", [])  # Optional: specific prospects
+            prospect_ids = [UUID(pid) for pid in params.get("prospect_ids", [])]  # Optional: specific prospects
             max_prospects = params.get("max_prospects", 1000)  # Limit if no IDs specified
             
             logger.info(f"Starting scoring job {job_id}")
@@ -63,68 +129,50 @@ async def score_prospects_async(job_id: str) -> Dict[str, Any]:
             # Initialize scorer
             scorer = ProspectScorer()
             
-            # Get prospects to score
-            if prospect_ids:
-                # Score specific prospects
-                query = select(Prospect).where(
-                    Prospect.id.in_([UUID(pid) for pid in prospect_ids])
-                )
-            else:
-                # Score all prospects (or up to limit)
-                query = select(Prospect).limit(max_prospects)
-            
-            result = await db.execute(query)
-            prospects = result.scalars().all()
-            
-            logger.info(f"Found {len(prospects)} prospects to score")
-            
             scored_count = 0
+            updated_count = 0
             errors = []
-            
-            # Score each prospect
-            for prospect in prospects:
-                try:
-                    # Extract email confidence from Hunter.io payload
-                    email_confidence = None
-                    if prospect.hunter_payload and prospect.hunter_payload.get("emails"):
-                        emails = prospect.hunter_payload["emails"]
-                        if emails:
-                            email_confidence = emails[0].get("confidence_score")
-                    
-                    # Calculate score
-                    new_score = scorer.calculate_score(
-                        domain_authority=float(prospect.da_est) if prospect.da_est else None,
-                        has_email=bool(prospect.contact_email),
-                        email_confidence=email_confidence,
-                        page_title=prospect.page_title,
-                        page_url=prospect.page_url,
-                        categories=None,  # Can be extracted from dataforseo_payload if needed
-                        dataforseo_payload=prospect.dataforseo_payload,
-                        hunter_payload=prospect.hunter_payload
-                    )
-                    
-                    # Update prospect score
-                    old_score = prospect.score
-                    prospect.score = new_score
-                    
-                    scored_count += 1
-                    
-                    if old_score != new_score:
-                        logger.debug(f"Updated score for {prospect.domain}: {old_score} → {new_score}")
+            last_id = None
+            
+            while True:
+                # Get the next chunk of prospects to score (keyset pagination on id)
+                chunk_limit = SCORING_CHUNK_SIZE
+                if not prospect_ids and max_prospects is not None:
+                    chunk_limit = min(chunk_limit, max_prospects - scored_count - len(errors))
+                    if chunk_limit <= 0:
+                        break
+                # Payloads live in prospect_payloads (one row per prospect, possibly none)
+                query = select(*SCORING_COLUMNS).select_from(Prospect).outerjoin(
+                    ProspectPayload, ProspectPayload.prospect_id == Prospect.id
+                )
+                if prospect_ids:
+                    query = query.where(Prospect.id.in_(prospect_ids))
+                if last_id is not None:
+                    query = query.where(Prospect.id > last_id)
+                rows = (await db.execute(query.order_by(Prospect.id).limit(chunk_limit))).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
                 
-                except Exception as e:
-                    error_msg = f"Error scoring prospect {prospect.id}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
-            
-            # Commit all changes
-            await db.commit()
+                scores = scorer.calculate_scores([_scoring_inputs(row) for row in rows])
+                
+                scored = []
+                for row, score in zip(rows, scores):
+                    if score is None:
+                        errors.append(f"Error scoring prospect {row.id}: invalid scoring inputs")
+                    else:
+                        scored.append((row.id, score))
+                
+                updated_count += await _write_scores(db, scored)
+                await db.commit()
+                scored_count += len(scored)
+                logger.info(f"Scored {scored_count} prospects so far ({updated_count} changed)")
             
             # Update job status
             job.status = "completed"
             job.result = {
                 "prospects_scored": scored_count,
+                "scores_changed": updated_count,
                 "errors": errors[:10] if errors else []  # Include first 10 errors
             }
             await db.commit()
@@ -142,6 +190,7 @@ async def score_prospects_async(job_id: str) -> Dict[str, Any]:
             
             # Update job status to failed
             try:
+                await db.rollback()
                 result = await db.execute(select(Job).where(Job.id == UUID(job_id)))
                 job = result.scalar_one_or_none()
                 if job:
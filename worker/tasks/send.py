@@ -129,7 +129,10 @@ async def send_emails_async(job_id: str) -> Dict[str, Any]:
                             prospect_id=prospect.id,
                             subject=subject,
                             body=body,
-                            response=send_result
+                            response=send_result,
+                            gmail_thread_id=send_result.get("thread_id"),
+                            gmail_message_id=send_result.get("message_id") if send_result.get("thread_id") else None,
+                            message_id_header=send_result.get("message_id_header")
                         )
                         db.add(email_log)
                         
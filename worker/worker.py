@@ -31,6 +31,10 @@ else:
     # Render might have different structure
     logger.warning(f"Backend directory not found at {backend_dir}, using current path")
 
+# Session hooks that turn committed job progress into events (pg_notify), so
+# GET /api/jobs/{id}/events on the API instances follows jobs run here too
+import app.services.job_events  # noqa: E402,F401
+
 # Redis connection
 redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 try: